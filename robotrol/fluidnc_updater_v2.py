@@ -10,6 +10,8 @@ import threading, time, json, re, os
 import urllib.parse
 import requests
 
+from robotrol.serial.settings import ControllerSettings
+
 DEFAULT_IP = "192.168.25.149"  # <- Deine Vorgabe ("pre IP")
 
 # --------------- Low-level HTTP Client ---------------
@@ -212,20 +214,13 @@ def parse_dollars(lines: list[str]) -> dict:
     """
     Parse $$ lines into a dict {int_code: float|str}
     Accepts lines like "$100=250.000 (x, step/mm)"
+    (thin wrapper over robotrol.serial.settings.ControllerSettings)
     """
+    settings = ControllerSettings.parse(lines)
     out = {}
-    pat = re.compile(r"^\s*\$([0-9]+)\s*=\s*([^\s]+)")
-    for ln in lines:
-        m = pat.match(ln)
-        if not m:
-            continue
-        code = int(m.group(1))
-        raw = m.group(2)
-        try:
-            val = float(raw)
-        except Exception:
-            val = raw
-        out[code] = val
+    for code, raw in settings.items():
+        val = settings.number(code, None)
+        out[code] = raw if val is None else val
     return out
 
 
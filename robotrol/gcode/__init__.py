@@ -0,0 +1 @@
+"""G-code program tools: host-side optimisation passes applied before streaming."""
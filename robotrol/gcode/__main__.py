@@ -0,0 +1,170 @@
+"""Command line entry point: ``python -m robotrol.gcode``.
+
+Subcommands
+-----------
+compile
+    Convert a Cartesian G-code file, drawn in a user plane, into joint-space
+    G-code for a robot profile::
+
+        python -m robotrol.gcode compile in.gcode --profile EB300 --plane plane.json
+
+estimate
+    Estimate the cycle time of a (joint-space) program from the controller's
+    ``$$`` settings::
+
+        python -m robotrol.gcode estimate job.gcode --settings settings.txt
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from robotrol.config.profiles import PROFILE_FILES, ProfileManager
+from robotrol.gcode.estimator import (
+    DEFAULT_LOOKAHEAD, MachineLimits, estimate_program, format_duration,
+)
+from robotrol.gcode.pipeline import (
+    DEFAULT_CHORD_TOL, DEFAULT_CHUNK, DEFAULT_FEED, DEFAULT_MAX_SEG_LEN, DEFAULT_OVERLAP,
+    PlaneFrame, compile_file, profile_limits,
+)
+from robotrol.gcode.program import load_program
+from robotrol.kinematics.dh_model import DHModel
+
+
+def _load_profile(spec: str, base_dir: str) -> Dict[str, Any]:
+    """Profile by name (``EB300``) or path to a profile JSON file."""
+    if spec.lower().endswith(".json") and os.path.isfile(spec):
+        with open(spec, "r", encoding="utf-8") as f:
+            return json.load(f)
+    mgr = ProfileManager(base_dir)
+    known = {name.lower(): name for name in list(PROFILE_FILES) + mgr.available_profiles()}
+    name = known.get(spec.lower())
+    if name is None:
+        raise SystemExit(f"unknown profile: {spec} (known: {', '.join(sorted(set(known.values())))})")
+    # Profiles live next to the app or in its profiles/ folder
+    for base in (base_dir, os.path.join(base_dir, "profiles")):
+        data = ProfileManager(base).load(name, create_from_legacy=False)
+        if "dh_model" in data:
+            return data
+    raise SystemExit(f"profile {name} not found or has no dh_model (base dir {base_dir})")
+
+
+def _cmd_compile(args: argparse.Namespace) -> int:
+    profile = _load_profile(args.profile, args.base_dir)
+    dh = DHModel.from_profile(profile)
+    plane = PlaneFrame.load(args.plane) if args.plane else PlaneFrame()
+    out_path = args.output or os.path.splitext(args.input)[0] + ".joint.gcode"
+
+    def progress(n: int) -> None:
+        if not args.quiet:
+            print(f"\r{n} waypoints", end="", file=sys.stderr, flush=True)
+
+    t0 = time.perf_counter()
+    tmp = out_path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="\n") as out:
+            report = compile_file(
+                args.input, out, dh.geom, plane,
+                limits=profile_limits(profile),
+                chord_tol=args.chord_tol,
+                max_seg_len=args.max_seg_len,
+                joint_tol=args.joint_tol,
+                feed=args.feed,
+                workers=args.workers,
+                chunk_size=args.chunk_size,
+                overlap=args.overlap,
+                on_progress=progress,
+            )
+        os.replace(tmp, out_path)
+    except BaseException:
+        # Never leave a partial program behind (errors, Ctrl+C)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    dt = time.perf_counter() - t0
+
+    if not args.quiet:
+        print(file=sys.stderr)
+        for msg in report.warnings[:20]:
+            print(f"warning: {msg}", file=sys.stderr)
+        if len(report.warnings) > 20:
+            print(f"... {len(report.warnings) - 20} more warning(s)", file=sys.stderr)
+    print(f"{out_path}: {report.summary()} in {dt:.2f} s")
+    if args.strict and report.limit_violations:
+        return 2
+    return 0
+
+
+def _cmd_estimate(args: argparse.Namespace) -> int:
+    if args.settings:
+        with open(args.settings, "r", encoding="utf-8") as f:
+            limits = MachineLimits.from_lines(f)
+    else:
+        limits = MachineLimits()
+    prog = load_program(args.input)
+    est = estimate_program(prog, limits, default_feed=args.feed, lookahead=args.lookahead)
+    print(f"{args.input}: {format_duration(est.total_s)} "
+          f"({est.total_s:.2f} s, {est.moves} moves, dwell {est.dwell_s:.2f} s)")
+    if args.top:
+        for line_no, t in est.slowest(args.top):
+            print(f"  line {line_no}: {t:.3f} s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m robotrol.gcode",
+        description="Robotrol G-code tools",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("compile", help="Cartesian plane G-code -> joint-space G-code")
+    p.add_argument("input", help="input G-code file (plane coordinates)")
+    p.add_argument("-o", "--output", help="output file (default: <input>.joint.gcode)")
+    p.add_argument("--profile", default="Moveo", help="profile name or profile JSON path")
+    p.add_argument("--plane", help="plane JSON (origin, u, v, rpy and transform options)")
+    p.add_argument("--base-dir", default=os.getcwd(), help="directory containing profiles/")
+    p.add_argument("--chord-tol", type=float, default=DEFAULT_CHORD_TOL,
+                   help="max arc chord deviation in mm")
+    p.add_argument("--max-seg-len", type=float, default=DEFAULT_MAX_SEG_LEN,
+                   help="max arc chord length in mm (0 = no limit)")
+    p.add_argument("--joint-tol", type=float, default=0.0,
+                   help="max joint-space deviation on arcs in degrees (0 = off)")
+    p.add_argument("--feed", type=float, default=DEFAULT_FEED, help="feed until the program sets F")
+    p.add_argument("--workers", type=int, default=None,
+                   help="IK worker processes (default: CPU count, 0 = in-process)")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="waypoints per IK task")
+    p.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="lead-in waypoints per chunk")
+    p.add_argument("--strict", action="store_true", help="exit 2 if any waypoint exceeds joint limits")
+    p.add_argument("-q", "--quiet", action="store_true", help="no progress or warnings on stderr")
+    p.set_defaults(func=_cmd_compile)
+
+    p = sub.add_parser("estimate", help="cycle-time estimate from $$ rate/accel settings")
+    p.add_argument("input", help="G-code file (joint space)")
+    p.add_argument("--settings", help="text file with the controller's $$ output")
+    p.add_argument("--feed", type=float, default=None, help="feed until the program sets F")
+    p.add_argument("--lookahead", type=int, default=DEFAULT_LOOKAHEAD,
+                   help="planner buffer in blocks (0 = whole program)")
+    p.add_argument("--top", type=int, default=0, help="list the N slowest lines")
+    p.set_defaults(func=_cmd_estimate)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
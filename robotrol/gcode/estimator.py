@@ -0,0 +1,352 @@
+"""
+Cycle-time estimate for (joint-space) G-code programs.
+
+Replays a :class:`~robotrol.gcode.program.CompiledProgram` through a model
+of the GRBL / FluidNC motion planner:
+
+* per block, the nominal speed is the programmed feed (or the rapid rate
+  for G0) limited by the per-axis max rates ``$110..$115`` along the move
+  direction, and the acceleration is limited by ``$120..$125`` the same way
+* the speed through a junction is bounded by the junction-deviation rule
+  (``$11``): ``v² = a·δ·sin(θ/2) / (1 − sin(θ/2))``
+* a backward and a forward pass give the entry/exit speed of every block,
+  and each block is timed as a trapezoid (or triangle) velocity profile
+
+The controller only plans over a short buffer (*lookahead* blocks), so
+the entry speed of a block is additionally capped by the speed from which
+it could still stop within the buffered blocks.  Arcs (G2/G3) are timed
+as straight moves to their end point; ``G4 P<s>`` dwells are added as-is.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, List, Mapping, Optional, Sequence, Union
+
+from robotrol.config.constants import AXES
+from robotrol.gcode.program import (
+    IF, IP, MODE_G20, MODE_G21, MODE_G90, MODE_G91, NWORDS,
+    OP_G0, OP_G1, OP_G2, OP_G3, OP_G4, OP_NONE, CompiledProgram,
+)
+from robotrol.serial.settings import ControllerSettings
+
+
+# GRBL setting numbers (same layout as fluidnc_updater_v2.SETTINGS_MAP)
+SETTING_JUNCTION_DEVIATION = 11
+SETTING_MAX_RATE = {ax: 110 + i for i, ax in enumerate(AXES)}
+SETTING_ACCEL = {ax: 120 + i for i, ax in enumerate(AXES)}
+
+DEFAULT_MAX_RATE = 1000.0         # units/min
+DEFAULT_ACCEL = 100.0             # units/s²
+DEFAULT_JUNCTION_DEVIATION = 0.01  # units
+DEFAULT_LOOKAHEAD = 16            # GRBL planner buffer (blocks)
+
+_EPS = 1e-9
+
+
+# ----------------------------------------------------------------------
+#  Machine limits
+# ----------------------------------------------------------------------
+
+@dataclass
+class MachineLimits:
+    """Per-axis rate/acceleration limits, in :data:`AXES` order."""
+
+    max_rate: List[float] = field(default_factory=lambda: [DEFAULT_MAX_RATE] * len(AXES))
+    accel: List[float] = field(default_factory=lambda: [DEFAULT_ACCEL] * len(AXES))
+    junction_deviation: float = DEFAULT_JUNCTION_DEVIATION
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[int, Union[float, str]]) -> "MachineLimits":
+        """Build from ``{setting_number: value}`` (e.g. a ``ControllerSettings``).
+
+        Missing or non-numeric settings keep their defaults.
+        """
+        def num(code: int, default: float) -> float:
+            try:
+                v = float(settings[code])
+            except (KeyError, TypeError, ValueError):
+                return default
+            return v if v > 0 else default
+
+        return cls(
+            max_rate=[num(SETTING_MAX_RATE[ax], DEFAULT_MAX_RATE) for ax in AXES],
+            accel=[num(SETTING_ACCEL[ax], DEFAULT_ACCEL) for ax in AXES],
+            junction_deviation=num(SETTING_JUNCTION_DEVIATION, DEFAULT_JUNCTION_DEVIATION),
+        )
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "MachineLimits":
+        """Build from raw ``$$`` response lines (``$110=3000.000``)."""
+        return cls.from_settings(ControllerSettings.parse(lines))
+
+
+# ----------------------------------------------------------------------
+#  Result
+# ----------------------------------------------------------------------
+
+@dataclass
+class CycleEstimate:
+    """Outcome of :func:`estimate_program`.
+
+    ``row_times`` holds the seconds spent on each compiled row (aligned
+    with ``CompiledProgram.src_line``), ``total_s`` their sum.
+    """
+
+    total_s: float
+    row_times: array
+    src_line: array
+    moves: int = 0
+    dwell_s: float = 0.0
+    _cumulative: Optional[array] = field(default=None, repr=False)
+
+    def line_time(self, line_no: int) -> float:
+        """Seconds spent on source line *line_no* (1-based)."""
+        i = bisect_right(self.src_line, line_no) - 1
+        if i < 0 or self.src_line[i] != line_no:
+            return 0.0
+        return self.row_times[i]
+
+    def time_until(self, line_no: int) -> float:
+        """Seconds from the program start until source line *line_no* is done."""
+        if self._cumulative is None:
+            acc = 0.0
+            cum = array("d")
+            for t in self.row_times:
+                acc += t
+                cum.append(acc)
+            self._cumulative = cum
+        i = bisect_right(self.src_line, line_no) - 1
+        return self._cumulative[i] if i >= 0 else 0.0
+
+    def remaining(self, line_no: int) -> float:
+        """Seconds left after source line *line_no* has been executed."""
+        return max(0.0, self.total_s - self.time_until(line_no))
+
+    def slowest(self, n: int = 10) -> List[tuple]:
+        """The *n* most expensive rows as ``(source_line, seconds)``."""
+        idx = sorted(range(len(self.row_times)), key=self.row_times.__getitem__, reverse=True)
+        return [(self.src_line[i], self.row_times[i]) for i in idx[:n]]
+
+
+def format_duration(seconds: float) -> str:
+    """``"1h 02m 03s"`` / ``"2m 03.4s"`` / ``"3.42s"``."""
+    if seconds >= 3600:
+        h, rem = divmod(int(round(seconds)), 3600)
+        return f"{h}h {rem // 60:02d}m {rem % 60:02d}s"
+    if seconds >= 60:
+        m, s = divmod(seconds, 60)
+        return f"{int(m)}m {s:04.1f}s"
+    return f"{seconds:.2f}s"
+
+
+# ----------------------------------------------------------------------
+#  Estimator
+# ----------------------------------------------------------------------
+
+def estimate_program(
+    prog: CompiledProgram,
+    limits: Optional[MachineLimits] = None,
+    *,
+    start: Optional[Sequence[float]] = None,
+    default_feed: Optional[float] = None,
+    lookahead: int = DEFAULT_LOOKAHEAD,
+) -> CycleEstimate:
+    """Estimate the execution time of *prog* on a GRBL-style controller.
+
+    Parameters
+    ----------
+    prog : CompiledProgram
+        Program to time; axis words are taken as joint values.
+    limits : MachineLimits, optional
+        Controller limits (defaults: :class:`MachineLimits` defaults).
+    start : sequence of float, optional
+        Axis positions before the first line (default: all zero).
+    default_feed : float, optional
+        Feed (units/min) until the program sets ``F``; defaults to the
+        slowest axis max rate.
+    lookahead : int
+        Planner buffer in blocks; 0 plans over the whole program.
+    """
+    limits = limits or MachineLimits()
+    nax = len(AXES)
+    rate_s = [max(_EPS, r) / 60.0 for r in limits.max_rate]
+    acc = [max(_EPS, a) for a in limits.accel]
+    jd = max(0.0, limits.junction_deviation)
+    pos = [float(v) for v in (start or [0.0] * nax)]
+    feed = (default_feed if default_feed else min(limits.max_rate)) / 60.0
+
+    nrows = len(prog)
+    row_times = array("d", bytes(8 * nrows))
+    ops, params, modes = prog.ops, prog.params, prog.modes
+
+    # Block data (motion rows only)
+    b_row: List[int] = []
+    b_len: List[float] = []
+    b_acc: List[float] = []
+    b_vmax2: List[float] = []   # nominal speed²
+    b_entry_max2: List[float] = []
+    dwell_total = 0.0
+
+    abs_mode = True
+    inch = False
+    motion = OP_G0
+    prev_u: Optional[List[float]] = None
+    prev_nom2 = 0.0
+    sqrt = math.sqrt
+
+    for row in range(nrows):
+        op = ops[row]
+        mode = modes[row]
+        if mode:
+            if mode & MODE_G20:
+                inch = True
+            elif mode & MODE_G21:
+                inch = False
+            if mode & MODE_G90:
+                abs_mode = True
+            elif mode & MODE_G91:
+                abs_mode = False
+        base = row * NWORDS
+        f_word = params[base + IF]
+        if f_word == f_word and f_word > 0:
+            feed = f_word * (25.4 if inch else 1.0) / 60.0
+
+        if op == OP_G4:
+            p = params[base + IP]
+            if p == p and p > 0:
+                row_times[row] = p
+                dwell_total += p
+            # A dwell drains the planner: the machine comes to a stop
+            prev_u = None
+            continue
+        if op in (OP_G0, OP_G1, OP_G2, OP_G3):
+            motion = op
+        elif op != OP_NONE:
+            continue
+
+        # Target and move vector
+        d = [0.0] * nax
+        moved = False
+        for i in range(nax):
+            v = params[base + i]
+            if v == v:
+                if inch:
+                    v *= 25.4
+                t = v if abs_mode else pos[i] + v
+                d[i] = t - pos[i]
+                pos[i] = t
+                moved = True
+        if not moved:
+            continue
+        length = sqrt(sum(x * x for x in d))
+        if length < _EPS:
+            continue
+        inv = 1.0 / length
+        u = [x * inv for x in d]
+
+        # Nominal speed and acceleration along u
+        v_nom = feed if motion != OP_G0 else float("inf")
+        a = float("inf")
+        for i in range(nax):
+            ui = abs(u[i])
+            if ui > _EPS:
+                lim = rate_s[i] / ui
+                if lim < v_nom:
+                    v_nom = lim
+                lim = acc[i] / ui
+                if lim < a:
+                    a = lim
+        nom2 = v_nom * v_nom
+
+        # Junction speed with the previous block
+        if prev_u is None:
+            entry_max2 = 0.0
+        else:
+            cos_t = -sum(p * q for p, q in zip(prev_u, u))
+            if cos_t > 0.999999:
+                entry_max2 = 0.0                      # reversal
+            elif cos_t < -0.999999:
+                entry_max2 = float("inf")             # straight on
+            else:
+                # Acceleration limit along the junction direction
+                jv = [q - p for p, q in zip(prev_u, u)]
+                jn = sqrt(sum(x * x for x in jv))
+                a_j = float("inf")
+                if jn > _EPS:
+                    for i in range(nax):
+                        ji = abs(jv[i]) / jn
+                        if ji > _EPS:
+                            lim = acc[i] / ji
+                            if lim < a_j:
+                                a_j = lim
+                sin_half = sqrt(0.5 * (1.0 - cos_t))
+                entry_max2 = a_j * jd * sin_half / (1.0 - sin_half)
+            entry_max2 = min(entry_max2, nom2, prev_nom2)
+
+        b_row.append(row)
+        b_len.append(length)
+        b_acc.append(a)
+        b_vmax2.append(nom2)
+        b_entry_max2.append(entry_max2)
+        prev_u = u
+        prev_nom2 = nom2
+
+    n = len(b_row)
+    entry2 = [0.0] * (n + 1)  # entry2[n] = final stop
+
+    # Planner-buffer cap: from block k the machine must be able to stop
+    # within blocks k .. k + lookahead - 1.
+    if lookahead > 0 and n:
+        budget = [0.0] * (n + 1)
+        for k in range(n - 1, -1, -1):
+            budget[k] = budget[k + 1] + 2.0 * b_acc[k] * b_len[k]
+        for k in range(n):
+            end = min(n, k + lookahead)
+            cap = budget[k] - budget[end]
+            if cap < b_entry_max2[k]:
+                b_entry_max2[k] = cap
+
+    # Backward pass: decelerate into every following block
+    nxt = 0.0
+    for k in range(n - 1, -1, -1):
+        v2 = nxt + 2.0 * b_acc[k] * b_len[k]
+        e = b_entry_max2[k]
+        nxt = e if e < v2 else v2
+        entry2[k] = nxt
+
+    # Forward pass: accelerate out of every previous block, then time it
+    total = dwell_total
+    for k in range(n):
+        a = b_acc[k]
+        length = b_len[k]
+        v0sq = entry2[k]
+        reach = v0sq + 2.0 * a * length
+        if entry2[k + 1] > reach:
+            entry2[k + 1] = reach
+        v1sq = entry2[k + 1]
+        vn2 = b_vmax2[k]
+        v0 = sqrt(v0sq)
+        v1 = sqrt(v1sq)
+        d_acc = (vn2 - v0sq) / (2.0 * a)
+        d_dec = (vn2 - v1sq) / (2.0 * a)
+        if d_acc + d_dec <= length:
+            vn = sqrt(vn2)
+            t = (vn - v0) / a + (vn - v1) / a + (length - d_acc - d_dec) / vn
+        else:
+            vp = sqrt(0.5 * (2.0 * a * length + v0sq + v1sq))
+            t = (vp - v0) / a + (vp - v1) / a
+        row_times[b_row[k]] = t
+        total += t
+
+    return CycleEstimate(
+        total_s=total,
+        row_times=row_times,
+        src_line=prog.src_line,
+        moves=n,
+        dwell_s=dwell_total,
+    )
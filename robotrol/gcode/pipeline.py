@@ -0,0 +1,553 @@
+"""
+Headless Cartesian G-code -> joint-space compiler.
+
+Offline equivalent of the G-code tab's interpreter, as a streaming
+pipeline:
+
+1. parse      — :func:`robotrol.gcode.program.load_program` (cached)
+2. plan       — plane UV (scale / mirror / rotate / offset) -> world XYZ,
+                arcs segmented to a chord tolerance (see
+                :mod:`robotrol.gcode.arcs`), one waypoint per target
+                (sequential: the
+                interpreter state depends on every previous line)
+3. solve      — IK per waypoint in fixed-size chunks on a process pool;
+                each chunk is led in by the last *overlap* waypoints of the
+                previous one so its wrapped joints (A, B) start on the same
+                branch, and whole-turn offsets are stitched when results
+                are collected in order
+4. emit       — ``G1`` joint lines written as chunks complete
+
+Only a bounded number of chunks is in flight, so memory does not grow with
+the program size.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from robotrol.config.constants import AXES
+from robotrol.gcode.arcs import DEFAULT_CHORD_TOL, arc_angles, arc_steps, refine_joint_space
+from robotrol.gcode.program import (
+    IF, II, IJ, IX, IY, IZ, MODE_G20, MODE_G21, MODE_G90, MODE_G91, NWORDS,
+    OP_G0, OP_G1, OP_G2, OP_G3, CompiledProgram, load_program,
+)
+from robotrol.kinematics.ik import IK6
+
+
+Vec3 = Tuple[float, float, float]
+
+DEFAULT_MAX_SEG_LEN = 0.0    # mm, optional cap on arc chord length (0 = none)
+DEFAULT_FEED = 3000.0
+RAPID_FEED_MAX = 6000.0      # G0 moves are capped like the G-code tab does
+DEFAULT_CHUNK = 2000         # waypoints per IK task
+DEFAULT_OVERLAP = 8          # lead-in waypoints per chunk
+WRAPPED_AXES = ("A", "B")    # joints unwrapped for continuity
+
+_ROTATIONS = {"0": 0, "90": 90, "180": 180, "270": 270}
+
+
+# ----------------------------------------------------------------------
+#  Plane definition
+# ----------------------------------------------------------------------
+
+def _normalize(v: Sequence[float], default: Vec3) -> Vec3:
+    n = math.sqrt(v[0] * v[0] + v[1] * v[1] + v[2] * v[2])
+    if n < 1e-9:
+        return default
+    return (v[0] / n, v[1] / n, v[2] / n)
+
+
+@dataclass
+class PlaneFrame:
+    """User plane plus the UV transform options of the G-code tab.
+
+    ``plane.json`` holds ``origin``, ``u``, ``v`` (``n`` is recomputed),
+    ``rpy`` = [roll, pitch, yaw] in degrees and optionally ``scale_x``,
+    ``scale_y``, ``mirror_x``, ``mirror_y``, ``rotate`` (0/90/180/270),
+    ``offset_u`` and ``offset_v``.
+    """
+
+    origin: Vec3 = (0.0, 0.0, 0.0)
+    u: Vec3 = (1.0, 0.0, 0.0)
+    v: Vec3 = (0.0, 1.0, 0.0)
+    n: Vec3 = (0.0, 0.0, 1.0)
+    rpy: Vec3 = (0.0, 0.0, 0.0)
+    scale_x: float = 1.0
+    scale_y: float = 1.0
+    mirror_x: bool = False
+    mirror_y: bool = False
+    rotate: int = 0
+    offset_u: float = 0.0
+    offset_v: float = 0.0
+
+    def __post_init__(self) -> None:
+        # Same orthonormalisation as GCodeTab._get_axes
+        u = _normalize(self.u, (1.0, 0.0, 0.0))
+        d = sum(a * b for a, b in zip(self.v, u))
+        v = _normalize(tuple(a - d * b for a, b in zip(self.v, u)), (0.0, 1.0, 0.0))
+        n = _normalize(
+            (u[1] * v[2] - u[2] * v[1], u[2] * v[0] - u[0] * v[2], u[0] * v[1] - u[1] * v[0]),
+            (0.0, 0.0, 1.0),
+        )
+        self.u, self.v, self.n = u, v, n
+        self.scale_x = max(1e-6, float(self.scale_x))
+        self.scale_y = max(1e-6, float(self.scale_y))
+        if int(self.rotate) % 360 not in (0, 90, 180, 270):
+            raise ValueError(f"rotate must be 0/90/180/270, got {self.rotate}")
+        self.rotate = int(self.rotate) % 360
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlaneFrame":
+        def vec(key: str, default: Vec3) -> Vec3:
+            raw = data.get(key)
+            if raw is None:
+                return default
+            if len(raw) != 3:
+                raise ValueError(f"plane '{key}' needs 3 components")
+            return (float(raw[0]), float(raw[1]), float(raw[2]))
+
+        rotate = str(data.get("rotate", 0)).rstrip("°")
+        if rotate not in _ROTATIONS:
+            raise ValueError(f"rotate must be 0/90/180/270, got {data.get('rotate')}")
+        return cls(
+            origin=vec("origin", (0.0, 0.0, 0.0)),
+            u=vec("u", (1.0, 0.0, 0.0)),
+            v=vec("v", (0.0, 1.0, 0.0)),
+            rpy=vec("rpy", (0.0, 0.0, 0.0)),
+            scale_x=float(data.get("scale_x", 1.0)),
+            scale_y=float(data.get("scale_y", 1.0)),
+            mirror_x=bool(data.get("mirror_x", False)),
+            mirror_y=bool(data.get("mirror_y", False)),
+            rotate=_ROTATIONS[rotate],
+            offset_u=float(data.get("offset_u", 0.0)),
+            offset_v=float(data.get("offset_v", 0.0)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "PlaneFrame":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a JSON object")
+        return cls.from_dict(data)
+
+    def transform_uv(
+        self, rx: Optional[float], ry: Optional[float], ff: float,
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Program X/Y -> plane U/V without offset (for arc centres)."""
+        mx = -1.0 if self.mirror_x else 1.0
+        my = -1.0 if self.mirror_y else 1.0
+        u_r = rx * ff * self.scale_x * mx if rx is not None else None
+        v_r = ry * ff * self.scale_y * my if ry is not None else None
+        if u_r is not None and v_r is not None and self.rotate:
+            if self.rotate == 90:
+                u_r, v_r = -v_r, u_r
+            elif self.rotate == 180:
+                u_r, v_r = -u_r, -v_r
+            elif self.rotate == 270:
+                u_r, v_r = v_r, -u_r
+        return u_r, v_r
+
+    def to_uvw(
+        self, rx: Optional[float], ry: Optional[float], rz: Optional[float], ff: float,
+    ) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """Program X/Y/Z -> plane U/V/W."""
+        u_t, v_t = self.transform_uv(rx, ry, ff)
+        u = u_t + self.offset_u if u_t is not None else None
+        v = v_t + self.offset_v if v_t is not None else None
+        w = rz * ff * (self.scale_x + self.scale_y) * 0.5 if rz is not None else None
+        return u, v, w
+
+    def world(self, uu: float, vv: float, ww: float) -> Vec3:
+        o, u, v, n = self.origin, self.u, self.v, self.n
+        return (
+            o[0] + uu * u[0] + vv * v[0] + ww * n[0],
+            o[1] + uu * u[1] + vv * v[1] + ww * n[1],
+            o[2] + uu * u[2] + vv * v[2] + ww * n[2],
+        )
+
+
+# ----------------------------------------------------------------------
+#  Stage 2: plan (sequential interpreter)
+# ----------------------------------------------------------------------
+
+@dataclass
+class Waypoint:
+    xyz: Vec3
+    feed: float
+    line: int  # 1-based source line
+    arc: bool = False
+
+
+def _opt(v: float) -> Optional[float]:
+    return None if v != v else v
+
+
+def plan_waypoints(
+    prog: CompiledProgram,
+    plane: PlaneFrame,
+    chord_tol: float = DEFAULT_CHORD_TOL,
+    max_seg_len: float = DEFAULT_MAX_SEG_LEN,
+    feed: float = DEFAULT_FEED,
+    on_warning: Optional[Callable[[str], None]] = None,
+    joint_tol: float = 0.0,
+    geom: Optional[Dict[str, float]] = None,
+) -> Iterator[Waypoint]:
+    """Interpret *prog* in plane coordinates and yield world waypoints.
+
+    Mirrors ``GCodeTab._exec_gcode``: G20/G21, G90/G91, G0/G1 and G2/G3
+    (in the plane's UV), arcs split so no chord deviates more than
+    *chord_tol* mm from the arc.  With *joint_tol* (degrees) and *geom*,
+    arc chords are further bisected where interpolating the joints would
+    leave the arc by more than *joint_tol*.
+    """
+    warn = on_warning or (lambda m: None)
+    max_seg_len = max(0.0, float(max_seg_len))
+    ik = IK6(geom) if joint_tol > 0.0 and geom is not None else None
+    roll, pitch, _yaw = plane.rpy
+
+    def ik_joints(p: Vec3) -> List[float]:
+        sol = ik.solve_xyz(p[0], p[1], p[2], pitch_deg=pitch, roll_deg=roll)
+        return [sol[ax] for ax in AXES]
+
+    abs_mode = True
+    metric = True
+    cur_u = cur_v = cur_w = 0.0
+    cur_feed = float(feed)
+    ops, params, modes = prog.ops, prog.params, prog.modes
+
+    for row in range(len(prog)):
+        op = ops[row]
+        mode = modes[row]
+        if mode:
+            if mode & MODE_G20:
+                metric = False
+            elif mode & MODE_G21:
+                metric = True
+            if mode & MODE_G90:
+                abs_mode = True
+            elif mode & MODE_G91:
+                abs_mode = False
+        if op not in (OP_G0, OP_G1, OP_G2, OP_G3):
+            continue
+
+        base = row * NWORDS
+        line = prog.src_line[row]
+        ff = 1.0 if metric else 25.4
+        f_word = params[base + IF]
+        if f_word == f_word:
+            cur_feed = f_word * ff
+        u1, v1, w1 = plane.to_uvw(
+            _opt(params[base + IX]), _opt(params[base + IY]), _opt(params[base + IZ]), ff,
+        )
+        if not abs_mode:
+            u1 = u1 + cur_u if u1 is not None else None
+            v1 = v1 + cur_v if v1 is not None else None
+            if op in (OP_G0, OP_G1):
+                w1 = w1 + cur_w if w1 is not None else None
+        u1 = cur_u if u1 is None else u1
+        v1 = cur_v if v1 is None else v1
+        w1 = cur_w if w1 is None else w1
+
+        if op in (OP_G0, OP_G1):
+            f = cur_feed if op == OP_G1 else min(cur_feed, RAPID_FEED_MAX)
+            yield Waypoint(plane.world(u1, v1, w1), f, line)
+            cur_u, cur_v, cur_w = u1, v1, w1
+            continue
+
+        # G2 / G3
+        ci_t, cj_t = plane.transform_uv(
+            _opt(params[base + II]) or 0.0, _opt(params[base + IJ]) or 0.0, ff,
+        )
+        cxl = cur_u + (ci_t or 0.0)
+        cyl = cur_v + (cj_t or 0.0)
+        r0 = math.hypot(cur_u - cxl, cur_v - cyl)
+        r1 = math.hypot(u1 - cxl, v1 - cyl)
+        if r0 < 1e-6:
+            warn(f"line {line}: arc radius too small, skipped")
+        elif abs(r0 - r1) > 0.5:
+            warn(f"line {line}: arc radius mismatch r0={r0:.3f} r1={r1:.3f}, skipped")
+        else:
+            start_a = math.atan2(cur_v - cyl, cur_u - cxl)
+            end_a = math.atan2(v1 - cyl, u1 - cxl)
+            if abs(u1 - cur_u) < 1e-6 and abs(v1 - cur_v) < 1e-6:
+                delta = -2 * math.pi if op == OP_G2 else 2 * math.pi
+            else:
+                delta = end_a - start_a
+                if op == OP_G2:
+                    if delta >= 0:
+                        delta -= 2 * math.pi
+                elif delta <= 0:
+                    delta += 2 * math.pi
+            steps = arc_steps(r0, delta, chord_tol, max_seg_len)
+            angles = arc_angles(start_a, delta, steps)
+
+            def point_at(a: float, cxl=cxl, cyl=cyl, r0=r0, w1=w1) -> Vec3:
+                return plane.world(cxl + r0 * math.cos(a), cyl + r0 * math.sin(a), w1)
+
+            if ik is not None:
+                angles = refine_joint_space(
+                    angles, start_a, point_at, ik_joints, joint_tol,
+                )
+            for ang in angles:
+                yield Waypoint(point_at(ang), cur_feed, line, arc=True)
+        cur_u, cur_v, cur_w = u1, v1, w1
+
+
+# ----------------------------------------------------------------------
+#  Stage 3: IK in chunks
+# ----------------------------------------------------------------------
+
+_WRAP_IDX = tuple(AXES.index(ax) for ax in WRAPPED_AXES)
+
+
+def _unwrap(a: float, prev: float) -> float:
+    return a + 360.0 * round((prev - a) / 360.0)
+
+
+def solve_chunk(
+    geom: Dict[str, float],
+    pitch_deg: float,
+    roll_deg: float,
+    points: Sequence[Vec3],
+    lead_in: int = 0,
+) -> List[Tuple[float, ...]]:
+    """IK for *points*; returns joint tuples in :data:`AXES` order.
+
+    The first *lead_in* points only seed the wrapped joints and are not
+    returned.
+    """
+    ik = IK6(geom)
+    out: List[Tuple[float, ...]] = []
+    prev: Optional[List[float]] = None
+    for k, (x, y, z) in enumerate(points):
+        sol = ik.solve_xyz(x, y, z, pitch_deg=pitch_deg, roll_deg=roll_deg)
+        q = [sol[ax] for ax in AXES]
+        if prev is not None:
+            for i in _WRAP_IDX:
+                q[i] = _unwrap(q[i], prev[i])
+        prev = q
+        if k >= lead_in:
+            out.append(tuple(q))
+    return out
+
+
+def _emit_lines(
+    joints: Sequence[Tuple[float, ...]],
+    feeds: Sequence[float],
+    limits: Dict[str, Tuple[float, float]],
+) -> Tuple[str, int, int]:
+    """Format joint moves; returns (text, violations, first violating index)."""
+    bounds = [limits.get(ax) for ax in AXES]
+    violations = 0
+    first = -1
+    parts = []
+    for k, (q, feed) in enumerate(zip(joints, feeds)):
+        for val, lim in zip(q, bounds):
+            if lim is not None and not lim[0] <= val <= lim[1]:
+                violations += 1
+                if first < 0:
+                    first = k
+                break
+        parts.append(
+            "G1 X%.3f Y%.3f Z%.3f A%.3f B%.3f C%.3f F%.0f\n"
+            % (q[0], q[1], q[2], q[3], q[4], q[5], feed)
+        )
+    return "".join(parts), violations, first
+
+
+def _solve_and_emit(
+    geom: Dict[str, float],
+    pitch_deg: float,
+    roll_deg: float,
+    points: Sequence[Vec3],
+    lead_in: int,
+    feeds: Sequence[float],
+    limits: Dict[str, Tuple[float, float]],
+) -> Tuple[List[Tuple[float, ...]], str, int, int]:
+    """Worker task: IK plus output formatting for one chunk."""
+    joints = solve_chunk(geom, pitch_deg, roll_deg, points, lead_in)
+    return (joints,) + _emit_lines(joints, feeds, limits)
+
+
+class _InlineExecutor(Executor):
+    """Runs tasks in the calling thread (``workers=0``)."""
+
+    def submit(self, fn, /, *args, **kwargs):  # type: ignore[override]
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+
+# ----------------------------------------------------------------------
+#  Driver
+# ----------------------------------------------------------------------
+
+@dataclass
+class CompileReport:
+    """Outcome of :func:`compile_file`."""
+
+    source_lines: int = 0
+    waypoints: int = 0
+    lines_out: int = 0
+    chunks: int = 0
+    arc_segments: int = 0
+    limit_violations: int = 0
+    first_violation_line: Optional[int] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        txt = (
+            f"{self.source_lines} source lines -> {self.waypoints} waypoints -> "
+            f"{self.lines_out} output lines ({self.chunks} chunk(s), "
+            f"{self.arc_segments} arc segment(s))"
+        )
+        if self.limit_violations:
+            txt += (
+                f"; {self.limit_violations} waypoint(s) outside joint limits "
+                f"(first at source line {self.first_violation_line})"
+            )
+        if self.warnings:
+            txt += f"; {len(self.warnings)} warning(s)"
+        return txt
+
+
+def profile_limits(profile: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    """Joint limits from a profile's ``manual_limits`` section."""
+    axes = ((profile.get("manual_limits") or {}).get("axes") or {})
+    lims: Dict[str, Tuple[float, float]] = {}
+    for ax in AXES:
+        spec = axes.get(ax)
+        if isinstance(spec, dict) and "min" in spec and "max" in spec:
+            lims[ax] = (float(spec["min"]), float(spec["max"]))
+    return lims
+
+
+def _chunked(it: Iterator[Waypoint], size: int) -> Iterator[List[Waypoint]]:
+    chunk: List[Waypoint] = []
+    for wp in it:
+        chunk.append(wp)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def compile_file(
+    in_path: str,
+    out: TextIO,
+    geom: Dict[str, float],
+    plane: PlaneFrame,
+    *,
+    limits: Optional[Dict[str, Tuple[float, float]]] = None,
+    chord_tol: float = DEFAULT_CHORD_TOL,
+    max_seg_len: float = DEFAULT_MAX_SEG_LEN,
+    joint_tol: float = 0.0,
+    feed: float = DEFAULT_FEED,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+    overlap: int = DEFAULT_OVERLAP,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> CompileReport:
+    """Compile the Cartesian program *in_path* into joint G-code on *out*.
+
+    Parameters
+    ----------
+    geom : dict
+        Link geometry (L1..L4) for :class:`~robotrol.kinematics.ik.IK6`.
+    plane : PlaneFrame
+        Work plane; its roll/pitch give the tool orientation.
+    limits : dict, optional
+        ``{axis: (min, max)}``; waypoints outside are counted in the report.
+    chord_tol, max_seg_len, joint_tol : float
+        Arc segmentation, see :func:`plan_waypoints`.
+    workers : int, optional
+        Process pool size (default: CPU count); 0 solves in-process.
+    chunk_size, overlap : int
+        Waypoints per IK task and lead-in waypoints per chunk.
+    on_progress : callable(int), optional
+        Called with the number of waypoints written so far.
+    """
+    prog = load_program(in_path)
+    report = CompileReport(source_lines=prog.n_source_lines)
+    roll, pitch, _yaw = plane.rpy
+    chunk_size = max(1, int(chunk_size))
+    overlap = max(0, int(overlap))
+    limits = limits or {}
+
+    if workers == 0:
+        executor: Executor = _InlineExecutor()
+        max_inflight = 2
+    else:
+        workers = workers or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers)
+        max_inflight = 2 * workers
+
+    out.write(f"; robotrol joint program compiled from {os.path.basename(in_path)}\n")
+    out.write(f"; plane origin={plane.origin} rpy={plane.rpy}\n")
+    out.write("G90\n")
+    report.lines_out = 1
+
+    inflight: Deque[Tuple[List[Waypoint], Future]] = deque()
+    last_q: Optional[Tuple[float, ...]] = None
+
+    def drain_one() -> None:
+        nonlocal last_q
+        chunk, fut = inflight.popleft()
+        joints, text, violations, first = fut.result()
+        if last_q is not None and joints:
+            # Whole-turn offset between independently solved chunks
+            shift = [0.0] * len(AXES)
+            for i in _WRAP_IDX:
+                shift[i] = 360.0 * round((last_q[i] - joints[0][i]) / 360.0)
+            if any(shift):
+                joints = [tuple(a + d for a, d in zip(q, shift)) for q in joints]
+                text, violations, first = _emit_lines(
+                    joints, [wp.feed for wp in chunk], limits,
+                )
+        out.write(text)
+        if violations:
+            report.limit_violations += violations
+            if report.first_violation_line is None:
+                report.first_violation_line = chunk[first].line
+        if joints:
+            last_q = joints[-1]
+        report.lines_out += len(joints)
+        report.waypoints += len(joints)
+        if on_progress is not None:
+            on_progress(report.waypoints)
+
+    try:
+        tail: List[Vec3] = []
+        waypoints = plan_waypoints(
+            prog, plane, chord_tol, max_seg_len, feed, report.warnings.append,
+            joint_tol=joint_tol, geom=geom,
+        )
+        for chunk in _chunked(waypoints, chunk_size):
+            pts = [wp.xyz for wp in chunk]
+            report.arc_segments += sum(1 for wp in chunk if wp.arc)
+            fut = executor.submit(
+                _solve_and_emit, geom, pitch, roll, tail + pts, len(tail),
+                [wp.feed for wp in chunk], limits,
+            )
+            inflight.append((chunk, fut))
+            report.chunks += 1
+            tail = pts[-overlap:] if overlap else []
+            while len(inflight) >= max_inflight:
+                drain_one()
+        while inflight:
+            drain_one()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return report
@@ -0,0 +1,467 @@
+"""
+Host-side path simplification for joint-space G-code.
+
+Arc segmentation and fixed-step Cartesian moves produce long runs of short,
+nearly collinear ``G1`` joint moves, each costing a full serial round trip.
+This pass shortens such runs before streaming:
+
+1. zero-length moves are dropped,
+2. moves that are collinear in joint space are merged (exact to the output
+   precision: the controller interpolates linearly in joint space, so the
+   executed path is unchanged),
+3. the remaining vertices are thinned with Douglas–Peucker, where the error
+   of a shortcut is measured in Cartesian space via batched FK: each removed
+   vertex (and each removed sub-segment midpoint) is compared with the TCP
+   position the controller reaches at the same joint-space parameter on the
+   shortcut.
+
+Only absolute-mode (``G90``) ``G0``/``G1`` runs with a constant feed are
+touched; every other line is a barrier and is emitted verbatim.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from robotrol.config.constants import AXES
+from robotrol.kinematics.dh_model import DHModel
+from robotrol.kinematics.fk import fk6_positions_mm
+
+
+DEFAULT_TOLERANCE_MM = 0.05
+JOINT_EPS_DEG = 1e-4        # zero-length threshold
+COLLINEAR_EPS_DEG = 5e-4    # half an LSB of the 3-decimal joint output
+MAX_RUN = 2000              # bounds Douglas-Peucker worst case per run
+
+Joints = Tuple[float, ...]
+
+_MOTION_G = {0, 1}
+_PASSIVE_G = {90}
+_WORD_LETTERS = set(AXES) | {"F", "N"}
+
+
+@dataclass
+class SimplifyReport:
+    """Summary of one simplification pass."""
+
+    lines_in: int = 0
+    lines_out: int = 0
+    zero_length_dropped: int = 0
+    collinear_merged: int = 0
+    tolerance_merged: int = 0
+    max_deviation_mm: float = 0.0
+    tolerance_mm: float = DEFAULT_TOLERANCE_MM
+
+    @property
+    def removed(self) -> int:
+        return self.lines_in - self.lines_out
+
+    def summary(self) -> str:
+        return (
+            f"Simplify: {self.lines_in} -> {self.lines_out} lines "
+            f"(-{self.removed}: zero={self.zero_length_dropped}, "
+            f"collinear={self.collinear_merged}, tol={self.tolerance_merged}), "
+            f"max dev {self.max_deviation_mm:.4f} mm "
+            f"(tol {self.tolerance_mm:g} mm)"
+        )
+
+
+@dataclass
+class _Move:
+    line: str
+    q: Joints
+    has_f: bool
+
+
+# ----------------------------------------------------------------------
+#  Line parsing
+# ----------------------------------------------------------------------
+
+def _split_words(line: str) -> Optional[Tuple[List[int], List[int], Dict[str, float]]]:
+    """Return (g_codes, m_codes, words) or None for lines without words."""
+    text = line
+    if ";" in text:
+        text = text[: text.index(";")]
+    if "(" in text:
+        parts = []
+        depth = 0
+        for ch in text:
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth = max(0, depth - 1)
+            elif depth == 0:
+                parts.append(ch)
+        text = "".join(parts)
+    text = text.strip().upper()
+    if not text or text.startswith("$"):
+        return None
+    g_codes: List[int] = []
+    m_codes: List[int] = []
+    words: Dict[str, float] = {}
+    for tok in text.split():
+        if len(tok) < 2 or not tok[0].isalpha():
+            raise ValueError(tok)
+        val = float(tok[1:])
+        if tok[0] == "G":
+            g_codes.append(int(val) if val.is_integer() else -1)
+        elif tok[0] == "M":
+            m_codes.append(int(val))
+        else:
+            words[tok[0]] = val
+    return g_codes, m_codes, words
+
+
+def _fmt_move(motion: int, prev: Joints, q: Joints, feed: Optional[float]) -> str:
+    parts = [f"G{motion}"]
+    for i, ax in enumerate(AXES):
+        if abs(q[i] - prev[i]) > JOINT_EPS_DEG:
+            parts.append(f"{ax}{q[i]:.3f}")
+    if feed is not None:
+        parts.append(f"F{feed:.0f}" if float(feed).is_integer() else f"F{feed:g}")
+    return " ".join(parts)
+
+
+# ----------------------------------------------------------------------
+#  Geometry helpers
+# ----------------------------------------------------------------------
+
+def _jdist(a: Joints, b: Joints) -> float:
+    return math.sqrt(sum((x - y) * (x - y) for x, y in zip(a, b)))
+
+
+def _unit(a: Joints, b: Joints) -> Optional[Joints]:
+    d = [y - x for x, y in zip(a, b)]
+    n = math.sqrt(sum(v * v for v in d))
+    if n < JOINT_EPS_DEG:
+        return None
+    return tuple(v / n for v in d)
+
+
+def _ray_param(a: Joints, u: Joints, p: Joints, eps: float) -> Optional[float]:
+    """Distance of *p* along the ray (a, u), or None if off the ray by > eps."""
+    d = [y - x for x, y in zip(a, p)]
+    t = sum(x * y for x, y in zip(d, u))
+    off2 = sum(v * v for v in d) - t * t
+    if off2 > eps * eps:
+        return None
+    return t
+
+
+def _lerp(a: Joints, b: Joints, t: float) -> Joints:
+    return tuple(x + (y - x) * t for x, y in zip(a, b))
+
+
+class _CartesianFK:
+    """Batched machine-joints -> TCP position (mm) through a DH model."""
+
+    def __init__(self, dh_model: DHModel):
+        self._dh = dh_model
+        self._geom = dh_model.geom
+        # The post-transform is affine per axis: recover offset/scale once
+        rows = [r["axis"] for r in dh_model.dh_rows]
+        offs = dh_model.apply_post_transform({})
+        ones = dh_model.apply_post_transform({ax: 1.0 for ax in rows})
+        self._map = [
+            (AXES.index(ax) if ax in AXES else -1, one - off, off)
+            for ax, off, one in zip(rows, offs, ones)
+        ]
+
+    def __call__(self, qs: Sequence[Joints]) -> List[Tuple[float, float, float]]:
+        m = self._map
+        rows = [
+            [(q[i] * sc + off) if i >= 0 else off for i, sc, off in m]
+            for q in qs
+        ]
+        return fk6_positions_mm(self._geom, rows, dh_model=self._dh)
+
+
+def _dist3(a: Tuple[float, float, float], b: Tuple[float, float, float]) -> float:
+    return math.sqrt(
+        (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2
+    )
+
+
+def _worst_sample(
+    pts: List[Joints],
+    i: int,
+    j: int,
+    span: float,
+    cum: List[float],
+    samples: List[Tuple[float, Tuple[float, float, float], int]],
+    fk: _CartesianFK,
+) -> Tuple[float, int]:
+    """Largest distance between original samples and the shortcut i->j."""
+    a, b = pts[i], pts[j]
+    if span < 1e-12:
+        shortcut = fk([a] * len(samples))
+    else:
+        shortcut = fk([_lerp(a, b, (s - cum[i]) / span) for s, _, _ in samples])
+    worst = -1.0
+    worst_k = i + 1
+    for (_, orig, k), cut in zip(samples, shortcut):
+        d = _dist3(orig, cut)
+        if d > worst:
+            worst = d
+            worst_k = k
+    return worst, worst_k
+
+
+def _douglas_peucker(
+    pts: List[Joints],
+    fk: _CartesianFK,
+    tol: float,
+) -> Tuple[List[int], float]:
+    """Return kept indices of *pts* and the max Cartesian deviation."""
+    n = len(pts)
+    if n <= 2:
+        return list(range(n)), 0.0
+
+    # Original vertices and sub-segment midpoints, FK'd once
+    mids = [_lerp(pts[i], pts[i + 1], 0.5) for i in range(n - 1)]
+    fk_all = fk(pts + mids)
+    p_cart = fk_all[:n]
+    m_cart = fk_all[n:]
+    cum = [0.0]
+    for i in range(1, n):
+        cum.append(cum[-1] + _jdist(pts[i - 1], pts[i]))
+
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    max_dev = 0.0
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        span = cum[j] - cum[i]
+        # Vertices first; sub-segment midpoints only if the vertices pass
+        worst, worst_k = _worst_sample(
+            pts, i, j, span, cum,
+            [(cum[k], p_cart[k], k) for k in range(i + 1, j)], fk,
+        )
+        if worst <= tol:
+            worst, worst_k = _worst_sample(
+                pts, i, j, span, cum,
+                [
+                    (0.5 * (cum[k] + cum[k + 1]), m_cart[k], max(k, i + 1))
+                    for k in range(i, j)
+                ],
+                fk,
+            )
+        if worst > tol:
+            worst_k = min(max(worst_k, i + 1), j - 1)
+            keep[worst_k] = True
+            stack.append((i, worst_k))
+            stack.append((worst_k, j))
+        else:
+            max_dev = max(max_dev, worst)
+    return [i for i in range(n) if keep[i]], max_dev
+
+
+# ----------------------------------------------------------------------
+#  Public API
+# ----------------------------------------------------------------------
+
+def simplify_lines(
+    lines: Iterable[str],
+    dh_model: Optional[DHModel] = None,
+    tolerance_mm: float = DEFAULT_TOLERANCE_MM,
+) -> Tuple[List[str], SimplifyReport]:
+    """Simplify a joint-space G-code program.
+
+    Parameters
+    ----------
+    lines : iterable of str
+        Program lines (joint-space ``G0``/``G1`` with X..C in degrees);
+        consumed once, so a lazy iterator over a large file works.
+    dh_model : DHModel, optional
+        Robot model for the Cartesian tolerance check.  Without it only
+        zero-length and joint-collinear moves are removed.
+    tolerance_mm : float
+        Maximum allowed TCP deviation from the original path, in mm.
+
+    Returns
+    -------
+    (lines_out, report)
+    """
+    report = SimplifyReport(tolerance_mm=tolerance_mm)
+    fk = _CartesianFK(dh_model) if dh_model is not None and tolerance_mm > 0 else None
+    out: List[str] = []
+
+    pos: List[Optional[float]] = [None] * len(AXES)
+    abs_mode = True
+    motion: Optional[int] = None
+    feed: Optional[float] = None
+
+    run: List[_Move] = []
+    run_anchor: Optional[Joints] = None
+    run_motion = 1
+    run_feed: Optional[float] = None
+
+    def flush() -> None:
+        nonlocal run, run_anchor
+        if run:
+            out.extend(
+                _simplify_run(run_anchor, run, run_motion, run_feed, fk,
+                              tolerance_mm, report)
+            )
+        run = []
+        run_anchor = None
+
+    for raw in lines:
+        report.lines_in += 1
+        line = raw.strip()
+        try:
+            parsed = _split_words(line)
+        except ValueError:
+            parsed = None
+            pos = [None] * len(AXES)
+        if parsed is None:
+            flush()
+            if line:
+                out.append(line)
+            if line.startswith("$"):
+                pos = [None] * len(AXES)
+            continue
+
+        g_codes, m_codes, words = parsed
+        g_set = set(g_codes)
+        move_g = g_set & _MOTION_G
+        new_motion = max(move_g) if move_g else motion
+        has_axes = any(ax in words for ax in AXES)
+
+        candidate = (
+            abs_mode
+            and not m_codes
+            and g_set <= (_MOTION_G | _PASSIVE_G)
+            and len(move_g) <= 1
+            and set(words) <= _WORD_LETTERS
+            and has_axes
+            and new_motion in _MOTION_G
+        )
+        if candidate:
+            new_pos = [words.get(ax, pos[i]) for i, ax in enumerate(AXES)]
+            if any(v is None for v in new_pos):
+                candidate = False
+
+        if not candidate:
+            flush()
+            out.append(line)
+            # Track modal state across barrier lines
+            if 90 in g_set:
+                abs_mode = True
+            if 91 in g_set:
+                abs_mode = False
+            motion_codes = g_set & {0, 1, 2, 3}
+            if motion_codes:
+                motion = max(motion_codes)
+            if "F" in words:
+                feed = words["F"]
+            if has_axes:
+                if g_set - {0, 1, 2, 3, 17, 18, 19, 20, 21, 90, 91, 94}:
+                    pos = [None] * len(AXES)  # G92/G28/G53 etc.
+                else:
+                    for i, ax in enumerate(AXES):
+                        if ax in words:
+                            if abs_mode:
+                                pos[i] = words[ax]
+                            elif pos[i] is not None:
+                                pos[i] += words[ax]
+            continue
+
+        q: Joints = tuple(new_pos)  # type: ignore[arg-type]
+        f_new = words.get("F")
+        prev: Optional[Joints] = None if any(v is None for v in pos) else tuple(pos)  # type: ignore[arg-type]
+        feed_changes = f_new is not None and f_new != feed
+
+        if run and (new_motion != run_motion or feed_changes or len(run) >= MAX_RUN):
+            flush()
+
+        if prev is not None and not feed_changes and _jdist(prev, q) < JOINT_EPS_DEG:
+            report.zero_length_dropped += 1
+            if new_motion != motion:
+                # Keep the modal switch for later lines without a G word
+                out.append(f"G{new_motion}")
+                motion = new_motion
+            continue
+
+        if not run:
+            run_anchor = prev
+            run_motion = new_motion  # type: ignore[assignment]
+            run_feed = f_new if f_new is not None else feed
+        run.append(_Move(line, q, f_new is not None))
+        pos = list(q)
+        motion = new_motion
+        if f_new is not None:
+            feed = f_new
+
+    flush()
+    report.lines_out = len(out)
+    return out, report
+
+
+def _simplify_run(
+    anchor: Optional[Joints],
+    run: List[_Move],
+    motion: int,
+    feed: Optional[float],
+    fk: Optional[_CartesianFK],
+    tol: float,
+    report: SimplifyReport,
+) -> List[str]:
+    moves = list(run)
+    if anchor is None:
+        # Unknown start position: first move is emitted as-is and anchors
+        head = moves.pop(0)
+        if not moves:
+            return [head.line]
+        anchor = head.q
+        out = [head.line]
+    else:
+        out = []
+
+    pts: List[Joints] = [anchor] + [m.q for m in moves]
+
+    # 1) joint-space collinear merge: every merged vertex stays within
+    #    COLLINEAR_EPS_DEG of one ray from the last kept vertex
+    idx = [0]
+    ray: Optional[Joints] = None
+    last_t = 0.0
+    for k in range(1, len(pts) - 1):
+        a = pts[idx[-1]]
+        if ray is None:
+            ray = _unit(a, pts[k])
+            last_t = _jdist(a, pts[k])
+        t_next = None
+        if ray is not None:
+            t_next = _ray_param(a, ray, pts[k + 1], COLLINEAR_EPS_DEG)
+        if t_next is not None and t_next >= last_t:
+            report.collinear_merged += 1
+            last_t = t_next
+            continue
+        idx.append(k)
+        ray = None
+    idx.append(len(pts) - 1)
+
+    # 2) tolerance-bounded Douglas-Peucker in Cartesian space
+    if fk is not None and len(idx) > 2:
+        sub = [pts[i] for i in idx]
+        kept, dev = _douglas_peucker(sub, fk, tol)
+        report.tolerance_merged += len(sub) - len(kept)
+        report.max_deviation_mm = max(report.max_deviation_mm, dev)
+        idx = [idx[k] for k in kept]
+
+    prev_k = 0
+    for k in idx[1:]:
+        mv = moves[k - 1]
+        if k == prev_k + 1:
+            out.append(mv.line)
+        else:
+            had_f = any(m.has_f for m in moves[prev_k:k])
+            out.append(_fmt_move(motion, pts[prev_k], mv.q, feed if had_f else None))
+        prev_k = k
+    return out
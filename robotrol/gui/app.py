@@ -9,6 +9,8 @@ to GUI panels/tabs via a thin coordination layer.
 from __future__ import annotations
 
 import logging
+import os
+import time
 import tkinter as tk
 from tkinter import ttk
 from typing import Any, Dict, Optional
@@ -17,11 +19,18 @@ from robotrol.config.constants import AXES, MOTION_EPS, SOFTMAX_RE
 from robotrol.config.app_config import AppConfig
 from robotrol.config.profiles import ProfileManager
 from robotrol.serial.client import SerialClient
-from robotrol.serial.protocol import parse_status_line, parse_softmax, is_homing_command
+from robotrol.serial.settings import ControllerSettings, SettingsCache, firmware_from_line
+from robotrol.serial.protocol import (
+    parse_status_line, parse_softmax, is_homing_command,
+)
 from robotrol.queue.gcode_queue import GCodeQueue
+from robotrol.visualizer.telemetry_hub import DEFAULT_PORT as TELEMETRY_HUB_PORT
+from robotrol.visualizer.telemetry_hub import TelemetryHub
+from robotrol.visualizer.telemetry_log import TelemetryRecorder
 from robotrol.visualizer.udp_mirror import UDPMirror
 from robotrol.kinematics.dh_model import DHModel
 from robotrol.kinematics.fk import fk6_forward_mm
+from robotrol.gui.ui_coalescer import UICoalescer
 
 # ── Defensive imports for GUI components (may not exist yet) ─────────────────
 
@@ -86,12 +95,32 @@ class RobotrolApp:
         self.profile_mgr = ProfileManager(self.config.base_dir)
         self.serial = SerialClient()
         self.dh: Optional[DHModel] = None
+        # Local pub/sub for dashboards/loggers (settings: telemetry_hub[_port])
+        self.telemetry_hub = TelemetryHub(
+            port=int(self.config.settings.get("telemetry_hub_port", TELEMETRY_HUB_PORT)))
+        if self.config.settings.get("telemetry_hub"):
+            try:
+                self.telemetry_hub.start()
+            except OSError as exc:
+                logger.warning("Telemetry hub disabled: %s", exc)
         self.queue = GCodeQueue(
             send_fn=self.serial.send_line,
             on_log=self.log,
             send_ctrl_x_fn=self.serial.send_ctrl_x,
+            metrics_path=os.path.join(self.config.base_dir, "data", "queue_metrics.jsonl"),
+            checkpoint_path=os.path.join(self.config.base_dir, "data", "queue_checkpoint.json"),
+            on_progress=self._publish_queue_progress,
+        )
+        self.udp = UDPMirror(
+            binary=bool(self.config.settings.get("udp_binary", False)),
+            max_rate_hz=self.config.settings.get("udp_max_rate_hz"),
+            transport=str(self.config.settings.get("visualizer_transport", "udp")),
         )
-        self.udp = UDPMirror()
+        if self.config.settings.get("record_serial_session"):
+            self._start_session_recording()
+        self.telemetry_recorder: Optional[TelemetryRecorder] = None
+        if self.config.settings.get("record_telemetry"):
+            self._start_telemetry_recording()
 
         # ── State ────────────────────────────────────────────────────────
         self.axis_positions: Dict[str, float] = {ax: 0.0 for ax in AXES}
@@ -99,9 +128,21 @@ class RobotrolApp:
         self.wco: Dict[str, float] = {ax: 0.0 for ax in AXES}
         self.machine_state: str = "Unknown"
         self.hw_limits: Dict[str, tuple] = {}
+        # Last $$ dump (typed); cached per profile + firmware in data/
+        self.controller_settings = ControllerSettings()
+        self.controller_firmware: Optional[str] = None
+        self.settings_cache = SettingsCache(
+            os.path.join(self.config.data_dir, "controller_settings.json"))
+        self._settings_dirty = False
         self.can_global_home: bool = True
         self.can_axis_home: bool = True
         self._use_wpos: bool = False
+        self._endstop_pins: Optional[frozenset] = None
+
+        # Status-driven refreshes: newest value per slot, one flush per frame
+        self.ui_coalescer = UICoalescer(self.root.after)
+        self.ui_coalescer.register("status", self._refresh_gui_positions)
+        self.ui_coalescer.register("endstops", self._refresh_endstops)
 
         # ── GUI components (guarded against missing modules) ─────────────
         self.theme: Any = None
@@ -147,6 +188,7 @@ class RobotrolApp:
 
         # ── Serial listener ──────────────────────────────────────────────
         self.serial.listeners.append(self._on_serial_line)
+        self.serial.on_tx_error = self._on_tx_error
 
         # ── Profile loading ──────────────────────────────────────────────
         self.profile_mgr.on_change(self._on_profile_changed)
@@ -253,6 +295,8 @@ class RobotrolApp:
         # ACK / error — notify queue worker
         if line == "ok":
             self.queue.notify_ack()
+            if self._settings_dirty:
+                self._cache_controller_settings()
             return
 
         if line.startswith("error:"):
@@ -263,6 +307,12 @@ class RobotrolApp:
         if line.startswith("Grbl ") or line.startswith("ALARM"):
             self._use_wpos = False
             self.wco = {ax: 0.0 for ax in AXES}
+        if line.startswith("ALARM"):
+            self.queue.notify_alarm(line)
+
+        # Firmware id (banner / $I): seed settings from the cache
+        if line.startswith("Grbl ") or line.startswith("[VER:"):
+            self._on_firmware(firmware_from_line(line))
 
         # Soft-limit / MaxTravel ($130..$135)
         parsed_sm = parse_softmax(line)
@@ -270,6 +320,10 @@ class RobotrolApp:
             ax, max_travel = parsed_sm
             self.hw_limits[ax] = (0.0, max_travel)
 
+        # $$ settings (rates / accelerations for the cycle-time estimate)
+        if line.startswith("$") and self.controller_settings.update_line(line):
+            self._settings_dirty = True
+
         # Real-time status line  <State|MPos:...|...>
         if line.startswith("<") and line.endswith(">"):
             status = parse_status_line(line)
@@ -278,7 +332,58 @@ class RobotrolApp:
 
         # Everything else — log non-noise lines
         if not self._is_noise(line):
-            self.root.after(0, self.log, "RX: " + line)
+            self.log("RX: " + line)
+
+    def _on_tx_error(self, msg: str) -> None:
+        """Lines were dropped or not written (TX writer / serial thread).
+
+        A running program would otherwise wait for an ``ok`` that never
+        comes, so it gets the error like a controller ``error:`` reply.
+        """
+        self.log(f"[ERR] {msg}")
+        if self.queue.running:
+            self.queue.notify_error(msg)
+
+    def _on_firmware(self, firmware: Optional[str]) -> None:
+        """Remember the firmware id; use its cached $$ dump until a fresh one arrives.
+
+        Settings read since connect belong to this controller and are kept
+        when the first id arrives; a different id later on (controller
+        swapped or reflashed) starts a fresh snapshot.
+        """
+        if not firmware or firmware == self.controller_firmware:
+            return
+        if self.controller_firmware is not None:
+            self._reset_controller_settings()
+        self.controller_firmware = firmware
+        if len(self.controller_settings):
+            return
+        cached = self.settings_cache.load(self.profile_mgr.active_name, firmware)
+        if cached is not None:
+            self.controller_settings = cached
+
+    def _reset_controller_settings(self) -> None:
+        """Forget the $$ snapshot and firmware id of the previous controller."""
+        self.controller_settings = ControllerSettings()
+        self.controller_firmware = None
+        self._settings_dirty = False
+
+    def on_connected(self) -> None:
+        """Toolbar hook: a new connection starts with an empty $$ snapshot."""
+        self._reset_controller_settings()
+
+    def on_disconnected(self) -> None:
+        """Toolbar hook: drop the snapshot so it cannot leak into the next controller."""
+        self._reset_controller_settings()
+
+    def _cache_controller_settings(self) -> None:
+        """Store the completed $$ dump (runs on the ``ok`` after it)."""
+        self._settings_dirty = False
+        try:
+            self.settings_cache.store(
+                self.profile_mgr.active_name, self.controller_firmware, self.controller_settings)
+        except OSError as exc:
+            logger.debug("settings cache write failed: %s", exc)
 
     def _apply_status(self, status: Dict[str, Any]) -> None:
         """Apply parsed status data to internal state and schedule UI update."""
@@ -346,19 +451,41 @@ class RobotrolApp:
                 full_pose[ax] = float(self.axis_positions[ax])
         if full_pose:
             self.udp.send_joints(full_pose)
-
-        # Schedule GUI refresh on main thread
+            self.publish_telemetry("joints", full_pose)
+        self.publish_telemetry("status", {
+            "state": self.machine_state,
+            "mpos": dict(mpos),
+            "wpos": dict(effective_wpos),
+            "pins": sorted(endstop_pins),
+        })
+
+        # Schedule GUI refresh on main thread (coalesced to one per frame)
         if updated or state:
-            self.root.after(0, self._refresh_gui_positions, state, endstop_pins)
-
-    def _refresh_gui_positions(
-        self,
-        state: Optional[str],
-        endstop_pins: set,
-    ) -> None:
+            self.ui_coalescer.post("status", self.machine_state)
+        if state:
+            pins = frozenset(endstop_pins)
+            if pins != self._endstop_pins:
+                self._endstop_pins = pins
+                self.ui_coalescer.post("endstops", pins)
+
+    def publish_telemetry(self, topic: str, data: Any) -> None:
+        """Hand *data* to the telemetry hub and the recorder (any thread)."""
+        self.telemetry_hub.publish(topic, data)
+        rec = self.telemetry_recorder
+        if rec is not None:
+            rec.publish(topic, data)
+
+    def _publish_queue_progress(self, line: int, total: int, state: str) -> None:
+        """Queue worker callback: progress for telemetry subscribers."""
+        self.publish_telemetry("queue", {"line": line, "total": total, "state": state})
+
+    def _refresh_gui_positions(self, state: Optional[str]) -> None:
         """Update GUI elements with current positions and state.
 
-        Called on the main thread via ``root.after``.
+        Called on the main thread by :attr:`ui_coalescer` with the newest
+        state.  The TCP panel gets ``mpos`` as it is at that time (machine
+        position, WCO applied in WPos mode), the same joint values the
+        kinematics use, not the display ``axis_positions``.
         """
         if self.status_block is not None and state and hasattr(self.status_block, "update_state"):
             try:
@@ -368,10 +495,21 @@ class RobotrolApp:
 
         if self.tcp_panel is not None and hasattr(self.tcp_panel, "update_positions"):
             try:
-                self.tcp_panel.update_positions(self.axis_positions)
+                self.tcp_panel.update_positions(self.mpos)
             except Exception as exc:
                 logger.debug("tcp_panel.update_positions failed: %s", exc)
 
+    def _refresh_endstops(self, pins: frozenset) -> None:
+        """Colour the manual tab's endstop indicators from the ``Pn:`` field."""
+        tab = self._tabs.get("Manual")
+        if tab is None or not hasattr(tab, "update_endstop_indicator"):
+            return
+        for ax in AXES:
+            try:
+                tab.update_endstop_indicator(ax, "triggered" if ax in pins else "clear")
+            except Exception as exc:
+                logger.debug("update_endstop_indicator failed: %s", exc)
+
     @staticmethod
     def _is_noise(line: str) -> bool:
         """Return True for lines that should not be logged."""
@@ -434,7 +572,8 @@ class RobotrolApp:
     # ──────────────────────────────────────────────────────────────────────
 
     def log(self, msg: str) -> None:
-        """Log a message.  Delegates to queue_panel if available."""
+        """Log a message (any thread).  Delegates to queue_panel if available,
+        which batches the widget updates."""
         if self.queue_panel is not None and hasattr(self.queue_panel, "log"):
             try:
                 self.queue_panel.log(msg)
@@ -480,6 +619,28 @@ class RobotrolApp:
     #  Shutdown / cleanup
     # ──────────────────────────────────────────────────────────────────────
 
+    def _start_session_recording(self) -> None:
+        """Record the serial session to data/sessions (settings flag
+        ``record_serial_session``); see robotrol/tools/replay_session.py."""
+        folder = os.path.join(self.config.data_dir, "sessions")
+        path = os.path.join(folder, time.strftime("serial_%Y%m%d_%H%M%S.rsl"))
+        try:
+            os.makedirs(folder, exist_ok=True)
+            self.serial.start_recording(path)
+        except OSError as exc:
+            logger.warning("Serial session recording disabled: %s", exc)
+
+    def _start_telemetry_recording(self) -> None:
+        """Record joints/status/queue events to data/telemetry (settings flag
+        ``record_telemetry``); see robotrol/tools/replay_telemetry.py."""
+        folder = os.path.join(self.config.data_dir, "telemetry")
+        path = os.path.join(folder, time.strftime("telemetry_%Y%m%d_%H%M%S.rtl"))
+        try:
+            os.makedirs(folder, exist_ok=True)
+            self.telemetry_recorder = TelemetryRecorder(path)
+        except OSError as exc:
+            logger.warning("Telemetry recording disabled: %s", exc)
+
     def shutdown(self) -> None:
         """Clean up all resources and destroy the main window."""
         # Stop TCP panel updates
@@ -494,12 +655,19 @@ class RobotrolApp:
             self.serial.disconnect()
         except Exception as exc:
             logger.debug("serial.disconnect failed: %s", exc)
+        self.serial.stop_recording()
 
         # Close UDP socket
         try:
             self.udp.close()
         except Exception as exc:
             logger.debug("udp.close failed: %s", exc)
+        self.telemetry_hub.close()
+        if self.telemetry_recorder is not None:
+            self.telemetry_recorder.close()
+            if self.telemetry_recorder.oversized:
+                logger.warning("Telemetry recording dropped %d record(s) over 64 KiB",
+                               self.telemetry_recorder.oversized)
 
         # Save config
         try:
@@ -0,0 +1,130 @@
+"""
+Thread-safe, bounded log buffer for the GUI log widget.
+
+Any thread (serial RX, queue worker, GUI) calls :meth:`LogBuffer.append`;
+it only takes a lock and appends to a list.  The GUI drains the pending
+messages once per frame (:meth:`LogBuffer.drain`) and inserts them into
+the text widget in a single call, so a streaming run no longer posts one
+``after(0, ...)`` callback and one widget update per line.  Pending
+messages are capped at *max_lines* (the oldest are dropped and counted),
+and :meth:`LogBuffer.trim_count` tells the widget when to cut its own
+history — in chunks of *trim_slack* lines, so trimming is amortised.
+
+Messages are classified by prefix (:func:`classify`) and filtered by a
+configurable minimum level; G-code traffic (``TX:`` / ``RX:``) is DEBUG.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from typing import List, Optional, Tuple, Union
+
+DEFAULT_MAX_LINES = 2000
+DEFAULT_FLUSH_MS = 50
+
+_RE_TRAFFIC = re.compile(r"^(?:\[\d+/\d+\] |\[resume\] )?(?:TX|RX):")
+
+
+def classify(msg: str) -> int:
+    """Logging level for a GUI log message, from its prefix."""
+    head = msg[:12]
+    if head.startswith(("[ERR", "[Error", "ERROR", "ALARM", "RX: ALARM", "RX: error")):
+        return logging.ERROR
+    if head.startswith(("[WARN", "[Warn", "BLOCKED", "Timeout")):
+        return logging.WARNING
+    if _RE_TRAFFIC.match(msg):
+        return logging.DEBUG
+    return logging.INFO
+
+
+def parse_level(level: Union[int, str, None], default: int = logging.DEBUG) -> int:
+    """``"info"`` / ``"WARNING"`` / ``20`` -> logging level number."""
+    if isinstance(level, int):
+        return level
+    if isinstance(level, str):
+        value = logging.getLevelName(level.strip().upper())
+        if isinstance(value, int):
+            return value
+    return default
+
+
+class LogBuffer:
+    """Pending GUI log lines, drained in batches by the UI thread.
+
+    Parameters
+    ----------
+    max_lines : int
+        Cap on pending messages and on the widget history.
+    min_level : int or str
+        Messages below this level are discarded on :meth:`append`.
+    trim_slack : int, optional
+        The widget may grow this many lines past *max_lines* before it is
+        trimmed back (default: 10 % of *max_lines*).
+    """
+
+    def __init__(
+        self,
+        max_lines: int = DEFAULT_MAX_LINES,
+        min_level: Union[int, str] = logging.DEBUG,
+        trim_slack: Optional[int] = None,
+    ):
+        self.max_lines = max(1, int(max_lines))
+        self.min_level = parse_level(min_level)
+        self.trim_slack = max(1, trim_slack if trim_slack is not None else self.max_lines // 10)
+        self._lock = threading.Lock()
+        self._pending: List[str] = []
+        self._dropped = 0
+        self.widget_lines = 0
+        self.appended = 0
+        self.filtered = 0
+
+    def append(self, msg: str, level: Optional[int] = None) -> bool:
+        """Queue *msg* (any thread); False if filtered out by level."""
+        if level is None:
+            level = classify(msg)
+        if level < self.min_level:
+            self.filtered += 1
+            return False
+        with self._lock:
+            self._pending.append(msg)
+            self.appended += 1
+            if len(self._pending) > 2 * self.max_lines:
+                # Amortised: cut back to max_lines once twice that piled up
+                cut = len(self._pending) - self.max_lines
+                del self._pending[:cut]
+                self._dropped += cut
+        return True
+
+    def drain(self) -> Tuple[List[str], int]:
+        """Take all pending messages (UI thread).
+
+        Returns ``(lines, dropped)`` where *dropped* counts messages lost
+        to the cap since the last drain; at most *max_lines* are returned.
+        """
+        with self._lock:
+            lines, self._pending = self._pending, []
+            dropped, self._dropped = self._dropped, 0
+        if len(lines) > self.max_lines:
+            dropped += len(lines) - self.max_lines
+            lines = lines[-self.max_lines:]
+        return lines, dropped
+
+    def trim_count(self, added: int) -> int:
+        """Record *added* widget lines; return how many old lines to delete."""
+        self.widget_lines += added
+        if self.widget_lines <= self.max_lines + self.trim_slack:
+            return 0
+        cut = self.widget_lines - self.max_lines
+        self.widget_lines = self.max_lines
+        return cut
+
+    def reset_widget(self) -> None:
+        """The widget was cleared."""
+        self.widget_lines = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
@@ -7,15 +7,39 @@ and a scrollable log widget for serial output.
 
 from __future__ import annotations
 
+import os
+import tempfile
+import threading
 import tkinter as tk
-from tkinter import ttk, filedialog
+from tkinter import ttk, filedialog, messagebox
 from typing import TYPE_CHECKING
 
+from robotrol.gcode.estimator import MachineLimits, estimate_program, format_duration
+from robotrol.gcode.program import compile_lines
+from robotrol.gcode.simplify import DEFAULT_TOLERANCE_MM, simplify_lines
+from robotrol.gui.log_buffer import DEFAULT_FLUSH_MS, DEFAULT_MAX_LINES, LogBuffer, parse_level
+from robotrol.gui.queue_view import QueueViewport
+from robotrol.queue.checkpoint import ModalState
 from robotrol.queue.cli_history import CLIHistory
+from robotrol.serial.settings import ControllerSettings
 
 if TYPE_CHECKING:
     from robotrol.queue.gcode_queue import GCodeQueue
 
+# The queue listbox is virtualised: it holds only these rows, fetched from
+# the (possibly file-backed) queue as the view scrolls.
+QUEUE_VIEW_ROWS = 4
+QUEUE_VIEW_POLL_MS = 100
+CURRENT_LINE_BG = "#3399ff"
+CURRENT_LINE_FG = "white"
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
 
 class QueuePanel(ttk.Frame):
     """G-Code queue panel with CLI input, log output, and run controls.
@@ -40,8 +64,25 @@ class QueuePanel(ttk.Frame):
         self._repeat_times_var = tk.StringVar(value="1")
         self._repeat_count_var = tk.StringVar(value="0")
 
+        # ── Path simplification ──────────────────────────────────────
+        self._simplify_tol_var = tk.StringVar(value=str(DEFAULT_TOLERANCE_MM))
+        self._simplifying = False
+
+        # ── Log: any thread appends, one batched insert per frame ────
+        settings = getattr(getattr(app, "config", None), "settings", None) or {}
+        self._log_buffer = LogBuffer(
+            max_lines=int(settings.get("log_max_lines", DEFAULT_MAX_LINES)),
+            min_level=settings.get("log_level", "DEBUG"),
+        )
+
+        # ── Queue view: visible window + line in flight ─────────────
+        self._view = QueueViewport(rows=QUEUE_VIEW_ROWS)
+        self._view_items: list[str] | None = None
+
         self._build_ui()
         self._bind_cli_keys()
+        self.after(DEFAULT_FLUSH_MS, self._flush_log)
+        self.after(QUEUE_VIEW_POLL_MS, self._tick_queue_view)
 
     # ------------------------------------------------------------------
     #  UI construction
@@ -66,9 +107,19 @@ class QueuePanel(ttk.Frame):
         self.txt_log = tk.Text(self, height=4, state=tk.DISABLED)
         self.txt_log.pack(fill=tk.BOTH, expand=False, padx=6, pady=4)
 
-        # ── Queue listbox ────────────────────────────────────────────
-        self.listbox_queue = tk.Listbox(self, height=4)
-        self.listbox_queue.pack(fill=tk.X, padx=6, pady=(0, 4))
+        # ── Queue listbox (virtualised, see QueueViewport) ───────────
+        list_frame = ttk.Frame(self)
+        list_frame.pack(fill=tk.X, padx=6, pady=(0, 4))
+        self._queue_scroll = ttk.Scrollbar(
+            list_frame, orient=tk.VERTICAL, command=self._on_queue_scroll
+        )
+        self._queue_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox_queue = tk.Listbox(
+            list_frame, height=QUEUE_VIEW_ROWS, activestyle="none"
+        )
+        self.listbox_queue.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox_queue.bind(seq, self._on_queue_wheel)
 
         # ── Buttons ──────────────────────────────────────────────────
         btn_frame = ttk.Frame(self)
@@ -95,6 +146,9 @@ class QueuePanel(ttk.Frame):
         ttk.Button(btn_frame, text="Stop / Abort", command=self._stop_abort).pack(
             side=tk.LEFT, padx=6
         )
+        ttk.Button(btn_frame, text="Continue Job", command=self._continue_job).pack(
+            side=tk.LEFT, padx=2
+        )
 
         # Repeat controls
         ttk.Checkbutton(
@@ -110,6 +164,18 @@ class QueuePanel(ttk.Frame):
         )
         self.lbl_repeat_status.pack(side=tk.LEFT)
 
+        # Path simplification controls
+        ttk.Button(btn_frame, text="Optimize", command=self._optimize_queue).pack(
+            side=tk.LEFT, padx=(12, 2)
+        )
+        ttk.Label(btn_frame, text="Tol (mm):").pack(side=tk.LEFT, padx=2)
+        ttk.Entry(
+            btn_frame, textvariable=self._simplify_tol_var, width=5, justify="center"
+        ).pack(side=tk.LEFT, padx=2)
+        ttk.Button(btn_frame, text="Estimate", command=self._estimate_queue).pack(
+            side=tk.LEFT, padx=(8, 2)
+        )
+
     # ------------------------------------------------------------------
     #  CLI history key bindings
     # ------------------------------------------------------------------
@@ -143,23 +209,50 @@ class QueuePanel(ttk.Frame):
     # ------------------------------------------------------------------
 
     def log(self, msg: str) -> None:
-        """Append a message to the log text widget."""
-        self.txt_log.configure(state=tk.NORMAL)
-        self.txt_log.insert(tk.END, msg + "\n")
-        self.txt_log.see(tk.END)
-        self.txt_log.configure(state=tk.DISABLED)
+        """Queue a message for the log widget (thread-safe).
+
+        Messages are written by :meth:`_flush_log` once per frame.
+        """
+        self._log_buffer.append(msg)
+
+    def set_log_level(self, level: object) -> None:
+        """Hide log messages below *level* (``"INFO"``, ``logging.WARNING``, ...)."""
+        self._log_buffer.min_level = parse_level(level, self._log_buffer.min_level)
+
+    def _flush_log(self) -> None:
+        """Write pending log lines in one insert and trim old history."""
+        lines, dropped = self._log_buffer.drain()
+        if lines or dropped:
+            if dropped:
+                lines.insert(0, f"[WARN] {dropped} log line(s) dropped")
+            text = "\n".join(lines) + "\n"
+            w = self.txt_log
+            w.configure(state=tk.NORMAL)
+            w.insert(tk.END, text)
+            cut = self._log_buffer.trim_count(text.count("\n"))
+            if cut:
+                w.delete("1.0", f"{cut + 1}.0")
+            w.see(tk.END)
+            w.configure(state=tk.DISABLED)
+        try:
+            self.after(DEFAULT_FLUSH_MS, self._flush_log)
+        except tk.TclError:
+            pass  # widget destroyed
 
     def update_queue(self, items: list[str]) -> None:
-        """Replace the listbox contents with *items*."""
-        self.listbox_queue.delete(0, tk.END)
-        for item in items:
-            self.listbox_queue.insert(tk.END, item)
+        """Show *items* instead of the queue until the next queue refresh."""
+        self._view_items = list(items)
+        self._view.invalidate()
+        self._view.set_total(len(self._view_items))
+        self._view.set_current(-1)
+        self._render_queue_view()
 
     def clear_log(self) -> None:
         """Erase all log text."""
         self.txt_log.configure(state=tk.NORMAL)
         self.txt_log.delete("1.0", tk.END)
         self.txt_log.configure(state=tk.DISABLED)
+        self._log_buffer.reset_widget()
 
     # ------------------------------------------------------------------
     #  Queue property helper
@@ -180,7 +273,7 @@ class QueuePanel(ttk.Frame):
         self._cli_history.add(cmd)
         self._queue.enqueue(cmd)
         self.entry_cmd.delete(0, tk.END)
-        self._refresh_listbox()
+        self._sync_queue_view()
 
     def _cli_send_now(self) -> None:
         cmd = self.entry_cmd.get().strip()
@@ -200,8 +293,34 @@ class QueuePanel(ttk.Frame):
 
     def _start_run(self) -> None:
         self._sync_repeat_settings()
+        self._view.follow = True
         self._queue.start_run()
 
+    def _continue_job(self) -> None:
+        """Continue an interrupted run from its saved checkpoint."""
+        if self._queue.running:
+            self.log("[WARN] Queue is already running")
+            return
+        point = self._queue.resume_point()
+        if point is None:
+            self.log("No resumable checkpoint for the current queue.")
+            return
+        next_line = int(point["line"]) + 1
+        total = int(point["total"])
+        if not messagebox.askyesno(
+            "Continue Job",
+            f"Last acknowledged line: {point['line']} of {total} "
+            f"({point.get('status', '?')}).\n\n"
+            f"Restore modal state, move back to the last position and "
+            f"continue at line {next_line}?",
+            parent=self,
+        ):
+            return
+        modal = ModalState.from_dict(point["modal"]) if point.get("modal") else None
+        self._sync_repeat_settings()
+        self._view.follow = True
+        self._queue.start_run(from_line=next_line, modal=modal)
+
     def _pause_run(self) -> None:
         self._queue.pause_run()
 
@@ -223,11 +342,10 @@ class QueuePanel(ttk.Frame):
         if not path:
             return
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                lines = [ln.strip() for ln in f if ln.strip()]
-            self._queue.enqueue_many(lines)
-            self.log(f"Loaded {len(lines)} lines from {path}")
+            source = self._queue.load_file(path)
             self._refresh_listbox()
+            # Index the rest in the background; the view grows as it does
+            threading.Thread(target=source.__len__, daemon=True).start()
         except OSError as e:
             self.log(f"[ERR] Load failed: {e}")
 
@@ -241,18 +359,161 @@ class QueuePanel(ttk.Frame):
             return
         try:
             with open(path, "w", encoding="utf-8") as f:
-                for line in self._queue.lines:
+                for line in self._queue.iter_lines():
                     f.write(line + "\n")
             self.log(f"Saved {self._queue.count()} lines to {path}")
         except OSError as e:
             self.log(f"[ERR] Save failed: {e}")
 
+    def _optimize_queue(self) -> None:
+        """Simplify the queued program in a worker thread."""
+        if self._queue.running or self._simplifying:
+            self.log("[WARN] Optimize not possible while a run is active")
+            return
+        if self._queue.is_empty():
+            return
+        try:
+            tol = float(self._simplify_tol_var.get())
+        except ValueError:
+            tol = DEFAULT_TOLERANCE_MM
+            self._simplify_tol_var.set(str(tol))
+        queue = self._queue
+        dh = getattr(self.app, "dh", None)
+        if dh is None:
+            self.log("[WARN] No DH model loaded — only exact merges are applied")
+        self._simplifying = True
+        revision = queue.revision
+
+        def worker() -> None:
+            path = None
+            try:
+                new_lines, report = simplify_lines(queue.iter_lines(), dh_model=dh,
+                                                   tolerance_mm=tol)
+                # Written to a file so the result is queued file-backed
+                fd, path = tempfile.mkstemp(prefix="robotrol_optimized_", suffix=".gcode")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    for line in new_lines:
+                        f.write(line + "\n")
+            except Exception as e:
+                if path is not None:
+                    _remove_quietly(path)
+                self.after(0, self._on_optimize_done, None, revision,
+                           f"[ERR] Optimize failed: {e}")
+                return
+            self.after(0, self._on_optimize_done, path, revision, report.summary())
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_optimize_done(self, path: str | None, revision: int, msg: str) -> None:
+        self._simplifying = False
+        if path is not None:
+            source = self._queue.replace_from_file(path, revision)
+            if source is None:
+                _remove_quietly(path)
+                self.log("[WARN] Queue changed or run started during optimize — result discarded")
+                return
+            self._refresh_listbox()
+            threading.Thread(target=source.__len__, daemon=True).start()
+        self.log(msg)
+
+    def _estimate_queue(self) -> None:
+        """Estimate the cycle time of the queued program in a worker thread."""
+        if self._queue.is_empty():
+            return
+        settings = getattr(self.app, "controller_settings", None) or ControllerSettings()
+        if not settings.has_motion_limits():
+            self.log("[WARN] No $$ settings received yet — estimate uses default rates")
+        limits = MachineLimits.from_settings(settings)
+        lines = self._queue.iter_lines()
+
+        def worker() -> None:
+            try:
+                est = estimate_program(compile_lines(lines), limits)
+            except Exception as e:
+                self.log(f"[ERR] Estimate failed: {e}")
+                return
+            msg = (f"Estimated cycle time: {format_duration(est.total_s)} "
+                   f"({est.moves} moves, dwell {est.dwell_s:.1f}s)")
+            self.log(msg)
+
+        threading.Thread(target=worker, daemon=True).start()
+
     # ------------------------------------------------------------------
     #  Internal helpers
     # ------------------------------------------------------------------
 
     def _refresh_listbox(self) -> None:
-        self.update_queue(self._queue.lines)
+        """Rebuild the visible window after the queue was replaced."""
+        self._view_items = None
+        self._view.invalidate()
+        self._sync_queue_view()
+
+    def _sync_queue_view(self) -> None:
+        """Incremental update for appended lines and the line in flight."""
+        if self._view_items is not None:
+            return
+        view = self._view
+        total = self._queue.known_count()
+        current = self._queue.current_index
+        if not view.dirty and total == view.total and current == view.current:
+            return
+        if total < view.total:
+            view.invalidate()  # lines were removed
+        view.set_total(total)
+        view.set_current(current)
+        self._render_queue_view()
+
+    def _tick_queue_view(self) -> None:
+        try:
+            self._sync_queue_view()
+        except Exception as exc:
+            self.log(f"[ERR] Queue view update failed: {exc}")
+        try:
+            self.after(QUEUE_VIEW_POLL_MS, self._tick_queue_view)
+        except tk.TclError:
+            pass  # widget destroyed
+
+    def _fetch_view_lines(self, start: int, stop: int) -> list[str]:
+        if self._view_items is not None:
+            return self._view_items[start:stop]
+        # Never index on the GUI thread; the background indexer catches up
+        return list(self._queue.iter_lines(start, stop, wait=False))
+
+    def _render_queue_view(self) -> None:
+        """Apply the viewport's edits to the listbox and scrollbar."""
+        view = self._view
+        lb = self.listbox_queue
+        for op in view.render(self._fetch_view_lines):
+            if op[0] == "delete":
+                lb.delete(op[1], op[2])
+            else:
+                lb.insert(op[1], *op[2])
+        old, new = view.highlight()
+        if old is not None:
+            lb.itemconfigure(old, background=lb.cget("background"),
+                             foreground=lb.cget("foreground"))
+        if new is not None:
+            lb.itemconfigure(new, background=CURRENT_LINE_BG, foreground=CURRENT_LINE_FG)
+        self._queue_scroll.set(*view.scrollbar())
+
+    def _on_queue_scroll(self, action: str, value: str, unit: str | None = None) -> None:
+        """Scrollbar command (``moveto f`` / ``scroll n units|pages``)."""
+        view = self._view
+        view.follow = False
+        if action == "moveto":
+            view.moveto(float(value))
+        elif unit == "pages":
+            view.scroll_pages(int(value))
+        else:
+            view.scroll(int(value))
+        self._render_queue_view()
+
+    def _on_queue_wheel(self, event: tk.Event) -> str:
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._view.follow = False
+        self._view.scroll(-1 if up else 1)
+        self._render_queue_view()
+        return "break"
 
     def _sync_repeat_settings(self) -> None:
         self._queue.repeat_enabled = self._repeat_var.get()
@@ -64,8 +64,10 @@ class TcpPosePanel(ttk.Frame):
         self._poll_interval = poll_interval_ms
         self._running = False
 
-        # Internal position buffer
+        # Internal position buffer; FK reruns only when it (or the DH model) changes
         self._axis_positions: Dict[str, float] = {ax: 0.0 for ax in AXES}
+        self._fk_dirty = True
+        self._fk_dh: Optional[DHModel] = None
 
         # Current TCP pose cache (mm / deg)
         self.current_tcp_pose: Dict[str, float] = {
@@ -139,6 +141,16 @@ class TcpPosePanel(ttk.Frame):
         """Return the currently displayed TCP pose (mm / deg)."""
         return dict(self.current_tcp_pose)
 
+    def update_positions(self, positions: Dict[str, float]) -> None:
+        """Push new machine positions and refresh now if they moved.
+
+        Called by the app's coalesced status refresh, so the pose follows
+        the status rate (at most once per frame) instead of the poll
+        interval; the periodic tick remains as a fallback.
+        """
+        if self._sync_positions(positions):
+            self._compute_and_display()
+
     # ------------------------------------------------------------------
     #  Periodic update
     # ------------------------------------------------------------------
@@ -148,27 +160,39 @@ class TcpPosePanel(ttk.Frame):
             return
         try:
             self._sync_positions()
-            self._compute_and_display()
+            if self._fk_dirty or getattr(self.app, "dh", None) is not self._fk_dh:
+                self._compute_and_display()
         except Exception as exc:
             # Avoid crashing the after-loop on transient errors.
             print(f"[TcpPosePanel] TCP update error: {exc}")
 
         self.after(self._poll_interval, self._tick_tcp_update)
 
-    def _sync_positions(self) -> None:
-        """Pull latest machine positions from app.mpos into the local buffer."""
-        mpos: Dict[str, float] = getattr(self.app, "mpos", {})
+    def _sync_positions(self, mpos: Optional[Dict[str, float]] = None) -> bool:
+        """Pull latest machine positions (default: app.mpos) into the local buffer.
+
+        Returns True if any axis moved by more than ``MOTION_EPS``.
+        """
+        if mpos is None:
+            mpos = getattr(self.app, "mpos", {})
+        changed = False
         for ax in AXES:
             new_val = float(mpos.get(ax, 0.0))
             old_val = self._axis_positions.get(ax, 0.0)
             if abs(new_val - old_val) > MOTION_EPS:
                 self._axis_positions[ax] = new_val
+                changed = True
+        if changed:
+            self._fk_dirty = True
+        return changed
 
     def _compute_and_display(self) -> None:
         """Run FK and update the label + internal pose cache."""
         dh: Optional[DHModel] = getattr(self.app, "dh", None)
+        self._fk_dh = dh
         if dh is None:
             return
+        self._fk_dirty = False
 
         # Build joint-angle dict in machine degrees
         joints_dict: Dict[str, float] = {
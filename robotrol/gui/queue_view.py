@@ -0,0 +1,170 @@
+"""
+Virtualised window onto the G-Code queue for the queue listbox.
+
+The listbox only ever holds the visible *rows* lines; :class:`QueueViewport`
+tracks which slice of the queue that is (``top``), the queue length and
+the line in flight, and turns changes into the minimal widget edits:
+
+* appending lines that fall outside the window only moves the scrollbar;
+* scrolling by less than a page deletes/inserts just the rows that moved;
+* a new current line re-colours two rows (and scrolls the window only
+  when *follow* is on and the line left it).
+
+:meth:`QueueViewport.render` returns the edits as ``("delete", first,
+last)`` / ``("insert", index, lines)`` tuples so the panel can apply them
+to a ``tk.Listbox`` and tests can check them without a display.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# fetch(start, stop) -> lines[start:stop] of the backing queue
+FetchFn = Callable[[int, int], Sequence[str]]
+Op = Tuple
+
+# Lines kept above the current one when *follow* scrolls the window
+FOLLOW_CONTEXT = 1
+
+
+class QueueViewport:
+    """Visible window of a (possibly huge) line sequence.
+
+    Parameters
+    ----------
+    rows : int
+        Number of listbox rows.
+    follow : bool
+        Scroll to keep the current line visible while a run advances.
+    """
+
+    def __init__(self, rows: int = 4, follow: bool = True):
+        self.rows = max(1, int(rows))
+        self.follow = follow
+        self.total = 0
+        self.top = 0
+        self.current = -1
+        # What the widget shows now: first queue index and the row texts
+        self._shown_top = 0
+        self._shown: List[str] = []
+        self._shown_current = -1
+        self.dirty = True
+
+    # ------------------------------------------------------------------
+    #  Model updates
+    # ------------------------------------------------------------------
+
+    def set_total(self, total: int) -> None:
+        self.total = max(0, int(total))
+        self._clamp()
+
+    def set_rows(self, rows: int) -> None:
+        self.rows = max(1, int(rows))
+        self._clamp()
+
+    def set_current(self, index: int) -> None:
+        """Line in flight (0-based, -1 for none)."""
+        self.current = int(index)
+        if self.follow and self.current >= 0:
+            if self.current < self.top or self.current >= self.top + self.rows:
+                self.scroll_to(self.current - FOLLOW_CONTEXT)
+
+    def scroll_to(self, top: int) -> None:
+        self.top = int(top)
+        self._clamp()
+
+    def scroll(self, delta: int) -> None:
+        """Scroll by *delta* lines (negative = up)."""
+        self.scroll_to(self.top + int(delta))
+
+    def scroll_pages(self, pages: int) -> None:
+        self.scroll(int(pages) * self.rows)
+
+    def moveto(self, fraction: float) -> None:
+        """Scrollbar ``moveto``: first visible line at *fraction* of the total."""
+        self.scroll_to(int(round(float(fraction) * self.total)))
+
+    def invalidate(self) -> None:
+        """The lines changed in place; the next render rebuilds the window."""
+        self.dirty = True
+
+    def _clamp(self) -> None:
+        self.top = max(0, min(self.top, self.total - self.rows))
+
+    # ------------------------------------------------------------------
+    #  View
+    # ------------------------------------------------------------------
+
+    def visible_range(self) -> Tuple[int, int]:
+        return self.top, min(self.top + self.rows, self.total)
+
+    def scrollbar(self) -> Tuple[float, float]:
+        """``(first, last)`` fractions for ``Scrollbar.set``."""
+        if self.total <= 0:
+            return 0.0, 1.0
+        first, last = self.visible_range()
+        return first / self.total, last / self.total
+
+    def current_row(self) -> Optional[int]:
+        """Listbox row of the current line, None if not visible."""
+        first, last = self.visible_range()
+        if first <= self.current < last:
+            return self.current - first
+        return None
+
+    def render(self, fetch: FetchFn) -> List[Op]:
+        """Edits that bring the widget to the current window.
+
+        Only lines that are not already shown are fetched.
+        """
+        first, last = self.visible_range()
+        shown_first = self._shown_top
+        shown_last = shown_first + len(self._shown)
+        ops: List[Op] = []
+        lo, hi = max(first, shown_first), min(last, shown_last)
+        if self.dirty or not self._shown or lo >= hi:
+            # Nothing reusable: replace the window
+            lines = list(fetch(first, last)) if last > first else []
+            if self._shown:
+                ops.append(("delete", 0, len(self._shown) - 1))
+            if lines:
+                ops.append(("insert", 0, lines))
+            self._shown = lines
+            self._shown_current = -1  # fresh rows are uncoloured
+            self.dirty = False
+        else:
+            shown = self._shown
+            # Drop rows that left the window (bottom first keeps indices valid)
+            if shown_last > hi:
+                ops.append(("delete", hi - shown_first, len(shown) - 1))
+            if lo > shown_first:
+                ops.append(("delete", 0, lo - shown_first - 1))
+            kept = shown[lo - shown_first:hi - shown_first]
+            head = list(fetch(first, lo)) if lo > first else []
+            tail = list(fetch(hi, last)) if last > hi else []
+            if head:
+                ops.append(("insert", 0, head))
+            if tail:
+                ops.append(("insert", len(head) + len(kept), tail))
+            self._shown = head + kept + tail
+        self._shown_top = first
+        if len(self._shown) < last - first:
+            # Short fetch: the queue shrank under us
+            self.total = first + len(self._shown)
+        return ops
+
+    def highlight(self) -> Tuple[Optional[int], Optional[int]]:
+        """``(old_row, new_row)`` to re-colour after :meth:`render`.
+
+        Rows are positions in the widget now; *old_row* is None when the
+        previous line is no longer shown or is still the current one,
+        *new_row* is None when the current line is not shown.
+        """
+        def row(index: int) -> Optional[int]:
+            r = index - self._shown_top
+            return r if index >= 0 and 0 <= r < len(self._shown) else None
+
+        old, new = row(self._shown_current), row(self.current)
+        self._shown_current = self.current
+        return (None if old == new else old), new
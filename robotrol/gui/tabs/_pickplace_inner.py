@@ -26,6 +26,7 @@ from robotrol.pickplace.control.transforms import (
 )
 from robotrol.pickplace.perception.camera import Frame
 from robotrol.pickplace.simulation.simulation_loop import SimulationRunner
+from robotrol.serial.aio import BlockingController
 
 
 class _CameraCaptureAdapter:
@@ -59,6 +60,7 @@ class PickPlaceTab(ttk.Frame):
         self._sim_cycles = tk.IntVar(value=1000)
         self._detect_var = tk.StringVar(value="No detection yet.")
         self._execute_app = execute_app
+        self._motion_waiter = None
         self._learner = None
         self._learning_enabled_var = tk.BooleanVar(value=False)
         self._learning_mode_var = tk.StringVar(value="shadow")
@@ -2073,11 +2075,13 @@ class PickPlaceTab(ttk.Frame):
                     f"pos={pose.position_mm} quat={pose.quaternion_xyzw} "
                     f"conf={pose.confidence:.3f}"
                 )
-                self._detect_var.set(msg)
+                self._ui_latest("pickplace.detect", lambda: self._detect_var.set(msg))
+                self._publish_detection(pose)
                 self._log(f"Detect ok: {msg}")
                 self._update_detection_overlay()
             except Exception as exc:
-                self._detect_var.set(f"Detect failed: {exc}")
+                err = f"Detect failed: {exc}"
+                self._ui_latest("pickplace.detect", lambda: self._detect_var.set(err))
                 self._log(f"Detect failed: {exc}")
         self._start_worker(_task)
 
@@ -2216,20 +2220,30 @@ class PickPlaceTab(ttk.Frame):
         except Exception:
             return fallback
 
+    def _serial_client(self):
+        app = self._execute_app
+        return getattr(app, "serial", None) or getattr(app, "client", None)
+
     def _wait_for_idle(self, timeout_s=30.0):
-        if self._execute_app is None or not hasattr(self._execute_app, "client"):
+        """Block until the moves sent so far have finished (worker thread).
+
+        Waits on the controller's replies instead of polling ``last_status``;
+        returns True when not connected, False on timeout or alarm.
+        """
+        client = self._serial_client()
+        if client is None or getattr(client, "ser", None) is None:
             return True
-        start = time.time()
-        while time.time() - start < timeout_s:
-            try:
-                st = getattr(self._execute_app.client, "last_status", None) or {}
-                state = str(st.get("state", "")).lower()
-                if "idle" in state or state == "":
-                    return True
-            except Exception:
-                pass
-            time.sleep(0.05)
-        return False
+        waiter = self._motion_waiter
+        if waiter is None or waiter.client is not client:
+            if waiter is not None:
+                waiter.close()
+            waiter = self._motion_waiter = BlockingController(client)
+        try:
+            waiter.wait_idle(timeout=timeout_s)
+            return True
+        except Exception as exc:
+            self._log(f"Wait for idle failed: {exc!r}")
+            return False
 
     def _pickup_test(self):
         def _task():
@@ -2437,6 +2451,24 @@ class PickPlaceTab(ttk.Frame):
     def _ui(self, fn):
         self.after(0, fn)
 
+    def _ui_latest(self, key, fn):
+        # Only the newest pending update per key runs (status-style widgets)
+        coalescer = getattr(self._execute_app, "ui_coalescer", None)
+        if coalescer is None:
+            self._ui(fn)
+        else:
+            coalescer.post_call(key, fn)
+
+    def _publish_detection(self, pose):
+        publish = getattr(self._execute_app, "publish_telemetry", None)
+        if publish is None:
+            return
+        publish("detections", {
+            "position_mm": [float(v) for v in pose.position_mm],
+            "quaternion_xyzw": [float(v) for v in pose.quaternion_xyzw],
+            "confidence": float(pose.confidence),
+        })
+
     def _log(self, message: str):
         if self._logger:
             try:
@@ -2449,7 +2481,7 @@ class PickPlaceTab(ttk.Frame):
         self._ui(_write)
 
     def _set_status(self, text: str):
-        self._ui(lambda: self._status_var.set(text))
+        self._ui_latest("pickplace.status", lambda: self._status_var.set(text))
 
     def _refresh_stack_index(self):
         idx = "n/a"
@@ -2458,7 +2490,7 @@ class PickPlaceTab(ttk.Frame):
                 idx = str(int(getattr(self._pipeline.context, "stack_index", 0)))
         except Exception:
             idx = "n/a"
-        self._ui(lambda: self._stack_index_var.set(f"Stack index: {idx}"))
+        self._ui_latest("pickplace.stack_index", lambda: self._stack_index_var.set(f"Stack index: {idx}"))
 
     def _reset_stack_index(self):
         try:
@@ -11,7 +11,6 @@ Extracted from Robotrol_FluidNC_v7_3.py lines 1079-2140, 4466-4519,
 
 from __future__ import annotations
 
-import json
 import math
 import tkinter as tk
 from tkinter import ttk
@@ -146,7 +145,6 @@ class FixedTcpTab(ttk.Frame):
         self.fixed_tcp_user_dragging: bool = False
         self.fixed_tcp_point: Optional[Tuple[float, float, float]] = None
 
-        self._vis_path_fixed: list = []
         self._vis_fixed_frame: Any = None
         self._gp_tcp_busy: bool = False
         self._gp_tcp_prev_rpy: Optional[Tuple[float, float, float]] = None
@@ -417,6 +415,7 @@ class FixedTcpTab(ttk.Frame):
     # ── Visualiser path ─────────────────────────────────────────────
 
     def _append_vis_path_fixed(self, pt: tuple) -> None:
+        """Stream one new point; the visualizer keeps the path itself."""
         try:
             x, y, z = float(pt[0]), float(pt[1]), float(pt[2])
         except (ValueError, TypeError, IndexError):
@@ -425,25 +424,13 @@ class FixedTcpTab(ttk.Frame):
             a = float(self.app.axis_positions.get("A", 0.0))
         except (ValueError, TypeError, AttributeError):
             a = 0.0
-        self._vis_path_fixed.append((x, y, z, a))
-        if len(self._vis_path_fixed) > 400:
-            self._vis_path_fixed = self._vis_path_fixed[-400:]
-        self._send_vis_path("path_fixed", self._vis_path_fixed)
-
-    def _send_vis_path(self, path_type: str, pts: list) -> None:
-        udp_sock = getattr(getattr(self.app, "client", None), "udp_sock", None)
-        if not udp_sock:
+        self._send_vis_path("path_fixed", [(x, y, z, a)], append=True)
+
+    def _send_vis_path(self, path_type: str, pts: list, append: bool = False) -> None:
+        udp = getattr(self.app, "udp", None)
+        if udp is None:
             return
-        udp_addr = getattr(self.app, "_udp_addr", ("127.0.0.1", 9999))
-        try:
-            msg = json.dumps({
-                "type": path_type,
-                "pts": [[float(a), float(b), float(c), float(d)]
-                        for a, b, c, d in pts],
-            })
-            udp_sock.sendto(msg.encode("utf-8"), udp_addr)
-        except OSError:
-            pass
+        udp.send_path(pts, path_type, append=append)
 
     def _send_vis_fixed_frame(
         self,
@@ -452,21 +439,10 @@ class FixedTcpTab(ttk.Frame):
         y_axis: tuple,
         z_axis: tuple,
     ) -> None:
-        udp_sock = getattr(getattr(self.app, "client", None), "udp_sock", None)
-        if not udp_sock:
+        udp = getattr(self.app, "udp", None)
+        if udp is None:
             return
-        udp_addr = getattr(self.app, "_udp_addr", ("127.0.0.1", 9999))
-        try:
-            msg = json.dumps({
-                "type": "fixed_frame",
-                "origin": [float(origin[0]), float(origin[1]), float(origin[2])],
-                "x": [float(x_axis[0]), float(x_axis[1]), float(x_axis[2])],
-                "y": [float(y_axis[0]), float(y_axis[1]), float(y_axis[2])],
-                "z": [float(z_axis[0]), float(z_axis[1]), float(z_axis[2])],
-            })
-            udp_sock.sendto(msg.encode("utf-8"), udp_addr)
-        except OSError:
-            pass
+        udp.send_fixed_frame(origin, x_axis, y_axis, z_axis)
 
     # ── TCP point target ────────────────────────────────────────────
 
@@ -525,6 +501,8 @@ class FixedTcpTab(ttk.Frame):
         self.fixed_tcp_last_delta = None
         self.fixed_tcp_stable_count = 0
         self.fixed_tcp_point = None
+        # New origin, new path
+        self._send_vis_path("path_fixed", [])
 
         # Send fixed frame to visualiser
         try:
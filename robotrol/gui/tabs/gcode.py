@@ -17,6 +17,12 @@ import tkinter.scrolledtext as scrolledtext
 from tkinter import ttk
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from robotrol.gcode.arcs import DEFAULT_CHORD_TOL, arc_angles, arc_steps
+from robotrol.gcode.program import (
+    IF, II, IJ, IX, IY, IZ, MODE_G20, MODE_G21, MODE_G90, MODE_G91, NWORDS,
+    OP_G0, OP_G1, OP_G2, OP_G3, CompiledProgram, load_program,
+)
+
 
 # ---------------------------------------------------------------------------
 # Vector helpers (pure functions, no dependencies)
@@ -104,26 +110,9 @@ def _world_axis_value(
     )
 
 
-def _parse_gcode_line(raw: str) -> Optional[Dict[str, Any]]:
-    """Parse a single G-code line into {cmd, params} or *None*."""
-    line = raw
-    if ";" in line:
-        line = line[: line.index(";")]
-    line = line.strip().upper()
-    if not line:
-        return None
-    tokens = line.split()
-    if not tokens:
-        return None
-    cmd = tokens[0]
-    params: Dict[str, float] = {}
-    for tok in tokens[1:]:
-        if len(tok) >= 2 and tok[0].isalpha():
-            try:
-                params[tok[0]] = float(tok[1:])
-            except ValueError:
-                pass
-    return {"cmd": cmd, "params": params}
+def _opt(v: float) -> Optional[float]:
+    """Compiled-program word value, NaN (absent) -> *None*."""
+    return None if v != v else v
 
 
 # ---------------------------------------------------------------------------
@@ -174,10 +163,11 @@ class GCodeTab(ttk.Frame):
         self.plane_center_j = tk.DoubleVar(value=0.0)
         self.plane_w = tk.DoubleVar(value=0.0)
         self.plane_feed = tk.DoubleVar(value=3000.0)
-        self.plane_seg_len = tk.DoubleVar(value=2.0)
+        self.plane_chord_tol = tk.DoubleVar(value=DEFAULT_CHORD_TOL)
+        self.plane_seg_len = tk.DoubleVar(value=0.0)  # max chord, 0 = no limit
 
         # ── Tk variables — G-code file interpreter ───────────────────────
-        self.plane_gcode_lines: List[str] = []
+        self.plane_gcode_program: Optional[CompiledProgram] = None
         self.plane_gcode_path = tk.StringVar(value="")
         self.plane_gcode_status = tk.StringVar(value="No file loaded.")
         self.plane_gcode_progress = tk.StringVar(value="")
@@ -430,6 +420,18 @@ class GCodeTab(ttk.Frame):
             "feed": feed,
         }
 
+    def _arc_seg_params(self) -> Tuple[float, float]:
+        """(chord tolerance, max chord length) for arc segmentation."""
+        try:
+            chord_tol = float(self.plane_chord_tol.get())
+        except (ValueError, tk.TclError):
+            chord_tol = DEFAULT_CHORD_TOL
+        try:
+            max_seg = float(self.plane_seg_len.get())
+        except (ValueError, tk.TclError):
+            max_seg = 0.0
+        return max(0.001, chord_tol), max(0.0, max_seg)
+
     def _arc_points(
         self,
     ) -> Optional[Tuple[List[Vec3], Vec3, float]]:
@@ -450,15 +452,10 @@ class GCodeTab(ttk.Frame):
         feed = arc["feed"]
         roll, pitch, yaw = arc["rpy"]
 
-        try:
-            seg_len = float(self.plane_seg_len.get())
-        except (ValueError, tk.TclError):
-            seg_len = 2.0
-        seg_len = max(0.5, seg_len)
-        steps = max(3, int(math.ceil(arc_len / seg_len)))
+        chord_tol, max_seg = self._arc_seg_params()
+        steps = arc_steps(r0, delta, chord_tol, max_seg)
         pts: List[Vec3] = []
-        for i in range(1, steps + 1):
-            ang = start + delta * (i / steps)
+        for ang in arc_angles(start, delta, steps):
             uu = cx + r0 * math.cos(ang)
             vv = cy + r0 * math.sin(ang)
             x = origin[0] + uu * u_axis[0] + vv * v_axis[0] + w * n_axis[0]
@@ -647,9 +644,9 @@ class GCodeTab(ttk.Frame):
     # ══════════════════════════════════════════════════════════════════════
 
     def _exec_gcode(self, dry_run: bool) -> None:  # noqa: C901 — faithful port
-        """Interpret loaded G-code lines; runs in a worker thread."""
-        lines = self.plane_gcode_lines
-        if not lines:
+        """Interpret the loaded G-code program; runs in a worker thread."""
+        prog = self.plane_gcode_program
+        if prog is None or not len(prog):
             self._log("G-code: no file loaded.")
             return
         if not self.plane_defined:
@@ -669,7 +666,7 @@ class GCodeTab(ttk.Frame):
         rot = self.plane_rotate.get()
         off_u = float(self.plane_offset_u.get())
         off_v = float(self.plane_offset_v.get())
-        seg_len = max(0.5, float(self.plane_seg_len.get()))
+        chord_tol, max_seg = self._arc_seg_params()
         stop = self.plane_gcode_stop_event
 
         # interpreter state
@@ -680,7 +677,8 @@ class GCodeTab(ttk.Frame):
         cur_w = 0.0
         cur_feed = float(self.plane_feed.get())
         move_count = 0
-        total = len(lines)
+        arc_segments = 0
+        total = prog.n_source_lines
 
         def transform_uv(
             rx: Optional[float], ry: Optional[float],
@@ -740,7 +738,7 @@ class GCodeTab(ttk.Frame):
             w1: Optional[float],
             ci: float, cj: float, direction: str, feed: float,
         ) -> bool:
-            nonlocal cur_u, cur_v, cur_w, move_count
+            nonlocal cur_u, cur_v, cur_w, move_count, arc_segments
             if u1 is None:
                 u1 = cur_u
             if v1 is None:
@@ -773,12 +771,11 @@ class GCodeTab(ttk.Frame):
                 else:
                     if delta <= 0:
                         delta += 2 * math.pi
-            arc_len_local = abs(delta) * r0
-            steps = max(3, int(math.ceil(arc_len_local / seg_len)))
-            for i in range(1, steps + 1):
+            steps = arc_steps(r0, delta, chord_tol, max_seg)
+            arc_segments += steps
+            for ang in arc_angles(start_a, delta, steps):
                 if stop.is_set():
                     return False
-                ang = start_a + delta * (i / steps)
                 uu = cxl + r0 * math.cos(ang)
                 vv = cyl + r0 * math.sin(ang)
                 if not dry_run:
@@ -792,33 +789,38 @@ class GCodeTab(ttk.Frame):
             cur_u, cur_v, cur_w = u1, v1, w1
             return True
 
-        for lineno, raw in enumerate(lines, 1):
+        ops, params, modes = prog.ops, prog.params, prog.modes
+        last_row = len(prog) - 1
+        for row in range(len(prog)):
+            lineno = prog.src_line[row]
             if stop.is_set():
                 self._log(f"G-code stopped at line {lineno}.")
                 break
-            parsed = _parse_gcode_line(raw)
-            if not parsed:
-                continue
-            cmd = parsed["cmd"]
-            p = parsed["params"]
-            if lineno % 100 == 0 or lineno == total:
+            op = ops[row]
+            base = row * NWORDS
+            if row % 100 == 0 or row == last_row:
                 self.plane_gcode_progress.set(
                     f"Line {lineno}/{total}  moves={move_count}"
                 )
-            if cmd == "G20":
-                metric = False
-            elif cmd == "G21":
-                metric = True
-            elif cmd == "G90":
-                abs_mode = True
-            elif cmd == "G91":
-                abs_mode = False
-            elif cmd in ("G17", "G18", "G19", "G28", "G92"):
-                pass  # plane select / home / set position: ignored
-            elif cmd in ("G0", "G1"):
-                if "F" in p:
-                    cur_feed = p["F"] * (25.4 if not metric else 1.0)
-                u1, v1, w1 = to_uv(p.get("X"), p.get("Y"), p.get("Z"))
+            mode = modes[row]
+            if mode:
+                if mode & MODE_G20:
+                    metric = False
+                elif mode & MODE_G21:
+                    metric = True
+                if mode & MODE_G90:
+                    abs_mode = True
+                elif mode & MODE_G91:
+                    abs_mode = False
+            # plane select / home / set position: ignored
+            if op == OP_G0 or op == OP_G1:
+                f_word = params[base + IF]
+                if f_word == f_word:
+                    cur_feed = f_word * (25.4 if not metric else 1.0)
+                u1, v1, w1 = to_uv(
+                    _opt(params[base + IX]), _opt(params[base + IY]),
+                    _opt(params[base + IZ]),
+                )
                 if not abs_mode:
                     if u1 is not None:
                         u1 += cur_u
@@ -826,23 +828,30 @@ class GCodeTab(ttk.Frame):
                         v1 += cur_v
                     if w1 is not None:
                         w1 += cur_w
-                feed = cur_feed if cmd == "G1" else min(cur_feed, 6000.0)
+                feed = cur_feed if op == OP_G1 else min(cur_feed, 6000.0)
                 if not do_move(u1, v1, w1, feed):
                     self._log(f"G-code aborted at line {lineno} (move failed).")
                     break
-            elif cmd in ("G2", "G3"):
-                if "F" in p:
-                    cur_feed = p["F"] * (25.4 if not metric else 1.0)
-                ci_t, cj_t = transform_uv(p.get("I", 0.0), p.get("J", 0.0))
+            elif op == OP_G2 or op == OP_G3:
+                f_word = params[base + IF]
+                if f_word == f_word:
+                    cur_feed = f_word * (25.4 if not metric else 1.0)
+                ci_t, cj_t = transform_uv(
+                    _opt(params[base + II]) or 0.0, _opt(params[base + IJ]) or 0.0,
+                )
                 ci_val = ci_t if ci_t is not None else 0.0
                 cj_val = cj_t if cj_t is not None else 0.0
-                u1, v1, w1 = to_uv(p.get("X"), p.get("Y"), p.get("Z"))
+                u1, v1, w1 = to_uv(
+                    _opt(params[base + IX]), _opt(params[base + IY]),
+                    _opt(params[base + IZ]),
+                )
                 if not abs_mode:
                     if u1 is not None:
                         u1 += cur_u
                     if v1 is not None:
                         v1 += cur_v
-                if not do_arc(u1, v1, w1, ci_val, cj_val, cmd, cur_feed):
+                direction = "G2" if op == OP_G2 else "G3"
+                if not do_arc(u1, v1, w1, ci_val, cj_val, direction, cur_feed):
                     self._log(f"G-code aborted at line {lineno} (arc failed).")
                     break
             # M, T, S, N, E: silently ignored
@@ -851,7 +860,8 @@ class GCodeTab(ttk.Frame):
             f"Done \u2014 {move_count} moves / {total} lines"
         )
         self._log(
-            f"G-code {'dry-run' if dry_run else 'run'} complete: {move_count} moves."
+            f"G-code {'dry-run' if dry_run else 'run'} complete: {move_count} moves "
+            f"({arc_segments} arc segments)."
         )
 
     # ══════════════════════════════════════════════════════════════════════
@@ -869,19 +879,26 @@ class GCodeTab(ttk.Frame):
         if not path:
             return
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                self.plane_gcode_lines = [ln.rstrip("\n") for ln in f]
+            prog = load_program(path, cache_dir=self._gcode_cache_dir())
+            self.plane_gcode_program = prog
             self.plane_gcode_path.set(path)
             self.plane_gcode_status.set(
-                f"{len(self.plane_gcode_lines)} lines loaded."
+                f"{prog.n_source_lines} lines loaded."
             )
             self.plane_gcode_progress.set("")
             self._log(
-                f"G-code loaded: {path} ({len(self.plane_gcode_lines)} lines)"
+                f"G-code loaded: {path} ({prog.n_source_lines} lines)"
             )
         except OSError as e:
             self._log(f"G-code load failed: {e}")
 
+    def _gcode_cache_dir(self) -> Optional[str]:
+        config = getattr(self.app, "config", None)
+        base_dir = getattr(config, "base_dir", None)
+        if not base_dir:
+            return None
+        return os.path.join(base_dir, "data", "cache", "gcode")
+
     def _gcode_run(self) -> None:
         if self.plane_gcode_worker and self.plane_gcode_worker.is_alive():
             self._log("G-code: already running.")
@@ -904,12 +921,12 @@ class GCodeTab(ttk.Frame):
     # ══════════════════════════════════════════════════════════════════════
 
     def _draw_preview(self) -> None:  # noqa: C901
-        """Parse loaded G-code and draw the UV path on the preview canvas."""
+        """Draw the UV path of the loaded program on the preview canvas."""
         canvas = self.plane_preview_canvas
         if canvas is None:
             return
-        lines = self.plane_gcode_lines
-        if not lines:
+        prog = self.plane_gcode_program
+        if prog is None or not len(prog):
             canvas.delete("all")
             canvas.create_text(150, 100, text="No file loaded.", fill="gray")
             return
@@ -921,7 +938,7 @@ class GCodeTab(ttk.Frame):
         rot = self.plane_rotate.get()
         off_u = float(self.plane_offset_u.get())
         off_v = float(self.plane_offset_v.get())
-        seg_len = max(0.5, float(self.plane_seg_len.get()))
+        chord_tol, max_seg = self._arc_seg_params()
         metric = True
         abs_mode = True
         cur_u = 0.0
@@ -952,22 +969,22 @@ class GCodeTab(ttk.Frame):
 
         draw_segs: List[Tuple[float, float, float, float, bool]] = []
 
-        for raw in lines:
-            parsed = _parse_gcode_line(raw)
-            if not parsed:
-                continue
-            cmd = parsed["cmd"]
-            p = parsed["params"]
-            if cmd == "G20":
-                metric = False
-            elif cmd == "G21":
-                metric = True
-            elif cmd == "G90":
-                abs_mode = True
-            elif cmd == "G91":
-                abs_mode = False
-            elif cmd in ("G0", "G1"):
-                u1, v1 = tuv(p.get("X"), p.get("Y"))
+        ops, params, modes = prog.ops, prog.params, prog.modes
+        for row in range(len(prog)):
+            op = ops[row]
+            base = row * NWORDS
+            mode = modes[row]
+            if mode:
+                if mode & MODE_G20:
+                    metric = False
+                elif mode & MODE_G21:
+                    metric = True
+                if mode & MODE_G90:
+                    abs_mode = True
+                elif mode & MODE_G91:
+                    abs_mode = False
+            if op == OP_G0 or op == OP_G1:
+                u1, v1 = tuv(_opt(params[base + IX]), _opt(params[base + IY]))
                 if not abs_mode:
                     if u1 is not None:
                         u1 += cur_u
@@ -977,13 +994,15 @@ class GCodeTab(ttk.Frame):
                     u1 = cur_u
                 if v1 is None:
                     v1 = cur_v
-                draw_segs.append((cur_u, cur_v, u1, v1, cmd == "G0"))
+                draw_segs.append((cur_u, cur_v, u1, v1, op == OP_G0))
                 cur_u, cur_v = u1, v1
-            elif cmd in ("G2", "G3"):
-                ci_t, cj_t = txuv(p.get("I", 0.0), p.get("J", 0.0))
+            elif op == OP_G2 or op == OP_G3:
+                ci_t, cj_t = txuv(
+                    _opt(params[base + II]) or 0.0, _opt(params[base + IJ]) or 0.0,
+                )
                 ci = ci_t if ci_t is not None else 0.0
                 cj = cj_t if cj_t is not None else 0.0
-                u1, v1 = tuv(p.get("X"), p.get("Y"))
+                u1, v1 = tuv(_opt(params[base + IX]), _opt(params[base + IY]))
                 if not abs_mode:
                     if u1 is not None:
                         u1 += cur_u
@@ -1003,19 +1022,18 @@ class GCodeTab(ttk.Frame):
                 start_a = math.atan2(cur_v - cyl, cur_u - cxl)
                 end_a = math.atan2(v1 - cyl, u1 - cxl)
                 if abs(u1 - cur_u) < 1e-6 and abs(v1 - cur_v) < 1e-6:
-                    delta = -2 * math.pi if cmd == "G2" else 2 * math.pi
+                    delta = -2 * math.pi if op == OP_G2 else 2 * math.pi
                 else:
                     delta = end_a - start_a
-                    if cmd == "G2":
+                    if op == OP_G2:
                         if delta >= 0:
                             delta -= 2 * math.pi
                     else:
                         if delta <= 0:
                             delta += 2 * math.pi
-                steps = max(3, int(math.ceil(abs(delta) * r0 / seg_len)))
+                steps = arc_steps(r0, delta, chord_tol, max_seg)
                 prev_u, prev_v = cur_u, cur_v
-                for i in range(1, steps + 1):
-                    ang = start_a + delta * (i / steps)
+                for ang in arc_angles(start_a, delta, steps):
                     uu = cxl + r0 * math.cos(ang)
                     vv = cyl + r0 * math.sin(ang)
                     draw_segs.append((prev_u, prev_v, uu, vv, False))
@@ -1259,7 +1277,11 @@ class GCodeTab(ttk.Frame):
 
         tf_r5 = ttk.Frame(tf)
         tf_r5.pack(anchor="w", padx=4, pady=(1, 4))
-        ttk.Label(tf_r5, text="SegLen:", width=8, anchor="w").pack(side=tk.LEFT)
+        ttk.Label(tf_r5, text="ChordTol:", width=8, anchor="w").pack(side=tk.LEFT)
+        ttk.Entry(
+            tf_r5, textvariable=self.plane_chord_tol, width=6, justify="right",
+        ).pack(side=tk.LEFT, padx=(2, 10))
+        ttk.Label(tf_r5, text="MaxSeg:", width=7, anchor="w").pack(side=tk.LEFT)
         ttk.Entry(
             tf_r5, textvariable=self.plane_seg_len, width=6, justify="right",
         ).pack(side=tk.LEFT, padx=(2, 10))
@@ -1351,7 +1373,11 @@ class GCodeTab(ttk.Frame):
         ttk.Entry(
             arc_row3, textvariable=self.plane_feed, width=8, justify="right",
         ).pack(side=tk.LEFT, padx=(4, 10))
-        ttk.Label(arc_row3, text="SegLen").pack(side=tk.LEFT)
+        ttk.Label(arc_row3, text="ChordTol").pack(side=tk.LEFT)
+        ttk.Entry(
+            arc_row3, textvariable=self.plane_chord_tol, width=8, justify="right",
+        ).pack(side=tk.LEFT, padx=(4, 10))
+        ttk.Label(arc_row3, text="MaxSeg").pack(side=tk.LEFT)
         ttk.Entry(
             arc_row3, textvariable=self.plane_seg_len, width=8, justify="right",
         ).pack(side=tk.LEFT, padx=(4, 0))
@@ -119,7 +119,8 @@ class ManualControlTab(ttk.Frame):
         # ── Per-tab state ─────────────────────────────────────────────────
         self.live_move = tk.BooleanVar(value=True)
         self.mode_absolute = tk.BooleanVar(value=True)
-        self.poll_positions = tk.BooleanVar(value=False)
+        self.poll_positions = tk.BooleanVar(value=app.serial.poller.enabled)
+        self.poll_positions.trace_add("write", self._on_poll_positions)
         self.manual_speed_factor = tk.DoubleVar(value=1 / 20)
 
         # Speed control state
@@ -210,6 +211,11 @@ class ManualControlTab(ttk.Frame):
     #  Position updates
     # ──────────────────────────────────────────────────────────────────────
 
+    def _on_poll_positions(self, *_args: Any) -> None:
+        """Enable/disable the serial layer's adaptive status polling."""
+        self.app.serial.poller.enabled = bool(self.poll_positions.get())
+        self.app.serial.poller.wake()
+
     def update_all_positions(self) -> None:
         """Refresh all axis displays from ``app.axis_positions``."""
         for ax in AXES:
@@ -0,0 +1,161 @@
+"""
+Latest-value slots for GUI refreshes posted from worker threads.
+
+The serial RX thread (and other workers) call :meth:`UICoalescer.post`
+with a key and the newest value; the value replaces whatever is still
+waiting in that key's slot.  At most one flush is scheduled on the UI
+thread at a time, paced to one per frame, and it hands each handler only
+the newest value.  A burst of status reports therefore costs one
+``after`` callback and one widget update per frame instead of one per
+line, and the replaced values are counted as *merged*.  With DEBUG
+logging enabled, a flush logs the counters (:meth:`UICoalescer.stats_line`)
+at most every *log_interval_s* seconds.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRAME_MS = 16
+DEFAULT_LOG_INTERVAL_S = 10.0
+
+Handler = Callable[[Any], None]
+
+
+def _call(fn: Callable[[], None]) -> None:
+    fn()
+
+
+class UICoalescer:
+    """Coalesce high-rate UI updates into one refresh per frame.
+
+    Parameters
+    ----------
+    schedule_fn : callable
+        ``schedule_fn(delay_ms, callback)`` runs *callback* on the UI
+        thread after *delay_ms* (e.g. ``root.after``).
+    frame_ms : int
+        Minimum spacing between two flushes.
+    clock : callable
+        Monotonic time source in seconds (tests inject a fake one).
+    log_interval_s : float
+        Minimum spacing of the DEBUG counter line (0 disables it).
+    """
+
+    def __init__(
+        self,
+        schedule_fn: Callable[[int, Callable[[], None]], Any],
+        frame_ms: int = DEFAULT_FRAME_MS,
+        clock: Callable[[], float] = time.monotonic,
+        log_interval_s: float = DEFAULT_LOG_INTERVAL_S,
+    ):
+        self._schedule = schedule_fn
+        self.frame_ms = max(0, int(frame_ms))
+        self._clock = clock
+        self.log_interval_s = log_interval_s
+        self._last_log: Optional[float] = None
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, Handler] = {}
+        self._slots: Dict[str, Tuple[Optional[Handler], Any]] = {}
+        self._pending = False
+        self._last_flush = float("-inf")
+        self.posted = 0
+        self.merged = 0
+        self.delivered = 0
+        self.flushes = 0
+        self.errors = 0
+        self._merged_by_key: Dict[str, int] = {}
+
+    def register(self, key: str, handler: Handler) -> None:
+        """Call ``handler(value)`` on the UI thread for updates to *key*."""
+        self._handlers[key] = handler
+
+    def post(self, key: str, value: Any = None, handler: Optional[Handler] = None) -> bool:
+        """Store *value* as the newest update for *key* (any thread).
+
+        *handler* overrides the registered one for this update.  Returns
+        True if an older, not yet delivered value was replaced.
+        """
+        with self._lock:
+            merged = key in self._slots
+            self._slots[key] = (handler, value)
+            self.posted += 1
+            if merged:
+                self.merged += 1
+                self._merged_by_key[key] = self._merged_by_key.get(key, 0) + 1
+            if self._pending:
+                return merged
+            self._pending = True
+            elapsed_ms = (self._clock() - self._last_flush) * 1000.0
+        delay = int(min(self.frame_ms, max(0.0, self.frame_ms - elapsed_ms + 0.999)))
+        try:
+            self._schedule(delay, self.flush)
+        except Exception as exc:  # UI torn down or not running
+            logger.debug("UICoalescer: schedule failed: %s", exc)
+            with self._lock:
+                self._pending = False
+        return merged
+
+    def post_call(self, key: str, fn: Callable[[], None]) -> bool:
+        """Run *fn* on the next flush unless a newer call replaces it."""
+        return self.post(key, fn, handler=_call)
+
+    def flush(self) -> int:
+        """Deliver the newest value of every slot (UI thread).
+
+        Returns the number of handlers called.
+        """
+        with self._lock:
+            slots, self._slots = self._slots, {}
+            self._pending = False
+            now = self._last_flush = self._clock()
+            self.flushes += 1
+        calls = 0
+        for key, (handler, value) in slots.items():
+            fn = handler or self._handlers.get(key)
+            if fn is None:
+                continue
+            try:
+                fn(value)
+                calls += 1
+            except Exception as exc:
+                self.errors += 1
+                logger.debug("UICoalescer: handler %r failed: %s", key, exc)
+        self.delivered += calls
+        if self.log_interval_s > 0 and logger.isEnabledFor(logging.DEBUG):
+            if self._last_log is None:
+                self._last_log = now
+            elif now - self._last_log >= self.log_interval_s:
+                self._last_log = now
+                logger.debug("UI updates: %s", self.stats_line())
+        return calls
+
+    @property
+    def pending(self) -> bool:
+        return self._pending
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters; ``merged`` is the number of updates never drawn."""
+        with self._lock:
+            return {
+                "posted": self.posted,
+                "merged": self.merged,
+                "delivered": self.delivered,
+                "flushes": self.flushes,
+                "errors": self.errors,
+                "merged_by_key": dict(self._merged_by_key),
+            }
+
+    def stats_line(self) -> str:
+        """One-line summary of :meth:`stats` for the log."""
+        st = self.stats()
+        by_key = ", ".join(f"{k}={n}" for k, n in sorted(st["merged_by_key"].items()))
+        return (f"posted={st['posted']} delivered={st['delivered']} "
+                f"merged={st['merged']}" + (f" ({by_key})" if by_key else "")
+                + f" flushes={st['flushes']} errors={st['errors']}")
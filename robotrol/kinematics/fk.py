@@ -7,7 +7,7 @@ Ported from tcp_pose_module_v3.py (lines 444-518).
 from __future__ import annotations
 
 import math
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Sequence, Tuple
 
 from robotrol.kinematics.dh_model import DHModel, fallback_dh_rows_from_geom
 
@@ -103,3 +103,80 @@ def fk6_forward_mm(
     tilt = -pitch
 
     return x, y, z, roll, pitch, yaw, tilt
+
+
+def fk6_positions_mm(
+    geom: Dict[str, float],
+    joints_rows: Iterable[Sequence[float]],
+    *,
+    dh_model: DHModel | None = None,
+) -> List[Tuple[float, float, float]]:
+    """Batched position-only forward kinematics.
+
+    Same chain as :func:`fk6_forward_mm`, but the per-row DH constants are
+    computed once for the whole batch and only the TCP position is
+    propagated, which makes it several times cheaper per pose.
+
+    Args:
+        geom: Geometry dict (used for fallback rows if no dh_model).
+        joints_rows: Iterable of post-transformed joint lists (degrees,
+                     DH-row order), e.g. from ``DHModel.apply_post_transform``.
+        dh_model: Optional DHModel instance.
+
+    Returns:
+        List of (X_mm, Y_mm, Z_mm), one per input row.
+    """
+    if dh_model is not None and dh_model.dh_rows:
+        dh_rows = dh_model.dh_rows
+        post = dh_model.post_transform
+    else:
+        dh_rows = fallback_dh_rows_from_geom(geom)
+        post = {}
+    mirror = -1.0 if post.get("mirror_x") else 1.0
+
+    consts = [
+        (
+            math.radians(row["theta_offset_deg"]),
+            math.cos(math.radians(row["alpha_deg"])),
+            math.sin(math.radians(row["alpha_deg"])),
+            float(row["a_mm"]),
+            float(row["d_mm"]),
+        )
+        for row in dh_rows
+    ]
+    cos, sin, rad = math.cos, math.sin, math.radians
+
+    out: List[Tuple[float, float, float]] = []
+    for joints in joints_rows:
+        n_j = len(joints)
+        r00, r01, r02 = 1.0, 0.0, 0.0
+        r10, r11, r12 = 0.0, 1.0, 0.0
+        r20, r21, r22 = 0.0, 0.0, 1.0
+        px = py = pz = 0.0
+        for i, (th0, ca, sa, a, d) in enumerate(consts):
+            th = th0 + (rad(joints[i]) if i < n_j else 0.0)
+            ct, st = cos(th), sin(th)
+            # Local DH column vectors: x=(ct,st,0) y=(-st*ca,ct*ca,sa) z=(st*sa,-ct*sa,ca)
+            yx, yy = -st * ca, ct * ca
+            zx, zy = st * sa, -ct * sa
+            tx, ty = a * ct, a * st
+            px += r00 * tx + r01 * ty + r02 * d
+            py += r10 * tx + r11 * ty + r12 * d
+            pz += r20 * tx + r21 * ty + r22 * d
+            r00, r01, r02 = (
+                r00 * ct + r01 * st,
+                r00 * yx + r01 * yy + r02 * sa,
+                r00 * zx + r01 * zy + r02 * ca,
+            )
+            r10, r11, r12 = (
+                r10 * ct + r11 * st,
+                r10 * yx + r11 * yy + r12 * sa,
+                r10 * zx + r11 * zy + r12 * ca,
+            )
+            r20, r21, r22 = (
+                r20 * ct + r21 * st,
+                r20 * yx + r21 * yy + r22 * sa,
+                r20 * zx + r21 * zy + r22 * ca,
+            )
+        out.append((mirror * px, py, pz))
+    return out
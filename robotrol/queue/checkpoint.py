@@ -0,0 +1,278 @@
+"""
+Resume-from-line checkpoints for the G-Code queue.
+
+While a program runs, the queue records the last acknowledged line and the
+modal state in effect after it (distance mode, units, plane, motion mode,
+feed and last commanded axis positions).  The record is written atomically
+(temp file + ``os.replace``) at a bounded rate, and unconditionally on
+abort, timeout, alarm and completion.
+
+:meth:`ModalState.preamble` turns a saved state back into the handful of
+lines that re-establish it on a freshly reset controller, so a run can be
+continued with ``GCodeQueue.start_run(from_line=N, modal=state)``.
+No tkinter dependency.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from robotrol.config.constants import AXES
+
+
+CHECKPOINT_VERSION = 1
+DEFAULT_MIN_INTERVAL = 1.0  # seconds between periodic checkpoint writes
+
+_WORD_RE = re.compile(r"([A-Z])\s*([-+]?(?:\d+\.?\d*|\.\d+))")
+_COMMENT_RE = re.compile(r"\([^)]*\)|;.*$")
+
+
+# ----------------------------------------------------------------------
+#  Modal state
+# ----------------------------------------------------------------------
+
+@dataclass
+class ModalState:
+    """Subset of the G-code modal state needed to continue a program."""
+
+    distance: int = 90       # 90 = absolute, 91 = incremental
+    units: int = 21          # 20 = inch, 21 = mm
+    plane: int = 17          # 17 / 18 / 19
+    motion: int = 0          # 0 / 1 / 2 / 3
+    feed: Optional[float] = None
+    pos: Dict[str, float] = field(default_factory=dict)
+
+    def update(self, line: str) -> None:
+        """Advance the state by one (executed) program line."""
+        text = _COMMENT_RE.sub("", line).upper()
+        if not text or text.lstrip().startswith("$"):
+            return
+        g_codes: List[float] = []
+        axes: Dict[str, float] = {}
+        for letter, value in _WORD_RE.findall(text):
+            v = float(value)
+            if letter == "G":
+                g_codes.append(v)
+            elif letter == "F":
+                self.feed = v
+            elif letter in AXES:
+                axes[letter] = v
+
+        non_modal = False
+        for g in g_codes:
+            if g in (90, 91):
+                self.distance = int(g)
+            elif g in (20, 21):
+                self.units = int(g)
+            elif g in (17, 18, 19):
+                self.plane = int(g)
+            elif g in (0, 1, 2, 3):
+                self.motion = int(g)
+            elif int(g) in (10, 28, 30, 53, 92):
+                non_modal = True
+
+        if not axes:
+            return
+        if non_modal:
+            # Homing / machine-coordinate / offset moves: position unknown
+            for ax in axes:
+                self.pos.pop(ax, None)
+            return
+        for ax, v in axes.items():
+            if self.distance == 90:
+                self.pos[ax] = v
+            elif ax in self.pos:
+                self.pos[ax] += v
+
+    def preamble(self, restore_position: bool = True) -> List[str]:
+        """Lines that re-establish this state on a reset controller.
+
+        Parameters
+        ----------
+        restore_position : bool
+            Also rapid (absolute) to the last known axis positions, so
+            partial-axis moves that follow start from the right place.
+        """
+        lines = [f"G{self.units} G{self.plane} G90"]
+        if restore_position and self.pos:
+            words = " ".join(
+                f"{ax}{self.pos[ax]:.3f}" for ax in AXES if ax in self.pos
+            )
+            lines.append(f"G0 {words}")
+        if self.distance != 90:
+            lines.append(f"G{self.distance}")
+        motion = f"G{self.motion}"
+        if self.feed is not None:
+            motion += f" F{self.feed:g}"
+        lines.append(motion)
+        return lines
+
+    @classmethod
+    def scan(cls, lines: Iterable[str]) -> "ModalState":
+        """Replay *lines* from the program start."""
+        state = cls()
+        for line in lines:
+            state.update(line)
+        return state
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "distance": self.distance,
+            "units": self.units,
+            "plane": self.plane,
+            "motion": self.motion,
+            "feed": self.feed,
+            "pos": dict(self.pos),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModalState":
+        return cls(
+            distance=int(data.get("distance", 90)),
+            units=int(data.get("units", 21)),
+            plane=int(data.get("plane", 17)),
+            motion=int(data.get("motion", 0)),
+            feed=data.get("feed"),
+            pos={str(k): float(v) for k, v in (data.get("pos") or {}).items()},
+        )
+
+    def copy(self) -> "ModalState":
+        return ModalState.from_dict(self.to_dict())
+
+
+# ----------------------------------------------------------------------
+#  Program identity
+# ----------------------------------------------------------------------
+
+def program_fingerprint(path: Optional[str], lines: Iterable[str] = ()) -> str:
+    """Identify a program so a checkpoint is only applied to the same job.
+
+    File-backed programs are identified by path, size and mtime; queued
+    lines (including lines appended after a file) by their CRC32.
+    """
+    parts = []
+    if path:
+        try:
+            st = os.stat(path)
+            parts.append(f"file:{os.path.abspath(path)}:{st.st_size}:{st.st_mtime_ns}")
+        except OSError:
+            parts.append(f"file:{os.path.abspath(path)}")
+    crc = 0
+    n = 0
+    for line in lines:
+        crc = zlib.crc32(line.encode("utf-8") + b"\n", crc)
+        n += 1
+    if n or not parts:
+        parts.append(f"lines:{n}:{crc:08x}")
+    return "|".join(parts)
+
+
+# ----------------------------------------------------------------------
+#  Checkpoint file
+# ----------------------------------------------------------------------
+
+class QueueCheckpoint:
+    """Rate-limited, atomically written checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        JSON file to write.
+    min_interval : float
+        Minimum seconds between periodic writes (forced writes ignore it).
+    """
+
+    def __init__(self, path: str, min_interval: float = DEFAULT_MIN_INTERVAL):
+        self.path = path
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {}
+        self._dirty = False
+        self._last_write = 0.0
+
+    def begin(
+        self,
+        program: str,
+        total: int,
+        first_line: int = 1,
+        modal: Optional[ModalState] = None,
+    ) -> None:
+        """Start tracking a run of *program* (see :func:`program_fingerprint`)."""
+        with self._lock:
+            self._data = {
+                "version": CHECKPOINT_VERSION,
+                "program": program,
+                "total": total,
+                "first_line": first_line,
+                "line": first_line - 1,
+                "modal": modal.to_dict() if modal is not None else None,
+                "status": "running",
+                "updated": time.time(),
+            }
+            self._dirty = True
+        self.flush()
+
+    def record(self, line_no: int, modal: ModalState) -> None:
+        """Line *line_no* (1-based) was acknowledged; write if due."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._data:
+                return
+            self._data["line"] = line_no
+            self._data["modal"] = modal.to_dict()
+            self._data["updated"] = time.time()
+            self._dirty = True
+            due = now - self._last_write >= self.min_interval
+        if due:
+            self.flush()
+
+    def flush(self, status: Optional[str] = None) -> None:
+        """Write the checkpoint now (optionally setting its *status*)."""
+        with self._lock:
+            if not self._data:
+                return
+            if status is not None:
+                self._data["status"] = status
+                self._dirty = True
+            if not self._dirty:
+                return
+            payload = json.dumps(self._data, separators=(",", ":"))
+            self._dirty = False
+            self._last_write = time.monotonic()
+            try:
+                d = os.path.dirname(self.path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                tmp = self.path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(payload)
+                os.replace(tmp, self.path)
+            except OSError:
+                self._dirty = True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Read the checkpoint file; *None* if missing or unreadable."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            return None
+        return data
+
+    def resumable(self, program: str) -> Optional[Dict[str, Any]]:
+        """Return the saved checkpoint if it belongs to *program* and is unfinished."""
+        data = self.load()
+        if not data or data.get("program") != program:
+            return None
+        if data.get("status") == "finished":
+            return None
+        if int(data.get("line", 0)) >= int(data.get("total", 0)):
+            return None
+        return data
@@ -0,0 +1,178 @@
+"""
+File-backed line source for the G-Code queue.
+
+Maps a program file into memory and indexes its non-blank lines lazily,
+so multi-megabyte programs can be queued without building one Python
+string per line.  The index is two compact ``array('Q')`` offset tables
+that grow in fixed-size chunks as lines are requested.
+"""
+
+import mmap
+import os
+import threading
+from array import array
+from typing import Iterator, Optional
+
+
+INDEX_CHUNK = 1 << 20  # bytes scanned per incremental index step
+
+
+class FileLineSource:
+    """Read-only, randomly accessible view on the lines of a G-Code file.
+
+    Opening is O(1): the file is memory-mapped and nothing is scanned until
+    a line is requested.  Blank lines are skipped (as the in-memory queue
+    does); every other line is returned stripped.
+
+    Parameters
+    ----------
+    path : str
+        Program file to map.
+    temporary : bool
+        Delete the file when the source is closed (generated programs).
+    """
+
+    def __init__(self, path: str, temporary: bool = False):
+        self.path = os.path.abspath(path)
+        self.temporary = temporary
+        self._fh = open(self.path, "rb")
+        self.size = os.fstat(self._fh.fileno()).st_size
+        self._mm: Optional[mmap.mmap] = None
+        if self.size:
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Offsets of non-blank lines: [start, end) excluding the newline
+        self._starts = array("Q")
+        self._ends = array("Q")
+        self._scan_pos = 0
+        self._complete = self.size == 0
+        self._lock = threading.Lock()
+        # One thread scans at a time, outside the lock; the others wait
+        # for its next chunk instead of for the whole scan
+        self._progress = threading.Condition(self._lock)
+        self._scanning = False
+        self._closing = False
+
+    # ------------------------------------------------------------------
+    #  Sequence protocol
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        self._index_until(None)
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if index < 0 or not self._index_until(index):
+            raise IndexError("line index out of range")
+        mm = self._mm
+        if mm is None:
+            raise ValueError("line source is closed")
+        return mm[self._starts[index]:self._ends[index]].decode(
+            "utf-8", errors="replace"
+        ).strip()
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        """Yield lines from index *start* (0-based) to the end."""
+        i = max(0, start)
+        while self._index_until(i):
+            yield self[i]
+            i += 1
+
+    def is_empty(self) -> bool:
+        return not self._index_until(0)
+
+    @property
+    def indexed_count(self) -> int:
+        """Number of lines indexed so far (may be less than ``len()``)."""
+        return len(self._starts)
+
+    @property
+    def fully_indexed(self) -> bool:
+        return self._complete
+
+    def close(self) -> None:
+        """Release the mapping and file handle."""
+        self._closing = True  # a running scan stops after its chunk
+        with self._lock:
+            while self._scanning:
+                self._progress.wait()
+            if self._mm is not None:
+                try:
+                    self._mm.close()
+                except Exception:
+                    pass
+                self._mm = None
+            try:
+                self._fh.close()
+            except Exception:
+                pass
+            self._complete = True
+            if self.temporary:
+                self.temporary = False
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+    # ------------------------------------------------------------------
+    #  Incremental index
+    # ------------------------------------------------------------------
+
+    def _index_until(self, index: Optional[int]) -> bool:
+        """Scan until line *index* is indexed (or to EOF if *None*).
+
+        Returns True if *index* exists.
+        """
+        if index is not None and index < len(self._starts):
+            return True
+        progress = self._progress
+        with progress:
+            while not (self._complete or self._closing) and (
+                index is None or index >= len(self._starts)
+            ):
+                if self._scanning:
+                    progress.wait()
+                    continue
+                self._scanning = True
+                progress.release()
+                try:
+                    self._index_step()
+                finally:
+                    progress.acquire()
+                    self._scanning = False
+                    progress.notify_all()
+        return index is None or index < len(self._starts)
+
+    def _index_step(self) -> None:
+        mm = self._mm
+        if mm is None:
+            self._complete = True
+            return
+        pos = self._scan_pos
+        end = min(pos + INDEX_CHUNK, self.size)
+        if end < self.size:
+            # Only consume whole lines; a chunk ends after its last newline
+            nl = mm.rfind(b"\n", pos, end)
+            if nl < 0:
+                nl = mm.find(b"\n", end)
+                end = self.size if nl < 0 else nl + 1
+            else:
+                end = nl + 1
+
+        starts, ends = self._starts, self._ends
+        off = pos
+        for raw in mm[pos:end].split(b"\n"):
+            n = len(raw)
+            if raw.strip():
+                starts.append(off)
+                ends.append(off + n)
+            off += n + 1
+
+        self._scan_pos = end
+        if end >= self.size:
+            self._complete = True
@@ -4,11 +4,28 @@ G-Code Queue — extracted from Robotrol_FluidNC_v7_3.py (ExecuteApp).
 Manages a list of G-Code lines with a background worker thread
 that sends them sequentially, waiting for ACK between commands.
 Supports pause (Feed Hold), resume, abort, and repeat.
+
+Every run is instrumented by a :class:`~robotrol.queue.metrics.QueueMetrics`
+(TX→ACK latency histogram, throughput, paused/starving time, timeouts and
+errors per line); see :attr:`GCodeQueue.metrics`.
+
+With a ``checkpoint_path`` the queue also persists the last acknowledged
+line and modal state (:mod:`robotrol.queue.checkpoint`), so an aborted or
+alarmed run can be continued with ``start_run(from_line=N)``.
+
+Large programs can be attached as a file-backed source
+(:meth:`GCodeQueue.load_file`) instead of being copied into the list;
+lines enqueued afterwards run after the file.
 """
 
 import threading
 import time
-from typing import Callable, Optional
+from itertools import islice
+from typing import Callable, Iterator, Optional
+
+from robotrol.queue.checkpoint import ModalState, QueueCheckpoint, program_fingerprint
+from robotrol.queue.file_source import FileLineSource
+from robotrol.queue.metrics import QueueMetrics
 
 
 DEFAULT_TIMEOUT = 30.0  # seconds per command
@@ -28,6 +45,14 @@ class GCodeQueue:
         clears internal state without resetting the controller.
     timeout : float
         Per-command ACK timeout in seconds.
+    metrics_path : str, optional
+        JSONL file that receives one summary record per finished run.
+    checkpoint_path : str, optional
+        JSON file for resume checkpoints.  If *None*, no checkpoint is kept.
+    on_progress : callable(line: int, total: int, state: str) -> None, optional
+        Called from the worker thread for every line sent (``"running"``,
+        1-based *line*) and once at the end of a run (``"finished"`` or
+        ``"aborted"``).  Must not block.
     """
 
     def __init__(
@@ -36,20 +61,43 @@ class GCodeQueue:
         on_log: Optional[Callable[[str], None]] = None,
         send_ctrl_x_fn: Optional[Callable[[], None]] = None,
         timeout: float = DEFAULT_TIMEOUT,
+        metrics_path: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        on_progress: Optional[Callable[[int, int, str], None]] = None,
     ):
         self._queue: list[str] = []
+        self._source: Optional[FileLineSource] = None
+        # Bumped on every content change (load, clear, enqueue)
+        self.revision = 0
+        # Replaced sources are closed once no run reads from them any more
+        self._source_lock = threading.Lock()
+        self._run_source: Optional[FileLineSource] = None
+        self._retired: list[FileLineSource] = []
         self.running = False
+        self.current_index = -1  # 0-based index of the line in flight
         self.paused = False
 
         self._send = send_fn
         self._send_ctrl_x = send_ctrl_x_fn
         self._log = on_log or (lambda m: None)
+        self._progress = on_progress or (lambda line, total, state: None)
         self._timeout = timeout
+        self.metrics = QueueMetrics(jsonl_path=metrics_path)
+        self.checkpoint: Optional[QueueCheckpoint] = (
+            QueueCheckpoint(checkpoint_path) if checkpoint_path else None
+        )
 
         # Threading primitives (mirror original worker logic)
         self._run_event = threading.Event()
         self._abort_event = threading.Event()
         self._awaiting_ack = False
+        self._rx_error = False
+        self._abort_reason = "aborted"
+
+        # Resume support (consumed by the worker at the next start)
+        self._start_index = 0
+        self._resume_modal: Optional[ModalState] = None
+        self._restore_position = True
 
         # Repeat support
         self.repeat_enabled = False
@@ -70,49 +118,202 @@ class GCodeQueue:
         if not g:
             return
         self._queue.append(g)
+        self.revision += 1
         self._log(f"Queued: {g}")
 
     def enqueue_many(self, lines: list[str]) -> None:
-        """Append multiple G-Code lines at once."""
-        for ln in lines:
-            self.enqueue(ln)
+        """Append multiple G-Code lines at once (logged as one summary)."""
+        batch = [g for g in (ln.strip() for ln in lines) if g]
+        if not batch:
+            return
+        self._queue.extend(batch)
+        self.revision += 1
+        self._log(f"Queued {len(batch)} line(s)")
+
+    def load_file(self, path: str, temporary: bool = False) -> FileLineSource:
+        """Replace the queue contents with a file-backed program.
+
+        The file is memory-mapped and indexed lazily, so this returns
+        immediately regardless of program size.  A *temporary* file is
+        deleted once the program is replaced and no run reads it.
+        """
+        source = FileLineSource(path, temporary=temporary)
+        self._queue.clear()
+        self._swap_source(source)
+        self.revision += 1
+        self._log(f"Loaded program: {source.path} ({source.size} bytes)")
+        return source
+
+    def replace_from_file(self, path: str, revision: int) -> Optional[FileLineSource]:
+        """Load the generated program at *path* if the queue is unchanged.
+
+        *revision* is :attr:`revision` when the program was derived from
+        the queue (e.g. by the optimizer in a worker thread).  Returns
+        None, and leaves *path* alone, if lines were loaded, cleared or
+        added since, or a run is active; otherwise *path* is loaded as a
+        temporary file.
+        """
+        if self.running or revision != self.revision:
+            return None
+        return self.load_file(path, temporary=True)
 
     def clear(self) -> None:
         """Remove all pending lines from the queue."""
         self._queue.clear()
+        self._swap_source(None)
+        self.revision += 1
         self._log("Queue cleared.")
 
     def is_empty(self) -> bool:
-        return len(self._queue) == 0
+        source = self._source
+        return not self._queue and (source is None or source.is_empty())
 
     def count(self) -> int:
-        return len(self._queue)
+        source = self._source
+        return (len(source) if source is not None else 0) + len(self._queue)
+
+    def known_count(self) -> int:
+        """Like :meth:`count`, but never forces a full index of a file.
+
+        While a file-backed program is still being indexed this is a lower
+        bound that grows as lines are indexed.
+        """
+        source = self._source
+        if source is None:
+            return len(self._queue)
+        if source.fully_indexed:
+            return len(source) + len(self._queue)
+        return source.indexed_count + len(self._queue)
+
+    def _swap_source(self, source: Optional[FileLineSource]) -> None:
+        """Attach *source* and close the previous one.
+
+        A source the worker is still reading is closed when its run ends.
+        """
+        with self._source_lock:
+            old, self._source = self._source, source
+            if old is None or old is source:
+                return
+            if old is self._run_source:
+                self._retired.append(old)
+                return
+        old.close()
+
+    def _take_run_source(self) -> Optional[FileLineSource]:
+        """Snapshot the current source for a run (worker thread)."""
+        with self._source_lock:
+            self._run_source = self._source
+            return self._source
+
+    def _release_run_source(self) -> None:
+        """End of a run: close sources that were replaced while it ran."""
+        with self._source_lock:
+            self._run_source = None
+            retired, self._retired = self._retired, []
+        for s in retired:
+            s.close()
+
+    @property
+    def source(self) -> Optional[FileLineSource]:
+        """The file-backed program, if one is loaded."""
+        return self._source
 
     @property
     def lines(self) -> list[str]:
-        """Return a shallow copy of the current queue contents."""
-        return list(self._queue)
+        """Return a shallow copy of the current queue contents.
+
+        Materialises file-backed programs; prefer :meth:`iter_lines` or
+        :meth:`line_at` for large files.
+        """
+        return list(self.iter_lines())
+
+    def iter_lines(
+        self, start: int = 0, stop: Optional[int] = None, wait: bool = True,
+    ) -> Iterator[str]:
+        """Yield queued lines from 0-based index *start* up to *stop*.
+
+        With ``wait=False`` nothing is indexed: lines past the indexed part
+        of a file that is still being indexed are left out (GUI thread).
+        """
+        source = self._source
+        if source is None:
+            return iter(self._queue[start:stop])
+        if not wait and not source.fully_indexed:
+            avail = source.indexed_count
+            stop = avail if stop is None else min(stop, avail)
+
+        def _iter() -> Iterator[str]:
+            yield from source.iter_from(start)
+            # Fully indexed at this point, so len() is cheap
+            yield from self._queue[max(0, start - len(source)):]
+
+        if stop is None:
+            return _iter()
+        return islice(_iter(), max(0, stop - start))
+
+    def line_at(self, index: int) -> str:
+        """Return the line at 0-based *index* (random access)."""
+        source = self._source
+        if source is None:
+            return self._queue[index]
+        if index < 0:
+            index += self.count()
+        if index < 0:
+            raise IndexError("line index out of range")
+        try:
+            return source[index]
+        except IndexError:
+            return self._queue[index - len(source)]
 
     # ------------------------------------------------------------------
     #  Run control
     # ------------------------------------------------------------------
 
-    def start_run(self) -> None:
-        """Start (or restart) queue execution from the beginning."""
-        if not self._queue:
+    def start_run(
+        self,
+        from_line: int = 1,
+        modal: Optional[ModalState] = None,
+        restore_position: bool = True,
+    ) -> None:
+        """Start (or restart) queue execution.
+
+        Parameters
+        ----------
+        from_line : int
+            1-based line to start at.  Values > 1 first send a short
+            preamble that re-establishes the modal state of the skipped
+            lines.
+        modal : ModalState, optional
+            Modal state in effect before *from_line* (e.g. from a saved
+            checkpoint).  If *None*, it is rebuilt by replaying the
+            skipped lines.
+        restore_position : bool
+            Include a rapid move back to the last known position in the
+            preamble.
+        """
+        if self.is_empty():
             self._log("Queue is empty.")
             return
+        # The upper bound is checked by the worker: counting the lines of
+        # a file still being indexed would block the caller (GUI thread)
+        self._start_index = max(0, from_line - 1)
+        self._resume_modal = modal
+        self._restore_position = restore_position
         self._abort_event.clear()
         self.paused = False
         self._repeat_count = 0
         self.running = True
-        self._log("RUN started")
+        if self._start_index:
+            self._log(f"RUN started from line {from_line}")
+        else:
+            self._log("RUN started")
         self._run_event.set()
 
     def pause_run(self) -> None:
         """Pause execution (sends Feed Hold '!' to controller)."""
         self._send("!")
         self.paused = True
+        self.metrics.on_pause()
         self._log("Paused (Feed Hold sent)")
 
     def resume_run(self) -> None:
@@ -122,6 +323,7 @@ class GCodeQueue:
             return
         self._send("~")
         self.paused = False
+        self.metrics.on_resume()
         self._log("Resume (~) sent")
 
     def stop_abort(self) -> None:
@@ -146,13 +348,46 @@ class GCodeQueue:
 
     def notify_ack(self) -> None:
         """Notify that the controller sent 'ok' (ACK)."""
+        self.metrics.on_ack(time.monotonic())
         self._awaiting_ack = False
 
     def notify_error(self, msg: str = "") -> None:
         """Notify that the controller sent an error response."""
+        self.metrics.on_error(time.monotonic())
         self._log(f"RX error: {msg}")
+        self._rx_error = True
         self._awaiting_ack = False
 
+    def notify_alarm(self, msg: str = "") -> None:
+        """Notify that the controller entered ALARM: stop the run.
+
+        The controller discards further motion while alarmed, so the run is
+        stopped without a soft reset and the checkpoint is written; the job
+        can be continued later with ``start_run(from_line=...)``.
+        """
+        if not self.running:
+            return
+        self._log(f"ALARM during run: {msg} — stopping queue")
+        self._abort_reason = "alarm"
+        self._abort_event.set()
+        self._run_event.clear()
+        self.paused = False
+        self.running = False
+        self._awaiting_ack = False
+
+    def resume_point(self) -> Optional[dict]:
+        """Saved checkpoint for the current queue contents, if resumable.
+
+        Returns the checkpoint dict (``line`` is the last acknowledged
+        1-based line, ``modal`` the state after it) or *None*.
+        """
+        if self.checkpoint is None or self.is_empty():
+            return None
+        return self.checkpoint.resumable(self._fingerprint())
+
+    def _fingerprint(self) -> str:
+        return self._fingerprint_of(self._source, list(self._queue))
+
     # ------------------------------------------------------------------
     #  Worker thread (mirrors original ExecuteApp.worker)
     # ------------------------------------------------------------------
@@ -164,54 +399,102 @@ class GCodeQueue:
             if self._abort_event.is_set():
                 time.sleep(0.05)
                 continue
-            if not self._queue:
+            if self.is_empty():
                 time.sleep(0.05)
                 continue
 
-            lines = list(self._queue)
-            self._log(f"Starting program execution ({len(lines)} line(s))")
+            # Snapshot: the file source is immutable, the list is copied
+            source = self._take_run_source()
+            extra = list(self._queue)
+            total = (len(source) if source is not None else 0) + len(extra)
+            start = self._start_index
+            self._start_index = 0
+            if start >= total:
+                self._log(f"Start line {start + 1} is beyond the end of the queue.")
+                self._resume_modal = None
+                self._run_event.clear()
+                self.running = False
+                self._release_run_source()
+                continue
             self._awaiting_ack = False
+            self._abort_reason = "aborted"
+
+            if source is not None:
+                lines = _chain_lines(source.iter_from(start),
+                                     extra[max(0, start - len(source)):])
+            else:
+                lines = iter(extra[start:])
+
+            modal: Optional[ModalState] = None
+            ckpt = self.checkpoint
+            if start or ckpt is not None:
+                modal = self._resume_modal
+                if modal is None:
+                    modal = ModalState.scan(self._iter_snapshot(source, extra, start))
+                modal = modal.copy()
+            self._resume_modal = None
+
+            if start:
+                self._log(f"Starting program execution at line {start + 1} "
+                          f"({total} line(s))")
+            else:
+                self._log(f"Starting program execution ({total} line(s))")
+            if ckpt is not None:
+                ckpt.begin(self._fingerprint_of(source, extra), total,
+                           first_line=start + 1, modal=modal)
+            self.metrics.begin_run(total - start)
+
+            if start and modal is not None:
+                for g in modal.preamble(self._restore_position):
+                    self._log(f"[resume] TX: {g}")
+                    if self._transmit(g) in ("abort", "timeout"):
+                        self._log("Resume preamble failed")
+                        self._abort_event.set()
+                        break
 
-            for i, g in enumerate(lines, start=1):
+            for i, g in enumerate(lines, start=start + 1):
+                self.current_index = i - 1
                 # Pause loop
                 while self.paused and not self._abort_event.is_set():
                     time.sleep(0.05)
                 if self._abort_event.is_set() or not self._run_event.is_set():
                     break
 
-                self._awaiting_ack = True
-                self._log(f"[{i}/{len(lines)}] TX: {g}")
-
-                try:
-                    self._send(g)
-                except Exception as e:
-                    self._log(f"TX error: {e}")
-                    self._awaiting_ack = False
-                    continue
-
-                # Wait for ACK with timeout
-                deadline = time.time() + self._timeout
-                while time.time() < deadline:
-                    if self._abort_event.is_set() or not self._run_event.is_set():
-                        self._awaiting_ack = False
-                        break
-                    if not self._awaiting_ack:
-                        break
-                    time.sleep(0.02)
-                else:
+                self._log(f"[{i}/{total}] TX: {g}")
+                self.metrics.on_tx(i)
+                self._progress(i, total, "running")
+                result = self._transmit(g)
+                if result == "ok" and modal is not None:
+                    modal.update(g)
+                    if ckpt is not None:
+                        ckpt.record(i, modal)
+                elif result == "timeout":
                     self._log(f"Timeout on: {g}")
-                    self._awaiting_ack = False
+                    self.metrics.on_timeout(i)
+                    if ckpt is not None:
+                        ckpt.flush()
 
             # End / abort / repeat
             if self._abort_event.is_set():
+                self._log_run_summary(self.metrics.end_run(self._abort_reason))
+                self._progress(self.current_index + 1, total, "aborted")
+                if ckpt is not None:
+                    ckpt.flush(self._abort_reason)
                 self._log("Program execution aborted")
                 self._abort_event.clear()
                 self._run_event.clear()
                 self.paused = False
                 self.running = False
                 self._awaiting_ack = False
+                self.current_index = -1
+                self._release_run_source()
                 continue
 
+            self._log_run_summary(self.metrics.end_run("finished"))
+            self._progress(total, total, "finished")
+            if ckpt is not None:
+                ckpt.flush("finished")
+
             if self.repeat_enabled and not self._abort_event.is_set():
                 self._repeat_count += 1
                 total = max(1, self.repeat_times)
@@ -225,4 +508,63 @@ class GCodeQueue:
             self.paused = False
             self.running = False
             self._awaiting_ack = False
+            self.current_index = -1
+            self._release_run_source()
             self._log("Queue finished — ready for next start")
+
+    def _transmit(self, g: str) -> str:
+        """Send one line and wait for its response.
+
+        Returns ``"ok"``, ``"error"``, ``"timeout"``, ``"abort"`` or
+        ``"tx_error"``.
+        """
+        self._rx_error = False
+        self._awaiting_ack = True
+        try:
+            self._send(g)
+        except Exception as e:
+            self._log(f"TX error: {e}")
+            self._awaiting_ack = False
+            return "tx_error"
+
+        # Wait for ACK with timeout
+        deadline = time.time() + self._timeout
+        while time.time() < deadline:
+            if self._abort_event.is_set() or not self._run_event.is_set():
+                self._awaiting_ack = False
+                return "abort"
+            if not self._awaiting_ack:
+                return "error" if self._rx_error else "ok"
+            time.sleep(0.02)
+        self._awaiting_ack = False
+        return "timeout"
+
+    @staticmethod
+    def _iter_snapshot(
+        source: Optional[FileLineSource], extra: list[str], stop: int
+    ) -> Iterator[str]:
+        """Yield the first *stop* lines of a worker snapshot."""
+        head = source.iter_from(0) if source is not None else iter(())
+        return islice(_chain_lines(head, extra), stop)
+
+    @staticmethod
+    def _fingerprint_of(source: Optional[FileLineSource], extra: list[str]) -> str:
+        return program_fingerprint(source.path if source is not None else None, extra)
+
+    def _log_run_summary(self, m: dict) -> None:
+        rtt = m["rtt_ms"]
+        rtt_txt = (
+            f"RTT mean {rtt['mean']:.1f} / p95 {rtt['p95']:g} ms"
+            if rtt["count"] else "no ACKs"
+        )
+        self._log(
+            f"Run {m['status']}: {m['acked']}/{m['total']} ack'd in "
+            f"{m['duration_s']:.1f} s ({m['lines_per_s']:.1f} lines/s), {rtt_txt}, "
+            f"paused {m['paused_s']:.1f} s, starving {m['starving_s']:.2f} s, "
+            f"timeouts {sum(m['timeouts'].values())}, errors {sum(m['errors'].values())}"
+        )
+
+
+def _chain_lines(head: Iterator[str], tail: list[str]) -> Iterator[str]:
+    yield from head
+    yield from tail
@@ -0,0 +1,259 @@
+"""
+Run metrics for the G-Code queue.
+
+Collects, per run, the TX→ACK latency of every line (fixed log-spaced
+histogram), throughput, time spent paused or starving (controller idle
+while the host prepares the next line) and timeouts/errors keyed by line
+number.  Per line the cost is a couple of ``time.monotonic()`` calls and
+one ``bisect``, so it can stay enabled in production.
+
+A compact summary of each finished run can be appended to a JSONL file.
+No tkinter dependency.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+
+# Histogram bucket upper edges in ms (roughly 1-2-5 log spacing); the
+# last bucket collects everything above the final edge.
+RTT_BUCKETS_MS = (
+    1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 200.0, 500.0,
+    1000.0, 2000.0, 5000.0, 10000.0, 30000.0,
+)
+
+
+class QueueMetrics:
+    """Per-run instrumentation for :class:`~robotrol.queue.gcode_queue.GCodeQueue`.
+
+    The queue worker calls :meth:`begin_run`, :meth:`on_tx`,
+    :meth:`on_timeout` and :meth:`end_run`; the serial RX path calls
+    :meth:`on_ack` / :meth:`on_error`; pause/resume calls
+    :meth:`on_pause` / :meth:`on_resume`.
+
+    Parameters
+    ----------
+    jsonl_path : str, optional
+        If set, :meth:`end_run` appends the run summary to this file.
+    """
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self.jsonl_path = jsonl_path
+        self._lock = threading.Lock()
+        self._last: Optional[Dict[str, Any]] = None
+        self._reset(total=0)
+        self.active = False
+
+    def _reset(self, total: int) -> None:
+        self.total = total
+        self.started_wall = time.time()
+        self._t0 = time.monotonic()
+        self._t_end: Optional[float] = None
+        self.hist: List[int] = [0] * (len(RTT_BUCKETS_MS) + 1)
+        self.rtt_count = 0
+        self.rtt_sum_ms = 0.0
+        self.rtt_min_ms = float("inf")
+        self.rtt_max_ms = 0.0
+        self.lines_sent = 0
+        self.lines_acked = 0
+        self.starving_s = 0.0
+        self.timeouts: Dict[int, int] = {}
+        self.errors: Dict[int, int] = {}
+        # Pause accounting: accumulated total plus the open interval
+        self._paused_total = 0.0
+        self._pause_start: Optional[float] = None
+        # Line in flight
+        self._tx_line = 0
+        self._tx_t: Optional[float] = None
+        self._tx_paused = 0.0
+        self._ack_t: Optional[float] = None
+        self._ack_paused = 0.0
+
+    # ------------------------------------------------------------------
+    #  Hooks
+    # ------------------------------------------------------------------
+
+    def begin_run(self, total: int) -> None:
+        """Start collecting a new run of *total* lines."""
+        with self._lock:
+            self._reset(total)
+            self.active = True
+
+    def extend_run(self, n: int) -> None:
+        """*n* more lines were appended to the running program."""
+        with self._lock:
+            self.total += n
+
+    def on_tx(self, line_no: int) -> None:
+        """Line *line_no* (1-based) is about to be sent."""
+        now = time.monotonic()
+        with self._lock:
+            paused = self._paused_at(now)
+            if self._ack_t is not None:
+                # Gap between the previous ACK and this TX, minus pauses
+                gap = (now - self._ack_t) - (paused - self._ack_paused)
+                if gap > 0:
+                    self.starving_s += gap
+            self._ack_t = None
+            self._tx_line = line_no
+            self._tx_t = now
+            self._tx_paused = paused
+            self.lines_sent += 1
+
+    def on_ack(self, t: Optional[float] = None) -> None:
+        """Controller acknowledged the line in flight (``ok``).
+
+        *t* is the ``time.monotonic()`` receive timestamp; defaults to now.
+        """
+        now = time.monotonic() if t is None else t
+        with self._lock:
+            if self._complete_locked(now):
+                self.lines_acked += 1
+
+    def on_error(self, t: Optional[float] = None) -> None:
+        """Controller answered the line in flight with ``error:``."""
+        now = time.monotonic() if t is None else t
+        with self._lock:
+            line_no = self._tx_line
+            # An error response still ends the round trip
+            if self._complete_locked(now) and line_no:
+                self.errors[line_no] = self.errors.get(line_no, 0) + 1
+
+    def on_timeout(self, line_no: int) -> None:
+        """No response for line *line_no* within the queue timeout."""
+        now = time.monotonic()
+        with self._lock:
+            self.timeouts[line_no] = self.timeouts.get(line_no, 0) + 1
+            self._tx_t = None
+            self._ack_t = now
+            self._ack_paused = self._paused_at(now)
+
+    def on_pause(self) -> None:
+        with self._lock:
+            if self._pause_start is None:
+                self._pause_start = time.monotonic()
+
+    def on_resume(self) -> None:
+        with self._lock:
+            self._close_pause(time.monotonic())
+
+    def end_run(self, status: str = "finished") -> Dict[str, Any]:
+        """Finish the run, append it to the JSONL file and return the summary."""
+        with self._lock:
+            now = time.monotonic()
+            self._close_pause(now)
+            self._t_end = now
+            self.active = False
+            summary = self._summary_locked(status)
+            self._last = summary
+        if self.jsonl_path:
+            try:
+                d = os.path.dirname(self.jsonl_path)
+                if d:
+                    os.makedirs(d, exist_ok=True)
+                with open(self.jsonl_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(summary, separators=(",", ":")) + "\n")
+            except OSError:
+                pass
+        return summary
+
+    # ------------------------------------------------------------------
+    #  Queries
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Snapshot of the current (or most recent) run."""
+        with self._lock:
+            if not self.active and self._last is not None:
+                return dict(self._last)
+            return self._summary_locked("running" if self.active else "idle")
+
+    @property
+    def last_run(self) -> Optional[Dict[str, Any]]:
+        """Summary of the most recently finished run, if any."""
+        return self._last
+
+    def percentile_ms(self, q: float) -> Optional[float]:
+        """Approximate RTT percentile (bucket upper edge), *q* in 0..100."""
+        with self._lock:
+            return self._percentile_locked(q)
+
+    # ------------------------------------------------------------------
+    #  Internal helpers
+    # ------------------------------------------------------------------
+
+    def _complete_locked(self, now: float) -> bool:
+        """Record the RTT of the line in flight; False if none was pending."""
+        if self._tx_t is None:
+            return False
+        paused = self._paused_at(now)
+        rtt_ms = max(0.0, ((now - self._tx_t) - (paused - self._tx_paused)) * 1000.0)
+        self.hist[bisect_left(RTT_BUCKETS_MS, rtt_ms)] += 1
+        self.rtt_count += 1
+        self.rtt_sum_ms += rtt_ms
+        if rtt_ms < self.rtt_min_ms:
+            self.rtt_min_ms = rtt_ms
+        if rtt_ms > self.rtt_max_ms:
+            self.rtt_max_ms = rtt_ms
+        self._tx_t = None
+        self._ack_t = now
+        self._ack_paused = paused
+        return True
+
+    def _paused_at(self, now: float) -> float:
+        if self._pause_start is None:
+            return self._paused_total
+        return self._paused_total + (now - self._pause_start)
+
+    def _close_pause(self, now: float) -> None:
+        if self._pause_start is not None:
+            self._paused_total += now - self._pause_start
+            self._pause_start = None
+
+    def _percentile_locked(self, q: float) -> Optional[float]:
+        if not self.rtt_count:
+            return None
+        rank = max(1, int(round(self.rtt_count * q / 100.0)))
+        seen = 0
+        for i, n in enumerate(self.hist):
+            seen += n
+            if seen >= rank:
+                if i < len(RTT_BUCKETS_MS):
+                    return min(RTT_BUCKETS_MS[i], self.rtt_max_ms)
+                return self.rtt_max_ms
+        return self.rtt_max_ms
+
+    def _summary_locked(self, status: str) -> Dict[str, Any]:
+        end = self._t_end if self._t_end is not None else time.monotonic()
+        duration = max(0.0, end - self._t0)
+        paused = self._paused_at(end)
+        active = max(0.0, duration - paused)
+        return {
+            "started": round(self.started_wall, 3),
+            "status": status,
+            "total": self.total,
+            "sent": self.lines_sent,
+            "acked": self.lines_acked,
+            "duration_s": round(duration, 3),
+            "lines_per_s": round(self.lines_acked / active, 2) if active > 0 else 0.0,
+            "paused_s": round(paused, 3),
+            "starving_s": round(self.starving_s, 3),
+            "rtt_ms": {
+                "count": self.rtt_count,
+                "mean": round(self.rtt_sum_ms / self.rtt_count, 3) if self.rtt_count else None,
+                "min": round(self.rtt_min_ms, 3) if self.rtt_count else None,
+                "max": round(self.rtt_max_ms, 3) if self.rtt_count else None,
+                "p50": self._percentile_locked(50),
+                "p95": self._percentile_locked(95),
+                "p99": self._percentile_locked(99),
+            },
+            "hist_edges_ms": list(RTT_BUCKETS_MS),
+            "hist": list(self.hist),
+            # JSON object keys are strings; keep line numbers explicit
+            "timeouts": {str(k): v for k, v in sorted(self.timeouts.items())},
+            "errors": {str(k): v for k, v in sorted(self.errors.items())},
+        }
@@ -0,0 +1,327 @@
+"""
+Asyncio layer over a line-oriented controller connection.
+
+:class:`AsyncController` wraps anything with ``send_line(str)`` and a
+``listeners`` list of ``cb(line)`` callbacks — a
+:class:`~robotrol.serial.client.SerialClient` or a
+:class:`~robotrol.serial.pool.PooledController` — and turns the RX stream
+into awaitables on one event loop:
+
+* ``await ctl.send(line)`` resolves when the controller acknowledges the
+  line (``ok``) and raises :class:`ControllerError` on ``error:N`` or an
+  alarm;
+* ``await ctl.wait_state("Idle")`` resolves on the first status report
+  after the last acknowledgement that is in one of the given states;
+* ``async for status in ctl.statuses()`` yields parsed status reports;
+* ``await ctl.run_program(lines)`` streams a program with the same
+  send-and-wait flow control and metrics as the threaded queue.
+
+:class:`BlockingController` runs an :class:`AsyncController` on a private
+loop thread for worker threads that are not asyncio code (the GUI
+pick-and-place sequences): ``wait_idle()`` blocks until the motion sent
+so far has finished.
+
+Received lines are handed to the loop with ``call_soon_threadsafe``, so
+waiting costs nothing until the reply arrives instead of a 50 ms sleep
+poll.  Acknowledgements are matched to sends in order, so lines sent
+through other paths while an ``await send()`` is pending would be
+miscounted.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from robotrol.queue.metrics import QueueMetrics
+from robotrol.serial.protocol import parse_status_line
+
+
+class ControllerError(RuntimeError):
+    """The controller rejected a line (``error:N``) or raised an alarm."""
+
+    def __init__(self, reply: str, line: str = ""):
+        super().__init__(f"{reply} ({line})" if line else reply)
+        self.reply = reply
+        self.line = line
+
+
+class AsyncController:
+    """Awaitable sends, state waits and status streams for one controller.
+
+    Parameters
+    ----------
+    client : object
+        Connection with ``send_line(str)`` and a ``listeners`` list.
+    loop : asyncio.AbstractEventLoop, optional
+        Loop that owns the futures (default: the running loop).
+    requery_interval : float
+        While :meth:`wait_state` waits, a status query is sent whenever no
+        report arrived for this many seconds (the poller normally answers
+        sooner).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        requery_interval: float = 0.2,
+    ):
+        self.client = client
+        self.loop = loop or asyncio.get_running_loop()
+        self.requery_interval = requery_interval
+        self.status: Optional[Dict[str, Any]] = None
+        self.status_t = 0.0
+        self.last_ack_t = 0.0
+        self._pending: Deque[Tuple[asyncio.Future, str]] = deque()
+        self._status_event = asyncio.Event()
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._state_waiters = 0
+        self._closed = False
+        client.listeners.append(self._on_line_threadsafe)
+
+    def close(self) -> None:
+        """Detach from the client and fail pending sends."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.client.listeners.remove(self._on_line_threadsafe)
+        except ValueError:
+            pass
+        self._fail_all(ControllerError("closed"))
+
+    async def __aenter__(self) -> "AsyncController":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    #  RX (client thread -> loop)
+    # ------------------------------------------------------------------
+
+    def _on_line_threadsafe(self, line: str) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._on_line, line, time.monotonic())
+        except RuntimeError:
+            pass  # loop closed
+
+    def _on_line(self, line: str, t: float) -> None:
+        if line == "ok" or line.startswith("error:"):
+            self.last_ack_t = t
+            if self._state_waiters:
+                # An ok can mean the motion ended (G4 sync): ask right away
+                self.request_status()
+            if self._pending:
+                fut, sent = self._pending.popleft()
+                # A send that timed out or was cancelled still owns this reply
+                if not fut.done():
+                    if line == "ok":
+                        fut.set_result(line)
+                    else:
+                        fut.set_exception(ControllerError(line, sent))
+        elif line.startswith("ALARM"):
+            self._fail_all(ControllerError(line))
+        elif line.startswith("<"):
+            status = parse_status_line(line)
+            self.status = status
+            self.status_t = t
+            self._status_event.set()
+            self._status_event = asyncio.Event()
+            for q in self._subscribers:
+                if q.full():
+                    q.get_nowait()  # slow consumer: drop the oldest report
+                q.put_nowait(status)
+
+    def _fail_all(self, exc: Exception) -> None:
+        while self._pending:
+            fut, _ = self._pending.popleft()
+            if not fut.done():
+                fut.set_exception(exc)
+
+    # ------------------------------------------------------------------
+    #  Commands
+    # ------------------------------------------------------------------
+
+    async def send(self, line: str, timeout: Optional[float] = None) -> str:
+        """Send *line* and wait for its ``ok``.
+
+        Raises
+        ------
+        ControllerError
+            On ``error:N``, an alarm, or :meth:`close` while waiting.
+        asyncio.TimeoutError
+            If no reply arrives within *timeout* seconds.
+        """
+        if self._closed:
+            raise ControllerError("closed", line)
+        text = line.strip()
+        fut = self.loop.create_future()
+        self._pending.append((fut, text))
+        self.client.send_line(text)
+        if timeout is None:
+            return await fut
+        return await asyncio.wait_for(fut, timeout)
+
+    def send_realtime(self, char: str) -> None:
+        """Send a real-time command (``!``, ``~``, ``?``); no reply expected."""
+        self.client.send_line(char)
+
+    def request_status(self) -> None:
+        query = getattr(self.client, "status_query_line", None)
+        self.client.send_line(query() if query is not None else "?")
+
+    async def wait_state(self, *states: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a status report in one of *states* (default ``"Idle"``).
+
+        Only reports received after the last acknowledgement count, so
+        ``await send("G1 ...")`` followed by ``await wait_state("Idle")``
+        waits for that move to finish instead of returning the stale
+        pre-move report.  ``"Hold"`` matches ``"Hold:0"`` and ``"Hold:1"``.
+        Every acknowledgement received while waiting triggers a status
+        query, so a wait ended by an ``ok`` costs one round trip rather
+        than a poll interval.
+        """
+        wanted = states or ("Idle",)
+        since = self.last_ack_t
+
+        def matches(st: Optional[Dict[str, Any]]) -> bool:
+            state = (st or {}).get("state") or ""
+            return state.split(":")[0] in wanted or state in wanted
+
+        async def _wait() -> Dict[str, Any]:
+            while True:
+                if self.status_t > since and matches(self.status):
+                    return self.status  # type: ignore[return-value]
+                event = self._status_event
+                try:
+                    await asyncio.wait_for(event.wait(), self.requery_interval)
+                except asyncio.TimeoutError:
+                    self.request_status()
+
+        if self.status_t <= since:
+            self.request_status()
+        self._state_waiters += 1
+        try:
+            if timeout is None:
+                return await _wait()
+            return await asyncio.wait_for(_wait(), timeout)
+        finally:
+            self._state_waiters -= 1
+
+    async def statuses(self, maxsize: int = 64) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every status report from now on (oldest dropped if slow)."""
+        q: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._subscribers.add(q)
+        try:
+            while True:
+                yield await q.get()
+        finally:
+            self._subscribers.discard(q)
+
+    async def run_program(
+        self,
+        lines: Iterable[str],
+        line_timeout: Optional[float] = 10.0,
+        stop_on_error: bool = False,
+        metrics: Optional[QueueMetrics] = None,
+    ) -> Dict[str, Any]:
+        """Stream *lines* with send-and-wait flow control; return the run summary.
+
+        Errors are counted per line (as in the threaded queue) unless
+        *stop_on_error*; an alarm ends the run with status ``"alarm"``.
+        """
+        program: List[str] = [s for s in (l.strip() for l in lines) if s and not s.startswith(";")]
+        m = metrics or QueueMetrics()
+        m.begin_run(len(program))
+        status = "finished"
+        for i, g in enumerate(program, start=1):
+            m.on_tx(i)
+            try:
+                await self.send(g, timeout=line_timeout)
+                m.on_ack(self.last_ack_t)
+            except asyncio.TimeoutError:
+                m.on_timeout(i)
+            except ControllerError as e:
+                if e.reply.startswith("error:"):
+                    m.on_error(self.last_ack_t)
+                    if stop_on_error:
+                        status = "error"
+                        break
+                else:
+                    status = "alarm" if e.reply.startswith("ALARM") else "aborted"
+                    break
+            except asyncio.CancelledError:
+                m.end_run("aborted")
+                raise
+        return m.end_run(status)
+
+
+class BlockingController:
+    """Blocking :class:`AsyncController` calls for plain worker threads.
+
+    Parameters
+    ----------
+    client : object
+        Connection with ``send_line(str)`` and a ``listeners`` list.
+    requery_interval : float
+        Passed to :class:`AsyncController`.
+
+    The methods may be called from any thread except the private loop
+    thread; timeouts raise :class:`asyncio.TimeoutError`.
+    """
+
+    def __init__(self, client: Any, requery_interval: float = 0.2):
+        self.client = client
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="aio-controller", daemon=True)
+        self._thread.start()
+
+        async def make() -> AsyncController:
+            return AsyncController(client, requery_interval=requery_interval)
+
+        self.ctl = self._call(make())
+
+    def _call(self, coro: Any, timeout: Optional[float] = None) -> Any:
+        if timeout is not None:
+            coro = asyncio.wait_for(coro, timeout)
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def wait_state(self, *states: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Blocking :meth:`AsyncController.wait_state`."""
+        return self._call(self.ctl.wait_state(*states), timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until all motion sent so far has finished; return the status.
+
+        Sends ``G4 P0``, which the controller only acknowledges once its
+        planner is empty, then waits for the next ``Idle`` report, so a
+        report from before the last move was accepted cannot end the wait.
+        A controller that rejects ``G4`` (``error:N``) falls back to the
+        state wait alone; an alarm raises :class:`ControllerError`.
+        """
+        async def _wait() -> Dict[str, Any]:
+            try:
+                await self.ctl.send("G4 P0")
+            except ControllerError as e:
+                if not e.reply.startswith("error:"):
+                    raise
+            return await self.ctl.wait_state("Idle")
+
+        return self._call(_wait(), timeout)
+
+    def close(self) -> None:
+        """Detach from the client and stop the loop thread."""
+        if self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self.ctl.close)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1.0)
+        if not self._thread.is_alive():
+            self._loop.close()
@@ -2,10 +2,16 @@
 Robotrol v2.0 — Serial client.
 
 Extracted from Robotrol_FluidNC_v7_3.py lines 208-563 (class SerialClient).
-Handles serial connection, RX worker thread, listener dispatch.
+Handles serial connection, TX writer thread
+(:mod:`robotrol.serial.tx_writer`), RX worker thread, listener dispatch,
+adaptive status polling (:mod:`robotrol.serial.status_poller`) and
+optional session recording (:mod:`robotrol.serial.session_log`).
+TX/RX traces are logged at DEBUG level on the ``robotrol.serial.client``
+logger and cost one level check per line when disabled.
 No tkinter dependency.
 """
 
+import logging
 import threading
 import time
 
@@ -13,6 +19,13 @@ import serial
 import serial.tools.list_ports
 
 from robotrol.config.constants import AXES, DEFAULT_ENDSTOP_LIMITS
+from robotrol.serial.session_log import SessionRecorder
+from robotrol.serial.status_poller import StatusPoller
+from robotrol.serial.tx_writer import REALTIME_CHARS, TxWriter, batch_bytes_for
+
+logger = logging.getLogger(__name__)
+
+WRITE_TIMEOUT = 0.2  # s, serial.Serial write_timeout
 
 
 class SerialClient:
@@ -48,8 +61,6 @@ class SerialClient:
         },
     }
 
-    DEBUG_SERIAL = True
-
     def __init__(self):
         self.ser = None
 
@@ -69,6 +80,18 @@ class SerialClient:
         self._warned_not_connected = False
         self.last_status = None
 
+        # Session recording (TX/RX lines with timestamps)
+        self.recorder = None
+
+        # All port writes go through the writer thread
+        self.writer = None
+
+        # Called with a message when lines were dropped or not written
+        self.on_tx_error = None
+
+        # Status queries at a machine-state dependent rate
+        self.poller = StatusPoller(self._send_status_query)
+
     # ----------------------------------------------------------------
     #  Select backend (FluidNC / GRBL / custom)
     # ----------------------------------------------------------------
@@ -78,8 +101,7 @@ class SerialClient:
             name = "fluidnc"
         self.backend_type = name
         self.backend_caps = self.BACKEND_CAPS[name]
-        if self.DEBUG_SERIAL:
-            print(f"[Backend] -> {self.backend_caps['name']} ({self.backend_type})")
+        logger.info("Backend -> %s (%s)", self.backend_caps["name"], self.backend_type)
 
     @property
     def is_fluidnc(self) -> bool:
@@ -135,7 +157,7 @@ class SerialClient:
                 port,
                 baudrate=baud,
                 timeout=0.05,
-                write_timeout=0.2,
+                write_timeout=WRITE_TIMEOUT,
                 rtscts=False,
                 dsrdtr=False,
                 xonxoff=False,
@@ -156,28 +178,56 @@ class SerialClient:
             self.rx_thread = threading.Thread(target=self._rx_loop, daemon=True)
             self.rx_thread.start()
 
-            if self.DEBUG_SERIAL:
-                print(f"[OK] Connected to {port} @ {baud} (Mega/GRBL)")
+            # Start TX writer thread
+            self.writer = TxWriter(
+                self.ser.write,
+                on_written=self._on_written,
+                on_error=self._on_write_error,
+                max_batch_bytes=batch_bytes_for(baud, WRITE_TIMEOUT),
+            )
+            self.writer.start()
+
+            logger.info("Connected to %s @ %s", port, baud)
 
             self.send_line("$$")
             self.send_line(self.status_query_line())
+            self.poller.start()
 
         except Exception as e:
             self.ser = None
-            print(f"[Error] Connection failed: {e}")
+            logger.error("Connection failed: %s", e)
             raise
 
     def disconnect(self):
         """Cleanly close the serial connection."""
         try:
+            self.poller.stop()
+            writer, self.writer = self.writer, None
+            if writer is not None:
+                writer.stop(drain=True, timeout=0.5)
             self.rx_running = False
             if self.ser:
-                if self.DEBUG_SERIAL:
-                    print("[INFO] Serial disconnect()")
+                logger.info("Serial disconnect()")
                 self.ser.close()
             self.ser = None
         except Exception as e:
-            print("[Error disconnect()]", e)
+            logger.error("disconnect() failed: %s", e)
+
+    # ----------------------------------------------------------------
+    #  Session recording
+    # ----------------------------------------------------------------
+    def start_recording(self, path: str) -> SessionRecorder:
+        """Record every TX/RX line to the binary session log *path*."""
+        self.stop_recording()
+        self.recorder = SessionRecorder(path)
+        logger.info("Recording serial session to %s", path)
+        return self.recorder
+
+    def stop_recording(self):
+        """Stop recording and close the session log."""
+        rec, self.recorder = self.recorder, None
+        if rec is not None:
+            rec.close()
 
     # ----------------------------------------------------------------
     #  COM-Port listing
@@ -189,40 +239,75 @@ class SerialClient:
     # ----------------------------------------------------------------
     #  Command sending
     # ----------------------------------------------------------------
-    def send_line(self, line: str):
-        """Send one line to serial."""
-        if not self.ser:
+    def _writer_or_warn(self, what: str):
+        writer = self.writer
+        if not self.ser or writer is None:
             if not self._warned_not_connected:
-                print("[Warn] Not connected (send_line ignored)")
+                logger.warning("Not connected (%s ignored)", what)
                 self._warned_not_connected = True
-            return
+            return None
         self._warned_not_connected = False
+        return writer
 
-        try:
-            text = line.strip()
-            data = (text + "\n").encode("utf-8")
-            with self.lock:
-                self.ser.write(data)
-            if self.DEBUG_SERIAL and text != "(TM)":
-                print("TX>", text)
-        except Exception as e:
-            print(f"[Warn] Send error: {e}")
+    def send_line(self, line: str):
+        """Queue one line for the TX writer thread.
+
+        Single real-time characters (``?``, ``!``, ``~``) are sent without a
+        newline through the priority lane (except on the custom backend,
+        which expects whole lines).  On the main (Tk) thread a full TX
+        queue drops the line at once instead of blocking the GUI; drops
+        are reported through :attr:`on_tx_error`.
+        """
+        writer = self._writer_or_warn("send_line")
+        if writer is None:
+            return
+        text = line.strip()
+        if text in REALTIME_CHARS and not self.is_custom:
+            writer.put_realtime(text)
+        else:
+            on_gui = threading.current_thread() is threading.main_thread()
+            if not writer.put_line(text, timeout=0.0 if on_gui else None):
+                if writer.running:
+                    self._report_tx_error(f"TX queue full, dropped: {text}")
+                return
+        self.poller.on_tx(text)
 
     def send_ctrl_x(self):
-        """Send Ctrl+X (soft reset)."""
-        if not self.ser:
-            if not self._warned_not_connected:
-                print("[Warn] Not connected (Ctrl+X ignored)")
-                self._warned_not_connected = True
+        """Send Ctrl+X (soft reset); queued, unwritten lines are dropped."""
+        writer = self._writer_or_warn("Ctrl+X")
+        if writer is None:
             return
-        self._warned_not_connected = False
-        try:
-            with self.lock:
-                self.ser.write(b"\x18")
-            if self.DEBUG_SERIAL:
-                print("TX> <Ctrl+X>")
-        except Exception as e:
-            print(f"[Warn] send_ctrl_x failed: {e}")
+        dropped = writer.discard_lines()
+        if dropped:
+            logger.info("Ctrl+X discarded %d queued lines", dropped)
+        writer.put_realtime("\x18")
+        self.poller.note_realtime("\x18")
+
+    def _on_written(self, text: str):
+        """Writer callback, once per item actually written to the port."""
+        rec = self.recorder
+        if rec is not None:
+            rec.tx(text)
+        if text not in ("?", "(TM)") and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("TX> %s", "<Ctrl+X>" if text == "\x18" else text)
+
+    def _on_write_error(self, error, texts):
+        """Writer callback: a write failed and *texts* were not sent."""
+        self._report_tx_error(
+            f"Write failed ({error}), {len(texts)} line(s) not sent, first: {texts[0]}")
+
+    def _report_tx_error(self, msg: str):
+        cb = self.on_tx_error
+        if cb is not None:
+            try:
+                cb(msg)
+            except Exception as e:
+                logger.warning("on_tx_error callback failed: %s", e)
+
+    def _send_status_query(self):
+        """Poller callback: send the backend's status query."""
+        if self.ser:
+            self.send_line(self.status_query_line())
 
     # ----------------------------------------------------------------
     #  RX worker thread
@@ -230,12 +315,12 @@ class SerialClient:
     def _rx_loop(self):
         """Continuously read serial data and dispatch to listeners."""
         buf = b""
-        if self.DEBUG_SERIAL:
-            print("[RX] Thread started")
+        logger.debug("RX thread started")
 
         while self.rx_running and self.ser:
             try:
-                data = self.ser.read(1024)
+                # Return as soon as anything arrived, not after 1 KiB or the timeout
+                data = self.ser.read(self.ser.in_waiting or 1)
                 if data:
                     buf += data
                     while b"\n" in buf:
@@ -243,27 +328,28 @@ class SerialClient:
                         txt = raw.decode("utf-8", errors="replace").strip()
                         if not txt:
                             continue
-                        if self.DEBUG_SERIAL:
-                            if not (
-                                txt.startswith("<")
-                                or txt == "ok"
-                                or txt.startswith("[MSG:")
-                                or txt.startswith("[GC:")
-                            ):
-                                print("RX<", txt)
+                        rec = self.recorder
+                        if rec is not None:
+                            rec.rx(txt)
+                        self.poller.on_line(txt)
+                        if logger.isEnabledFor(logging.DEBUG) and not (
+                            txt.startswith("<")
+                            or txt == "ok"
+                            or txt.startswith("[MSG:")
+                            or txt.startswith("[GC:")
+                        ):
+                            logger.debug("RX< %s", txt)
 
                         for cb in list(self.listeners):
                             try:
                                 cb(txt)
                             except Exception as e:
-                                print("[Warn Listener]", e)
+                                logger.warning("Listener failed: %s", e)
                 else:
                     time.sleep(0.02)
 
             except Exception as e:
-                if self.DEBUG_SERIAL:
-                    print("[RX-loop error]", e)
+                logger.debug("RX-loop error: %s", e)
                 time.sleep(0.1)
 
-        if self.DEBUG_SERIAL:
-            print("[RX] Thread ended")
+        logger.debug("RX thread ended")
@@ -0,0 +1,522 @@
+"""
+Multi-controller pool on a single ``selectors`` I/O thread.
+
+:class:`ControllerPool` owns the file descriptors of N serial ports or
+pseudo-terminals and serves all of them from one event loop: reads are
+split into lines and dispatched per controller, writes are buffered and
+flushed when the port is writable, and each controller's
+:class:`~robotrol.serial.status_poller.StatusPoller` is ticked from the
+loop (its next due time bounds the ``select()`` timeout).  Twenty arms
+cost one thread instead of an RX thread, a TX thread and a poll thread
+each.
+
+Every :class:`PooledController` has
+
+* a program queue streamed with send-and-wait-for-``ok`` flow control,
+  as :class:`~robotrol.queue.gcode_queue.GCodeQueue` does, with its own
+  :class:`~robotrol.queue.metrics.QueueMetrics`;
+* raw line listeners and parsed status listeners (called on the I/O
+  thread, so they must not block);
+* TX/RX counters and the poller's round-trip statistics.
+
+Ports are opened with ``os.open`` and configured with ``termios``, so no
+pyserial is needed; POSIX only.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import selectors
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional
+
+from robotrol.queue.metrics import QueueMetrics
+from robotrol.serial.protocol import parse_status_line
+from robotrol.serial.status_poller import StatusPoller
+from robotrol.serial.tx_writer import REALTIME_CHARS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAM_TIMEOUT = 10.0  # s per line without ok / error
+
+
+def open_port(path: str, baud: int = 115200) -> int:
+    """Open *path* non-blocking in raw mode and return the file descriptor."""
+    import termios
+    import tty
+
+    fd = os.open(path, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+    try:
+        tty.setraw(fd)
+        speed = getattr(termios, f"B{int(baud)}", None)
+        if speed is not None:
+            attrs = termios.tcgetattr(fd)
+            attrs[4] = attrs[5] = speed
+            termios.tcsetattr(fd, termios.TCSANOW, attrs)
+    except (OSError, termios.error):
+        os.close(fd)
+        raise
+    return fd
+
+
+# ----------------------------------------------------------------------
+#  Controller
+# ----------------------------------------------------------------------
+
+class PooledController:
+    """One controller connection inside a :class:`ControllerPool`.
+
+    Created by :meth:`ControllerPool.add` / :meth:`ControllerPool.add_fd`;
+    the ``send_*`` and ``stream`` methods may be called from any thread.
+    """
+
+    def __init__(self, pool: "ControllerPool", name: str, fd: int, owns_fd: bool, poll: bool):
+        self.pool = pool
+        self.name = name
+        self.fd = fd
+        self.owns_fd = owns_fd
+        self.closed = False
+
+        self.listeners: List[Callable[[str], None]] = []
+        self.status_listeners: List[Callable[["PooledController", Dict[str, Any]], None]] = []
+        self.status: Optional[Dict[str, Any]] = None
+
+        self.poller = StatusPoller(lambda: self.send_realtime("?"))
+        self.poller.enabled = poll
+        self.metrics = QueueMetrics()
+
+        self._lock = threading.Lock()
+        self._rx = b""
+        self._out = bytearray()
+        self._rt = bytearray()
+
+        # Streaming state (send one line, wait for ok / error)
+        self._stream: Deque[str] = deque()
+        self._streaming = False
+        self._line_no = 0
+        self._in_flight: Optional[float] = None
+        self._done = threading.Event()
+        self._done.set()
+        self.last_run: Optional[Dict[str, Any]] = None
+
+        self.rx_lines = 0
+        self.rx_bytes = 0
+        self.tx_lines = 0
+        self.tx_bytes = 0
+        self.writes = 0
+        self.errors = 0
+        self.alarms = 0
+
+    # ------------------------------------------------------------------
+    #  Public API (any thread)
+    # ------------------------------------------------------------------
+
+    @property
+    def state(self) -> str:
+        """Machine state from the last status report."""
+        return self.poller.state
+
+    def send_line(self, line: str) -> None:
+        """Queue one line; single real-time characters skip the line buffer.
+
+        Do not mix with :meth:`stream` while a program runs: the extra
+        ``ok`` would be taken as the acknowledgement of a program line.
+        """
+        text = line.strip()
+        if text in REALTIME_CHARS:
+            self.send_realtime(text)
+            return
+        with self._lock:
+            self._out += (text + "\n").encode("utf-8")
+            self.tx_lines += 1
+        self.poller.on_tx(text)
+        self.pool._wake()
+
+    def send_realtime(self, char: str) -> None:
+        """Queue a real-time command ahead of buffered lines."""
+        with self._lock:
+            if char == "\x18":
+                # Soft reset: lines not yet written are void
+                self._out.clear()
+            self._rt += char.encode("latin-1")
+        if char != "?":
+            self.poller.note_realtime(char)
+        self.pool._wake()
+
+    def stream(self, lines: Iterable[str]) -> None:
+        """Append program *lines* and start streaming if idle."""
+        new = [s for s in (l.strip() for l in lines) if s and not s.startswith(";")]
+        with self._lock:
+            self._stream.extend(new)
+            if not self._streaming and self._stream:
+                self._streaming = True
+                self._line_no = 0
+                self._done.clear()
+                self.metrics.begin_run(len(self._stream))
+            elif self._streaming:
+                self.metrics.extend_run(len(new))
+        self.pool._wake()
+
+    def abort_stream(self, reason: str = "aborted") -> None:
+        """Drop the rest of the program (the controller is not reset)."""
+        with self._lock:
+            self._finish_locked(reason)
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    def wait_stream(self, timeout: Optional[float] = None) -> bool:
+        """Block until the current program has finished or was aborted."""
+        return self._done.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {
+                "state": self.state,
+                "closed": self.closed,
+                "rx_lines": self.rx_lines,
+                "rx_bytes": self.rx_bytes,
+                "tx_lines": self.tx_lines,
+                "tx_bytes": self.tx_bytes,
+                "writes": self.writes,
+                "errors": self.errors,
+                "alarms": self.alarms,
+                "streaming": self._streaming,
+                "stream_pending": len(self._stream),
+            }
+        out["poll"] = self.poller.stats()
+        out["run"] = self.metrics.summary() if self._streaming else self.last_run
+        return out
+
+    # ------------------------------------------------------------------
+    #  I/O thread
+    # ------------------------------------------------------------------
+
+    def _finish_locked(self, status: str) -> None:
+        if not self._streaming:
+            return
+        self._stream.clear()
+        self._streaming = False
+        self._in_flight = None
+        self.last_run = self.metrics.end_run(status)
+        self._done.set()
+
+    def _pump_locked(self, now: float) -> None:
+        """Send the next program line if none is waiting for a reply."""
+        if not self._streaming or self._in_flight is not None:
+            return
+        if not self._stream:
+            self._finish_locked("finished")
+            return
+        line = self._stream.popleft()
+        self._line_no += 1
+        self.metrics.on_tx(self._line_no)
+        self._out += (line + "\n").encode("utf-8")
+        self.tx_lines += 1
+        self._in_flight = now
+
+    def _service(self, now: float, timeout: float) -> Optional[float]:
+        """Poll, stream and check timeouts; return the next due time."""
+        due = self.poller.tick(now)
+        with self._lock:
+            sent = self._in_flight
+            if sent is not None and now - sent >= timeout:
+                self.metrics.on_timeout(self._line_no)
+                logger.warning("%s: timeout on program line %d", self.name, self._line_no)
+                self._in_flight = None
+            self._pump_locked(now)
+            if self._in_flight is not None:
+                t = self._in_flight + timeout
+                due = t if due is None else min(due, t)
+        return due
+
+    def _flush(self) -> bool:
+        """Write as much as the port takes; True if data is left over."""
+        with self._lock:
+            if not (self._rt or self._out):
+                return False
+            data = bytes(self._rt + self._out)
+            try:
+                n = os.write(self.fd, data)
+            except BlockingIOError:
+                return True
+            except OSError as e:
+                logger.warning("%s: write failed: %s", self.name, e)
+                self._out.clear()
+                self._rt.clear()
+                return False
+            self.writes += 1
+            self.tx_bytes += n
+            k = min(n, len(self._rt))
+            del self._rt[:k]
+            del self._out[:n - k]
+            return bool(self._rt or self._out)
+
+    def _on_readable(self, now: float) -> bool:
+        """Read and dispatch complete lines; False on EOF / port error."""
+        try:
+            data = os.read(self.fd, 4096)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        if not data:
+            return False
+        self.rx_bytes += len(data)
+        buf = self._rx + data
+        *lines, self._rx = buf.split(b"\n")
+        for raw in lines:
+            txt = raw.decode("utf-8", errors="replace").strip()
+            if txt:
+                self._on_line(txt, now)
+        return True
+
+    def _on_line(self, txt: str, now: float) -> None:
+        self.rx_lines += 1
+        self.poller.on_line(txt, now)
+        status = None
+        with self._lock:
+            if txt == "ok" or txt.startswith("error:"):
+                if txt != "ok":
+                    self.errors += 1
+                if self._in_flight is not None:
+                    if txt == "ok":
+                        self.metrics.on_ack(now)
+                    else:
+                        self.metrics.on_error(now)
+                    self._in_flight = None
+                    self._pump_locked(now)
+            elif txt.startswith("ALARM"):
+                self.alarms += 1
+                self._finish_locked("alarm")
+            elif txt.startswith("<"):
+                status = parse_status_line(txt)
+                self.status = status
+        for cb in list(self.listeners):
+            try:
+                cb(txt)
+            except Exception as e:
+                logger.warning("%s: listener failed: %s", self.name, e)
+        if status is not None:
+            for scb in list(self.status_listeners):
+                try:
+                    scb(self, status)
+                except Exception as e:
+                    logger.warning("%s: status listener failed: %s", self.name, e)
+
+
+# ----------------------------------------------------------------------
+#  Pool
+# ----------------------------------------------------------------------
+
+class ControllerPool:
+    """N controller connections served by one selector thread.
+
+    Parameters
+    ----------
+    stream_timeout : float
+        Seconds a program line may wait for ``ok`` / ``error`` before it is
+        counted as a timeout and the next line is sent.
+
+    Example::
+
+        with ControllerPool() as pool:
+            arm1 = pool.add("arm1", "/dev/ttyUSB0")
+            arm2 = pool.add("arm2", "/dev/ttyUSB1")
+            arm1.stream(lines_a)
+            arm2.stream(lines_b)
+            arm1.wait_stream(); arm2.wait_stream()
+    """
+
+    def __init__(self, stream_timeout: float = DEFAULT_STREAM_TIMEOUT):
+        self.stream_timeout = stream_timeout
+        self._controllers: Dict[str, PooledController] = {}
+        self._lock = threading.Lock()
+        self._sel = selectors.DefaultSelector()
+        self._registered: Dict[int, int] = {}  # fd -> event mask
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.loop_iterations = 0
+
+    # ------------------------------------------------------------------
+    #  Membership
+    # ------------------------------------------------------------------
+
+    def add(self, name: str, path: str, baud: int = 115200, poll: bool = True) -> PooledController:
+        """Open the serial device or pty *path* and add it as *name*."""
+        return self.add_fd(name, open_port(path, baud), owns_fd=True, poll=poll)
+
+    def add_fd(self, name: str, fd: int, owns_fd: bool = False, poll: bool = True) -> PooledController:
+        """Add an already open descriptor (switched to non-blocking)."""
+        os.set_blocking(fd, False)
+        with self._lock:
+            if name in self._controllers:
+                raise ValueError(f"controller {name!r} already in pool")
+            ctl = PooledController(self, name, fd, owns_fd, poll)
+            self._controllers[name] = ctl
+        if self._running:
+            ctl.poller.reset()
+        self._wake()
+        return ctl
+
+    def remove(self, name: str) -> None:
+        """Remove *name*; its descriptor is closed if the pool opened it."""
+        with self._lock:
+            ctl = self._controllers.pop(name, None)
+        if ctl is None:
+            return
+        ctl.abort_stream("removed")
+        ctl.closed = True
+        self._wake()
+        if not self._running:
+            self._sync_registrations()
+            self._close_fd(ctl)
+        # else: the loop unregisters and closes it
+
+    def __getitem__(self, name: str) -> PooledController:
+        return self._controllers[name]
+
+    def __iter__(self) -> Iterator[PooledController]:
+        return iter(list(self._controllers.values()))
+
+    def __len__(self) -> int:
+        return len(self._controllers)
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._controllers)
+
+    def broadcast_realtime(self, char: str) -> None:
+        """Send a real-time command (e.g. ``!`` feed hold) to every controller."""
+        for ctl in self:
+            ctl.send_realtime(char)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {ctl.name: ctl.stats() for ctl in self}
+
+    # ------------------------------------------------------------------
+    #  Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the I/O thread (no-op if running)."""
+        if self._running:
+            return
+        self._running = True
+        for ctl in self:
+            ctl.poller.reset()
+        self._thread = threading.Thread(target=self._loop, name="controller-pool", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the I/O thread; connections stay open."""
+        self._running = False
+        self._wake()
+        t, self._thread = self._thread, None
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=2.0)
+
+    def close(self) -> None:
+        """Stop and close every connection the pool opened."""
+        self.stop()
+        for name in self.names:
+            self.remove(name)
+        self._sel.close()
+        for fd in (self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "ControllerPool":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    #  Event loop
+    # ------------------------------------------------------------------
+
+    def _wake(self) -> None:
+        if threading.current_thread() is self._thread:
+            return  # the loop services every controller before selecting
+        try:
+            os.write(self._wake_w, b"\0")
+        except (BlockingIOError, OSError):
+            pass  # pipe full (a wake-up is pending anyway) or closed
+
+    def _set_mask(self, ctl: PooledController, want_write: bool) -> None:
+        mask = selectors.EVENT_READ | (selectors.EVENT_WRITE if want_write else 0)
+        if self._registered.get(ctl.fd) != mask:
+            self._sel.modify(ctl.fd, mask, ctl)
+            self._registered[ctl.fd] = mask
+
+    def _sync_registrations(self) -> None:
+        live = {ctl.fd: ctl for ctl in self._controllers.values() if not ctl.closed}
+        for fd in list(self._registered):
+            if fd not in live:
+                self._sel.unregister(fd)
+                del self._registered[fd]
+        for fd, ctl in live.items():
+            if fd not in self._registered:
+                self._sel.register(fd, selectors.EVENT_READ, ctl)
+                self._registered[fd] = selectors.EVENT_READ
+
+    @staticmethod
+    def _close_fd(ctl: PooledController) -> None:
+        if ctl.owns_fd:
+            try:
+                os.close(ctl.fd)
+            except OSError:
+                pass
+
+    def _loop(self) -> None:
+        known = set()
+        while self._running:
+            self.loop_iterations += 1
+            self._sync_registrations()
+            current = set(self._controllers.values())
+            for ctl in known - current:
+                self._close_fd(ctl)
+            known = current
+
+            now = time.monotonic()
+            due: Optional[float] = None
+            for ctl in current:
+                if ctl.closed:
+                    continue
+                t = ctl._service(now, self.stream_timeout)
+                if t is not None and (due is None or t < due):
+                    due = t
+                self._set_mask(ctl, ctl._flush())
+
+            timeout = None if due is None else max(0.0, due - time.monotonic())
+            for key, mask in self._sel.select(timeout):
+                ctl = key.data
+                if ctl is None:
+                    try:
+                        while os.read(self._wake_r, 4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                    continue
+                if mask & selectors.EVENT_READ and not ctl._on_readable(time.monotonic()):
+                    logger.warning("%s: port closed", ctl.name)
+                    ctl.closed = True
+                    ctl.abort_stream("disconnected")
+                    continue
+                if mask & selectors.EVENT_WRITE:
+                    self._set_mask(ctl, ctl._flush())
+        for ctl in known - set(self._controllers.values()):
+            self._close_fd(ctl)
@@ -0,0 +1,250 @@
+"""
+Serial session recording and replay.
+
+:class:`SessionRecorder` writes every TX/RX line with its
+``time.monotonic()`` timestamp to a compact binary log;
+:class:`SessionReplayer` feeds the recorded RX stream back into listener
+callbacks (the same ``cb(line)`` signature as ``SerialClient.listeners``)
+at the original pace, N times faster, or as fast as possible.
+
+File layout (little endian)::
+
+    header  b"RSL1" | f64 wall-clock start | f64 monotonic start
+    record  u32 delta_us | u8 kind | u16 length | payload (UTF-8)
+
+``delta_us`` is the time since the previous record; gaps longer than a
+``u32`` are bridged by empty :data:`KIND_GAP` records.  A status-report
+line costs 7 bytes of framing.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Tuple
+
+
+MAGIC = b"RSL1"
+_HEADER = struct.Struct("<4sdd")
+_RECORD = struct.Struct("<IBH")
+
+KIND_TX = 0
+KIND_RX = 1
+KIND_GAP = 2
+
+_MAX_DELTA_US = 0xFFFFFFFF
+_MAX_PAYLOAD = 0xFFFF
+
+
+# ----------------------------------------------------------------------
+#  Recorder
+# ----------------------------------------------------------------------
+
+class SessionRecorder:
+    """Append TX/RX lines with timestamps to a binary session log.
+
+    Thread-safe: TX (GUI/queue threads) and RX (reader thread) may record
+    concurrently.  Writes are buffered; :meth:`close` flushes.
+
+    Parameters
+    ----------
+    path : str
+        Output file (overwritten).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._f: Optional[BinaryIO] = open(path, "wb")
+        self._t0 = time.monotonic()
+        self._last = self._t0
+        self.records = 0
+        self._f.write(_HEADER.pack(MAGIC, time.time(), self._t0))
+
+    def record(self, kind: int, line: str, t: Optional[float] = None) -> None:
+        """Record one line (*kind* is :data:`KIND_TX` or :data:`KIND_RX`)."""
+        now = time.monotonic() if t is None else t
+        data = line.encode("utf-8", errors="replace")[:_MAX_PAYLOAD]
+        with self._lock:
+            f = self._f
+            if f is None:
+                return
+            delta = max(0, int(round((now - self._last) * 1e6)))
+            self._last = max(self._last, now)
+            while delta > _MAX_DELTA_US:
+                f.write(_RECORD.pack(_MAX_DELTA_US, KIND_GAP, 0))
+                delta -= _MAX_DELTA_US
+            f.write(_RECORD.pack(delta, kind, len(data)))
+            f.write(data)
+            self.records += 1
+
+    def tx(self, line: str) -> None:
+        self.record(KIND_TX, line)
+
+    def rx(self, line: str) -> None:
+        self.record(KIND_RX, line)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+    @property
+    def closed(self) -> bool:
+        return self._f is None
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ----------------------------------------------------------------------
+#  Reading
+# ----------------------------------------------------------------------
+
+@dataclass
+class SessionInfo:
+    started_wall: float
+    started_monotonic: float
+
+
+def read_header(f: BinaryIO) -> SessionInfo:
+    raw = f.read(_HEADER.size)
+    if len(raw) != _HEADER.size:
+        raise ValueError("not a session log (truncated header)")
+    magic, wall, mono = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError("not a session log (bad magic)")
+    return SessionInfo(wall, mono)
+
+
+def iter_session(path: str) -> Iterator[Tuple[float, int, str]]:
+    """Yield ``(t, kind, line)`` with *t* in seconds since the recording start.
+
+    A truncated last record (recorder killed mid-write) is ignored.
+    """
+    with open(path, "rb") as f:
+        read_header(f)
+        data = f.read()
+    rec = _RECORD
+    size = rec.size
+    pos = 0
+    t_us = 0
+    end = len(data)
+    while pos + size <= end:
+        delta, kind, n = rec.unpack_from(data, pos)
+        pos += size
+        if pos + n > end:
+            break
+        t_us += delta
+        if kind != KIND_GAP:
+            yield t_us / 1e6, kind, data[pos:pos + n].decode("utf-8", errors="replace")
+        pos += n
+
+
+def session_stats(path: str) -> dict:
+    """Counts, duration and line rates of a recorded session."""
+    tx = rx = status = 0
+    last = 0.0
+    for t, kind, line in iter_session(path):
+        last = t
+        if kind == KIND_TX:
+            tx += 1
+        else:
+            rx += 1
+            if line.startswith("<"):
+                status += 1
+    return {
+        "duration_s": round(last, 3),
+        "tx_lines": tx,
+        "rx_lines": rx,
+        "status_reports": status,
+        "rx_per_s": round(rx / last, 1) if last > 0 else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+#  Replay
+# ----------------------------------------------------------------------
+
+class SessionReplayer:
+    """Feed a recorded RX stream into listener callbacks.
+
+    Parameters
+    ----------
+    path : str
+        Session log written by :class:`SessionRecorder`.
+    speed : float
+        Time scale: 1.0 = original pace, N = N times faster, 0 (or a
+        negative value) = no pacing at all.
+    kinds : iterable of int
+        Record kinds to replay (default: RX only).
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, kinds: Iterable[int] = (KIND_RX,)):
+        self.path = path
+        self.speed = speed
+        self.kinds = frozenset(kinds)
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def replay(
+        self,
+        listeners: List[Callable[[str], None]],
+        on_tx: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Replay into *listeners* on the calling thread; returns timing stats.
+
+        With ``KIND_TX`` in :attr:`kinds`, recorded TX lines go to *on_tx*.
+        Listener exceptions are counted, not raised (as in the RX loop).
+        """
+        self._stop.clear()
+        paced = self.speed > 0
+        scale = 1.0 / self.speed if paced else 0.0
+        start = time.monotonic()
+        lines = errors = 0
+        max_lag = 0.0
+        for t, kind, line in iter_session(self.path):
+            if self._stop.is_set():
+                break
+            if kind not in self.kinds:
+                continue
+            if paced:
+                due = start + t * scale
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._stop.wait(wait)
+                else:
+                    max_lag = max(max_lag, -wait)
+            if kind == KIND_TX:
+                if on_tx is not None:
+                    on_tx(line)
+                lines += 1
+                continue
+            for cb in list(listeners):
+                try:
+                    cb(line)
+                except Exception:
+                    errors += 1
+            lines += 1
+        elapsed = time.monotonic() - start
+        return {
+            "lines": lines,
+            "elapsed_s": round(elapsed, 4),
+            "lines_per_s": round(lines / elapsed, 1) if elapsed > 0 else 0.0,
+            "max_lag_s": round(max_lag, 4),
+            "listener_errors": errors,
+        }
@@ -0,0 +1,298 @@
+"""
+Typed snapshot of the controller's ``$$`` settings.
+
+:class:`ControllerSettings` parses a ``$$`` dump once into per-axis
+``array('d')`` groups (steps/unit ``$100..``, max rate ``$110..``,
+acceleration ``$120..``, max travel ``$130..``, in :data:`AXES` order) and
+typed flags, so limit checks and trajectory timing read a setting in O(1)
+instead of re-querying or re-parsing text.  It is also a read-only
+``Mapping[int, str]`` of the normalised values, so code that takes a
+``{setting_number: value}`` dict (e.g. ``MachineLimits.from_settings``)
+accepts it unchanged.
+
+:meth:`ControllerSettings.diff` returns the minimal ``$N=value`` lines that
+turn one snapshot into another (numeric values compared with a tolerance),
+and :class:`SettingsCache` keeps the last dump per controller and firmware
+in a JSON file.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import time
+from array import array
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Union
+
+from robotrol.config.constants import AXES
+from robotrol.serial.protocol import parse_settings_line
+
+
+# Axis groups: first setting number (X), then one per axis in AXES order
+AXIS_GROUPS: Dict[str, int] = {
+    "steps": 100,
+    "max_rate": 110,
+    "accel": 120,
+    "max_travel": 130,
+}
+
+# Scalar settings
+SETTING_INVERT_MASK = 3
+SETTING_STATUS_REPORT = 10
+SETTING_JUNCTION_DEVIATION = 11
+SETTING_SOFT_LIMITS = 20
+SETTING_HARD_LIMITS = 21
+SETTING_HOMING = 22
+
+_RE_VERSION = re.compile(r"^\[VER:([^\]:]+)")
+_RE_FLUIDNC = re.compile(r"\[FluidNC (v[^\s\]]+)")
+_RE_GRBL = re.compile(r"^Grbl (\S+)")
+
+_NAN = float("nan")
+
+
+def normalize_value(raw: str) -> str:
+    """Setting value without the trailing comment (``"250.000 (x, step/mm)"``)."""
+    raw = raw.strip()
+    return raw.split()[0] if raw else ""
+
+
+def firmware_from_line(line: str) -> Optional[str]:
+    """Firmware id from a welcome banner or ``$I`` reply, else None.
+
+    ``Grbl 3.7 [FluidNC v3.7.17 ...]`` -> ``"FluidNC v3.7.17"``,
+    ``Grbl 1.1h ['$' for help]`` -> ``"Grbl 1.1h"``,
+    ``[VER:1.1h.20190825:]`` -> ``"Grbl 1.1h.20190825"``.
+    """
+    m = _RE_FLUIDNC.search(line)
+    if m:
+        return f"FluidNC {m.group(1)}"
+    m = _RE_GRBL.match(line)
+    if m:
+        return f"Grbl {m.group(1)}"
+    m = _RE_VERSION.match(line)
+    if m:
+        return f"Grbl {m.group(1)}"
+    return None
+
+
+def _as_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        return _NAN
+
+
+class ControllerSettings(Mapping[int, str]):
+    """Parsed ``$$`` dump with O(1) typed access.
+
+    Parameters
+    ----------
+    values : mapping, optional
+        ``{setting_number: value}``; values may be numbers or strings.
+    """
+
+    def __init__(self, values: Optional[Mapping[int, Union[float, str]]] = None):
+        self._raw: Dict[int, str] = {}
+        self._num: Dict[int, float] = {}
+        n = len(AXES)
+        self.steps = array("d", [_NAN] * n)
+        self.max_rate = array("d", [_NAN] * n)
+        self.accel = array("d", [_NAN] * n)
+        self.max_travel = array("d", [_NAN] * n)
+        self._groups = {
+            AXIS_GROUPS["steps"]: self.steps,
+            AXIS_GROUPS["max_rate"]: self.max_rate,
+            AXIS_GROUPS["accel"]: self.accel,
+            AXIS_GROUPS["max_travel"]: self.max_travel,
+        }
+        if values:
+            for code, value in values.items():
+                self.set(int(code), value)
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "ControllerSettings":
+        """Build from raw ``$$`` response lines; other lines are ignored."""
+        s = cls()
+        for line in lines:
+            s.update_line(line)
+        return s
+
+    # ------------------------------------------------------------------
+    #  Updates
+    # ------------------------------------------------------------------
+
+    def set(self, code: int, value: Union[float, str]) -> None:
+        """Set one setting (keeps the typed arrays in sync)."""
+        if isinstance(value, str):
+            text = normalize_value(value)
+        else:
+            v = float(value)
+            text = str(int(v)) if v.is_integer() else repr(v)
+        self._raw[code] = text
+        num = _as_float(text)
+        self._num[code] = num
+        group = self._groups.get(code - code % 10)
+        if group is not None and code % 10 < len(group):
+            group[code % 10] = num
+
+    def update_line(self, line: str) -> bool:
+        """Apply one ``$N=value`` line; False if *line* is not a setting."""
+        parsed = parse_settings_line(line)
+        if parsed is None:
+            return False
+        self.set(parsed[0], parsed[1])
+        return True
+
+    # ------------------------------------------------------------------
+    #  Mapping[int, str]
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, code: int) -> str:
+        return self._raw[code]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ControllerSettings):
+            return not self.diff(other) and not other.diff(self)
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ControllerSettings({len(self)} settings)"
+
+    # ------------------------------------------------------------------
+    #  Typed access
+    # ------------------------------------------------------------------
+
+    def number(self, code: int, default: float = _NAN) -> float:
+        """Numeric value of setting *code* (NaN / *default* if missing)."""
+        v = self._num.get(code, _NAN)
+        return default if math.isnan(v) else v
+
+    def axis(self, group: str, ax: str) -> float:
+        """Per-axis value, e.g. ``axis("max_rate", "X")`` (NaN if missing)."""
+        return self._groups[AXIS_GROUPS[group]][AXES.index(ax)]
+
+    def flag(self, code: int) -> Optional[bool]:
+        v = self._num.get(code, _NAN)
+        return None if math.isnan(v) else v != 0.0
+
+    @property
+    def soft_limits(self) -> Optional[bool]:
+        return self.flag(SETTING_SOFT_LIMITS)
+
+    @property
+    def hard_limits(self) -> Optional[bool]:
+        return self.flag(SETTING_HARD_LIMITS)
+
+    @property
+    def homing(self) -> Optional[bool]:
+        return self.flag(SETTING_HOMING)
+
+    @property
+    def invert_mask(self) -> Optional[int]:
+        v = self._num.get(SETTING_INVERT_MASK, _NAN)
+        return None if math.isnan(v) else int(v)
+
+    @property
+    def junction_deviation(self) -> float:
+        return self.number(SETTING_JUNCTION_DEVIATION)
+
+    def has_motion_limits(self) -> bool:
+        """True once any max-rate or acceleration setting is known."""
+        return any(not math.isnan(v) for v in self.max_rate) or any(
+            not math.isnan(v) for v in self.accel
+        )
+
+    # ------------------------------------------------------------------
+    #  Diff / serialisation
+    # ------------------------------------------------------------------
+
+    def diff(self, target: Mapping[int, Union[float, str]], rel_tol: float = 1e-6) -> List[str]:
+        """``$N=value`` lines that change this snapshot into *target*.
+
+        Only settings present in *target* are considered; numeric values
+        within *rel_tol* (``250`` vs ``250.000``) are treated as equal.
+        """
+        want = target if isinstance(target, ControllerSettings) else ControllerSettings(target)
+        out: List[str] = []
+        for code in sorted(want):
+            new = want[code]
+            old = self._raw.get(code)
+            if old is not None:
+                a, b = self._num[code], want._num[code]
+                if math.isnan(a) or math.isnan(b):
+                    if old == new:
+                        continue
+                elif math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-9):
+                    continue
+            out.append(f"${code}={new}")
+        return out
+
+    def to_lines(self) -> List[str]:
+        return [f"${code}={self._raw[code]}" for code in sorted(self._raw)]
+
+    def as_dict(self) -> Dict[int, str]:
+        return dict(self._raw)
+
+
+# ----------------------------------------------------------------------
+#  Cache
+# ----------------------------------------------------------------------
+
+class SettingsCache:
+    """Last ``$$`` dump per ``(controller, firmware)`` in a JSON file.
+
+    Parameters
+    ----------
+    path : str
+        JSON file (created on the first :meth:`store`).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, dict] = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data = data
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(controller: str, firmware: Optional[str]) -> str:
+        return f"{controller}|{firmware or 'unknown'}"
+
+    def load(self, controller: str, firmware: Optional[str]) -> Optional[ControllerSettings]:
+        entry = self._data.get(self.key(controller, firmware))
+        if not entry:
+            return None
+        return ControllerSettings({int(k): v for k, v in entry.get("settings", {}).items()})
+
+    def store(self, controller: str, firmware: Optional[str], settings: ControllerSettings) -> bool:
+        """Save *settings*; returns False if the cached dump was identical."""
+        key = self.key(controller, firmware)
+        values = {str(k): v for k, v in sorted(settings.as_dict().items())}
+        entry = self._data.get(key)
+        if entry and entry.get("settings") == values:
+            return False
+        self._data[key] = {"saved": round(time.time(), 3), "settings": values}
+        d = os.path.dirname(self.path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        return True
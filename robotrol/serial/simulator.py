@@ -0,0 +1,615 @@
+"""
+Virtual GRBL / FluidNC controller on a pseudo-terminal.
+
+:class:`VirtualController` opens a pty pair and speaks the controller line
+protocol on it, so :meth:`SerialClient.connect` (or anything else that
+opens a serial device path) can attach to :attr:`VirtualController.port`
+unchanged:
+
+* ``ok`` / ``error:N`` responses, ``ALARM:N`` on :meth:`trigger_alarm`
+* ``$$`` settings dump, ``$N=value``, ``$G``, ``$I``, ``$X``, ``$H`` / ``$H<axis>``
+* real-time ``?`` (status report with MPos or WPos, WCO, FS and Pn),
+  ``!`` feed hold, ``~`` cycle start and Ctrl-X soft reset
+* G0/G1/G2/G3 (arcs are timed as straight moves), G4, G20/G21, G90/G91,
+  G92; other G/M words are accepted and ignored
+
+Motion lines go into a planner buffer of *planner_blocks* entries; as on
+the real controller, the ``ok`` for a motion line is only sent once the
+block fits into the buffer, which gives realistic flow control for
+streaming benchmarks.  Blocks run for the time of a rest-to-rest
+trapezoidal profile limited by ``$110..$115`` / ``$120..$125`` (or
+``length / feed`` with ``motion_model="constant"``), multiplied by
+*time_scale* (0 = instantaneous).
+
+POSIX only (``os.openpty``).  No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import collections
+import math
+import os
+import re
+import select
+import threading
+import time
+import tty
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Union
+
+from robotrol.config.constants import AXES
+
+
+DEFAULT_SETTINGS: Dict[int, float] = {
+    10: 1,            # status report: MPos
+    11: 0.010,        # junction deviation
+    20: 0, 21: 0, 22: 1,
+    **{100 + i: 80.0 for i in range(len(AXES))},    # steps/unit
+    **{110 + i: 3000.0 for i in range(len(AXES))},  # max rate, units/min
+    **{120 + i: 200.0 for i in range(len(AXES))},   # accel, units/s²
+    **{130 + i: 300.0 for i in range(len(AXES))},   # max travel
+}
+
+BANNERS = {
+    "fluidnc": "Grbl 3.7 [FluidNC v3.7.17 (sim) '$' for help]",
+    "grbl": "Grbl 1.1h ['$' for help]",
+}
+
+WCO_REPORT_EVERY = 10  # status reports between WCO fields
+
+# GRBL error codes used here
+ERR_EXPECTED_COMMAND = 1
+ERR_BAD_NUMBER = 2
+ERR_INVALID_STATEMENT = 3
+ERR_IDLE_ERROR = 8
+ERR_ALARM_LOCK = 9
+ERR_UNSUPPORTED = 20
+ERR_UNDEFINED_FEED = 22
+
+_WORD_RE = re.compile(r"([A-Z])([-+]?[0-9.]*)")
+_COMMENT_RE = re.compile(r"\([^)]*\)|;.*$")
+_MOTION = {0.0, 1.0, 2.0, 3.0}
+_IGNORED_G = {17.0, 18.0, 19.0, 40.0, 43.1, 49.0, 54.0, 55.0, 56.0, 57.0,
+              58.0, 59.0, 61.0, 64.0, 80.0, 93.0, 94.0}
+_REALTIME = {ord("?"), ord("!"), ord("~"), 0x18}
+_KNOWN_LETTERS = set("GMFPSTNIJKRL") | set(AXES)
+
+
+@dataclass
+class _Block:
+    start: List[float]
+    target: List[float]
+    duration: float
+    feed: float
+
+
+class VirtualController:
+    """Simulated controller behind a pseudo-terminal.
+
+    Parameters
+    ----------
+    settings : dict, optional
+        ``{setting_number: value}`` overriding :data:`DEFAULT_SETTINGS`.
+    planner_blocks : int
+        Planner buffer size in motion blocks (GRBL: 16, FluidNC: 32).
+    time_scale : float
+        Multiplier on simulated motion and dwell times (0 = instantaneous).
+    motion_model : str
+        ``"trapezoid"`` (rest-to-rest profile) or ``"constant"`` (feed only).
+    backend : str
+        ``"fluidnc"`` or ``"grbl"`` — selects the start-up banner.
+    homing_time : float
+        Seconds a ``$H`` cycle takes (before *time_scale*).
+    """
+
+    def __init__(
+        self,
+        settings: Optional[Dict[int, Union[float, str]]] = None,
+        planner_blocks: int = 16,
+        time_scale: float = 1.0,
+        motion_model: str = "trapezoid",
+        backend: str = "fluidnc",
+        homing_time: float = 1.0,
+    ):
+        if motion_model not in ("trapezoid", "constant"):
+            raise ValueError(f"unknown motion model: {motion_model}")
+        self.settings: Dict[int, Union[float, str]] = dict(DEFAULT_SETTINGS)
+        if settings:
+            self.settings.update(settings)
+        self.planner_blocks = max(1, int(planner_blocks))
+        self.time_scale = max(0.0, float(time_scale))
+        self.motion_model = motion_model
+        self.banner = BANNERS.get(backend, BANNERS["fluidnc"])
+        self.homing_time = homing_time
+
+        # Machine state (guarded by _cond)
+        self._cond = threading.Condition()
+        self.state = "Idle"
+        self.mpos: List[float] = [0.0] * len(AXES)
+        self.wco: List[float] = [0.0] * len(AXES)
+        self.pins = ""
+        self._planner: Deque[_Block] = collections.deque()
+        self._elapsed = 0.0       # time into the executing block
+        self._hold = False
+        self._reset_gen = 0       # bumped on soft reset to drop pending work
+        self._reports = 0
+
+        # Parser modal state (line thread only)
+        self._abs = True
+        self._inch = False
+        self._motion = 0.0
+        self._feed = 0.0
+        self._target: List[float] = [0.0] * len(AXES)
+
+        # Counters for benchmarks
+        self.lines_received = 0
+        self.oks_sent = 0
+        self.errors_sent = 0
+        self.status_reports = 0
+        self.max_planner_depth = 0
+
+        self._master: Optional[int] = None
+        self._slave: Optional[int] = None
+        self.port: Optional[str] = None
+        self._write_lock = threading.Lock()
+        self._lines: Deque[str] = collections.deque()
+        self._lines_cond = threading.Condition()
+        self._running = False
+        self._threads: List[threading.Thread] = []
+
+    # ------------------------------------------------------------------
+    #  Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> str:
+        """Open the pty, start the controller threads and return the port path."""
+        if self._running:
+            return self.port  # type: ignore[return-value]
+        master, slave = os.openpty()
+        # Raw mode: no echo, no line editing, no CR/LF translation
+        tty.setraw(slave)
+        self._master, self._slave = master, slave
+        self.port = os.ttyname(slave)
+        self._running = True
+        for target in (self._reader_loop, self._line_loop, self._motion_loop):
+            t = threading.Thread(target=target, daemon=True,
+                                 name=f"vctl-{target.__name__.strip('_')}")
+            t.start()
+            self._threads.append(t)
+        self._write(self.banner)
+        return self.port
+
+    def stop(self) -> None:
+        """Stop the threads and close the pty."""
+        self._running = False
+        with self._cond:
+            self._cond.notify_all()
+        with self._lines_cond:
+            self._lines_cond.notify_all()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads.clear()
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def __enter__(self) -> "VirtualController":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    #  Test hooks
+    # ------------------------------------------------------------------
+
+    def trigger_alarm(self, code: int = 1) -> None:
+        """Enter ALARM (as a hard/soft limit would): motion is discarded."""
+        with self._cond:
+            self._planner.clear()
+            self._elapsed = 0.0
+            self._hold = False
+            self.state = "Alarm"
+            self._cond.notify_all()
+        self._write(f"ALARM:{code}")
+
+    def set_pins(self, pins: str) -> None:
+        """Set the ``Pn:`` field of status reports (e.g. ``"XZ"``)."""
+        with self._cond:
+            self.pins = pins
+
+    def wait_idle(self, timeout: float = 10.0) -> bool:
+        """Block until all received lines and planned motion are done."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lines_cond:
+                pending = bool(self._lines)
+            with self._cond:
+                if not pending and not self._planner and self.state in ("Idle", "Alarm"):
+                    return True
+            time.sleep(0.005)
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "lines_received": self.lines_received,
+            "oks_sent": self.oks_sent,
+            "errors_sent": self.errors_sent,
+            "status_reports": self.status_reports,
+            "max_planner_depth": self.max_planner_depth,
+        }
+
+    # ------------------------------------------------------------------
+    #  I/O
+    # ------------------------------------------------------------------
+
+    def _write(self, text: str) -> None:
+        fd = self._master
+        if fd is None:
+            return
+        data = (text + "\r\n").encode("ascii", errors="replace")
+        with self._write_lock:
+            try:
+                while data:
+                    n = os.write(fd, data)
+                    data = data[n:]
+            except OSError:
+                pass
+
+    def _reply(self, err: int = 0) -> None:
+        if err:
+            self.errors_sent += 1
+            self._write(f"error:{err}")
+        else:
+            self.oks_sent += 1
+            self._write("ok")
+
+    def _reader_loop(self) -> None:
+        """Split input into real-time characters and command lines."""
+        buf = bytearray()
+        while self._running:
+            fd = self._master
+            if fd is None:
+                break
+            try:
+                ready, _, _ = select.select([fd], [], [], 0.05)
+                if not ready:
+                    continue
+                data = os.read(fd, 4096)
+            except OSError:
+                # No client attached (EIO) or closed during stop()
+                time.sleep(0.02)
+                continue
+            for b in data:
+                if b in _REALTIME:
+                    self._realtime(b)
+                elif b in (0x0A, 0x0D):
+                    if buf:
+                        line = buf.decode("ascii", errors="replace")
+                        buf.clear()
+                        with self._lines_cond:
+                            self._lines.append(line)
+                            self._lines_cond.notify()
+                else:
+                    buf.append(b)
+
+    def _realtime(self, b: int) -> None:
+        if b == ord("?"):
+            self._write(self._status_report())
+        elif b == ord("!"):
+            with self._cond:
+                if self.state == "Run":
+                    self._hold = True
+                    self.state = "Hold:0"
+        elif b == ord("~"):
+            with self._cond:
+                if self._hold:
+                    self._hold = False
+                    self.state = "Run" if self._planner else "Idle"
+                    self._cond.notify_all()
+        elif b == 0x18:
+            self._soft_reset()
+
+    def _soft_reset(self) -> None:
+        with self._lines_cond:
+            self._lines.clear()
+        with self._cond:
+            moving = bool(self._planner) and not self._hold
+            self._planner.clear()
+            self._elapsed = 0.0
+            self._hold = False
+            self._reset_gen += 1
+            # Position is lost if the machine was moving
+            self.state = "Alarm" if moving else ("Alarm" if self.state == "Alarm" else "Idle")
+            self._cond.notify_all()
+        self._abs, self._inch, self._motion = True, False, 0.0
+        self._target = list(self.mpos)
+        self._write(self.banner)
+        if moving:
+            self._write("ALARM:3")
+
+    # ------------------------------------------------------------------
+    #  Status
+    # ------------------------------------------------------------------
+
+    def _status_report(self) -> str:
+        with self._cond:
+            pos = self._current_pos()
+            state = self.state
+            block = self._planner[0] if self._planner and not self._hold else None
+            feed = block.feed if block is not None else 0.0
+            pins = self.pins
+            wco = list(self.wco)
+            self._reports += 1
+            with_wco = self._reports % WCO_REPORT_EVERY == 1
+        self.status_reports += 1
+        if self._setting_int(10) & 1:
+            fields = ["MPos:" + _fmt(pos)]
+        else:
+            fields = ["WPos:" + _fmt(p - w for p, w in zip(pos, wco))]
+        fields.append(f"FS:{feed:.0f},0")
+        if pins:
+            fields.append("Pn:" + pins)
+        if with_wco:
+            fields.append("WCO:" + _fmt(wco))
+        return f"<{state}|" + "|".join(fields) + ">"
+
+    def _current_pos(self) -> List[float]:
+        """Machine position, interpolated inside the executing block."""
+        if not self._planner:
+            return list(self.mpos)
+        b = self._planner[0]
+        f = min(1.0, self._elapsed / b.duration) if b.duration > 0 else 0.0
+        return [s + (t - s) * f for s, t in zip(b.start, b.target)]
+
+    def _setting_int(self, code: int) -> int:
+        try:
+            return int(float(self.settings.get(code, 0)))
+        except (TypeError, ValueError):
+            return 0
+
+    def _setting_float(self, code: int, default: float) -> float:
+        try:
+            v = float(self.settings.get(code, default))
+        except (TypeError, ValueError):
+            return default
+        return v if v > 0 else default
+
+    # ------------------------------------------------------------------
+    #  Line execution
+    # ------------------------------------------------------------------
+
+    def _line_loop(self) -> None:
+        while self._running:
+            with self._lines_cond:
+                while self._running and not self._lines:
+                    self._lines_cond.wait(0.1)
+                if not self._running:
+                    break
+                line = self._lines.popleft()
+            self.lines_received += 1
+            gen = self._reset_gen
+            err = self._execute(line.strip(), gen)
+            if err is None or gen != self._reset_gen:
+                continue  # dropped by a soft reset
+            self._reply(err)
+
+    def _execute(self, line: str, gen: int) -> Optional[int]:
+        """Run one command line; returns an error code, 0 for ok, None if reset."""
+        if not line:
+            return 0
+        if line.startswith("$"):
+            return self._dollar(line.upper(), gen)
+        text = _COMMENT_RE.sub("", line).upper().replace(" ", "")
+        if not text:
+            return 0
+        with self._cond:
+            if self.state == "Alarm":
+                return ERR_ALARM_LOCK
+        words = _WORD_RE.findall(text)
+        if "".join(l + v for l, v in words) != text:
+            return ERR_EXPECTED_COMMAND
+        g_codes: List[float] = []
+        axes: Dict[int, float] = {}
+        dwell = None
+        for letter, raw in words:
+            try:
+                val = float(raw)
+            except ValueError:
+                return ERR_BAD_NUMBER
+            if letter == "G":
+                g_codes.append(val)
+            elif letter == "F":
+                self._feed = val * (25.4 if self._inch else 1.0)
+            elif letter in AXES:
+                axes[AXES.index(letter)] = val
+            elif letter == "P":
+                dwell = val
+            elif letter not in _KNOWN_LETTERS:
+                return ERR_UNSUPPORTED
+        set_wco = False
+        for g in g_codes:
+            if g in _MOTION:
+                self._motion = g
+            elif g == 90.0:
+                self._abs = True
+            elif g == 91.0:
+                self._abs = False
+            elif g == 20.0:
+                self._inch = True
+            elif g == 21.0:
+                self._inch = False
+            elif g == 92.0:
+                set_wco = True
+            elif g == 4.0:
+                return self._dwell(dwell or 0.0, gen)
+            elif g not in _IGNORED_G:
+                return ERR_UNSUPPORTED
+        if not axes:
+            return 0
+        scale = 25.4 if self._inch else 1.0
+        if set_wco:
+            with self._cond:
+                pos = self._current_pos() if not self._planner else list(self._planner[-1].target)
+                for i, v in axes.items():
+                    self.wco[i] = pos[i] - v * scale
+            return 0
+        target = list(self._target)
+        for i, v in axes.items():
+            v *= scale
+            # Program coordinates are work coordinates
+            target[i] = v + self.wco[i] if self._abs else target[i] + v
+        if self._motion != 0.0 and self._feed <= 0.0:
+            return ERR_UNDEFINED_FEED
+        return self._plan(target, gen)
+
+    def _plan(self, target: List[float], gen: int) -> Optional[int]:
+        start = list(self._target)
+        delta = [t - s for s, t in zip(start, target)]
+        length = math.sqrt(sum(d * d for d in delta))
+        self._target = target
+        if length < 1e-9:
+            return 0
+        duration, feed = self._block_time(delta, length)
+        block = _Block(start, target, duration * self.time_scale, feed)
+        with self._cond:
+            while (self._running and gen == self._reset_gen
+                   and len(self._planner) >= self.planner_blocks):
+                self._cond.wait(0.1)
+            if gen != self._reset_gen or not self._running:
+                return None
+            if self.state == "Alarm":
+                return ERR_ALARM_LOCK
+            self._planner.append(block)
+            depth = len(self._planner)
+            if depth > self.max_planner_depth:
+                self.max_planner_depth = depth
+            if self.state == "Idle":
+                self.state = "Run"
+            self._cond.notify_all()
+        return 0
+
+    def _block_time(self, delta: Sequence[float], length: float) -> tuple:
+        """Seconds for a rest-to-rest move and its nominal feed (units/min)."""
+        v = self._feed / 60.0 if self._motion != 0.0 else float("inf")
+        a = float("inf")
+        for i, d in enumerate(delta):
+            u = abs(d) / length
+            if u > 1e-12:
+                v = min(v, self._setting_float(110 + i, 1000.0) / 60.0 / u)
+                a = min(a, self._setting_float(120 + i, 100.0) / u)
+        if self.motion_model == "constant":
+            return length / v, v * 60.0
+        d_acc = v * v / a
+        if d_acc <= length:
+            return 2.0 * v / a + (length - d_acc) / v, v * 60.0
+        return 2.0 * math.sqrt(length / a), v * 60.0
+
+    def _wait_planner_empty(self, gen: int) -> bool:
+        with self._cond:
+            while self._running and gen == self._reset_gen and self._planner:
+                self._cond.wait(0.1)
+            return self._running and gen == self._reset_gen
+
+    def _dwell(self, seconds: float, gen: int) -> Optional[int]:
+        if not self._wait_planner_empty(gen):
+            return None
+        deadline = time.monotonic() + max(0.0, seconds) * self.time_scale
+        while time.monotonic() < deadline:
+            if gen != self._reset_gen or not self._running:
+                return None
+            time.sleep(min(0.01, max(0.0, deadline - time.monotonic())))
+        return 0
+
+    def _dollar(self, line: str, gen: int) -> Optional[int]:
+        with self._cond:
+            state = self.state
+        if state not in ("Idle", "Alarm") and line not in ("$G", "$I"):
+            return ERR_IDLE_ERROR
+        if line == "$$":
+            for code in sorted(self.settings):
+                v = self.settings[code]
+                txt = f"{v:.3f}" if isinstance(v, float) else str(v)
+                self._write(f"${code}={txt}")
+            return 0
+        if line == "$G":
+            mode = (f"G{int(self._motion)} G54 G17 G{20 if self._inch else 21} "
+                    f"G{90 if self._abs else 91} G94 M5 M9 T0 F{self._feed:g} S0")
+            self._write(f"[GC:{mode}]")
+            return 0
+        if line == "$I":
+            self._write(f"[VER:{self.banner}]")
+            return 0
+        if line == "$X":
+            with self._cond:
+                if self.state == "Alarm":
+                    self.state = "Idle"
+            self._write("[MSG:Caution: Unlocked]")
+            return 0
+        if line.startswith("$H"):
+            axes = line[2:]
+            if any(ax not in AXES for ax in axes):
+                return ERR_INVALID_STATEMENT
+            return self._home(axes or "".join(AXES), gen)
+        m = re.match(r"^\$(\d+)=(.+)$", line)
+        if m:
+            raw = m.group(2).strip()
+            try:
+                self.settings[int(m.group(1))] = float(raw)
+            except ValueError:
+                return ERR_BAD_NUMBER
+            return 0
+        return ERR_INVALID_STATEMENT
+
+    def _home(self, axes: str, gen: int) -> Optional[int]:
+        with self._cond:
+            self.state = "Home"
+        deadline = time.monotonic() + self.homing_time * self.time_scale
+        while time.monotonic() < deadline:
+            if gen != self._reset_gen or not self._running:
+                return None
+            time.sleep(0.01)
+        with self._cond:
+            for ax in axes:
+                i = AXES.index(ax)
+                self.mpos[i] = 0.0
+                self._target[i] = 0.0
+            self.state = "Idle"
+        return 0
+
+    # ------------------------------------------------------------------
+    #  Motion
+    # ------------------------------------------------------------------
+
+    def _motion_loop(self) -> None:
+        last = time.monotonic()
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                dt, last = now - last, now
+                if not self._planner or self._hold:
+                    if not self._planner and self.state == "Run":
+                        self.state = "Idle"
+                    self._cond.wait(0.01)
+                    last = time.monotonic()
+                    continue
+                self._elapsed += dt
+                block = self._planner[0]
+                if self._elapsed >= block.duration:
+                    self._elapsed -= block.duration
+                    self.mpos = list(block.target)
+                    self._planner.popleft()
+                    if not self._planner:
+                        self._elapsed = 0.0
+                    self._cond.notify_all()
+                    continue
+                self._cond.wait(min(0.005, block.duration - self._elapsed))
+
+
+def _fmt(values) -> str:
+    return ",".join(f"{v:.3f}" for v in values)
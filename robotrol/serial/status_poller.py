@@ -0,0 +1,274 @@
+"""
+Adaptive status-poll scheduler.
+
+:class:`StatusPoller` sends the backend's status query (``?`` or ``(TM)``)
+at a rate that follows the machine state from the last status report:
+fast while the machine moves (``Run``/``Jog``/``Home``/``Hold``), slow
+while it rests (``Idle``/``Alarm``/...).  At most one query is in flight;
+its reply round trip is measured.  After a real-time command (``!``,
+``~``, Ctrl-X) polling holds off briefly so the query does not race the
+command, and a motion line sent while idle pulls the next poll forward
+so the transition to ``Run`` shows up without waiting a slow interval.
+
+:class:`~robotrol.serial.client.SerialClient` owns one poller and feeds
+it every TX/RX line.  Timing logic lives in :meth:`StatusPoller.tick`,
+which takes the current time, so it can be driven without the thread.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+
+ACTIVE_STATES = frozenset({"Run", "Jog", "Home", "Hold", "Door"})
+REALTIME_COMMANDS = frozenset({"!", "~", "\x18"})
+
+DEFAULT_ACTIVE_INTERVAL = 0.1   # s, while moving
+DEFAULT_IDLE_INTERVAL = 1.0     # s, while resting
+DEFAULT_UNKNOWN_INTERVAL = 0.25  # s, before the first report
+
+
+def state_of(line: str) -> Optional[str]:
+    """Machine state of a status report (``"Hold"`` for ``<Hold:0|...>``)."""
+    if not line.startswith("<"):
+        return None
+    end = len(line)
+    for sep in ("|", ">", ":"):
+        i = line.find(sep, 1)
+        if 0 < i < end:
+            end = i
+    return line[1:end] or None
+
+
+class StatusPoller:
+    """Send status queries at a state-dependent rate and time their replies.
+
+    Parameters
+    ----------
+    send_fn : callable()
+        Sends one status query (e.g. ``client.send_line("?")``).
+    active_interval, idle_interval, unknown_interval : float
+        Poll period in seconds while moving, resting, and before the first
+        report.
+    reply_timeout : float
+        A query without reply for this long is counted as lost and the
+        next one may be sent.
+    realtime_holdoff : float
+        Pause after ``!`` / ``~``.
+    reset_holdoff : float
+        Pause after Ctrl-X (ended early by the controller's welcome banner).
+    history : int
+        Number of recent round trips kept for percentiles.
+    """
+
+    def __init__(
+        self,
+        send_fn: Callable[[], None],
+        active_interval: float = DEFAULT_ACTIVE_INTERVAL,
+        idle_interval: float = DEFAULT_IDLE_INTERVAL,
+        unknown_interval: float = DEFAULT_UNKNOWN_INTERVAL,
+        reply_timeout: float = 1.0,
+        realtime_holdoff: float = 0.25,
+        reset_holdoff: float = 2.0,
+        history: int = 256,
+    ):
+        self.send_fn = send_fn
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.unknown_interval = unknown_interval
+        self.reply_timeout = reply_timeout
+        self.realtime_holdoff = realtime_holdoff
+        self.reset_holdoff = reset_holdoff
+        self.enabled = True
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._rtt_ms: Deque[float] = deque(maxlen=max(1, history))
+        self.reset()
+
+    def reset(self, now: Optional[float] = None) -> None:
+        """Forget the machine state and counters (new connection)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.state = "Unknown"
+            self._last_sent = now
+            self._pending: Optional[float] = None
+            self._hold_until = 0.0
+            self._resetting = False
+            self._boost_at: Optional[float] = None
+            self.queries = 0
+            self.replies = 0
+            self.timeouts = 0
+            self._rtt_sum_ms = 0.0
+            self._rtt_max_ms = 0.0
+            self._rtt_ms.clear()
+
+    # ------------------------------------------------------------------
+    #  Thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the poll thread (no-op if running)."""
+        if self._running:
+            return
+        self.reset()
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name="status-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+        self._wake.set()
+        t, self._thread = self._thread, None
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=1.0)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def wake(self) -> None:
+        """Re-evaluate the schedule now (e.g. after changing :attr:`enabled`)."""
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while self._running:
+            due = self.tick(time.monotonic())
+            wait = None if due is None else max(0.0, due - time.monotonic())
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    # ------------------------------------------------------------------
+    #  Scheduling
+    # ------------------------------------------------------------------
+
+    def interval(self) -> float:
+        """Poll period for the current machine state."""
+        if self.state in ACTIVE_STATES:
+            return self.active_interval
+        if self.state == "Unknown":
+            return self.unknown_interval
+        return self.idle_interval
+
+    def tick(self, now: float) -> Optional[float]:
+        """Send a query if one is due at *now*; return the next due time.
+
+        *None* means nothing is scheduled (disabled) until :meth:`on_tx`,
+        :meth:`note_realtime` or a status line wakes the poller.
+        """
+        with self._lock:
+            if self._pending is not None and now - self._pending >= self.reply_timeout:
+                self._pending = None
+                self.timeouts += 1
+            if not self.enabled:
+                return None
+            due = self._due_locked()
+            if now < due:
+                return due
+            self._pending = now
+            self._last_sent = now
+            self._boost_at = None
+            self.queries += 1
+        self.send_fn()
+        with self._lock:
+            return self._due_locked()
+
+    def _due_locked(self) -> float:
+        if self._pending is not None:
+            return self._pending + self.reply_timeout
+        due = self._last_sent + self.interval()
+        if self._boost_at is not None:
+            due = min(due, self._boost_at)
+        return max(due, self._hold_until)
+
+    # ------------------------------------------------------------------
+    #  Serial hooks
+    # ------------------------------------------------------------------
+
+    def on_line(self, line: str, now: Optional[float] = None) -> None:
+        """Feed one received line (cheap for anything but status reports)."""
+        if line.startswith("<"):
+            state = state_of(line)
+            now = time.monotonic() if now is None else now
+            with self._lock:
+                if state:
+                    self.state = state
+                self._resetting = False
+                if self._pending is not None:
+                    rtt_ms = (now - self._pending) * 1000.0
+                    self._pending = None
+                    self.replies += 1
+                    self._rtt_ms.append(rtt_ms)
+                    self._rtt_sum_ms += rtt_ms
+                    if rtt_ms > self._rtt_max_ms:
+                        self._rtt_max_ms = rtt_ms
+            self._wake.set()
+        elif self._resetting and (line.startswith("Grbl") or line.startswith("[MSG:")):
+            # Controller is back after a soft reset
+            with self._lock:
+                self._resetting = False
+                self._hold_until = 0.0
+            self._wake.set()
+
+    def on_tx(self, line: str, now: Optional[float] = None) -> None:
+        """Note a transmitted line; motion while resting pulls the next poll in."""
+        if line in REALTIME_COMMANDS:
+            self.note_realtime(line, now)
+            return
+        if not line or line[0] in "?($" or self.state in ACTIVE_STATES:
+            return
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            boost = now + self.active_interval
+            if self._boost_at is None or boost < self._boost_at:
+                self._boost_at = boost
+        self._wake.set()
+
+    def note_realtime(self, cmd: str, now: Optional[float] = None) -> None:
+        """Hold off polling after real-time command *cmd* (``!``, ``~``, Ctrl-X)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if cmd == "\x18":
+                # Reset drops any query in flight and the known state
+                self._hold_until = now + self.reset_holdoff
+                self._pending = None
+                self._resetting = True
+                self.state = "Unknown"
+            else:
+                self._hold_until = max(self._hold_until, now + self.realtime_holdoff)
+                # Feed hold / resume change the state; poll right after the pause
+                self._boost_at = self._hold_until
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    #  Metrics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and reply round-trip times in ms."""
+        with self._lock:
+            samples = sorted(self._rtt_ms)
+            out: Dict[str, Any] = {
+                "state": self.state,
+                "interval_s": self.interval(),
+                "queries": self.queries,
+                "replies": self.replies,
+                "timeouts": self.timeouts,
+                "rtt_ms": None,
+            }
+            if samples:
+                n = len(samples)
+                out["rtt_ms"] = {
+                    "last": round(self._rtt_ms[-1], 2),
+                    "mean": round(self._rtt_sum_ms / self.replies, 2),
+                    "p50": round(samples[(n - 1) // 2], 2),
+                    "p95": round(samples[min(n - 1, int(0.95 * n))], 2),
+                    "max": round(self._rtt_max_ms, 2),
+                }
+            return out
@@ -0,0 +1,286 @@
+"""
+Serial TX writer thread.
+
+:class:`TxWriter` owns all writes to the port: callers enqueue lines and
+return immediately, the writer thread joins everything pending into one
+``write()`` call (fewer syscalls and USB transfers when the GUI, queue
+worker and gamepad send at the same time).  Real-time commands (``?``,
+``!``, ``~``, Ctrl-X) go into a separate lane that is written before any
+buffered line, so a feed hold never waits behind queued motion.
+
+The line lane is bounded: producers block for up to *put_timeout*
+seconds when it is full (callers on a GUI thread pass ``timeout=0``),
+then the line is dropped and counted.  A coalesced write must finish
+within the port's write timeout, so :func:`batch_bytes_for` sizes the
+batch from the baud rate; short writes are continued, and whatever a
+failed write did not send is counted as ``lost`` and reported through
+*on_error* — never only logged.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+REALTIME_CHARS = frozenset({"?", "!", "~", "\x18"})
+
+DEFAULT_MAX_LINES = 512
+DEFAULT_MAX_BATCH_BYTES = 1024
+MIN_BATCH_BYTES = 64
+
+
+def batch_bytes_for(baud: int, write_timeout: float, margin: float = 0.5) -> int:
+    """Largest batch that is written well within *write_timeout* seconds.
+
+    A serial byte takes 10 bit times (8N1), so the port moves ``baud / 10``
+    bytes per second; *margin* leaves room for USB latency and a device
+    that is briefly not draining (115200 baud, 0.2 s -> 1152 bytes).
+    """
+    return max(MIN_BATCH_BYTES, int(baud / 10.0 * write_timeout * margin))
+
+
+class TxWriter:
+    """Background writer with line coalescing and a real-time priority lane.
+
+    Parameters
+    ----------
+    write_fn : callable(bytes)
+        Writes to the port (e.g. ``serial.Serial.write``); exceptions are
+        logged and counted.
+    on_written : callable(str), optional
+        Called with the text of every item after it has been written
+        (session recording).
+    on_error : callable(Exception, list of str), optional
+        Called from the writer thread when a write fails, with the texts
+        of the items that were not (completely) sent.
+    max_lines : int
+        Capacity of the line lane.
+    max_batch_bytes : int
+        Upper bound on a single coalesced write; keep it below what the
+        port writes within its write timeout (:func:`batch_bytes_for`).
+    put_timeout : float
+        How long :meth:`put_line` blocks on a full lane before dropping.
+    """
+
+    def __init__(
+        self,
+        write_fn: Callable[[bytes], Any],
+        on_written: Optional[Callable[[str], None]] = None,
+        on_error: Optional[Callable[[Exception, List[str]], None]] = None,
+        max_lines: int = DEFAULT_MAX_LINES,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+        put_timeout: float = 2.0,
+    ):
+        self.write_fn = write_fn
+        self.on_written = on_written
+        self.on_error = on_error
+        self.max_lines = max(1, max_lines)
+        self.max_batch_bytes = max(1, max_batch_bytes)
+        self.put_timeout = put_timeout
+
+        self._cond = threading.Condition()
+        self._lines: Deque[Tuple[bytes, str]] = deque()
+        self._realtime: Deque[Tuple[bytes, str]] = deque()
+        self._busy = False
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.writes = 0
+        self.lines_written = 0
+        self.realtime_written = 0
+        self.bytes_written = 0
+        self.max_batch = 0
+        self.dropped = 0
+        self.errors = 0
+        self.lost = 0
+
+    # ------------------------------------------------------------------
+    #  Thread
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the writer thread (no-op if running)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name="serial-tx", daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = False, timeout: float = 1.0) -> None:
+        """Stop the thread; pending items are written first if *drain*."""
+        if drain:
+            self.wait_empty(timeout)
+        with self._cond:
+            self._running = False
+            self._lines.clear()
+            self._realtime.clear()
+            self._cond.notify_all()
+        t, self._thread = self._thread, None
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # ------------------------------------------------------------------
+    #  Producers
+    # ------------------------------------------------------------------
+
+    def put_line(self, text: str, timeout: Optional[float] = None) -> bool:
+        """Queue *text* plus newline; False if not running or dropped.
+
+        On a full lane this blocks for *timeout* seconds (default
+        :attr:`put_timeout`); ``0`` drops immediately.
+        """
+        item = ((text + "\n").encode("utf-8"), text)
+        with self._cond:
+            if not self._running:
+                return False
+            if len(self._lines) >= self.max_lines:
+                wait = self.put_timeout if timeout is None else timeout
+                if wait > 0:
+                    self._cond.wait_for(
+                        lambda: len(self._lines) < self.max_lines or not self._running,
+                        timeout=wait,
+                    )
+                if not self._running:
+                    return False
+                if len(self._lines) >= self.max_lines:
+                    self.dropped += 1
+                    logger.error("TX queue full, dropped: %s", text)
+                    return False
+            self._lines.append(item)
+            self._cond.notify_all()
+        return True
+
+    def put_realtime(self, char: str) -> bool:
+        """Queue a real-time command; it is written ahead of queued lines."""
+        with self._cond:
+            if not self._running:
+                return False
+            self._realtime.append((char.encode("latin-1"), char))
+            self._cond.notify_all()
+        return True
+
+    def discard_lines(self) -> int:
+        """Drop all queued (unwritten) lines, e.g. before a soft reset."""
+        with self._cond:
+            n = len(self._lines)
+            self._lines.clear()
+            self._cond.notify_all()
+        return n
+
+    def wait_empty(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued has been written."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._lines or self._realtime or self._busy) or not self._running,
+                timeout=timeout,
+            )
+
+    @property
+    def pending(self) -> int:
+        return len(self._lines) + len(self._realtime)
+
+    # ------------------------------------------------------------------
+    #  Writer loop
+    # ------------------------------------------------------------------
+
+    def _take_batch_locked(self) -> List[Tuple[bytes, str]]:
+        batch = list(self._realtime)
+        self._realtime.clear()
+        size = sum(len(d) for d, _ in batch)
+        lines = self._lines
+        while lines and (size == 0 or size + len(lines[0][0]) <= self.max_batch_bytes):
+            item = lines.popleft()
+            size += len(item[0])
+            batch.append(item)
+        return batch
+
+    def _loop(self) -> None:
+        cond = self._cond
+        while True:
+            with cond:
+                cond.wait_for(lambda: self._lines or self._realtime or not self._running)
+                if not self._running:
+                    break
+                batch = self._take_batch_locked()
+                self._busy = True
+                # Room in the line lane for blocked producers
+                cond.notify_all()
+            data = b"".join(d for d, _ in batch)
+            sent, error = self._write_all(data)
+            if sent:
+                self.writes += 1
+                self.bytes_written += sent
+            if error is None and len(batch) > self.max_batch:
+                self.max_batch = len(batch)
+            cb = self.on_written
+            end = 0
+            for n, (d, text) in enumerate(batch):
+                end += len(d)
+                if end > sent:
+                    self._report_lost(error, [t for _, t in batch[n:]])
+                    break
+                if d.endswith(b"\n"):
+                    self.lines_written += 1
+                else:
+                    self.realtime_written += 1
+                if cb is not None:
+                    cb(text)
+            with cond:
+                self._busy = False
+                cond.notify_all()
+
+    def _write_all(self, data: bytes) -> Tuple[int, Optional[Exception]]:
+        """Write *data*, continuing after short writes.
+
+        Returns the number of bytes sent and the error that stopped the
+        write (``None`` when everything was sent).
+        """
+        sent = 0
+        while sent < len(data):
+            try:
+                n = self.write_fn(data[sent:] if sent else data)
+            except Exception as e:
+                return sent, e
+            if not isinstance(n, int):
+                return len(data), None
+            if n <= 0:
+                return sent, IOError(f"write stalled after {sent} of {len(data)} bytes")
+            sent += n
+        return sent, None
+
+    def _report_lost(self, error: Exception, texts: List[str]) -> None:
+        self.errors += 1
+        self.lost += len(texts)
+        logger.error("Send error, %d item(s) not sent (first: %r): %s",
+                     len(texts), texts[0], error)
+        cb = self.on_error
+        if cb is not None:
+            try:
+                cb(error, texts)
+            except Exception as e:
+                logger.warning("on_error callback failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        items = self.lines_written + self.realtime_written
+        return {
+            "writes": self.writes,
+            "lines": self.lines_written,
+            "realtime": self.realtime_written,
+            "bytes": self.bytes_written,
+            "items_per_write": round(items / self.writes, 2) if self.writes else 0.0,
+            "max_batch": self.max_batch,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "lost": self.lost,
+            "pending": self.pending,
+        }
@@ -1,55 +1,50 @@
 import math
 from pathlib import Path
 
+from robotrol.gcode.program import (
+    II, IJ, IK, IX, IY, IZ, MODE_G17, MODE_G18, MODE_G19,
+    OP_G0, OP_G1, OP_G2, OP_G3, load_program,
+)
 
-def _parse_words(line: str):
-    out = {}
-    for part in line.strip().split():
-        if not part:
-            continue
-        k = part[0].upper()
-        v = part[1:]
-        out[k] = v
-    return out
+
+PLANE_MASK = MODE_G17 | MODE_G18 | MODE_G19
 
 
 def _validate_file(path: Path):
     if not path.is_file():
         raise SystemExit(f"missing example file: {path}")
 
-    lines = [ln.strip() for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip() and not ln.strip().startswith(";")]
-    if not any(ln in {"G17", "G18", "G19"} for ln in lines):
+    prog = load_program(str(path))
+    if not any(m & PLANE_MASK for m in prog.modes):
         raise SystemExit(f"missing plane select (G17/18/19) in {path}")
 
     x = y = z = 0.0
-    plane = "G17"
+    plane = MODE_G17
     checked = 0
 
-    for ln in lines:
-        up = ln.upper()
-        if up in {"G17", "G18", "G19"}:
-            plane = up
-            continue
-        if up.startswith("G0 ") or up.startswith("G1 "):
-            words = _parse_words(ln)
-            x = float(words.get("X", x))
-            y = float(words.get("Y", y))
-            z = float(words.get("Z", z))
+    for row in range(len(prog)):
+        mode = prog.modes[row] & PLANE_MASK
+        if mode:
+            plane = mode
+        op = prog.ops[row]
+        if op in (OP_G0, OP_G1):
+            x = _word(prog, row, IX, x)
+            y = _word(prog, row, IY, y)
+            z = _word(prog, row, IZ, z)
             continue
-        if up.startswith("G2 ") or up.startswith("G3 "):
-            words = _parse_words(ln)
-            x1 = float(words.get("X", x))
-            y1 = float(words.get("Y", y))
-            z1 = float(words.get("Z", z))
-            i = float(words.get("I", 0.0))
-            j = float(words.get("J", 0.0))
-            k = float(words.get("K", 0.0))
-
-            if plane == "G17":
+        if op in (OP_G2, OP_G3):
+            x1 = _word(prog, row, IX, x)
+            y1 = _word(prog, row, IY, y)
+            z1 = _word(prog, row, IZ, z)
+            i = _word(prog, row, II, 0.0)
+            j = _word(prog, row, IJ, 0.0)
+            k = _word(prog, row, IK, 0.0)
+
+            if plane == MODE_G17:
                 c0, c1 = x + i, y + j
                 r0 = math.hypot(x - c0, y - c1)
                 r1 = math.hypot(x1 - c0, y1 - c1)
-            elif plane == "G18":
+            elif plane == MODE_G18:
                 c0, c1 = x + i, z + k
                 r0 = math.hypot(x - c0, z - c1)
                 r1 = math.hypot(x1 - c0, z1 - c1)
@@ -59,7 +54,9 @@ def _validate_file(path: Path):
                 r1 = math.hypot(y1 - c0, z1 - c1)
 
             if abs(r0 - r1) > 1e-6:
-                raise SystemExit(f"arc radius mismatch in {path}: {ln}")
+                raise SystemExit(
+                    f"arc radius mismatch in {path} (line {prog.src_line[row]})"
+                )
             x, y, z = x1, y1, z1
             checked += 1
 
@@ -68,6 +65,11 @@ def _validate_file(path: Path):
     print(f"OK: checked {checked} arc moves in {path}")
 
 
+def _word(prog, row: int, col: int, default: float) -> float:
+    v = prog.word(row, col)
+    return default if v is None else v
+
+
 def main():
     files = [
         Path("data/examples/plane_g2g3_3dp_example.gcode"),
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Inspect and replay recorded serial sessions (``*.rsl``).
+
+Subcommands:
+- ``stats``  line counts, duration and RX rate
+- ``dump``   print the records as text (``t  TX|RX  line``)
+- ``bench``  replay the RX stream through the status/settings parsers at
+  ``--speed`` (1 = real time, 0 = as fast as possible) and report the
+  achieved line rate and pacing lag
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from robotrol.serial.protocol import parse_settings_line, parse_status_line, parse_softmax
+from robotrol.serial.session_log import KIND_TX, SessionReplayer, iter_session, session_stats
+
+
+def _parse_pipeline(line: str) -> None:
+    """The parsing part of RobotrolApp._on_serial_line, without the GUI."""
+    if line == "ok" or line.startswith("error:"):
+        return
+    parse_softmax(line)
+    parse_settings_line(line)
+    if line.startswith("<") and line.endswith(">"):
+        parse_status_line(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("stats")
+    p.add_argument("session")
+    p = sub.add_parser("dump")
+    p.add_argument("session")
+    p = sub.add_parser("bench")
+    p.add_argument("session")
+    p.add_argument("--speed", type=float, default=0.0, help="1 = real time, 0 = max speed")
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(json.dumps(session_stats(args.session), indent=2))
+    elif args.command == "dump":
+        for t, kind, line in iter_session(args.session):
+            print(f"{t:12.6f}  {'TX' if kind == KIND_TX else 'RX'}  {line}")
+    else:
+        result = SessionReplayer(args.session, speed=args.speed).replay([_parse_pipeline])
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Inspect and replay recorded telemetry logs (``*.rtl``).
+
+Subcommands:
+- ``stats``  record counts per topic, duration and size
+- ``dump``   print the records as text (``t  topic  data``)
+- ``play``   replay into RoboSim through a UDPMirror (UDP JSON/binary or
+  shared memory) and/or a telemetry hub at ``--speed`` (1-100, 0 = as
+  fast as possible), starting at ``--start`` seconds
+- ``bench``  replay unpaced through the chosen transport as a load
+  generator and report the achieved record rate
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from robotrol.visualizer.mailbox import TelemetryMailbox
+from robotrol.visualizer.telemetry_hub import TelemetryHub
+from robotrol.visualizer.telemetry_log import (
+    TelemetryReplayer, iter_telemetry, mailbox_sink, telemetry_stats, udp_sink,
+)
+from robotrol.visualizer.udp_mirror import UDPMirror
+
+
+def _add_transport(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--udp", default="127.0.0.1:9999", help="visualizer HOST:PORT")
+    p.add_argument("--binary", action="store_true", help="binary UDP frames")
+    p.add_argument("--transport", choices=("udp", "shm"), default="udp")
+    p.add_argument("--hub", type=int, default=None, help="also serve a telemetry hub on PORT")
+
+
+def _sinks(args, mirror_out: list, hub_out: list) -> list:
+    host, _, port = args.udp.rpartition(":")
+    mirror = UDPMirror((host or "127.0.0.1", int(port)), binary=args.binary,
+                       transport=args.transport)
+    mirror_out.append(mirror)
+    sinks = [udp_sink(mirror)]
+    if args.hub is not None:
+        hub = TelemetryHub(port=args.hub)
+        hub.start()
+        hub_out.append(hub)
+        sinks.append(hub.publish)
+    return sinks
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("stats")
+    p.add_argument("log")
+    p = sub.add_parser("dump")
+    p.add_argument("log")
+    p = sub.add_parser("play")
+    p.add_argument("log")
+    p.add_argument("--speed", type=float, default=1.0, help="1 = real time, 0 = max speed")
+    p.add_argument("--start", type=float, default=0.0, help="seek to SECONDS first")
+    p.add_argument("--end", type=float, default=None, help="stop at SECONDS")
+    _add_transport(p)
+    p = sub.add_parser("bench")
+    p.add_argument("log")
+    p.add_argument("--mailbox-only", action="store_true",
+                   help="decode into an in-process mailbox, no sockets")
+    _add_transport(p)
+    args = parser.parse_args(argv)
+
+    if args.command == "stats":
+        print(json.dumps(telemetry_stats(args.log), indent=2))
+        return 0
+    if args.command == "dump":
+        for t, topic, data in iter_telemetry(args.log):
+            print(f"{t:12.6f}  {topic:<10}  {json.dumps(data)}")
+        return 0
+
+    mirrors: list = []
+    hubs: list = []
+    try:
+        if args.command == "bench" and args.mailbox_only:
+            mailbox = TelemetryMailbox()
+            result = TelemetryReplayer(args.log, speed=0).replay([mailbox_sink(mailbox)])
+            result["mailbox"] = mailbox.stats()
+        else:
+            sinks = _sinks(args, mirrors, hubs)
+            if args.command == "bench":
+                result = TelemetryReplayer(args.log, speed=0).replay(sinks)
+            else:
+                replayer = TelemetryReplayer(args.log, speed=args.speed)
+                try:
+                    result = replayer.replay(sinks, start=args.start, end=args.end)
+                except KeyboardInterrupt:
+                    replayer.stop()
+                    result = {"position_s": round(replayer.position, 3), "interrupted": True}
+        print(json.dumps(result, indent=2))
+    finally:
+        for m in mirrors:
+            m.close()
+        for h in hubs:
+            h.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
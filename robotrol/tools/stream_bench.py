@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Streaming latency/throughput benchmark against the virtual controller.
+
+Starts a :class:`~robotrol.serial.simulator.VirtualController` on a pty,
+attaches the real :class:`~robotrol.serial.client.SerialClient` to it and
+streams a synthetic program through :class:`~robotrol.queue.gcode_queue.GCodeQueue`.
+Prints the run summary from the queue metrics (lines/s, RTT percentiles,
+starving time) and the TX writer counters; ``--json`` prints it as one
+JSON object for CI.
+
+Needs pyserial and a POSIX system (pty).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from robotrol.queue.gcode_queue import GCodeQueue
+from robotrol.serial.client import SerialClient
+from robotrol.serial.simulator import VirtualController
+
+
+def _program(n: int) -> list[str]:
+    lines = ["G21 G90", "F3000"]
+    for i in range(n):
+        a = 2.0 * math.pi * i / 200.0
+        lines.append(f"G1 X{20.0 * math.cos(a):.3f} Y{20.0 * math.sin(a):.3f}")
+    return lines
+
+
+def run(lines: int, time_scale: float, planner_blocks: int, timeout: float) -> dict:
+    with VirtualController(time_scale=time_scale, planner_blocks=planner_blocks) as vc:
+        client = SerialClient()
+        client.connect(vc.port)
+        # Let the connect-time $$ / ? responses drain before the run
+        time.sleep(0.3)
+        queue = GCodeQueue(client.send_line, timeout=timeout)
+
+        def on_line(line: str) -> None:
+            if line == "ok":
+                queue.notify_ack()
+            elif line.startswith("error:"):
+                queue.notify_error(line)
+            elif line.startswith("ALARM"):
+                queue.notify_alarm(line)
+
+        client.listeners.append(on_line)
+        queue.enqueue_many(_program(lines))
+        queue.start_run()
+        time.sleep(0.05)
+        while queue.running:
+            time.sleep(0.05)
+        tx_stats = client.writer.stats()
+        client.disconnect()
+        summary = dict(queue.metrics.last_run or {})
+        summary["tx"] = tx_stats
+        summary["controller"] = vc.stats()
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=2000, help="program length")
+    parser.add_argument("--time-scale", type=float, default=0.0,
+                        help="simulated motion time multiplier (0 = protocol only)")
+    parser.add_argument("--planner-blocks", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=10.0, help="per-line ACK timeout")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    s = run(args.lines, args.time_scale, args.planner_blocks, args.timeout)
+    if args.json:
+        print(json.dumps(s))
+    else:
+        rtt = s.get("rtt_ms", {})
+        print(f"status={s.get('status')} acked={s.get('acked')}/{s.get('total')} "
+              f"in {s.get('duration_s')} s -> {s.get('lines_per_s')} lines/s")
+        print(f"RTT ms: p50={rtt.get('p50')} p95={rtt.get('p95')} p99={rtt.get('p99')} "
+              f"max={rtt.get('max')}; starving {s.get('starving_s')} s")
+        print(f"tx writer: {s.get('tx')}")
+        print(f"controller: {s.get('controller')}")
+    return 0 if s.get("status") == "finished" else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,118 @@
+"""
+Latest-state mailbox between the visualizer's UDP thread and its Tk loop.
+
+The socket thread hands every datagram to :meth:`TelemetryMailbox.put_line`,
+which parses it once and merges it into the pending state:
+
+* ``abs`` (joint pose) — the newest values win, field by field;
+* ``fixed_frame`` and ``robot_profile`` — the newest message wins;
+* ``path_fixed`` / ``path_kin`` — a full path replaces whatever is
+  pending; a message with ``"append": true`` extends the pending path (or
+  is kept as an append if no full path is pending).  Merged appends
+  carry the newest ``seq`` and the first one as ``seq_first``.
+
+The Tk loop calls :meth:`TelemetryMailbox.drain` once per frame and
+applies at most one message per kind, so a 100+ Hz joint stream never
+queues up work for the viewer; superseded messages are only counted.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+
+PATH_TYPES = ("path_fixed", "path_kin")
+# Apply order on drain: the profile changes FK, the pose comes last
+APPLY_ORDER = ("robot_profile", "fixed_frame", "path_fixed", "path_kin", "abs")
+
+
+class TelemetryMailbox:
+    """Merge visualizer messages from any thread; drain them once per frame."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._last: Any = None
+        self._last_seq = 0
+        self.received = 0
+        self.merged = 0
+        self.parse_errors = 0
+        self.drains = 0
+
+    def put_line(self, line: str) -> bool:
+        """Parse one datagram and merge it; False if it is not a JSON message."""
+        try:
+            msg = json.loads(line)
+        except ValueError:
+            msg = None
+        if not isinstance(msg, dict):
+            with self._lock:
+                self.parse_errors += 1
+                self._last = line
+                self._last_seq += 1
+            return False
+        self.put(msg)
+        return True
+
+    def put(self, msg: Dict[str, Any]) -> None:
+        """Merge an already decoded message (any thread)."""
+        kind = msg.get("type")
+        with self._lock:
+            self.received += 1
+            self._last = msg
+            self._last_seq += 1
+            if kind is None:
+                return
+            old = self._pending.get(kind)
+            if old is None:
+                self._pending[kind] = msg
+                return
+            self.merged += 1
+            if kind in PATH_TYPES and msg.get("append"):
+                merged = dict(old)
+                merged["pts"] = list(old.get("pts", [])) + list(msg.get("pts", []))
+                if "seq" in msg:
+                    # Merged appends keep the first seq for gap detection
+                    if old.get("append") and "seq" in old:
+                        merged.setdefault("seq_first", old["seq"])
+                    merged["seq"] = msg["seq"]
+                self._pending[kind] = merged
+            elif kind == "abs":
+                # Newest pose wins field by field (e.g. "S" is not always sent)
+                merged = dict(old)
+                merged.update(msg)
+                self._pending[kind] = merged
+            else:
+                self._pending[kind] = msg
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Pending messages (newest per kind) in apply order (Tk thread)."""
+        with self._lock:
+            if not self._pending:
+                return []
+            pending, self._pending = self._pending, {}
+            self.drains += 1
+        out = [pending.pop(k) for k in APPLY_ORDER if k in pending]
+        out.extend(pending.values())  # unknown kinds, arrival order
+        return out
+
+    def last(self) -> Tuple[int, Any]:
+        """``(counter, message)`` of the newest datagram, for a status label.
+
+        *message* is the decoded dict, or the raw text if it was not JSON;
+        the counter changes whenever a new datagram arrived.
+        """
+        with self._lock:
+            return self._last_seq, self._last
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "received": self.received,
+                "merged": self.merged,
+                "parse_errors": self.parse_errors,
+                "drains": self.drains,
+                "pending": len(self._pending),
+            }
@@ -0,0 +1,143 @@
+"""
+Bounded path store for the visualizer's ``path_fixed`` / ``path_kin``.
+
+Path messages are applied incrementally instead of rebuilding the path
+from the full point list:
+
+* a message without ``"append"`` replaces the path (an empty ``pts``
+  list clears it);
+* ``"append": true`` adds only the new points.
+
+Senders number the operations of each path with a 16-bit ``seq``.  An
+append at most :data:`STALE_WINDOW` behind the last applied ``seq`` is a
+late duplicate and is dropped; an append that does not follow on
+directly counts as a gap (datagrams were lost) but is still shown.
+Replacements are always applied, so a restarted sender resyncs with its
+first full path.  Messages without ``seq`` (older senders) are applied
+unconditionally.
+
+Points live in a ring buffer of *capacity* entries; the oldest points
+fall off.  :meth:`PathRing.display` returns at most *max_display*
+points, decimated by a stride anchored at each point's absolute index
+so the kept points do not jump around while the path grows.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+SEQ_MOD = 1 << 16
+STALE_WINDOW = 1024
+
+DEFAULT_CAPACITY = 20_000
+DEFAULT_MAX_DISPLAY = 2_000
+
+Point = Tuple[float, ...]
+
+
+def next_seq(seq: int) -> int:
+    """Sequence number following *seq* (16-bit wrap)."""
+    return (seq + 1) % SEQ_MOD
+
+
+class PathRing:
+    """Ring-buffered path with seq-checked replace/append operations.
+
+    Parameters
+    ----------
+    capacity : int
+        Points kept; older points are discarded.
+    max_display : int, optional
+        Upper bound for :meth:`display`; *None* disables decimation.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY,
+                 max_display: Optional[int] = DEFAULT_MAX_DISPLAY):
+        self.capacity = max(1, int(capacity))
+        self.max_display = max_display
+        self._pts: deque = deque(maxlen=self.capacity)
+        self._base = 0          # absolute index of self._pts[0]
+        self._seq: Optional[int] = None
+        self.version = 0
+        self._display: List[Point] = []
+        self._display_version = 0
+        self.gaps = 0
+        self.stale = 0
+
+    def __len__(self) -> int:
+        return len(self._pts)
+
+    def points(self) -> List[Point]:
+        """All stored points, oldest first."""
+        return list(self._pts)
+
+    def replace(self, pts: Sequence[Point]) -> None:
+        self._base += len(self._pts)
+        self._pts.clear()
+        self._extend(pts)
+        self.version += 1
+
+    def clear(self) -> None:
+        self.replace(())
+
+    def append(self, pts: Sequence[Point]) -> None:
+        if pts:
+            self._extend(pts)
+            self.version += 1
+
+    def _extend(self, pts: Sequence[Point]) -> None:
+        self._base += max(0, len(self._pts) + len(pts) - self.capacity)
+        self._pts.extend(pts)
+
+    def apply(self, msg: Mapping[str, Any], pts: Sequence[Point]) -> bool:
+        """Apply a path message whose points were already converted.
+
+        *msg* supplies ``append``, ``seq`` and (for appends merged by the
+        mailbox) ``seq_first``.  Returns False if the message was dropped.
+        """
+        seq = msg.get("seq")
+        if not msg.get("append"):
+            self.replace(pts)
+            self._seq = seq
+            return True
+        if seq is not None and self._seq is not None:
+            first = msg.get("seq_first", seq)
+            behind = (self._seq - first) % SEQ_MOD
+            if behind < STALE_WINDOW:
+                self.stale += 1
+                return False
+            if first != next_seq(self._seq):
+                self.gaps += 1
+        self.append(pts)
+        if seq is not None:
+            self._seq = seq
+        return True
+
+    def display(self) -> List[Point]:
+        """Points to draw; the same list object until the path changes."""
+        if self._display_version == self.version:
+            return self._display
+        n = len(self._pts)
+        limit = self.max_display
+        if not limit or n <= limit:
+            shown = list(self._pts)
+        else:
+            stride = -(-n // limit)
+            offset = (-self._base) % stride
+            pts = list(self._pts)
+            shown = pts[offset::stride]
+            if not shown or shown[-1] is not pts[-1]:
+                shown.append(pts[-1])  # always end at the newest point
+        self._display = shown
+        self._display_version = self.version
+        return shown
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "points": len(self._pts),
+            "total": self._base + len(self._pts),
+            "gaps": self.gaps,
+            "stale": self.stale,
+        }
@@ -10,6 +10,11 @@ from dataclasses import dataclass
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from robotrol.visualizer.ik_rotosim import RotoSimIK, IKLimits
+from robotrol.visualizer.mailbox import TelemetryMailbox
+from robotrol.visualizer.path_store import PathRing
+from robotrol.visualizer.shm_channel import ShmTelemetryReader
+from robotrol.visualizer.scene import SceneRenderer, TOOL_ARROW_LEN
+from robotrol.visualizer.telemetry_proto import TelemetryDecoder, is_binary
 
 # World coordinates are in cm, UI step sizes are in mm
 MM_TO_WORLD = 0.1  # 1 mm = 0.1 cm
@@ -18,6 +23,7 @@ VIEW_LIMIT_XY = 70.0
 VIEW_LIMIT_Z  = 95.0
 GRIPPER_LEN   = 6.0
 GRIPPER_MAX_GAP = 8.0   # 4 cm je Seite
+FRAME_MS = 33           # redraw check interval (~30 FPS); draws only when dirty
 
 # ------------------ Models ------------------
 @dataclass
@@ -239,9 +245,11 @@ def tcp_pose_5(geom, pose):
 
 # ------------------ UDP Listener ------------------
 class UDPListener(threading.Thread):
-    def __init__(self, cb):
+    """Feed JSON text and binary telemetry datagrams into *mailbox*."""
+    def __init__(self, mailbox):
         super().__init__(daemon=True)
-        self.cb = cb
+        self.mailbox = mailbox
+        self.decoder = TelemetryDecoder()
         self.start()
     def run(self):
         s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -250,9 +258,14 @@ class UDPListener(threading.Thread):
         while True:
             try:
                 data,_=s.recvfrom(65535)
+                if is_binary(data):
+                    msg = self.decoder.feed(data)
+                    if msg is not None:
+                        self.mailbox.put(msg)
+                    continue
                 line=data.decode("utf-8","replace").strip()
                 if line:
-                    self.cb(line)
+                    self.mailbox.put_line(line)
             except Exception:
                 # UDP noise ignorieren
                 time.sleep(0.05)
@@ -275,12 +288,17 @@ class VisualizerApp(ttk.Frame):
         )
         self.pose.servo = 1000.0
         self.gcode_lines = []
-        self.path_fixed = []
-        self.path_kin = []
+        # Ring-buffered, seq-checked paths; decimated for drawing
+        self.paths = {"path_fixed": PathRing(), "path_kin": PathRing()}
         self.fixed_frame = None
+        self._dirty = True      # set whenever pose/paths/frame/profile change
+        # UDP thread only parses + merges; the Tk loop drains once per frame
+        self.mailbox = TelemetryMailbox()
+        self.shm_reader = ShmTelemetryReader()
+        self._udp_label_seq = 0
         self._build_ui()
-        UDPListener(self.on_udp)
-        self.after(50, self.loop)
+        UDPListener(self.mailbox)
+        self.after(FRAME_MS, self.loop)
 
     def _apply_robot_profile(self, data: dict):
         try:
@@ -377,6 +395,7 @@ class VisualizerApp(ttk.Frame):
                 self.robot_joint_order = order
 
             self.robot_profile_name = str(data.get("profile", self.robot_profile_name))
+            self._dirty = True
             self.log(
                 f" Profil {self.robot_profile_name}: "
                 f"base={self.geom.base_height:.2f}cm L1={self.geom.L1:.2f}cm "
@@ -434,21 +453,29 @@ class VisualizerApp(ttk.Frame):
         self.ax_xy = fig.add_subplot(gs[1, 0])
         self.ax3d  = fig.add_subplot(gs[1, 1], projection="3d")
 
-        # Aspect & Labels
-        self.ax_yz.set_aspect(0.8)
-        self.ax_xz.set_aspect(0.8)
-        self.ax_xy.set_aspect("equal")
-
+        # Static axes setup (limits never change, so backgrounds can be cached)
         for ax, title in [
-            (self.ax_yz, "YZ View"),
-            (self.ax_xz, "XZ View"),
-            (self.ax_xy, "XY View")
+            (self.ax_yz, "YZ"),
+            (self.ax_xz, "XZ"),
+            (self.ax_xy, "XY")
         ]:
+            ax.set_xlim(-80, 80)
+            ax.set_ylim(*((-80, 80) if title == "XY" else (0, 100)))
+            ax.set_aspect("equal")
             ax.set_title(title)
-            ax.grid(True, linestyle=":", color="#888", alpha=0.5)
+            ax.grid(True, linestyle=":", color="#999", alpha=0.4)
 
-        # Canvas einbetten
+        # Canvas einbetten; all dynamic artists live in the scene renderer
         self.canvas = FigureCanvasTkAgg(fig, master=self)
+        self.scene = SceneRenderer(
+            self.canvas, self.ax3d,
+            {"xy": self.ax_xy, "yz": self.ax_yz, "xz": self.ax_xz},
+        )
+        self.ax3d.set_xlim(-VIEW_LIMIT_XY, VIEW_LIMIT_XY)
+        self.ax3d.set_ylim(-VIEW_LIMIT_XY, VIEW_LIMIT_XY)
+        self.ax3d.set_zlim(0, VIEW_LIMIT_Z)
+        self.ax3d.set_box_aspect([1, 1, VIEW_LIMIT_Z / VIEW_LIMIT_XY])
+        self.ax3d.set_title("3D View")
         self.canvas.draw()
         #  Less vertical expand so G-code area keeps enough space
         self.canvas.get_tk_widget().pack(fill="both", expand=False, padx=6, pady=4)
@@ -488,36 +515,42 @@ class VisualizerApp(ttk.Frame):
 
     # ------------------ Event handlers ------------------
     def on_udp(self, line):
-        # Timestamp entfernen, falls vorhanden
-        try:
-            d = json.loads(line)
-            if "timestamp" in d:
-                d.pop("timestamp")
-            clean = json.dumps(d)
-            self.udp_recv_var.set(f"UDP: {clean}")
-        except (json.JSONDecodeError, KeyError, TypeError):
-            self.udp_recv_var.set(f"UDP: {line}")
+        """Queue one datagram (thread-safe); applied by :meth:`loop`."""
+        self.mailbox.put_line(line)
+
+    def _drain_udp(self):
+        """Apply the newest pending message of each kind (Tk thread)."""
+        for data in self.mailbox.drain():
+            self._apply_message(data)
+        # Same-host app publishing through shared memory (if it does)
+        for data in self.shm_reader.poll():
+            self._apply_message(data)
+        seq, last = self.mailbox.last()
+        if seq != self._udp_label_seq:
+            self._udp_label_seq = seq
+            # Timestamp entfernen, falls vorhanden
+            if isinstance(last, dict):
+                shown = {k: v for k, v in last.items() if k not in ("timestamp", "t", "seq")}
+                try:
+                    text = json.dumps(shown)
+                except (TypeError, ValueError):
+                    text = str(shown)
+            else:
+                text = str(last)
+            self.udp_recv_var.set(f"UDP: {text[:300]}")
+
+    def _apply_message(self, data):
         try:
-            data = json.loads(line)
-            if data.get("type") == "path_fixed":
-                pts = data.get("pts", [])
+            store = self.paths.get(data.get("type"))
+            if store is not None:
                 parsed = []
-                for p in pts:
+                for p in data.get("pts", []):
                     if len(p) >= 4:
                         parsed.append((p[0] * MM_TO_WORLD, p[1] * MM_TO_WORLD, p[2] * MM_TO_WORLD, float(p[3])))
                     elif len(p) >= 3:
                         parsed.append((p[0] * MM_TO_WORLD, p[1] * MM_TO_WORLD, p[2] * MM_TO_WORLD, 0.0))
-                self.path_fixed = parsed
-                return
-            if data.get("type") == "path_kin":
-                pts = data.get("pts", [])
-                parsed = []
-                for p in pts:
-                    if len(p) >= 4:
-                        parsed.append((p[0] * MM_TO_WORLD, p[1] * MM_TO_WORLD, p[2] * MM_TO_WORLD, float(p[3])))
-                    elif len(p) >= 3:
-                        parsed.append((p[0] * MM_TO_WORLD, p[1] * MM_TO_WORLD, p[2] * MM_TO_WORLD, 0.0))
-                self.path_kin = parsed
+                if store.apply(data, parsed):
+                    self._dirty = True
                 return
             if data.get("type") == "fixed_frame":
                 origin = data.get("origin", [0, 0, 0])
@@ -530,25 +563,37 @@ class VisualizerApp(ttk.Frame):
                     "y": np.array(y_axis, dtype=float),
                     "z": np.array(z_axis, dtype=float),
                 }
+                self._dirty = True
                 return
             if data.get("type") == "robot_profile":
                 self._apply_robot_profile(data)
                 return
             if data.get("type") == "abs":
-                self.pose.X = float(data.get("X", 0))
-                self.pose.Y = float(data.get("Y", 0))
-                self.pose.Z = float(data.get("Z", 0))
-                self.pose.A = float(data.get("A", 0))
-                self.pose.B = float(data.get("B", 0))
-                self.pose.C = float(data.get("C", 0))   # NEW
+                before = (self.pose.X, self.pose.Y, self.pose.Z,
+                          self.pose.A, self.pose.B, self.pose.C, self.pose.servo)
+                # Axes missing from a frame keep their value (e.g. "S"-only
+                # frames from mirrored M3 lines, partial binary frames)
+                self.pose.X = float(data.get("X", self.pose.X))
+                self.pose.Y = float(data.get("Y", self.pose.Y))
+                self.pose.Z = float(data.get("Z", self.pose.Z))
+                self.pose.A = float(data.get("A", self.pose.A))
+                self.pose.B = float(data.get("B", self.pose.B))
+                self.pose.C = float(data.get("C", self.pose.C))
                 if "S" in data:
                     self.pose.servo = float(data["S"])
+                after = (self.pose.X, self.pose.Y, self.pose.Z,
+                         self.pose.A, self.pose.B, self.pose.C, self.pose.servo)
+                if after != before:
+                    self._dirty = True
         except Exception:
             pass  # no more logs for UDP noise
 
     def loop(self):
-        self.redraw()
-        self.after(50, self.loop)
+        self._drain_udp()
+        if self._dirty:
+            self._dirty = False
+            self.redraw()
+        self.after(FRAME_MS, self.loop)
 
     # ------------------ Tool-Axis Motion & Debug ------------------
     def fix_position(self):
@@ -644,6 +689,7 @@ class VisualizerApp(ttk.Frame):
 
             # Apply pose
             self.pose.A = sol["A"]; self.pose.X = sol["X"]; self.pose.Y = sol["Y"]; self.pose.Z = sol["Z"]; self.pose.B = sol["B"]
+            self._dirty = True
 
             # === G-code from joint angles ===
             gline = (
@@ -716,241 +762,91 @@ class VisualizerApp(ttk.Frame):
 
     # ------------------ Draw ------------------
     def redraw(self):
+        """Push the current state into the persistent artists and blit."""
         pts, dir_tool = self._current_fk()
         X, Y, Z, Yaw, Tilt = self._current_tcp_pose()
         self.tcp_var.set(f"TCP  X={X:.2f}  Y={Y:.2f}  Z={Z:.2f}  Yaw={Yaw:.2f}  Tilt={Tilt:.2f}")
 
-        self.ax3d.clear()
-        for i in range(len(pts) - 1):
-            p1, p2 = pts[i], pts[i + 1]
-            if i == 0:
-                col = "#777777"
-            elif i == (len(pts) - 2):
-                col = "#cc3333"
-            else:
-                col = "#00aa55"
-            self.ax3d.plot([p1[0], p2[0]], [p1[1], p2[1]], [p1[2], p2[2]],
-                           "o-", color=col, lw=2)
-
-        # === Axes ===
-        L = 20
-        self.ax3d.quiver(0, 0, 0, L, 0, 0, color="r")
-        self.ax3d.quiver(0, 0, 0, 0, L, 0, color="g")
-        self.ax3d.quiver(0, 0, 0, 0, 0, L, color="b")
+        scene = self.scene
+        scene.set_arm(pts)
+        scene.set_paths({"kin": self.paths["path_kin"].display(),
+                         "fixed": self.paths["path_fixed"].display()})
 
         # === Tool-Vektor (rot) ===
-        p_tcp = np.array(pts[-1])
+        p_tcp = np.array(pts[-1], dtype=float)
         t = dir_tool / np.linalg.norm(dir_tool)
-        self.ax3d.quiver(p_tcp[0], p_tcp[1], p_tcp[2],
-                         t[0]*10, t[1]*10, t[2]*10, color="red")
-
-        self._draw_path_3d(self.ax3d, self.path_kin, "#20c050")
-        self._draw_path_3d(self.ax3d, self.path_fixed, "#1a9850")
-        self._draw_fixed_frame_3d(self.ax3d)
-
-        # === 2D-Ansichten im Weltkoordinatensystem ===
-        pts_2d = [np.array(p, dtype=float) for p in pts]
-        path_kin_2d = [(p[0], p[1], p[2]) for p in self.path_kin]
-        path_fixed_2d = [(p[0], p[1], p[2]) for p in self.path_fixed]
-        fixed_frame_2d = self.fixed_frame
-
-
-        # === 2D-Ansichten des Arms ===
-        # XY = Draufsicht
-        self._draw_2d(self.ax_xy, pts_2d, (0, 1), "XY")
-        self._draw_path_2d(self.ax_xy, path_kin_2d, (0, 1), "#20c050")
-        self._draw_path_2d(self.ax_xy, path_fixed_2d, (0, 1), "#1a9850")
-        self._draw_fixed_frame_2d(self.ax_xy, (0, 1), fixed_frame_2d)
-
-        # YZ = Seitenansicht
-        self._draw_2d(self.ax_yz, pts_2d, (1, 2), "YZ")
-        self._draw_path_2d(self.ax_yz, path_kin_2d, (1, 2), "#20c050")
-        self._draw_path_2d(self.ax_yz, path_fixed_2d, (1, 2), "#1a9850")
-        self._draw_fixed_frame_2d(self.ax_yz, (1, 2), fixed_frame_2d)
-
-        # XZ = Frontansicht
-        self._draw_2d(self.ax_xz, pts_2d, (0, 2), "XZ")
-        self._draw_path_2d(self.ax_xz, path_kin_2d, (0, 2), "#20c050")
-        self._draw_path_2d(self.ax_xz, path_fixed_2d, (0, 2), "#1a9850")
-        self._draw_fixed_frame_2d(self.ax_xz, (0, 2), fixed_frame_2d)
+        tool = (p_tcp, t * TOOL_ARROW_LEN)
 
-
-        # === Gripper (two parallel lines, rolls with A + B + C around tool axis) ===
-        # === Greifer (Backen korrekt stabilisiert & alle Rotationen A/B/C integriert) ===
         try:
-            servo_val = float(np.clip(self.pose.servo, 0.0, 1000.0))
-            half_gap = np.interp(servo_val, [0.0, 1000.0],
-                                 [GRIPPER_MAX_GAP / 2.0, 0.0])
-            line_len = GRIPPER_LEN * 1.5
-
-            P3 = np.array(pts[-2], dtype=float)
-            P4 = np.array(pts[-1], dtype=float)
-            p_tcp = P4
-
-            # Toolrichtung
-            t = P4 - P3
-            t /= np.linalg.norm(t) + 1e-12
-
-            # ---------------------------------------------------------
-            # STABLE reference vector (singularity-safe)
-            # ---------------------------------------------------------
-            up = np.array([0.0, 0.0, 1.0])
-            v0 = np.cross(up, t)
-
-            # Fallback when tool ~ Z-axis -> use second reference vector
-            if np.linalg.norm(v0) < 1e-6:
-                up2 = np.array([1.0, 0.0, 0.0])
-                v0 = np.cross(up2, t)
-
-            v0 /= np.linalg.norm(v0) + 1e-12
-
-            # ---------------------------------------------------------
-            # OPTIONAL: Vorverdrehung um +90 im XY-Plane (dein Wunsch)
-            # ---------------------------------------------------------
-            def rotZ(v, ang):
-                c = math.cos(ang)
-                s = math.sin(ang)
-                return np.array([c*v[0]-s*v[1], s*v[0]+c*v[1], v[2]])
-
-            v0 = rotZ(v0, math.radians(90.0))
-
-            # ---------------------------------------------------------
-            # Wrist Roll B + Tool Roll C um die Toolachse
-            # ---------------------------------------------------------
-            def rot_axis(v, axis, ang):
-                axis = axis / (np.linalg.norm(axis) + 1e-12)
-                c = math.cos(ang)
-                s = math.sin(ang)
-                return v*c + np.cross(axis, v)*s + axis*np.dot(axis, v)*(1-c)
-
-            v_side = v0
-            # Achtung: B rollt "gegen" die Richtung, C normal
-            v_side = rot_axis(v_side, t, -math.radians(self.pose.B))
-            v_side = rot_axis(v_side, t,  math.radians(self.pose.C))
-
-            # ---------------------------------------------------------
-            # Greiferlinien errechnen
-            # ---------------------------------------------------------
-            pL0 = p_tcp - v_side * half_gap
-            pL1 = pL0 + t * line_len
-            pR0 = p_tcp + v_side * half_gap
-            pR1 = pR0 + t * line_len
-
-            # ---------------------------------------------------------
-            # 3D Zeichnen
-            # ---------------------------------------------------------
-            for p1, p2 in ((pL0, pL1), (pR0, pR1)):
-                self.ax3d.plot([p1[0], p2[0]],
-                               [p1[1], p2[1]],
-                               [p1[2], p2[2]], color="#00aaff", lw=5)
-
-            # ---------------------------------------------------------
-            # 2D Projektionen
-            # ---------------------------------------------------------
-            lw2d = 3.0
-            for ax, (i, j) in (
-                (self.ax_xy, (0, 1)),
-                (self.ax_yz, (1, 2)),
-                (self.ax_xz, (0, 2)),
-            ):
-                ax.plot([pL0[i], pL1[i]], [pL0[j], pL1[j]], color="#00aaff", lw=lw2d)
-                ax.plot([pR0[i], pR1[i]], [pR0[j], pR1[j]], color="#00aaff", lw=lw2d)
-
+            jaws = self._gripper_jaws(pts)
         except Exception as e:
             print(" Greifer draw error:", e)
+            jaws = []
 
+        scene.set_overlay(tool, jaws, self.fixed_frame)
+        scene.render()
 
-
-
-
-        # === Grenzen & Titel ===
-        self.ax3d.set_xlim(-VIEW_LIMIT_XY, VIEW_LIMIT_XY)
-        self.ax3d.set_ylim(-VIEW_LIMIT_XY, VIEW_LIMIT_XY)
-        self.ax3d.set_zlim(0, VIEW_LIMIT_Z)
-        self.ax3d.set_box_aspect([1, 1, VIEW_LIMIT_Z / VIEW_LIMIT_XY])
-        self.ax3d.set_title("3D View")
-        self.canvas.draw()
-
-    def _draw_2d(self, ax, pts, idx, title):
-        ax.clear()
-        xs = [p[idx[0]] for p in pts]
-        ys = [p[idx[1]] for p in pts]
-        ax.plot(xs, ys, 'o-', lw=2)
-
-        # Dynamische Bereiche pro Ansicht
-        if title == "XY":
-            ax.set_xlim(-80, 80)
-            ax.set_ylim(-80, 80)
-        elif title in ("YZ", "XZ"):
-            ax.set_xlim(-80, 80)
-            ax.set_ylim(0, 100)
-
-        ax.set_aspect('equal')
-        ax.set_title(title)
-        ax.grid(True, linestyle=":", color="#999", alpha=0.4)
-
-    def _draw_path_2d(self, ax, pts, idx, color):
-        if not pts or len(pts) < 2:
-            return
-        xs = [p[idx[0]] for p in pts]
-        ys = [p[idx[1]] for p in pts]
-        ax.plot(xs, ys, '-', color=color, lw=2)
-        ax.annotate(
-            "",
-            xy=(xs[-1], ys[-1]),
-            xytext=(xs[-2], ys[-2]),
-            arrowprops=dict(arrowstyle="->", color=color, lw=2),
-        )
-
-    def _draw_path_3d(self, ax, pts, color):
-        if not pts or len(pts) < 2:
-            return
-        xs = [p[0] for p in pts]
-        ys = [p[1] for p in pts]
-        zs = [p[2] for p in pts]
-        ax.plot(xs, ys, zs, color=color, lw=2)
-        dx = xs[-1] - xs[-2]
-        dy = ys[-1] - ys[-2]
-        dz = zs[-1] - zs[-2]
-        ax.quiver(xs[-2], ys[-2], zs[-2], dx, dy, dz, color=color, linewidths=2)
-
-
-    def _draw_fixed_frame_3d(self, ax, frame=None):
-        if frame is None:
-            frame = self.fixed_frame
-        if not frame:
-            return
-        o = np.array(frame["origin"], dtype=float)
-        x = np.array(frame["x"], dtype=float)
-        y = np.array(frame["y"], dtype=float)
-        z = np.array(frame["z"], dtype=float)
-        for v in (x, y, z):
-            n = np.linalg.norm(v)
-            if n > 1e-9:
-                v /= n
-        L = 8.0
-        ax.quiver(o[0], o[1], o[2], x[0]*L, x[1]*L, x[2]*L, color="#cc3333")
-        ax.quiver(o[0], o[1], o[2], y[0]*L, y[1]*L, y[2]*L, color="#33aa33")
-        ax.quiver(o[0], o[1], o[2], z[0]*L, z[1]*L, z[2]*L, color="#3366cc")
-
-    def _draw_fixed_frame_2d(self, ax, idx, frame=None):
-        if frame is None:
-            frame = self.fixed_frame
-        if not frame:
-            return
-        o = np.array(frame["origin"], dtype=float)
-        x = np.array(frame["x"], dtype=float)
-        y = np.array(frame["y"], dtype=float)
-        z = np.array(frame["z"], dtype=float)
-        for v in (x, y, z):
-            n = np.linalg.norm(v)
-            if n > 1e-9:
-                v /= n
-        L = 8.0
-        for v, color in ((x, "#cc3333"), (y, "#33aa33"), (z, "#3366cc")):
-            p0 = (o[idx[0]], o[idx[1]])
-            p1 = (o[idx[0]] + v[idx[0]] * L, o[idx[1]] + v[idx[1]] * L)
-            ax.plot([p0[0], p1[0]], [p0[1], p1[1]], color=color, lw=2)
+    def _gripper_jaws(self, pts):
+        """Gripper as two parallel lines, rolled with B + C around the tool axis."""
+        # === Greifer (Backen korrekt stabilisiert & alle Rotationen A/B/C integriert) ===
+        servo_val = float(np.clip(self.pose.servo, 0.0, 1000.0))
+        half_gap = np.interp(servo_val, [0.0, 1000.0],
+                             [GRIPPER_MAX_GAP / 2.0, 0.0])
+        line_len = GRIPPER_LEN * 1.5
+
+        P3 = np.array(pts[-2], dtype=float)
+        P4 = np.array(pts[-1], dtype=float)
+        p_tcp = P4
+
+        # Toolrichtung
+        t = P4 - P3
+        t /= np.linalg.norm(t) + 1e-12
+
+        # ---------------------------------------------------------
+        # STABLE reference vector (singularity-safe)
+        # ---------------------------------------------------------
+        up = np.array([0.0, 0.0, 1.0])
+        v0 = np.cross(up, t)
+
+        # Fallback when tool ~ Z-axis -> use second reference vector
+        if np.linalg.norm(v0) < 1e-6:
+            up2 = np.array([1.0, 0.0, 0.0])
+            v0 = np.cross(up2, t)
+
+        v0 /= np.linalg.norm(v0) + 1e-12
+
+        # ---------------------------------------------------------
+        # OPTIONAL: Vorverdrehung um +90 im XY-Plane (dein Wunsch)
+        # ---------------------------------------------------------
+        def rotZ(v, ang):
+            c = math.cos(ang)
+            s = math.sin(ang)
+            return np.array([c*v[0]-s*v[1], s*v[0]+c*v[1], v[2]])
+
+        v0 = rotZ(v0, math.radians(90.0))
+
+        # ---------------------------------------------------------
+        # Wrist Roll B + Tool Roll C um die Toolachse
+        # ---------------------------------------------------------
+        def rot_axis(v, axis, ang):
+            axis = axis / (np.linalg.norm(axis) + 1e-12)
+            c = math.cos(ang)
+            s = math.sin(ang)
+            return v*c + np.cross(axis, v)*s + axis*np.dot(axis, v)*(1-c)
+
+        v_side = v0
+        # Achtung: B rollt "gegen" die Richtung, C normal
+        v_side = rot_axis(v_side, t, -math.radians(self.pose.B))
+        v_side = rot_axis(v_side, t,  math.radians(self.pose.C))
+
+        # ---------------------------------------------------------
+        # Greiferlinien errechnen
+        # ---------------------------------------------------------
+        pL0 = p_tcp - v_side * half_gap
+        pL1 = pL0 + t * line_len
+        pR0 = p_tcp + v_side * half_gap
+        pR1 = pR0 + t * line_len
+        return [(pL0, pL1), (pR0, pR1)]
 
 # ------------------ Main ------------------
 if __name__ == "__main__":
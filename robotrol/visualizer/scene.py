@@ -0,0 +1,309 @@
+"""
+Persistent-artist, blitted renderer for the RoboSim views.
+
+:class:`SceneRenderer` creates every artist of the four views (3D, XY,
+YZ, XZ) once and afterwards only replaces their data.  All dynamic
+artists are *animated*: a full ``canvas.draw()`` (first show, resize,
+rotating the 3D view) renders the static parts — axes, grid, ticks,
+world axes — and is cached per axes with ``copy_from_bbox``; a frame
+then restores that background, draws the dynamic artists and blits the
+axes' bounding box.
+
+Each path is one polyline inside a single ``LineCollection`` per view
+(``Line3DCollection`` in 3D) together with its arrow head, and the
+numpy arrays for a path are rebuilt only when a new path list arrives,
+so multi-thousand-point paths cost almost nothing per frame.
+No tkinter dependency (works with any matplotlib canvas that blits).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib.collections import LineCollection
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+
+ARM_COLORS = ("#777777", "#00aa55", "#cc3333")  # base, links, tool link
+ARM_COLOR_2D = "C0"
+PATH_COLORS = {"kin": "#20c050", "fixed": "#1a9850"}
+GRIPPER_COLOR = "#00aaff"
+FRAME_COLORS = ("#cc3333", "#33aa33", "#3366cc")
+TOOL_ARROW_COLOR = "red"
+FRAME_AXIS_LEN = 8.0
+TOOL_ARROW_LEN = 10.0
+WORLD_AXIS_LEN = 20.0
+ARROW_HEAD_RATIO = 0.3
+ARROW_HEAD_DEG = 15.0
+
+# name -> (x index, y index) of the 2D projections
+VIEWS_2D = {"xy": (0, 1), "yz": (1, 2), "xz": (0, 2)}
+
+Segment = np.ndarray  # (N, 2) or (N, 3)
+
+
+def arrow_head(p0: np.ndarray, p1: np.ndarray,
+               ratio: float = ARROW_HEAD_RATIO,
+               angle_deg: float = ARROW_HEAD_DEG,
+               length: Optional[float] = None) -> List[Segment]:
+    """Two head strokes for an arrow from *p0* to *p1* (2D or 3D)."""
+    p0 = np.asarray(p0, dtype=float)
+    p1 = np.asarray(p1, dtype=float)
+    v = p1 - p0
+    n = float(np.linalg.norm(v))
+    if n < 1e-12:
+        return []
+    back = -v / n
+    head = length if length is not None else n * ratio
+    a = math.radians(angle_deg)
+    if p0.shape[0] == 2:
+        c, s = math.cos(a), math.sin(a)
+        dirs = [np.array([c * back[0] - s * back[1], s * back[0] + c * back[1]]),
+                np.array([c * back[0] + s * back[1], -s * back[0] + c * back[1]])]
+    else:
+        ref = np.array([0.0, 0.0, 1.0]) if abs(back[2]) < 0.9 else np.array([1.0, 0.0, 0.0])
+        u = np.cross(back, ref)
+        u /= np.linalg.norm(u)
+        dirs = [back * math.cos(a) + u * math.sin(a),
+                back * math.cos(a) - u * math.sin(a)]
+    return [np.array([p1, p1 + d * head]) for d in dirs]
+
+
+def arrow(p0: Sequence[float], v: Sequence[float]) -> List[Segment]:
+    """Shaft plus head for a quiver-style arrow at *p0* along *v*."""
+    p0 = np.asarray(p0, dtype=float)
+    p1 = p0 + np.asarray(v, dtype=float)
+    return [np.array([p0, p1])] + arrow_head(p0, p1)
+
+
+def frame_axes(frame: Optional[Dict[str, Any]], length: float = FRAME_AXIS_LEN
+               ) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """``[(origin, unit_axis * length), ...]`` for x, y, z of a fixed frame."""
+    if not frame:
+        return []
+    o = np.asarray(frame["origin"], dtype=float)
+    out = []
+    for key in ("x", "y", "z"):
+        v = np.array(frame[key], dtype=float)
+        n = np.linalg.norm(v)
+        if n > 1e-9:
+            v = v / n
+        out.append((o, v * length))
+    return out
+
+
+def path_array(path: Sequence[Sequence[float]]) -> np.ndarray:
+    """``(N, 3)`` float array from ``[(x, y, z, ...), ...]``."""
+    if not path:
+        return np.empty((0, 3))
+    return np.asarray([p[:3] for p in path], dtype=float)
+
+
+class SceneRenderer:
+    """Owns the dynamic artists of the RoboSim figure.
+
+    Parameters
+    ----------
+    canvas : FigureCanvasBase
+        Canvas of the figure (must support ``copy_from_bbox`` / ``blit``).
+    ax3d : Axes3D
+        The 3D view.
+    axes_2d : dict
+        ``{"xy": ax, "yz": ax, "xz": ax}``.
+    """
+
+    def __init__(self, canvas: Any, ax3d: Any, axes_2d: Dict[str, Any]):
+        self.canvas = canvas
+        self.ax3d = ax3d
+        self.axes_2d = dict(axes_2d)
+        self._backgrounds: Dict[Any, Any] = {}
+        self._paths_src: Dict[str, Any] = {name: None for name in PATH_COLORS}
+        self._paths: Dict[str, np.ndarray] = {name: np.empty((0, 3)) for name in PATH_COLORS}
+        self.frames = 0
+        self.full_draws = 0
+
+        # ── 3D ───────────────────────────────────────────────────────
+        ax = ax3d
+        L = WORLD_AXIS_LEN
+        # World axes never change: drawn into the cached background
+        ax.add_collection(Line3DCollection(
+            arrow((0, 0, 0), (L, 0, 0)) + arrow((0, 0, 0), (0, L, 0)) + arrow((0, 0, 0), (0, 0, L)),
+            colors=["r"] * 3 + ["g"] * 3 + ["b"] * 3,
+        ), autolim=False)
+        self._arm3d = [ax.plot([], [], [], "o-", color=c, lw=2, animated=True)[0]
+                       for c in ARM_COLORS]
+        self._paths3d = self._add(ax, Line3DCollection([], linewidths=2))
+        self._overlay3d = self._add(ax, Line3DCollection([]))
+
+        # ── 2D projections ───────────────────────────────────────────
+        self._arm2d: Dict[str, Any] = {}
+        self._paths2d: Dict[str, LineCollection] = {}
+        self._overlay2d: Dict[str, LineCollection] = {}
+        for name, a in self.axes_2d.items():
+            self._arm2d[name] = a.plot([], [], "o-", color=ARM_COLOR_2D, lw=2, animated=True)[0]
+            self._paths2d[name] = self._add(a, LineCollection([], linewidths=2))
+            self._overlay2d[name] = self._add(a, LineCollection([]))
+
+        self._cid = canvas.mpl_connect("draw_event", self._on_draw)
+
+    @staticmethod
+    def _add(ax: Any, coll: Any) -> Any:
+        coll.set_animated(True)
+        # Already 3D where needed; autolim off since limits are fixed
+        ax.add_collection(coll, autolim=False)
+        return coll
+
+    def disconnect(self) -> None:
+        self.canvas.mpl_disconnect(self._cid)
+
+    # ------------------------------------------------------------------
+    #  Data
+    # ------------------------------------------------------------------
+
+    def set_arm(self, pts: Sequence[Sequence[float]]) -> None:
+        """Arm polyline: first link grey, middle links green, tool link red."""
+        p = np.asarray(pts, dtype=float).reshape(-1, 3)
+        n = len(p)
+        if n >= 3:
+            parts = [p[0:2], p[1:n - 1] if n >= 4 else p[:0], p[n - 2:n]]
+        else:
+            parts = [p, p[:0], p[:0]]
+        for line, part in zip(self._arm3d, parts):
+            line.set_data_3d(part[:, 0], part[:, 1], part[:, 2])
+        for name, (i, j) in VIEWS_2D.items():
+            if name in self._arm2d:
+                self._arm2d[name].set_data(p[:, i], p[:, j])
+
+    def set_paths(self, paths: Dict[str, Sequence[Sequence[float]]]) -> bool:
+        """Replace path data; only paths given as a new object are rebuilt.
+
+        Returns True if anything changed.
+        """
+        changed = False
+        for name in PATH_COLORS:
+            src = paths.get(name)
+            if src is self._paths_src[name]:
+                continue
+            self._paths_src[name] = src
+            self._paths[name] = path_array(src or [])
+            changed = True
+        if not changed:
+            return False
+        segs3d: List[Segment] = []
+        cols3d: List[str] = []
+        for name, color in PATH_COLORS.items():
+            arr = self._paths[name]
+            if len(arr) < 2:
+                continue
+            strokes = [arr] + arrow_head(arr[-2], arr[-1])
+            segs3d += strokes
+            cols3d += [color] * len(strokes)
+        self._paths3d.set_segments(segs3d)
+        self._paths3d.set_color(cols3d or "none")
+        for name, (i, j) in VIEWS_2D.items():
+            coll = self._paths2d.get(name)
+            if coll is None:
+                continue
+            segs: List[Segment] = []
+            cols: List[str] = []
+            for pname, color in PATH_COLORS.items():
+                arr = self._paths[pname]
+                if len(arr) < 2:
+                    continue
+                flat = arr[:, (i, j)]
+                strokes = [flat] + arrow_head(flat[-2], flat[-1], length=2.0, angle_deg=25.0)
+                segs += strokes
+                cols += [color] * len(strokes)
+            coll.set_segments(segs)
+            coll.set_color(cols or "none")
+        return True
+
+    def set_overlay(self, tool: Optional[Tuple[np.ndarray, np.ndarray]],
+                    jaws: Sequence[Tuple[np.ndarray, np.ndarray]],
+                    frame: Optional[Dict[str, Any]]) -> None:
+        """Tool arrow, gripper jaws and fixed frame (one collection per view)."""
+        axes = frame_axes(frame)
+        segs3d: List[Segment] = []
+        cols3d: List[str] = []
+        lws3d: List[float] = []
+        if tool is not None:
+            strokes = arrow(tool[0], tool[1])
+            segs3d += strokes
+            cols3d += [TOOL_ARROW_COLOR] * len(strokes)
+            lws3d += [1.5] * len(strokes)
+        for k, (o, v) in enumerate(axes):
+            strokes = arrow(o, v)
+            segs3d += strokes
+            cols3d += [FRAME_COLORS[k]] * len(strokes)
+            lws3d += [1.5] * len(strokes)
+        for a, b in jaws:
+            segs3d.append(np.array([a, b], dtype=float))
+            cols3d.append(GRIPPER_COLOR)
+            lws3d.append(5.0)
+        self._overlay3d.set_segments(segs3d)
+        self._overlay3d.set_color(cols3d or "none")
+        self._overlay3d.set_linewidth(lws3d or 1.0)
+
+        for name, (i, j) in VIEWS_2D.items():
+            coll = self._overlay2d.get(name)
+            if coll is None:
+                continue
+            segs: List[Segment] = []
+            cols: List[str] = []
+            lws: List[float] = []
+            for k, (o, v) in enumerate(axes):
+                segs.append(np.array([[o[i], o[j]], [o[i] + v[i], o[j] + v[j]]]))
+                cols.append(FRAME_COLORS[k])
+                lws.append(2.0)
+            for a, b in jaws:
+                segs.append(np.array([[a[i], a[j]], [b[i], b[j]]], dtype=float))
+                cols.append(GRIPPER_COLOR)
+                lws.append(3.0)
+            coll.set_segments(segs)
+            coll.set_color(cols or "none")
+            coll.set_linewidth(lws or 1.0)
+
+    # ------------------------------------------------------------------
+    #  Drawing
+    # ------------------------------------------------------------------
+
+    def _dynamic(self, ax: Any) -> List[Any]:
+        if ax is self.ax3d:
+            return [*self._arm3d, self._paths3d, self._overlay3d]
+        for name, a in self.axes_2d.items():
+            if a is ax:
+                return [self._paths2d[name], self._overlay2d[name], self._arm2d[name]]
+        return []
+
+    def _all_axes(self) -> List[Any]:
+        return [self.ax3d, *self.axes_2d.values()]
+
+    def _draw_dynamic(self, ax: Any) -> None:
+        for artist in self._dynamic(ax):
+            if isinstance(artist, Line3DCollection):
+                artist.do_3d_projection()
+            ax.draw_artist(artist)
+
+    def _on_draw(self, event: Any) -> None:
+        """Full redraw happened: cache the static backgrounds, overlay the rest."""
+        self.full_draws += 1
+        for ax in self._all_axes():
+            self._backgrounds[ax] = self.canvas.copy_from_bbox(ax.bbox)
+            self._draw_dynamic(ax)
+
+    def render(self) -> None:
+        """Blit the dynamic artists onto the cached backgrounds."""
+        if not self._backgrounds:
+            self.canvas.draw()  # first frame: _on_draw caches and overlays
+            self.frames += 1
+            return
+        canvas = self.canvas
+        for ax in self._all_axes():
+            bg = self._backgrounds.get(ax)
+            if bg is None:
+                continue
+            canvas.restore_region(bg)
+            self._draw_dynamic(ax)
+            canvas.blit(ax.bbox)
+        self.frames += 1
@@ -0,0 +1,334 @@
+"""
+Shared-memory telemetry channel between the controller app and RoboSim.
+
+When both run on the same host the joint pose and the visualizer paths
+can skip UDP loopback and JSON entirely: the app (single writer) packs
+them into a named :mod:`multiprocessing.shared_memory` segment and the
+visualizer reads them straight out of the mapping with
+``struct.unpack_from``.
+
+Layout (little endian)::
+
+    header  magic "RSHM" | version u32 | state u32 | path_capacity u32 | epoch u64
+    joints  seq u64 | t f64 | mask u32 | pad u32 | 7 x f64   (JOINT_KEYS order)
+    path i  seq u64 | total u64 | generation u32 | pad u32 | capacity x (x, y, z, a) f32
+
+Each slot is guarded by a seqlock: the writer makes ``seq`` odd, writes
+the data and makes it even again; a reader retries while ``seq`` is odd
+or changed during its copy.  Paths are rings of *path_capacity* points:
+``total`` counts the points written since the last replacement and
+``generation`` changes on every replacement or clear, so a reader only
+copies points it has not seen yet.  A restarted writer reuses the
+segment with a new ``epoch``; readers then start over.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from robotrol.visualizer.telemetry_proto import JOINT_KEYS, PATH_KINDS
+
+SHM_NAME = "robotrol_telemetry"
+SHM_MAGIC = b"RSHM"
+SHM_VERSION = 1
+PATH_CAPACITY = 8192
+
+STATE_OPEN = 1
+STATE_CLOSED = 2
+
+HEADER = struct.Struct("<4sIIIQ")
+JOINTS = struct.Struct("<QdII7d")
+PATH_HEADER = struct.Struct("<QQII")
+POINT = struct.Struct("<4f")
+_SEQ = struct.Struct("<Q")
+
+JOINTS_OFF = HEADER.size
+PATHS_OFF = JOINTS_OFF + JOINTS.size
+
+READ_RETRIES = 16
+ATTACH_RETRY_S = 1.0
+
+
+def segment_size(path_capacity: int = PATH_CAPACITY) -> int:
+    return PATHS_OFF + len(PATH_KINDS) * (PATH_HEADER.size + path_capacity * POINT.size)
+
+
+def _path_off(index: int, capacity: int) -> int:
+    return PATHS_OFF + index * (PATH_HEADER.size + capacity * POINT.size)
+
+
+def _open_existing(name: str) -> shared_memory.SharedMemory:
+    """Attach without letting this process' resource tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == "posix":
+            try:
+                from multiprocessing import resource_tracker
+                resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+            except Exception:
+                pass
+        return shm
+
+
+class ShmTelemetryWriter:
+    """Create (or take over) the segment and publish joints and paths.
+
+    Parameters
+    ----------
+    name : str
+        Segment name shared with the visualizer.
+    path_capacity : int
+        Points kept per path ring.
+    clock : callable
+        Monotonic time source for joint timestamps.
+    """
+
+    def __init__(self, name: str = SHM_NAME, path_capacity: int = PATH_CAPACITY,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.capacity = int(path_capacity)
+        self._clock = clock
+        self._lock = threading.Lock()   # one writer per slot
+        size = segment_size(self.capacity)
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a crashed app: reuse it if it is large enough
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm.size < size:
+                self._shm.close()
+                self._shm.unlink()
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        self._buf = self._shm.buf
+        self._joints: Dict[str, float] = {}
+        self._jseq = 0
+        self._paths = [{"seq": 0, "total": 0, "gen": 0} for _ in PATH_KINDS]
+        self._buf[:PATHS_OFF] = bytes(PATHS_OFF)
+        for i in range(len(PATH_KINDS)):
+            PATH_HEADER.pack_into(self._buf, _path_off(i, self.capacity), 0, 0, 0, 0)
+        HEADER.pack_into(self._buf, 0, SHM_MAGIC, SHM_VERSION, STATE_OPEN, self.capacity,
+                         random.getrandbits(63) or 1)
+
+    def write_joints(self, joints: Mapping[str, float]) -> None:
+        """Publish the pose; axes not in *joints* keep their last value."""
+        with self._lock:
+            if self._buf is None:
+                return
+            for key in JOINT_KEYS:
+                if key in joints:
+                    self._joints[key] = float(joints[key])
+            mask = 0
+            values = []
+            for i, key in enumerate(JOINT_KEYS):
+                if key in self._joints:
+                    mask |= 1 << i
+                values.append(self._joints.get(key, 0.0))
+            seq = self._jseq + 1
+            _SEQ.pack_into(self._buf, JOINTS_OFF, seq)
+            JOINTS.pack_into(self._buf, JOINTS_OFF, seq, self._clock(), mask, 0, *values)
+            self._jseq = seq + 1
+            _SEQ.pack_into(self._buf, JOINTS_OFF, self._jseq)
+
+    def write_path(self, points: Sequence[Sequence[float]], path_type: str = "path_fixed",
+                   append: bool = False) -> None:
+        """Replace (or, with *append*, extend) a path ring."""
+        index = PATH_KINDS.index(path_type)
+        cap = self.capacity
+        pts = [(float(p[0]), float(p[1]), float(p[2]), float(p[3]) if len(p) > 3 else 0.0)
+               for p in points]
+        with self._lock:
+            if self._buf is None:
+                return
+            state = self._paths[index]
+            off = _path_off(index, cap)
+            data_off = off + PATH_HEADER.size
+            seq = state["seq"] + 1
+            _SEQ.pack_into(self._buf, off, seq)
+            if not append:
+                state["gen"] = (state["gen"] + 1) & 0xFFFFFFFF
+                state["total"] = 0
+            total = state["total"]
+            skip = max(0, len(pts) - cap)   # older points would be overwritten anyway
+            start = total + skip
+            pos = 0
+            remaining = pts[skip:]
+            while pos < len(remaining):
+                slot = (start + pos) % cap
+                run = remaining[pos:pos + cap - slot]
+                flat = [v for p in run for v in p]
+                struct.pack_into(f"<{len(flat)}f", self._buf, data_off + slot * POINT.size, *flat)
+                pos += len(run)
+            state["total"] = total + len(pts)
+            state["seq"] = seq + 1
+            PATH_HEADER.pack_into(self._buf, off, seq, state["total"], state["gen"], 0)
+            _SEQ.pack_into(self._buf, off, state["seq"])
+
+    def close(self, unlink: bool = True) -> None:
+        """Mark the segment closed for readers and release it."""
+        with self._lock:
+            if self._buf is None:
+                return
+            struct.pack_into("<I", self._buf, 8, STATE_CLOSED)
+            self._buf = None
+        self._shm.close()
+        if unlink:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class ShmTelemetryReader:
+    """Poll the segment from the visualizer (one thread).
+
+    :meth:`poll` attaches lazily (retrying every :data:`ATTACH_RETRY_S`)
+    and returns new data as visualizer message dicts, the same shape the
+    UDP path produces.
+    """
+
+    def __init__(self, name: str = SHM_NAME, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self._clock = clock
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._buf: Any = None
+        self._next_attach = float("-inf")
+        self._reset(0, 0)
+        self.retries = 0
+        self.overruns = 0
+
+    def _reset(self, epoch: int, capacity: int) -> None:
+        self._epoch = epoch
+        self.capacity = capacity
+        self._jseq = 0
+        self._path_pos = [(None, 0) for _ in PATH_KINDS]   # (generation, total)
+
+    @property
+    def attached(self) -> bool:
+        return self._buf is not None
+
+    def attach(self) -> bool:
+        """Open the segment if the writer created it; False otherwise."""
+        if self._buf is not None:
+            return True
+        try:
+            shm = _open_existing(self.name)
+        except (FileNotFoundError, OSError, ValueError):
+            return False
+        magic, version, state, capacity, epoch = HEADER.unpack_from(shm.buf, 0)
+        if (magic != SHM_MAGIC or version != SHM_VERSION or state != STATE_OPEN
+                or shm.size < segment_size(capacity)):
+            shm.close()
+            return False
+        self._shm, self._buf = shm, shm.buf
+        self._reset(epoch, capacity)
+        return True
+
+    def detach(self) -> None:
+        if self._shm is not None:
+            self._buf = None
+            try:
+                self._shm.close()
+            except BufferError:
+                pass
+            self._shm = None
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """New path data and the newest pose since the last call."""
+        if self._buf is None:
+            now = self._clock()
+            if now < self._next_attach:
+                return []
+            self._next_attach = now + ATTACH_RETRY_S
+            if not self.attach():
+                return []
+        _, _, state, capacity, epoch = HEADER.unpack_from(self._buf, 0)
+        if state != STATE_OPEN:
+            self.detach()
+            return []
+        if epoch != self._epoch:
+            self._reset(epoch, capacity)   # writer restarted on the same segment
+        out = []
+        for i in range(len(PATH_KINDS)):
+            msg = self.read_path(i)
+            if msg is not None:
+                out.append(msg)
+        pose = self.read_joints()
+        if pose is not None:
+            out.append(pose)
+        return out
+
+    def read_joints(self) -> Optional[Dict[str, Any]]:
+        """The pose as an ``abs`` message, or None if unchanged."""
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            seq = _SEQ.unpack_from(buf, JOINTS_OFF)[0]
+            if seq & 1:
+                self.retries += 1
+                continue
+            if seq == self._jseq:
+                return None
+            _, t, mask, _, *values = JOINTS.unpack_from(buf, JOINTS_OFF)
+            if _SEQ.unpack_from(buf, JOINTS_OFF)[0] != seq:
+                self.retries += 1
+                continue
+            self._jseq = seq
+            msg: Dict[str, Any] = {"type": "abs", "t": t}
+            for i, key in enumerate(JOINT_KEYS):
+                if mask & (1 << i):
+                    msg[key] = values[i]
+            return msg
+        return None
+
+    def read_path(self, index: int) -> Optional[Dict[str, Any]]:
+        """Points added to path *index* since the last read, as a message."""
+        buf = self._buf
+        cap = self.capacity
+        off = _path_off(index, cap)
+        data_off = off + PATH_HEADER.size
+        for _ in range(READ_RETRIES):
+            seq, total, gen, _ = PATH_HEADER.unpack_from(buf, off)
+            if seq & 1:
+                self.retries += 1
+                continue
+            last_gen, last_total = self._path_pos[index]
+            if gen == last_gen and total == last_total:
+                return None
+            replace = gen != last_gen
+            start = 0 if replace else last_total
+            lost = max(0, total - cap - start)
+            start += lost
+            pts: List[List[float]] = []
+            pos = start
+            while pos < total:
+                slot = pos % cap
+                n = min(total - pos, cap - slot)
+                flat = struct.unpack_from(f"<{4 * n}f", buf, data_off + slot * POINT.size)
+                pts.extend(list(flat[k:k + 4]) for k in range(0, 4 * n, 4))
+                pos += n
+            if _SEQ.unpack_from(buf, off)[0] != seq:
+                self.retries += 1
+                continue
+            if lost:
+                self.overruns += 1
+            self._path_pos[index] = (gen, total)
+            msg: Dict[str, Any] = {"type": PATH_KINDS[index], "pts": pts}
+            if not replace:
+                msg["append"] = True
+            return msg
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "attached": int(self._buf is not None),
+            "retries": self.retries,
+            "overruns": self.overruns,
+        }
@@ -0,0 +1,342 @@
+"""
+Local telemetry hub — fan robot telemetry out to any number of consumers.
+
+A TCP server on localhost (default port 9998) that visualizers,
+dashboards and loggers connect to.  The app calls
+:meth:`TelemetryHub.publish` from whatever thread produces the data
+(the serial RX thread for joints and status, the queue worker for
+progress, ...).  ``publish`` never touches a socket and never encodes: it
+hands the message to each subscriber's bounded outbox and returns.  One
+writer thread per subscriber encodes (once per message, shared) and
+sends, so a slow or stuck consumer only ever delays itself.
+
+Wire format, newline-delimited JSON in both directions::
+
+    hub -> client   {"topic": "joints", "seq": 12, "t": 1234.5, "data": {...}}
+    client -> hub   {"topics": ["joints", "status"], "rate_hz": 10,
+                     "policy": "latest", "queue": 64}
+
+The subscription line is optional (default: every topic, no rate limit,
+``latest``) and may be sent again at any time.  Drop policies:
+
+``latest``
+    keep only the newest message per topic (state-like data);
+``drop_oldest``
+    bounded FIFO of *queue* messages, the oldest one is discarded;
+``drop_newest``
+    bounded FIFO, new messages are discarded while it is full.
+
+``seq`` counts per topic, so clients can see what they missed.  New
+subscribers first receive the last message of every topic they watch.
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import select
+import socket
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 9998
+TOPICS = ("joints", "status", "queue", "detections")
+POLICIES = ("latest", "drop_oldest", "drop_newest")
+DEFAULT_QUEUE = 64
+MAX_QUEUE = 10_000
+
+HANDSHAKE_S = 0.2       # wait this long for a subscription before sending
+POLL_S = 0.2            # writer wake-up interval (control lines, shutdown)
+SEND_TIMEOUT_S = 2.0    # a consumer this slow is disconnected
+MAX_CONTROL_LINE = 4096
+
+
+class _Message:
+    """One published message; encoded lazily, once for all subscribers."""
+
+    __slots__ = ("topic", "seq", "t", "data", "_wire")
+
+    def __init__(self, topic: str, seq: int, t: float, data: Any):
+        self.topic = topic
+        self.seq = seq
+        self.t = t
+        self.data = data
+        self._wire: Optional[bytes] = None
+
+    def wire(self) -> bytes:
+        wire = self._wire
+        if wire is None:
+            wire = self._wire = (json.dumps(
+                {"topic": self.topic, "seq": self.seq, "t": self.t, "data": self.data},
+                default=str) + "\n").encode("utf-8")
+        return wire
+
+
+class _Subscriber:
+    """Outbox, settings and writer thread of one connected client."""
+
+    def __init__(self, hub: "TelemetryHub", sock: socket.socket, addr: Tuple[str, int]):
+        self.hub = hub
+        self.sock = sock
+        self.addr = addr
+        self.topics: Optional[FrozenSet[str]] = None   # None = all
+        self.min_interval = 0.0
+        self.policy = "latest"
+        self.maxlen = DEFAULT_QUEUE
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._latest: Dict[str, _Message] = {}
+        self._fifo: deque = deque()
+        self._rx = b""
+        self._last_flush = float("-inf")
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name=f"telemetry-sub-{addr[1]}",
+                                       daemon=True)
+
+    # ── called from publishing threads ──────────────────────────────────
+
+    def offer(self, msg: _Message) -> None:
+        with self._lock:
+            if self.topics is not None and msg.topic not in self.topics:
+                return
+            if self.policy == "latest":
+                if msg.topic in self._latest:
+                    self.dropped += 1
+                self._latest[msg.topic] = msg
+            elif len(self._fifo) >= self.maxlen:
+                self.dropped += 1
+                if self.policy == "drop_newest":
+                    return
+                self._fifo.popleft()
+                self._fifo.append(msg)
+            else:
+                self._fifo.append(msg)
+        self._wake.set()
+
+    # ── writer thread ───────────────────────────────────────────────────
+
+    def configure(self, req: Dict[str, Any]) -> None:
+        """Apply a subscription request (unknown values keep the defaults)."""
+        with self._lock:
+            topics = req.get("topics")
+            if isinstance(topics, list):
+                self.topics = frozenset(str(t) for t in topics) or None
+            rate = req.get("rate_hz")
+            if isinstance(rate, (int, float)):
+                self.min_interval = 1.0 / rate if rate > 0 else 0.0
+            if req.get("policy") in POLICIES and req["policy"] != self.policy:
+                self.policy = req["policy"]
+                self._fifo.extend(self._latest.values())
+                self._latest.clear()
+                if self.policy == "latest":
+                    for msg in self._fifo:
+                        self._latest[msg.topic] = msg
+                    self._fifo.clear()
+            size = req.get("queue")
+            if isinstance(size, int) and size > 0:
+                self.maxlen = min(size, MAX_QUEUE)
+            while len(self._fifo) > self.maxlen:
+                self._fifo.popleft()
+                self.dropped += 1
+
+    def _read_control(self, timeout: float) -> None:
+        ready, _, _ = select.select([self.sock], [], [], timeout)
+        if not ready:
+            return
+        chunk = self.sock.recv(MAX_CONTROL_LINE)
+        if not chunk:
+            raise ConnectionError("client closed")
+        self._rx += chunk
+        while b"\n" in self._rx:
+            line, self._rx = self._rx.split(b"\n", 1)
+            try:
+                req = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(req, dict):
+                self.configure(req)
+        if len(self._rx) > MAX_CONTROL_LINE:
+            self._rx = b""
+
+    def _take(self) -> List[_Message]:
+        with self._lock:
+            self._wake.clear()
+            if self._latest:
+                batch = sorted(self._latest.values(), key=lambda m: m.t)
+                self._latest.clear()
+            else:
+                batch = list(self._fifo)
+                self._fifo.clear()
+        return batch
+
+    def _run(self) -> None:
+        try:
+            self._read_control(HANDSHAKE_S)
+            self.hub._register(self)
+            self.sock.settimeout(SEND_TIMEOUT_S)
+            while not self.closed:
+                self._wake.wait(POLL_S)
+                self._read_control(0)
+                wait = self._last_flush + self.min_interval - time.monotonic()
+                if wait > 0:
+                    self._read_control(min(wait, POLL_S))
+                    continue
+                batch = self._take()
+                if not batch:
+                    continue
+                self._last_flush = time.monotonic()
+                self.sock.sendall(b"".join(m.wire() for m in batch))
+                self.sent += len(batch)
+        except (OSError, ConnectionError, ValueError) as exc:
+            logger.debug("telemetry subscriber %s gone: %s", self.addr, exc)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wake.set()
+        self.hub._unregister(self)
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._latest) + len(self._fifo)
+        return {
+            "addr": f"{self.addr[0]}:{self.addr[1]}",
+            "topics": sorted(self.topics) if self.topics is not None else None,
+            "policy": self.policy,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "pending": pending,
+        }
+
+
+class TelemetryHub:
+    """Local pub/sub server for joint state, status, queue progress, etc.
+
+    Parameters
+    ----------
+    host : str
+        Bind address; keep it on loopback.
+    port : int
+        TCP port (0 picks a free one, see :attr:`address`).
+    clock : callable
+        Timestamp source for messages.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 clock=time.monotonic):
+        self.host = host
+        self.port = port
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._subs: Tuple[_Subscriber, ...] = ()
+        self._all: List[_Subscriber] = []
+        self._last: Dict[str, _Message] = {}
+        self._seq: Dict[str, int] = {}
+        self._server: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self.published = 0
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def address(self) -> Optional[Tuple[str, int]]:
+        return self._server.getsockname() if self._server is not None else None
+
+    def start(self) -> None:
+        """Bind and start accepting subscribers; raises OSError if the port is taken."""
+        if self._server is not None:
+            return
+        srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            srv.bind((self.host, self.port))
+            srv.listen(8)
+        except OSError:
+            srv.close()
+            raise
+        self._server = srv
+        self._thread = threading.Thread(target=self._accept_loop, args=(srv,),
+                                        name="telemetry-hub", daemon=True)
+        self._thread.start()
+
+    def _accept_loop(self, srv: socket.socket) -> None:
+        while True:
+            try:
+                sock, addr = srv.accept()
+            except OSError:
+                return   # closed
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sub = _Subscriber(self, sock, addr)
+            with self._lock:
+                self._all.append(sub)
+            sub.thread.start()
+
+    def _register(self, sub: _Subscriber) -> None:
+        with self._lock:
+            if sub.closed:
+                return
+            self._subs = self._subs + (sub,)
+            snapshot = list(self._last.values())
+        for msg in snapshot:
+            sub.offer(msg)
+
+    def _unregister(self, sub: _Subscriber) -> None:
+        with self._lock:
+            self._subs = tuple(s for s in self._subs if s is not sub)
+            if sub in self._all:
+                self._all.remove(sub)
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Hand *data* to every subscriber of *topic* (any thread, never blocks on I/O).
+
+        *data* must not be mutated afterwards; it is encoded later on the
+        subscribers' threads.  A no-op while the hub is not started.
+        """
+        if self._server is None:
+            return
+        with self._lock:
+            seq = self._seq.get(topic, 0) + 1
+            self._seq[topic] = seq
+            msg = _Message(topic, seq, self._clock(), data)
+            self._last[topic] = msg
+            subs = self._subs
+            self.published += 1
+        for sub in subs:
+            sub.offer(msg)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            subs = list(self._subs)
+            published = self.published
+        return {"published": published, "subscribers": [s.stats() for s in subs]}
+
+    def close(self) -> None:
+        """Stop accepting and disconnect all subscribers."""
+        srv, self._server = self._server, None
+        if srv is not None:
+            try:
+                srv.shutdown(socket.SHUT_RDWR)   # wakes accept() on Linux
+            except OSError:
+                pass
+            try:
+                srv.close()
+            except OSError:
+                pass
+        with self._lock:
+            subs = list(self._all)
+        for sub in subs:
+            sub.close()
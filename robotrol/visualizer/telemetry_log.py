@@ -0,0 +1,499 @@
+"""
+Telemetry recording and replay.
+
+:class:`TelemetryRecorder` appends joint states, status reports, queue
+progress and other telemetry events with their ``time.monotonic()``
+timestamps to a compact binary log; it has the same ``publish(topic,
+data)`` signature as :class:`~robotrol.visualizer.telemetry_hub.TelemetryHub`.
+:class:`TelemetryReplayer` plays a log back into any ``sink(topic,
+data)`` callables at 1x-100x (or unpaced), with seeking; see
+:func:`udp_sink` and :func:`mailbox_sink` for driving RoboSim.
+
+File layout (little endian)::
+
+    header  b"RTL1" | f64 wall-clock start | f64 monotonic start
+    record  u32 delta_us | u8 kind | u16 length | payload
+
+Payloads: ``KIND_JOINTS`` axis mask u8 + f32 per axis (as in
+:mod:`robotrol.visualizer.telemetry_proto`), ``KIND_QUEUE`` line u32 |
+total u32 | state u8, ``KIND_STATUS`` / ``KIND_EVENT`` UTF-8 JSON (events
+as ``{"topic": ..., "data": ...}``).  Joint and status records identical
+to the previous one are skipped, and records whose payload does not fit
+the u16 length (a status or event over 64 KiB) are dropped and counted
+rather than truncated into JSON that cannot be read back.  A six-axis
+joint record is 32 bytes.
+
+The sidecar index ``<path>.idx`` gets one entry per
+:attr:`TelemetryRecorder.index_interval`::
+
+    u64 t_us | u64 offset | u64 joints | u64 status | u64 queue
+
+(the time of the previous record, the file offset of the next one and the
+offsets of the newest joints/status/queue records so far, 0 = none), so a
+seek restores the full state and starts decoding close to its target.  Both files are append-only; a missing or truncated
+index is rebuilt by scanning (:func:`build_index`).
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from robotrol.visualizer.telemetry_proto import JOINT_KEYS
+
+MAGIC = b"RTL1"
+_HEADER = struct.Struct("<4sdd")
+_RECORD = struct.Struct("<IBH")
+_INDEX = struct.Struct("<QQQQQ")
+_QUEUE = struct.Struct("<IIB")
+
+KIND_GAP = 0
+KIND_JOINTS = 1
+KIND_STATUS = 2
+KIND_QUEUE = 3
+KIND_EVENT = 4
+
+QUEUE_STATES = ("running", "finished", "aborted")
+# Kinds whose newest record is the whole state (restored when seeking)
+STATE_KINDS = (KIND_JOINTS, KIND_STATUS, KIND_QUEUE)
+INDEX_SUFFIX = ".idx"
+DEFAULT_INDEX_INTERVAL = 1.0
+
+_MAX_DELTA_US = 0xFFFFFFFF
+_MAX_PAYLOAD = 0xFFFF
+_JOINT_FMTS = {n: struct.Struct("<B" + "f" * n) for n in range(len(JOINT_KEYS) + 1)}
+
+Sink = Callable[[str, Any], None]
+
+
+def _encode_joints(joints: Dict[str, float]) -> bytes:
+    mask = 0
+    values = []
+    for i, key in enumerate(JOINT_KEYS):
+        if key in joints:
+            mask |= 1 << i
+            values.append(float(joints[key]))
+    return _JOINT_FMTS[len(values)].pack(mask, *values)
+
+
+def _decode(kind: int, payload: bytes) -> Tuple[str, Any]:
+    if kind == KIND_JOINTS:
+        mask = payload[0]
+        keys = [k for i, k in enumerate(JOINT_KEYS) if mask & (1 << i)]
+        values = _JOINT_FMTS[len(keys)].unpack(payload)[1:]
+        return "joints", dict(zip(keys, values))
+    if kind == KIND_QUEUE:
+        line, total, state = _QUEUE.unpack(payload)
+        return "queue", {"line": line, "total": total,
+                         "state": QUEUE_STATES[state] if state < len(QUEUE_STATES) else "unknown"}
+    obj = json.loads(payload.decode("utf-8"))
+    if kind == KIND_STATUS:
+        return "status", obj
+    return str(obj.get("topic", "event")), obj.get("data")
+
+
+# ----------------------------------------------------------------------
+#  Recorder
+# ----------------------------------------------------------------------
+
+class TelemetryRecorder:
+    """Append telemetry with timestamps to a binary log plus index.
+
+    Thread-safe; writes are buffered and :meth:`close` flushes.
+    :attr:`skipped` counts duplicate joint/status records and
+    :attr:`oversized` records dropped for a payload over 64 KiB.
+
+    Parameters
+    ----------
+    path : str
+        Output file (overwritten, as is its ``.idx``).
+    index_interval : float
+        Seconds between index entries.
+    """
+
+    def __init__(self, path: str, index_interval: float = DEFAULT_INDEX_INTERVAL):
+        self.path = path
+        self.index_interval = index_interval
+        self._lock = threading.Lock()
+        self._f: Optional[BinaryIO] = open(path, "wb")
+        self._idx: Optional[BinaryIO] = open(path + INDEX_SUFFIX, "wb")
+        self._t0 = time.monotonic()
+        self._last = self._t0
+        self._t_us = 0
+        self._offset = _HEADER.size
+        self._next_index_us = 0
+        self._last_payload: Dict[int, bytes] = {}
+        self._state_off = {k: 0 for k in STATE_KINDS}
+        self.records = 0
+        self.skipped = 0
+        self.oversized = 0
+        self._f.write(_HEADER.pack(MAGIC, time.time(), self._t0))
+
+    def _write(self, kind: int, payload: bytes, t: Optional[float], dedupe: bool = False) -> None:
+        now = time.monotonic() if t is None else t
+        with self._lock:
+            f = self._f
+            if f is None:
+                return
+            if len(payload) > _MAX_PAYLOAD:
+                self.oversized += 1
+                return
+            if dedupe:
+                if self._last_payload.get(kind) == payload:
+                    self.skipped += 1
+                    return
+                self._last_payload[kind] = payload
+            if self._t_us >= self._next_index_us:
+                self._idx.write(_INDEX.pack(
+                    self._t_us, self._offset, *(self._state_off[k] for k in STATE_KINDS)))
+                self._next_index_us = self._t_us + int(self.index_interval * 1e6)
+            delta = max(0, int(round((now - self._last) * 1e6)))
+            self._last = max(self._last, now)
+            self._t_us += delta
+            while delta > _MAX_DELTA_US:
+                f.write(_RECORD.pack(_MAX_DELTA_US, KIND_GAP, 0))
+                self._offset += _RECORD.size
+                delta -= _MAX_DELTA_US
+            if kind in self._state_off:
+                self._state_off[kind] = self._offset
+            f.write(_RECORD.pack(delta, kind, len(payload)))
+            f.write(payload)
+            self._offset += _RECORD.size + len(payload)
+            self.records += 1
+
+    def record_joints(self, joints: Dict[str, float], t: Optional[float] = None) -> None:
+        self._write(KIND_JOINTS, _encode_joints(joints), t, dedupe=True)
+
+    def record_status(self, status: Dict[str, Any], t: Optional[float] = None) -> None:
+        payload = json.dumps(status, separators=(",", ":"), default=str).encode("utf-8")
+        self._write(KIND_STATUS, payload, t, dedupe=True)
+
+    def record_queue(self, line: int, total: int, state: str, t: Optional[float] = None) -> None:
+        code = QUEUE_STATES.index(state) if state in QUEUE_STATES else 0xFF
+        self._write(KIND_QUEUE, _QUEUE.pack(max(0, line), max(0, total), code), t)
+
+    def record_event(self, topic: str, data: Any, t: Optional[float] = None) -> None:
+        payload = json.dumps({"topic": topic, "data": data}, separators=(",", ":"),
+                             default=str).encode("utf-8")
+        self._write(KIND_EVENT, payload, t)
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Record by topic (``TelemetryHub.publish`` signature)."""
+        if topic == "joints":
+            self.record_joints(data)
+        elif topic == "status":
+            self.record_status(data)
+        elif topic == "queue":
+            self.record_queue(int(data.get("line", 0)), int(data.get("total", 0)),
+                              str(data.get("state", "")))
+        else:
+            self.record_event(topic, data)
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.flush()
+                self._idx.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._idx.close()
+                self._f = self._idx = None
+
+    @property
+    def closed(self) -> bool:
+        return self._f is None
+
+    def __enter__(self) -> "TelemetryRecorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ----------------------------------------------------------------------
+#  Reading
+# ----------------------------------------------------------------------
+
+def _read_log(path: str) -> bytes:
+    with open(path, "rb") as f:
+        raw = f.read()
+    if len(raw) < _HEADER.size or raw[:4] != MAGIC:
+        raise ValueError("not a telemetry log")
+    return raw
+
+
+def _iter_records(raw: bytes, offset: int = _HEADER.size,
+                  t_us: int = 0) -> Iterator[Tuple[int, int, int, bytes]]:
+    """Yield ``(t_us, offset, kind, payload)``; stops at a truncated tail."""
+    size = _RECORD.size
+    end = len(raw)
+    pos = offset
+    while pos + size <= end:
+        delta, kind, n = _RECORD.unpack_from(raw, pos)
+        if pos + size + n > end:
+            break
+        t_us += delta
+        if kind != KIND_GAP:
+            yield t_us, pos, kind, raw[pos + size:pos + size + n]
+        pos += size + n
+
+
+def iter_telemetry(path: str) -> Iterator[Tuple[float, str, Any]]:
+    """Yield ``(t, topic, data)`` with *t* in seconds since the recording start."""
+    raw = _read_log(path)
+    for t_us, _, kind, payload in _iter_records(raw):
+        try:
+            topic, data = _decode(kind, payload)
+        except (ValueError, struct.error, IndexError):
+            continue
+        yield t_us / 1e6, topic, data
+
+
+IndexEntry = Tuple[int, int, int, int, int]
+
+
+def build_index(path: str, interval: float = DEFAULT_INDEX_INTERVAL) -> List[IndexEntry]:
+    """Index entries by scanning the log (for a missing or damaged ``.idx``)."""
+    raw = _read_log(path)
+    out: List[IndexEntry] = []
+    state = {k: 0 for k in STATE_KINDS}
+    prev_us = 0
+    next_us = 0
+    step = int(interval * 1e6)
+    for t_us, pos, kind, _ in _iter_records(raw):
+        if prev_us >= next_us:
+            out.append((prev_us, pos, *(state[k] for k in STATE_KINDS)))
+            next_us = prev_us + step
+        if kind in state:
+            state[kind] = pos
+        prev_us = t_us
+    return out
+
+
+def read_index(path: str) -> List[IndexEntry]:
+    """Index entries from ``<path>.idx``, rebuilt if unusable."""
+    try:
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return build_index(path)
+    n = len(raw) // _INDEX.size
+    entries = [_INDEX.unpack_from(raw, i * _INDEX.size) for i in range(n)]
+    if not entries or any(b[0] < a[0] for a, b in zip(entries, entries[1:])):
+        return build_index(path)
+    return entries
+
+
+def telemetry_stats(path: str) -> dict:
+    """Record counts per topic, duration and file size."""
+    counts: Dict[str, int] = {}
+    last = 0.0
+    for t, topic, _ in iter_telemetry(path):
+        counts[topic] = counts.get(topic, 0) + 1
+        last = t
+    total = sum(counts.values())
+    return {
+        "duration_s": round(last, 3),
+        "records": total,
+        "by_topic": counts,
+        "bytes": os.path.getsize(path),
+        "records_per_s": round(total / last, 1) if last > 0 else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+#  Replay
+# ----------------------------------------------------------------------
+
+class TelemetryReplayer:
+    """Play a telemetry log into sink callables.
+
+    Parameters
+    ----------
+    path : str
+        Log written by :class:`TelemetryRecorder`.
+    speed : float
+        Time scale: 1.0 = original pace, N = N times faster, 0 (or a
+        negative value) = no pacing.  May be changed while playing.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0):
+        self.path = path
+        self.speed = speed
+        self._raw = _read_log(path)
+        self._index = read_index(path)
+        self._index_t = [entry[0] for entry in self._index]
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._seek_to: Optional[float] = None
+        self.position = 0.0
+
+    @property
+    def duration(self) -> float:
+        last = 0
+        t0, offset = self._index[-1][:2] if self._index else (0, _HEADER.size)
+        for t_us, _, _, _ in _iter_records(self._raw, offset, t0):
+            last = t_us
+        return last / 1e6
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def seek(self, t: float) -> None:
+        """Jump to *t* seconds (takes effect at the next record when playing)."""
+        with self._lock:
+            self._seek_to = max(0.0, float(t))
+
+    def _start_point(self, t: float) -> Tuple[int, int, Dict[int, bytes]]:
+        """``(t_us, offset, state)`` of the index entry at or before *t*."""
+        i = bisect.bisect_right(self._index_t, int(t * 1e6)) - 1
+        if i < 0:
+            return 0, _HEADER.size, {}
+        t_us, offset, *state_offs = self._index[i]
+        state = {}
+        for kind, off in zip(STATE_KINDS, state_offs):
+            if off:
+                _, _, n = _RECORD.unpack_from(self._raw, off)
+                state[kind] = self._raw[off + _RECORD.size:off + _RECORD.size + n]
+        return t_us, offset, state
+
+    def _deliver(self, sinks: List[Sink], topic: str, data: Any) -> int:
+        errors = 0
+        for sink in sinks:
+            try:
+                sink(topic, data)
+            except Exception:
+                errors += 1
+        return errors
+
+    def replay(self, sinks: List[Sink], start: float = 0.0,
+               end: Optional[float] = None) -> dict:
+        """Replay into *sinks* on the calling thread; returns timing stats.
+
+        Starting (or seeking) past the beginning first delivers the newest
+        ``joints``/``status``/``queue`` state before the target, then plays
+        on from there.  Sink exceptions are counted, not raised.
+        """
+        self._stop.clear()
+        with self._lock:
+            self._seek_to = start
+        records = errors = seeks = 0
+        max_lag = 0.0
+        wall0 = time.monotonic()
+        records_iter: Iterator[Tuple[int, int, int, bytes]] = iter(())
+        anchor_wall = anchor_t = 0.0
+        while not self._stop.is_set():
+            with self._lock:
+                target, self._seek_to = self._seek_to, None
+            if target is not None:
+                # Collapse state up to the target, then re-anchor the clock
+                t_us, offset, state = self._start_point(target)
+                records_iter = _iter_records(self._raw, offset, t_us)
+                pending = None
+                for rec in records_iter:
+                    if rec[0] / 1e6 >= target:
+                        pending = rec
+                        break
+                    if rec[2] in STATE_KINDS:
+                        state[rec[2]] = rec[3]
+                for kind in STATE_KINDS:
+                    if kind not in state:
+                        continue
+                    try:
+                        topic, data = _decode(kind, state[kind])
+                    except (ValueError, struct.error, IndexError):
+                        continue
+                    errors += self._deliver(sinks, topic, data)
+                if pending is not None:
+                    records_iter = _chain(pending, records_iter)
+                anchor_wall, anchor_t = time.monotonic(), target
+                self.position = target
+                seeks += 1
+            rec = next(records_iter, None)
+            if rec is None:
+                break
+            t = rec[0] / 1e6
+            if end is not None and t > end:
+                break
+            speed = self.speed
+            if speed > 0:
+                due = anchor_wall + (t - anchor_t) / speed
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._wait(wait)
+                    if self._stop.is_set():
+                        break
+                    with self._lock:
+                        if self._seek_to is not None:
+                            continue   # seek requested while waiting; rec dropped
+                else:
+                    max_lag = max(max_lag, -wait)
+            else:
+                anchor_wall, anchor_t = time.monotonic(), t
+            if self.speed != speed:
+                anchor_wall, anchor_t = time.monotonic(), t   # speed changed live
+            try:
+                topic, data = _decode(rec[2], rec[3])
+            except (ValueError, struct.error, IndexError):
+                continue
+            errors += self._deliver(sinks, topic, data)
+            self.position = t
+            records += 1
+        elapsed = time.monotonic() - wall0
+        return {
+            "records": records,
+            "seeks": max(0, seeks - 1),
+            "position_s": round(self.position, 4),
+            "elapsed_s": round(elapsed, 4),
+            "records_per_s": round(records / elapsed, 1) if elapsed > 0 else 0.0,
+            "max_lag_s": round(max_lag, 4),
+            "sink_errors": errors,
+        }
+
+    def _wait(self, seconds: float) -> None:
+        """Sleep, waking early for stop() or seek()."""
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set():
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return
+            with self._lock:
+                if self._seek_to is not None:
+                    return
+            self._stop.wait(min(left, 0.05))
+
+
+def _chain(first, rest):
+    yield first
+    yield from rest
+
+
+# ----------------------------------------------------------------------
+#  Sinks
+# ----------------------------------------------------------------------
+
+def udp_sink(mirror) -> Sink:
+    """Send replayed joints through a :class:`UDPMirror` (RoboSim over UDP/shm)."""
+    def sink(topic: str, data: Any) -> None:
+        if topic == "joints":
+            mirror.send_joints(data)
+    return sink
+
+
+def mailbox_sink(mailbox) -> Sink:
+    """Feed replayed joints straight into a RoboSim :class:`TelemetryMailbox`."""
+    def sink(topic: str, data: Any) -> None:
+        if topic == "joints":
+            msg = {"type": "abs"}
+            msg.update(data)
+            mailbox.put(msg)
+    return sink
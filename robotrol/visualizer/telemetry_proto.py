@@ -0,0 +1,201 @@
+"""
+Compact binary telemetry format for the visualizer link.
+
+Every datagram starts with a fixed header::
+
+    magic "RT" | version u8 | type u8 | seq u32 | t f64 (sender monotonic s)
+
+followed by a type-specific payload (little endian):
+
+``MSG_JOINTS``
+    ``mask u8`` — bit *i* set if axis ``JOINT_KEYS[i]`` is present —
+    then one ``f32`` per present axis.  A six-axis frame is 41 bytes
+    instead of ~110 bytes of JSON.
+``MSG_PATH``
+    ``kind u8`` (0 = ``path_fixed``, 1 = ``path_kin``), ``flags u8``
+    (bit 0 = append), ``seq u16``, ``chunk u16``, ``chunks u16``,
+    ``count u16``, then *count* points of four ``f32`` (x, y, z, a).
+    ``seq`` numbers the operations of one path and identifies the
+    transfer: a path is split into chunks that fit :data:`MAX_DATAGRAM`
+    and the receiver assembles it once all of its chunks arrived.
+    *append* transfers carry only the new points (delta); a replacement
+    with no points clears the path.
+
+:class:`TelemetryDecoder` turns datagrams back into the same message
+dicts the JSON format produces (``{"type": "abs", "X": ...}``,
+``{"type": "path_fixed", "pts": [...], "seq": 7, "append": True}``), so receivers
+can accept both formats side by side (:func:`is_binary`).
+No tkinter dependency.
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+MAGIC = b"RT"
+VERSION = 1
+
+MSG_JOINTS = 1
+MSG_PATH = 2
+
+JOINT_KEYS = ("X", "Y", "Z", "A", "B", "C", "S")
+PATH_KINDS = ("path_fixed", "path_kin")
+FLAG_APPEND = 0x01
+
+HEADER = struct.Struct("<2sBBId")
+PATH_HEADER = struct.Struct("<BBHHHH")
+POINT = struct.Struct("<4f")
+
+MAX_DATAGRAM = 1400  # stays below a typical MTU
+POINTS_PER_CHUNK = (MAX_DATAGRAM - HEADER.size - PATH_HEADER.size) // POINT.size
+
+# A joint frame whose seq is at most this far behind the last one is stale;
+# a larger backwards jump means the sender restarted.
+STALE_WINDOW = 1024
+# Incomplete path transfers kept while waiting for missing chunks
+MAX_OPEN_TRANSFERS = 8
+
+_JOINT_FMTS = {n: struct.Struct("<B" + "f" * n) for n in range(len(JOINT_KEYS) + 1)}
+
+
+def is_binary(data: bytes) -> bool:
+    """True if *data* is a binary telemetry datagram (not JSON text)."""
+    return data[:2] == MAGIC
+
+
+class TelemetryEncoder:
+    """Build binary datagrams; owns the sequence and transfer counters."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self.seq = 0
+        self._transfer = 0
+
+    def _header(self, msg_type: int) -> bytes:
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        return HEADER.pack(MAGIC, VERSION, msg_type, self.seq, self._clock())
+
+    def joints(self, joints: Mapping[str, float]) -> bytes:
+        """One joint frame; keys outside :data:`JOINT_KEYS` are ignored."""
+        mask = 0
+        values: List[float] = []
+        for i, key in enumerate(JOINT_KEYS):
+            if key in joints:
+                mask |= 1 << i
+                values.append(float(joints[key]))
+        return self._header(MSG_JOINTS) + _JOINT_FMTS[len(values)].pack(mask, *values)
+
+    def path(self, points: Sequence[Sequence[float]], path_type: str = "path_fixed",
+             append: bool = False, seq: Optional[int] = None) -> List[bytes]:
+        """Datagrams for a full path (or, with *append*, new points only).
+
+        *seq* is the sender's per-path operation number; without it an
+        internal counter is used.
+        """
+        kind = PATH_KINDS.index(path_type)
+        if seq is None:
+            self._transfer = (self._transfer + 1) & 0xFFFF
+            seq = self._transfer
+        seq &= 0xFFFF
+        flags = FLAG_APPEND if append else 0
+        pts = [(float(p[0]), float(p[1]), float(p[2]), float(p[3]) if len(p) > 3 else 0.0)
+               for p in points]
+        chunks = max(1, -(-len(pts) // POINTS_PER_CHUNK))
+        out = []
+        for c in range(chunks):
+            part = pts[c * POINTS_PER_CHUNK:(c + 1) * POINTS_PER_CHUNK]
+            body = b"".join(POINT.pack(*p) for p in part)
+            out.append(self._header(MSG_PATH)
+                       + PATH_HEADER.pack(kind, flags, seq, c, chunks, len(part))
+                       + body)
+        return out
+
+
+class _Transfer:
+    __slots__ = ("kind", "append", "chunks")
+
+    def __init__(self, kind: int, append: bool, count: int):
+        self.kind = kind
+        self.append = append
+        self.chunks: List[Optional[List[List[float]]]] = [None] * count
+
+
+class TelemetryDecoder:
+    """Turn binary datagrams into message dicts (one receiving thread)."""
+
+    def __init__(self):
+        self._last_joint_seq: Optional[int] = None
+        self._transfers: Dict[Tuple[int, int], _Transfer] = {}
+        self.frames = 0
+        self.stale = 0
+        self.invalid = 0
+        self.incomplete = 0
+
+    def feed(self, data: bytes) -> Optional[Dict[str, Any]]:
+        """Decode one datagram; None if invalid, stale or a partial transfer."""
+        if len(data) < HEADER.size:
+            self.invalid += 1
+            return None
+        magic, version, msg_type, seq, t = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            self.invalid += 1
+            return None
+        try:
+            if msg_type == MSG_JOINTS:
+                return self._joints(data, seq, t)
+            if msg_type == MSG_PATH:
+                return self._path(data)
+        except (struct.error, IndexError, ValueError):
+            pass
+        self.invalid += 1
+        return None
+
+    def _joints(self, data: bytes, seq: int, t: float) -> Optional[Dict[str, Any]]:
+        last = self._last_joint_seq
+        if last is not None and 0 <= (last - seq) & 0xFFFFFFFF < STALE_WINDOW:
+            self.stale += 1  # duplicate or reordered behind a newer frame
+            return None
+        mask = data[HEADER.size]
+        keys = [k for i, k in enumerate(JOINT_KEYS) if mask & (1 << i)]
+        values = _JOINT_FMTS[len(keys)].unpack_from(data, HEADER.size)[1:]
+        self._last_joint_seq = seq
+        self.frames += 1
+        msg: Dict[str, Any] = {"type": "abs", "seq": seq, "t": t}
+        msg.update(zip(keys, values))
+        return msg
+
+    def _path(self, data: bytes) -> Optional[Dict[str, Any]]:
+        kind, flags, seq, chunk, chunks, count = PATH_HEADER.unpack_from(data, HEADER.size)
+        transfer = (kind, seq)
+        off = HEADER.size + PATH_HEADER.size
+        pts = [list(POINT.unpack_from(data, off + i * POINT.size)) for i in range(count)]
+        tr = self._transfers.get(transfer)
+        if tr is None:
+            if len(self._transfers) >= MAX_OPEN_TRANSFERS:
+                self._transfers.pop(next(iter(self._transfers)))
+                self.incomplete += 1
+            tr = self._transfers[transfer] = _Transfer(kind, bool(flags & FLAG_APPEND), chunks)
+        tr.chunks[chunk] = pts
+        if any(c is None for c in tr.chunks):
+            return None
+        del self._transfers[transfer]
+        self.frames += 1
+        msg: Dict[str, Any] = {
+            "type": PATH_KINDS[tr.kind],
+            "pts": [p for c in tr.chunks for p in c],  # type: ignore[union-attr]
+            "seq": seq,
+        }
+        if tr.append:
+            msg["append"] = True
+        return msg
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "frames": self.frames,
+            "stale": self.stale,
+            "invalid": self.invalid,
+            "incomplete": self.incomplete,
+            "open_transfers": len(self._transfers),
+        }
@@ -9,14 +9,35 @@ JSON message formats (type field determines semantics):
   "abs"           — Joint positions  {"type":"abs", "X":..., "Y":..., ..., "timestamp":...}
   "path_fixed"    — Fixed TCP path   {"type":"path_fixed", "pts":[[x,y,z,a], ...]}
   "path_kin"      — Kinematic path   {"type":"path_kin",   "pts":[[x,y,z,a], ...]}
+                    Path messages carry a per-path "seq"; "append": true
+                    adds points, an empty "pts" clears the path.
   "fixed_frame"   — Coordinate frame {"type":"fixed_frame","origin":[x,y,z],"x":[...],"y":[...],"z":[...]}
   "robot_profile" — Full profile     {"type":"robot_profile","profile":"...","geometry_mm":{...}, ...}
+
+With ``binary=True`` joint frames and paths use the struct-packed format
+of :mod:`robotrol.visualizer.telemetry_proto` instead (sequence numbers,
+monotonic timestamps, paths split into datagram-sized chunks); frames and
+profiles stay JSON.  The visualizer accepts both formats.
+
+With ``max_rate_hz`` joint frames are rate limited: poses arriving faster
+are coalesced (newest value per axis wins) and the latest one is sent as
+soon as the interval allows, so the final pose of a move is never lost.
+
+With ``transport="shm"`` joint frames and paths are written to the
+shared-memory channel of :mod:`robotrol.visualizer.shm_channel` instead
+(visualizer on the same host); everything else still goes over UDP.  If
+the segment cannot be created the mirror falls back to UDP.
 """
 
 import json
 import socket
+import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
+
+from robotrol.visualizer.path_store import next_seq
+from robotrol.visualizer.shm_channel import SHM_NAME, ShmTelemetryWriter
+from robotrol.visualizer.telemetry_proto import TelemetryEncoder
 
 
 class UDPMirror:
@@ -28,14 +49,47 @@ class UDPMirror:
         Target (host, port).  Default ``("127.0.0.1", 9999)``.
     enabled : bool
         If *False*, all send methods are no-ops.
+    binary : bool
+        Send joint frames and paths in the binary telemetry format.
+    max_rate_hz : float, optional
+        Upper bound for joint frames per second; *None* sends every pose.
+    transport : str
+        ``"udp"`` (default) or ``"shm"`` for joints and paths.
+    shm_name : str
+        Shared-memory segment name for ``transport="shm"``.
+    clock : callable
+        Monotonic time source (tests).
     """
 
-    def __init__(self, addr: tuple[str, int] = ("127.0.0.1", 9999), enabled: bool = True):
+    def __init__(self, addr: tuple[str, int] = ("127.0.0.1", 9999), enabled: bool = True,
+                 binary: bool = False, max_rate_hz: Optional[float] = None,
+                 transport: str = "udp", shm_name: str = SHM_NAME,
+                 clock=time.monotonic):
         self.addr = addr
         self.enabled = enabled
+        self.binary = binary
         self.sock: Optional[socket.socket] = None
         if enabled:
             self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._clock = clock
+        self._encoder = TelemetryEncoder(clock)
+        self._tx_lock = threading.Lock()   # encoder counters + socket
+        # Joint rate limiter: latest pose waits for the interval to pass
+        self._min_interval = 1.0 / max_rate_hz if max_rate_hz else 0.0
+        self._cond = threading.Condition()
+        self._pending_pose: Optional[Dict[str, float]] = None
+        self._last_pose_t = float("-inf")
+        self._flusher: Optional[threading.Thread] = None
+        self.poses_sent = 0
+        self.poses_coalesced = 0
+        self._path_seq: Dict[str, int] = {}
+        self.shm: Optional[ShmTelemetryWriter] = None
+        if enabled and transport == "shm":
+            try:
+                self.shm = ShmTelemetryWriter(shm_name, clock=clock)
+            except (OSError, ValueError):
+                self.shm = None   # UDP fallback
+        self.transport = "shm" if self.shm is not None else "udp"
 
     # ------------------------------------------------------------------
     #  Low-level
@@ -60,6 +114,16 @@ class UDPMirror:
         except Exception:
             pass
 
+    def _send_bytes(self, datagrams) -> None:
+        """Send pre-encoded binary datagrams."""
+        if not self.enabled or not self.sock:
+            return
+        try:
+            for dgram in datagrams:
+                self.sock.sendto(dgram, self.addr)
+        except Exception:
+            pass
+
     # ------------------------------------------------------------------
     #  Joint positions  (type: "abs")
     # ------------------------------------------------------------------
@@ -85,17 +149,69 @@ class UDPMirror:
                 "C": -12.5,
                 "timestamp": 1741900000.123
             }
+
+        With ``max_rate_hz`` set the pose may be merged into a pending one
+        and sent later from the mirror's flush thread.
         """
+        pose = {ax: float(val) for ax, val in joints.items()}
+        if not self._min_interval:
+            self._emit_pose(pose)
+            return
+        with self._cond:
+            if self._pending_pose is not None:
+                self._pending_pose.update(pose)
+                self.poses_coalesced += 1
+                return
+            now = self._clock()
+            if now - self._last_pose_t >= self._min_interval:
+                self._last_pose_t = now
+            else:
+                self._pending_pose = pose
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="udp-mirror-flush", daemon=True)
+                    self._flusher.start()
+                self._cond.notify()
+                return
+        self._emit_pose(pose)
+
+    def _emit_pose(self, pose: Dict[str, float]) -> None:
+        self.poses_sent += 1
+        if self.shm is not None:
+            self.shm.write_joints(pose)
+            return
+        if self.binary:
+            with self._tx_lock:
+                self._send_bytes([self._encoder.joints(pose)])
+            return
         msg: dict = {"type": "abs", "timestamp": time.time()}
-        for ax, val in joints.items():
-            msg[ax] = float(val)
+        msg.update(pose)
         self._send_json(msg)
 
+    def _flush_loop(self) -> None:
+        """Send the pending pose once the rate interval has passed."""
+        while True:
+            with self._cond:
+                while self.enabled:
+                    if self._pending_pose is None:
+                        self._cond.wait()
+                        continue
+                    wait = self._last_pose_t + self._min_interval - self._clock()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if not self.enabled:
+                    return
+                pose, self._pending_pose = self._pending_pose, None
+                self._last_pose_t = self._clock()
+            self._emit_pose(pose)
+
     # ------------------------------------------------------------------
     #  Path data  (type: "path_fixed" / "path_kin")
     # ------------------------------------------------------------------
 
-    def send_path(self, points: list, path_type: str = "path_fixed") -> None:
+    def send_path(self, points: list, path_type: str = "path_fixed",
+                  append: bool = False) -> None:
         """Send a list of path points to the visualizer.
 
         Parameters
@@ -105,20 +221,49 @@ class UDPMirror:
             extra axis value (typically joint-A / rotation).
         path_type : str
             Either ``"path_fixed"`` or ``"path_kin"``.
+        append : bool
+            *points* are new points to append to the visualizer's path
+            instead of a replacement for it.
 
-        JSON format sent::
+        JSON format sent (``"append": true`` only for appends)::
 
             {
                 "type": "path_fixed",
-                "pts": [[x, y, z, a], ...]
+                "pts": [[x, y, z, a], ...],
+                "seq": 12
             }
+
+        ``seq`` counts the operations of each path (16 bit, wrapping) so
+        the visualizer can drop late appends and notice lost ones.
+        In binary mode the points are sent as one or more chunks of
+        :data:`~robotrol.visualizer.telemetry_proto.POINTS_PER_CHUNK`.
         """
+        if self.shm is not None:
+            self.shm.write_path(points, path_type, append)
+            return
+        with self._tx_lock:
+            seq = next_seq(self._path_seq.get(path_type, 0))
+            self._path_seq[path_type] = seq
+            if self.binary:
+                self._send_bytes(self._encoder.path(points, path_type, append, seq))
+                return
         msg = {
             "type": path_type,
             "pts": [[float(a), float(b), float(c), float(d)] for a, b, c, d in points],
+            "seq": seq,
         }
+        if append:
+            msg["append"] = True
         self._send_json(msg)
 
+    def append_path(self, points: list, path_type: str = "path_fixed") -> None:
+        """Send only the new *points* of a path (see :meth:`send_path`)."""
+        self.send_path(points, path_type, append=True)
+
+    def clear_path(self, path_type: str = "path_fixed") -> None:
+        """Clear a path in the visualizer."""
+        self.send_path([], path_type)
+
     # ------------------------------------------------------------------
     #  Fixed coordinate frame  (type: "fixed_frame")
     # ------------------------------------------------------------------
@@ -216,21 +361,31 @@ class UDPMirror:
         if line.startswith("M3") and "S" in line:
             try:
                 s_val = float(line.split("S", 1)[1].strip())
-                msg = {
-                    "type": "abs",
-                    "S": s_val,
-                    "timestamp": time.time(),
-                }
-                self._send_json(msg)
             except Exception:
-                pass
+                return
+            self.send_joints({"S": s_val})
 
     # ------------------------------------------------------------------
     #  Lifecycle
     # ------------------------------------------------------------------
 
+    def stats(self) -> Dict[str, int]:
+        """Joint frames sent and merged by the rate limiter."""
+        with self._cond:
+            return {
+                "poses_sent": self.poses_sent,
+                "poses_coalesced": self.poses_coalesced,
+                "seq": self._encoder.seq,
+            }
+
     def close(self) -> None:
-        """Close the UDP socket."""
+        """Close the UDP socket and the shared-memory segment."""
+        with self._cond:
+            self.enabled = False
+            self._cond.notify_all()
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
         if self.sock:
             try:
                 self.sock.close()
@@ -0,0 +1,118 @@
+"""Test the asyncio controller layer against the virtual controller."""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+simulator = pytest.importorskip("robotrol.serial.simulator")
+if not hasattr(os, "openpty"):
+    pytest.skip("pseudo-terminals not available", allow_module_level=True)
+
+from robotrol.serial.aio import AsyncController, BlockingController, ControllerError  # noqa: E402
+from robotrol.serial.pool import ControllerPool  # noqa: E402
+
+
+@pytest.fixture
+def arm():
+    vc = simulator.VirtualController(time_scale=1.0)
+    vc.start()
+    pool = ControllerPool()
+    ctl = pool.add("arm", vc.port)
+    pool.start()
+    ctl.vc = vc
+    yield ctl
+    pool.close()
+    vc.stop()
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10.0))
+
+
+class TestAsyncController:
+    """send / wait_state / statuses / run_program."""
+
+    def test_send_resolves_on_ok_and_raises_on_error(self, arm):
+        async def main():
+            async with AsyncController(arm) as ctl:
+                assert await ctl.send("G21 G90") == "ok"
+                with pytest.raises(ControllerError) as exc:
+                    await ctl.send("G1 X1 Q5")
+                assert exc.value.reply.startswith("error:")
+                assert exc.value.line == "G1 X1 Q5"
+
+        _run(main())
+
+    def test_wait_state_waits_for_the_move(self, arm):
+        async def main():
+            async with AsyncController(arm) as ctl:
+                await ctl.send("G1 X5 F3000")
+                t0 = time.monotonic()
+                st = await ctl.wait_state("Idle", timeout=5.0)
+                assert st["state"] == "Idle"
+                assert st["mpos"]["X"] == pytest.approx(5.0)
+                return time.monotonic() - t0
+
+        # 5 mm at 3000 mm/min with 200 mm/s² takes well over 0.1 s
+        assert _run(main()) > 0.1
+
+    def test_status_iterator_sees_run_then_idle(self, arm):
+        async def main():
+            async with AsyncController(arm) as ctl:
+                states = []
+
+                async def watch():
+                    async for st in ctl.statuses():
+                        states.append(st["state"])
+                        if states[-1] == "Idle" and "Run" in states:
+                            return
+
+                task = asyncio.ensure_future(watch())
+                await asyncio.sleep(0)
+                await ctl.send("G1 X3 F3000")
+                await asyncio.wait_for(task, 5.0)
+                return states
+
+        states = _run(main())
+        assert "Run" in states and states[-1] == "Idle"
+
+    def test_run_program_and_alarm(self, arm):
+        async def main():
+            async with AsyncController(arm) as ctl:
+                ok = await ctl.run_program(["G21 G90", "G1 X1 F3000", "G1 X2 Q1", "G1 X0"])
+                assert ok["status"] == "finished"
+                assert ok["acked"] == 3 and ok["errors"] == {"3": 1}
+                # An alarm fails the send still waiting for its ok
+                dwell = asyncio.ensure_future(ctl.send("G4 P5"))
+                await asyncio.sleep(0.1)
+                arm.vc.trigger_alarm(1)
+                with pytest.raises(ControllerError) as exc:
+                    await dwell
+                assert exc.value.reply == "ALARM:1"
+
+        _run(main())
+
+
+class TestBlockingController:
+    """Blocking facade used by worker threads."""
+
+    def test_wait_idle_after_moves_sent_elsewhere(self, arm):
+        waiter = BlockingController(arm)
+        try:
+            # Sent around the controller, as the GUI motion helpers do
+            arm.send_line("G21 G90")
+            arm.send_line("G1 X5 F3000")
+            t0 = time.monotonic()
+            st = waiter.wait_idle(timeout=5.0)
+            elapsed = time.monotonic() - t0
+            assert st["state"] == "Idle"
+            assert st["mpos"]["X"] == pytest.approx(5.0)
+            assert elapsed > 0.1
+            with pytest.raises(asyncio.TimeoutError):
+                waiter.wait_state("Alarm", timeout=0.2)
+        finally:
+            waiter.close()
+        assert waiter.ctl._on_line_threadsafe not in arm.listeners
+
@@ -0,0 +1,76 @@
+"""Tests for chord-tolerance arc segmentation."""
+
+import math
+
+import pytest
+
+from robotrol.gcode.arcs import arc_angles, arc_points, arc_steps, refine_joint_space
+
+
+def _chord_error(radius, sweep, steps):
+    return radius * (1 - math.cos(abs(sweep) / steps / 2))
+
+
+class TestArcSteps:
+    """Segment count from chord tolerance."""
+
+    @pytest.mark.parametrize("radius", [0.5, 3.0, 12.5, 80.0, 400.0])
+    @pytest.mark.parametrize("tol", [0.005, 0.05])
+    def test_error_within_tolerance(self, radius, tol):
+        sweep = 1.7 * math.pi
+        n = arc_steps(radius, sweep, tol)
+        assert _chord_error(radius, sweep, n) <= tol + 1e-12
+        if n > 1:
+            # One segment fewer would exceed the tolerance
+            assert _chord_error(radius, sweep, n - 1) > tol
+
+    def test_fewer_segments_than_fixed_length(self):
+        # Fixed 2 mm chords over mixed radii, at the same worst-case error
+        sweep = 2 * math.pi
+        radii = (2.0, 5.0, 50.0)
+        fixed = [max(3, math.ceil(sweep * r / 2.0)) for r in radii]
+        worst = max(_chord_error(r, sweep, n) for r, n in zip(radii, fixed))
+        adaptive = [arc_steps(r, sweep, worst) for r in radii]
+        assert sum(adaptive) < sum(fixed) / 3
+
+    def test_tolerance_larger_than_radius(self):
+        assert arc_steps(0.1, 2 * math.pi, 1.0) == 4
+        assert arc_steps(0.0, math.pi, 0.05) == 1
+
+    def test_max_seg_len_caps_chord(self):
+        n = arc_steps(100.0, math.pi, 1.0, max_seg_len=5.0)
+        chord = 2 * 100.0 * math.sin(math.pi / n / 2)
+        assert chord <= 5.0 + 1e-9
+        assert n > arc_steps(100.0, math.pi, 1.0)
+
+    def test_angles_and_points(self):
+        angles = arc_angles(0.0, -math.pi, 4)
+        assert angles == pytest.approx([-math.pi / 4, -math.pi / 2, -3 * math.pi / 4, -math.pi])
+        pts = arc_points(1.0, 0.0, 2.0, 0.0, math.pi / 2, 2)
+        assert pts[-1] == pytest.approx((1.0, 2.0))
+
+
+class TestRefineJointSpace:
+    """Joint-space subdivision."""
+
+    def test_no_refinement_for_linear_joints(self):
+        angles = arc_angles(0.0, 1.0, 4)
+        out = refine_joint_space(angles, 0.0, lambda a: a, lambda p: [10.0 * p], 0.01)
+        assert out == angles
+
+    def test_bisects_nonlinear_joints(self):
+        angles = arc_angles(0.0, 1.0, 2)
+        # Quadratic joint: midpoint deviation is 100 * (h/2)^2
+        out = refine_joint_space(angles, 0.0, lambda a: a, lambda p: [100.0 * p * p], 0.5)
+        assert len(out) > len(angles)
+        assert out == sorted(out) and out[-1] == 1.0
+        prev = 0.0
+        for a in out:
+            assert 100.0 * ((a - prev) / 2) ** 2 <= 0.5
+            prev = a
+
+    def test_wrap_is_not_a_deviation(self):
+        # Joint crossing +-180 deg must not trigger subdivision
+        joint = lambda p: [((p + 180.0) % 360.0) - 180.0]
+        angles = [175.0, 185.0]
+        assert refine_joint_space(angles, 165.0, lambda a: a, joint, 0.1) == angles
@@ -0,0 +1,104 @@
+"""Test the selector-based multi-controller pool."""
+
+import os
+import threading
+import time
+
+import pytest
+
+simulator = pytest.importorskip("robotrol.serial.simulator")
+if not hasattr(os, "openpty"):
+    pytest.skip("pseudo-terminals not available", allow_module_level=True)
+
+from robotrol.serial.pool import ControllerPool  # noqa: E402
+
+
+def _program(n, scale=10.0):
+    return ["G21 G90", "F3000"] + [f"G1 X{(i % 10) * scale / 10:.2f} Y{i % 3}" for i in range(n)]
+
+
+@pytest.fixture
+def cell():
+    ctls = [simulator.VirtualController(time_scale=0.0) for _ in range(3)]
+    for c in ctls:
+        c.start()
+    pool = ControllerPool(stream_timeout=2.0)
+    yield ctls, pool
+    pool.close()
+    for c in ctls:
+        c.stop()
+
+
+class TestControllerPool:
+    """Several controllers streamed and polled from one thread."""
+
+    def test_streams_all_controllers_on_one_thread(self, cell):
+        ctls, pool = cell
+        before = threading.active_count()
+        arms = [pool.add(f"arm{i}", c.port) for i, c in enumerate(ctls)]
+        pool.start()
+        assert threading.active_count() == before + 1
+        for arm in arms:
+            arm.stream(_program(40))
+        for arm in arms:
+            assert arm.wait_stream(10.0)
+        for arm, c in zip(arms, ctls):
+            run = arm.stats()["run"]
+            assert run["status"] == "finished"
+            assert run["acked"] == run["total"] == 42
+            assert c.stats()["lines_received"] >= 42
+
+    def test_status_stream_and_polling(self, cell):
+        ctls, pool = cell
+        seen = {}
+        arm = pool.add("arm0", ctls[0].port)
+        arm.status_listeners.append(lambda ctl, st: seen.setdefault(ctl.name, st))
+        pool.start()
+        deadline = time.monotonic() + 2.0
+        while "arm0" not in seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert seen["arm0"]["state"] == "Idle"
+        assert arm.state == "Idle"
+        poll = arm.stats()["poll"]
+        assert poll["replies"] >= 1 and poll["rtt_ms"]["max"] >= 0.0
+
+    def test_alarm_aborts_only_that_controller(self, cell):
+        ctls, pool = cell
+        slow = simulator.VirtualController(time_scale=1.0)
+        slow.start()
+        try:
+            a = pool.add("slow", slow.port, poll=False)
+            b = pool.add("fast", ctls[1].port, poll=False)
+            pool.start()
+            a.stream(_program(200, scale=100.0))
+            b.stream(_program(20))
+            time.sleep(0.2)
+            slow.trigger_alarm(1)
+            assert a.wait_stream(2.0)
+            assert b.wait_stream(5.0)
+            assert a.last_run["status"] == "alarm"
+            assert b.last_run["status"] == "finished"
+            assert a.stats()["alarms"] == 1
+        finally:
+            pool.remove("slow")
+            slow.stop()
+
+    def test_appended_lines_count_towards_run(self, cell):
+        ctls, pool = cell
+        arm = pool.add("arm0", ctls[0].port, poll=False)
+        # Pool not started yet: both parts form one run
+        arm.stream(_program(30))
+        arm.stream(_program(10))
+        pool.start()
+        assert arm.wait_stream(10.0)
+        assert arm.last_run["status"] == "finished"
+        assert arm.last_run["acked"] == arm.last_run["total"] == 44
+
+    def test_remove_and_duplicate_name(self, cell):
+        ctls, pool = cell
+        pool.add("arm0", ctls[0].port)
+        with pytest.raises(ValueError):
+            pool.add("arm0", ctls[0].port)
+        pool.start()
+        pool.remove("arm0")
+        assert len(pool) == 0 and pool.names == []
@@ -0,0 +1,74 @@
+"""Test the typed $$ settings snapshot, diffing and cache."""
+
+import math
+
+from robotrol.gcode.estimator import MachineLimits
+from robotrol.serial.settings import (
+    ControllerSettings, SettingsCache, firmware_from_line,
+)
+
+DUMP = [
+    "$3=5",
+    "$11=0.010",
+    "$20=1",
+    "$22=0",
+    "$100=80.000 (x, step/mm)",
+    "$110=3000.000",
+    "$111=2500.000",
+    "$125=50.000",
+    "$130=300.000",
+    "$32=abc",
+    "ok",
+]
+
+
+class TestControllerSettings:
+    """Parsing into typed groups and flags."""
+
+    def test_parse_typed_access(self):
+        s = ControllerSettings.parse(DUMP)
+        assert len(s) == 10
+        assert s[100] == "80.000"
+        assert s.steps[0] == 80.0
+        assert s.axis("max_rate", "Y") == 2500.0
+        assert s.accel[5] == 50.0 and math.isnan(s.accel[0])
+        assert s.max_travel[0] == 300.0
+        assert s.soft_limits is True and s.homing is False and s.hard_limits is None
+        assert s.invert_mask == 5
+        assert s.junction_deviation == 0.01
+        assert s.number(32, -1.0) == -1.0 and s[32] == "abc"
+        assert s.has_motion_limits()
+
+    def test_mapping_feeds_machine_limits(self):
+        s = ControllerSettings.parse(DUMP)
+        lim = MachineLimits.from_settings(s)
+        assert lim.max_rate[:2] == [3000.0, 2500.0]
+        assert lim.accel[5] == 50.0
+
+    def test_minimal_diff(self):
+        cur = ControllerSettings.parse(DUMP)
+        target = {110: 3000, 111: 2000.0, 20: "1", 32: "abc", 120: 150, 22: 1}
+        assert cur.diff(target) == ["$22=1", "$111=2000", "$120=150"]
+        assert cur.diff(ControllerSettings.parse(DUMP)) == []
+        cur.update_line("$111=2000")
+        assert cur.axis("max_rate", "Y") == 2000.0
+
+    def test_firmware_ids(self):
+        assert firmware_from_line("Grbl 3.7 [FluidNC v3.7.17 (sim) '$' for help]") == "FluidNC v3.7.17"
+        assert firmware_from_line("Grbl 1.1h ['$' for help]") == "Grbl 1.1h"
+        assert firmware_from_line("[VER:1.1h.20190825:]") == "Grbl 1.1h.20190825"
+        assert firmware_from_line("ok") is None
+
+
+class TestSettingsCache:
+    """Per controller + firmware JSON cache."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "cache.json")
+        s = ControllerSettings.parse(DUMP)
+        cache = SettingsCache(path)
+        assert cache.store("Moveo", "Grbl 1.1h", s)
+        assert not cache.store("Moveo", "Grbl 1.1h", s)
+        again = SettingsCache(path).load("Moveo", "Grbl 1.1h")
+        assert again == s and again.steps[0] == 80.0
+        assert SettingsCache(path).load("Moveo", "FluidNC v3.7.17") is None
@@ -0,0 +1,84 @@
+"""Tests for the GRBL-style cycle-time estimator."""
+
+import math
+
+import pytest
+
+from robotrol.gcode.estimator import MachineLimits, estimate_program, format_duration
+from robotrol.gcode.program import compile_lines
+
+
+def _limits(rate=6000.0, accel=100.0, jd=0.01):
+    return MachineLimits(max_rate=[rate] * 6, accel=[accel] * 6, junction_deviation=jd)
+
+
+class TestMachineLimits:
+    """Settings parsing."""
+
+    def test_from_lines(self):
+        lim = MachineLimits.from_lines([
+            "$11=0.020", "$110=3000.000 (x max rate)", "$123=50", "$124=abc", "ok",
+        ])
+        assert lim.junction_deviation == pytest.approx(0.02)
+        assert lim.max_rate[0] == 3000.0
+        assert lim.accel[3] == 50.0
+        assert lim.accel[4] == MachineLimits().accel[4]
+
+    def test_from_settings_dict(self):
+        lim = MachineLimits.from_settings({111: 1200.0, 121: "75"})
+        assert lim.max_rate[1] == 1200.0 and lim.accel[1] == 75.0
+
+
+class TestEstimate:
+    """Planner model."""
+
+    def test_trapezoid(self):
+        # 100 mm at 50 mm/s, 100 mm/s²: 0.5 s up, 0.5 s down, 1.5 s cruise
+        est = estimate_program(compile_lines(["G1 X100 F3000"]), _limits())
+        assert est.total_s == pytest.approx(2.5)
+        assert est.line_time(1) == pytest.approx(2.5)
+
+    def test_triangle(self):
+        # 4 mm never reaches 50 mm/s: t = 2 * sqrt(d / a)
+        est = estimate_program(compile_lines(["G1 X4 F3000"]), _limits())
+        assert est.total_s == pytest.approx(2 * math.sqrt(4 / 100))
+
+    def test_axis_rate_limit_and_rapid(self):
+        lim = _limits(rate=600.0, accel=1e6)
+        est = estimate_program(compile_lines(["G0 X100"]), lim)
+        assert est.total_s == pytest.approx(10.0, rel=1e-3)
+
+    def test_straight_junction_keeps_speed(self):
+        split = estimate_program(compile_lines(["G1 X50 F3000", "X100"]), _limits())
+        assert split.total_s == pytest.approx(2.5)
+
+    def test_corner_and_reversal_slow_down(self):
+        straight = estimate_program(compile_lines(["G1 X50 F3000", "X100"]), _limits()).total_s
+        corner = estimate_program(compile_lines(["G1 X50 F3000", "Y50"]), _limits()).total_s
+        reverse = estimate_program(compile_lines(["G1 X50 F3000", "X0"]), _limits()).total_s
+        assert straight < corner < reverse
+        # Reversal stops completely: two independent 50 mm moves
+        single = estimate_program(compile_lines(["G1 X50 F3000"]), _limits()).total_s
+        assert reverse == pytest.approx(2 * single)
+
+    def test_lookahead_limits_speed_on_short_segments(self):
+        lines = ["G91 F3000"] + ["G1 X0.1"] * 1000
+        prog = compile_lines(lines)
+        full = estimate_program(prog, _limits(), lookahead=0).total_s
+        short = estimate_program(prog, _limits(), lookahead=4).total_s
+        assert full == pytest.approx(2.5, rel=1e-3)
+        assert short > full
+
+    def test_dwell_modes_and_progress(self):
+        prog = compile_lines(["G21 G91", "G1 X100 F3000", "G4 P1.5", "G90", "X0"])
+        est = estimate_program(prog, _limits())
+        assert est.dwell_s == pytest.approx(1.5)
+        assert est.total_s == pytest.approx(2.5 + 1.5 + 2.5)
+        assert est.time_until(3) == pytest.approx(4.0)
+        assert est.remaining(3) == pytest.approx(2.5)
+        assert est.slowest(1) == [(2, pytest.approx(2.5))]
+
+    def test_format_duration(self):
+        assert format_duration(3.421) == "3.42s"
+        assert format_duration(123.4) == "2m 03.4s"
+        assert format_duration(3723) == "1h 02m 03s"
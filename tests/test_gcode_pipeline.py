@@ -0,0 +1,127 @@
+"""Tests for the headless G-code -> joint-space compiler."""
+
+import io
+import json
+import math
+
+from pathlib import Path
+
+import pytest
+
+from robotrol.gcode import pipeline
+from robotrol.gcode.__main__ import main
+from robotrol.gcode.pipeline import PlaneFrame, compile_file, plan_waypoints, profile_limits
+from robotrol.gcode.program import compile_text, load_program
+from robotrol.kinematics.dh_model import DHModel
+
+
+EXAMPLES = Path(__file__).parent.parent / "data" / "examples"
+PLANE = {"origin": [250.0, 0.0, 150.0], "u": [1, 0, 0], "v": [0, 1, 0], "rpy": [0, 90, 0]}
+
+
+def _circle_program(n=300, r=20.0):
+    lines = ["G21 G90", "G0 X20 Y0 Z0", "F1500"]
+    for i in range(1, n + 1):
+        a = 2 * math.pi * i / 60
+        lines.append(f"G1 X{r * math.cos(a):.3f} Y{r * math.sin(a):.3f}")
+    return "\n".join(lines) + "\n"
+
+
+class TestPlaneFrame:
+    """Plane coordinates to world coordinates."""
+
+    def test_orthonormalizes_axes(self):
+        plane = PlaneFrame(u=(2.0, 0.0, 0.0), v=(1.0, 1.0, 0.0))
+        assert plane.u == pytest.approx((1.0, 0.0, 0.0))
+        assert plane.v == pytest.approx((0.0, 1.0, 0.0))
+        assert plane.n == pytest.approx((0.0, 0.0, 1.0))
+
+    def test_transform_options(self):
+        plane = PlaneFrame.from_dict({"scale_x": 2, "mirror_y": True, "rotate": 90,
+                                      "offset_u": 5})
+        u, v, w = plane.to_uvw(1.0, 1.0, 2.0, 1.0)
+        # scale/mirror -> (2, -1), rotate 90 -> (1, 2), offset -> (6, 2)
+        assert (u, v) == pytest.approx((6.0, 2.0))
+        assert w == pytest.approx(3.0)
+
+    def test_rejects_bad_rotation(self):
+        with pytest.raises(ValueError):
+            PlaneFrame.from_dict({"rotate": 45})
+
+
+class TestPlanWaypoints:
+    """Sequential interpreter stage."""
+
+    def test_linear_and_arc_moves(self):
+        prog = compile_text("G21 G90\nG1 X10 Y0 F600\nG2 X0 Y-10 I-10 J0\n")
+        plane = PlaneFrame(origin=(100.0, 0.0, 50.0))
+        wps = list(plan_waypoints(prog, plane, chord_tol=0.05))
+        assert wps[0].xyz == pytest.approx((110.0, 0.0, 50.0))
+        assert wps[0].feed == 600 and wps[0].line == 2 and not wps[0].arc
+        # Quarter circle of radius 10 within 0.05 mm chord error, ending on target
+        arc = [wp for wp in wps if wp.line == 3]
+        assert all(wp.arc for wp in arc)
+        assert len(arc) == math.ceil((math.pi / 2) / (2 * math.acos(1 - 0.05 / 10)))
+        assert arc[-1].xyz == pytest.approx((100.0, -10.0, 50.0))
+
+    @pytest.mark.parametrize("name", sorted(p.name for p in EXAMPLES.glob("*.gcode")))
+    def test_default_tolerance_no_more_segments(self, name, monkeypatch):
+        # The default must not segment any bundled program finer than the
+        # fixed 2 mm chords did (max(3, ceil(|delta|*r/2)) per arc).
+        arcs = []
+        real = pipeline.arc_steps
+
+        def record(r0, delta, *args):
+            arcs.append((r0, delta))
+            return real(r0, delta, *args)
+
+        monkeypatch.setattr(pipeline, "arc_steps", record)
+        prog = load_program(str(EXAMPLES / name))
+        new = sum(wp.arc for wp in plan_waypoints(prog, PlaneFrame()))
+        old = sum(max(3, math.ceil(abs(d) * r / 2.0)) for r, d in arcs)
+        assert arcs and new <= old
+        if name == "tobias_cursive.gcode":
+            assert old == 54
+
+    def test_inch_units(self):
+        prog = compile_text("G20\nG1 X1\n")
+        wps = list(plan_waypoints(prog, PlaneFrame()))
+        assert wps[0].xyz[0] == pytest.approx(25.4)
+
+
+class TestCompileFile:
+    """Chunked IK must not change the output."""
+
+    def test_chunked_matches_single_chunk(self, tmp_path, eb300_profile):
+        src = tmp_path / "circle.gcode"
+        src.write_text(_circle_program())
+        geom = DHModel.from_profile(eb300_profile).geom
+        plane = PlaneFrame.from_dict(PLANE)
+
+        outputs = []
+        for chunk_size in (10_000, 37):
+            buf = io.StringIO()
+            report = compile_file(str(src), buf, geom, plane, workers=0,
+                                  chunk_size=chunk_size, overlap=4,
+                                  limits=profile_limits(eb300_profile))
+            outputs.append(buf.getvalue())
+        assert outputs[0] == outputs[1]
+        assert report.waypoints == 301
+        assert report.chunks == math.ceil(301 / 37)
+        body = outputs[1].splitlines()[3:]
+        assert len(body) == 301 and all(l.startswith("G1 X") for l in body)
+
+    def test_cli(self, tmp_path, base_dir):
+        src = tmp_path / "circle.gcode"
+        src.write_text(_circle_program(n=20))
+        plane = tmp_path / "plane.json"
+        plane.write_text(json.dumps(PLANE))
+        out = tmp_path / "out.gcode"
+        rc = main(["compile", str(src), "-o", str(out), "--profile", "EB300",
+                   "--plane", str(plane), "--base-dir", str(base_dir),
+                   "--workers", "0", "-q"])
+        assert rc == 0
+        assert out.read_text().count("\nG1 X") == 21
+        assert main(["compile", str(tmp_path / "missing.gcode"), "--base-dir",
+                     str(base_dir), "--workers", "0", "-q"]) == 1
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,125 @@
+"""Test the compiled G-code program representation and its cache."""
+
+import math
+import os
+
+import pytest
+
+from robotrol.gcode import program as P
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    P.clear_cache()
+    yield
+    P.clear_cache()
+
+
+class TestCompile:
+    """Tests for compile_lines."""
+
+    def test_ops_and_words(self):
+        prog = P.compile_lines([
+            "; header", "", "G21 G90", "G1 X10 Y-2.5 F1200 (move)",
+            "g2 x1 y1 i0.5 j0", "M3 S500", "X5", "$H",
+        ])
+        assert len(prog) == 6
+        assert prog.n_source_lines == 8
+        assert list(prog.src_line) == [3, 4, 5, 6, 7, 8]
+        assert [P.op_name(op) for op in prog.ops] == ["G21", "G1", "G2", "M3", "", "?"]
+        assert prog.modes[0] == P.MODE_G21 | P.MODE_G90
+        assert prog.words(1) == {"X": 10.0, "Y": -2.5, "F": 1200.0}
+        assert prog.word(1, P.IZ) is None
+        assert math.isnan(prog.row(1)[P.IZ])
+        assert prog.word(3, P.IS) == 500.0
+
+    def test_motion_code_wins_over_modal_codes(self):
+        prog = P.compile_lines(["G90 G0 X1", "G17 G91", "G01 X2"])
+        assert list(prog.ops) == [P.OP_G0, P.OP_G17, P.OP_G1]
+        assert prog.modes[1] == P.MODE_G17 | P.MODE_G91
+
+    def test_malformed_words_are_skipped(self):
+        prog = P.compile_lines(["G1 Xabc Y2", "G99999 X1"])
+        assert prog.words(0) == {"Y": 2.0}
+        assert prog.ops[1] == P.OP_OTHER
+
+    def test_bulk_tokenizer_matches_line_compiler(self):
+        pytest.importorskip("numpy")
+        lines = [
+            "; header (x)", "G21 G90", "G1 X10 Y-2.5 F1200 (move)", "g2 x1 y1 i.5 j-0",
+            "M3 S500", "X5", "$H", "T1 M6", "N10 G1 X+1.", "G1 X1 X2", "G1 X1e3 Y2",
+            "G38.2 Z-5 F100", "G-1 X1", "G99999", "X Y1.2.3 Z--1 A12345678901234567",
+            "(open comment G1 X9", "G0\tZ3 \x1f", "", "   ", "G1 X1\x0cY2", "M30",
+        ]
+        text = "\r\n".join(lines) + "\rG1 X3 ; end"
+        bulk = P._compile_bulk(text, None, "")
+        ref = P.compile_lines(text.splitlines())
+        assert list(bulk.ops) == list(ref.ops)
+        assert list(bulk.modes) == list(ref.modes)
+        assert list(bulk.src_line) == list(ref.src_line)
+        assert bulk.n_source_lines == ref.n_source_lines
+        assert bulk.params.tobytes() == ref.params.tobytes()
+
+    def test_compile_text_uses_bulk_path_for_large_text(self, monkeypatch):
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(P, "BULK_MIN_CHARS", 1)
+        calls = []
+        real = P._compile_bulk
+
+        def bulk(*args):
+            calls.append(args[0])
+            return real(*args)
+
+        monkeypatch.setattr(P, "_compile_bulk", bulk)
+        prog = P.compile_text("G1 X1\nG1 X2\n")
+        assert calls == ["G1 X1\nG1 X2\n"]
+        assert prog.words(1) == {"X": 2.0}
+
+
+class TestLoadProgram:
+    """Tests for the per-file cache."""
+
+    def test_cached_until_content_changes(self, tmp_path):
+        path = tmp_path / "prog.gcode"
+        path.write_text("G1 X1\nG1 X2\n")
+        first = P.load_program(str(path))
+        assert P.load_program(str(path)) is first
+
+        # Touched but unchanged: same digest, no recompilation
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        assert P.load_program(str(path)) is first
+
+        path.write_text("G1 X1\nG1 X2\nG1 X3\n")
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 20_000_000))
+        changed = P.load_program(str(path))
+        assert changed is not first
+        assert len(changed) == 3
+
+    def test_same_content_keeps_each_path(self, tmp_path):
+        a = tmp_path / "a.gcode"
+        b = tmp_path / "b.gcode"
+        a.write_text("G1 X1\n")
+        b.write_text("G1 X1\n")
+        prog_a = P.load_program(str(a))
+        prog_b = P.load_program(str(b))
+        assert prog_a.path == os.path.abspath(a)
+        assert prog_b.path == os.path.abspath(b)
+        assert prog_a.params is prog_b.params
+        assert P.load_program(str(a)) is prog_a
+
+    def test_disk_cache_roundtrip(self, tmp_path):
+        path = tmp_path / "prog.gcode"
+        path.write_text("G21\nG2 X1 Y1 I0.5 J0 F300\nM5\n")
+        cache_dir = tmp_path / "cache"
+        first = P.load_program(str(path), cache_dir=str(cache_dir))
+        assert len(os.listdir(cache_dir)) == 1
+
+        P.clear_cache()
+        again = P.load_program(str(path), cache_dir=str(cache_dir))
+        assert again is not first
+        assert list(again.ops) == list(first.ops)
+        assert list(again.modes) == list(first.modes)
+        assert list(again.src_line) == list(first.src_line)
+        assert again.words(1) == first.words(1)
+        assert again.path == os.path.abspath(path)
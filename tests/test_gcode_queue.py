@@ -0,0 +1,363 @@
+"""Test the G-Code queue, its file-backed line source, metrics and checkpoints."""
+
+import json
+import threading
+import time
+
+import pytest
+
+from robotrol.queue import file_source, metrics
+from robotrol.queue.checkpoint import ModalState
+from robotrol.queue.file_source import FileLineSource
+from robotrol.queue.gcode_queue import GCodeQueue
+from robotrol.queue.metrics import QueueMetrics
+
+
+@pytest.fixture
+def program_file(tmp_path):
+    path = tmp_path / "prog.gcode"
+    path.write_bytes(b"G90\r\n\n  G1 X1 F100  \n   \nG1 X2\nG1 X3")
+    return path
+
+
+def _wait_idle(q, timeout=5.0):
+    deadline = time.time() + timeout
+    while q.running and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class TestFileLineSource:
+    """Tests for FileLineSource."""
+
+    def test_skips_blank_lines_and_strips(self, program_file):
+        src = FileLineSource(str(program_file))
+        assert list(src) == ["G90", "G1 X1 F100", "G1 X2", "G1 X3"]
+        assert len(src) == 4
+
+    def test_random_access(self, program_file):
+        src = FileLineSource(str(program_file))
+        assert src[2] == "G1 X2"
+        assert src[-1] == "G1 X3"
+        with pytest.raises(IndexError):
+            src[4]
+
+    def test_lazy_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_source, "INDEX_CHUNK", 16)
+        path = tmp_path / "big.gcode"
+        path.write_text("".join(f"G1 X{i}\n" for i in range(100)))
+        src = FileLineSource(str(path))
+        assert src.indexed_count == 0
+        assert src[3] == "G1 X3"
+        assert not src.fully_indexed
+        assert len(src) == 100
+        assert src[99] == "G1 X99"
+
+    def test_background_scan_does_not_block_readers(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_source, "INDEX_CHUNK", 16)
+        path = tmp_path / "big.gcode"
+        path.write_text("".join(f"G1 X{i}\n" for i in range(1000)))
+        src = FileLineSource(str(path))
+        step = src._index_step
+
+        def slow_step():
+            time.sleep(0.002)
+            step()
+
+        src._index_step = slow_step
+        worker = threading.Thread(target=src.__len__)
+        worker.start()
+        while src.indexed_count < 10:
+            time.sleep(0.001)
+        k = src.indexed_count + 3
+        assert src[k] == f"G1 X{k}"
+        assert not src.fully_indexed  # did not wait for the whole scan
+        src.close()
+        worker.join(1.0)
+        assert not worker.is_alive() and src._fh.closed
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.gcode"
+        path.write_bytes(b"")
+        src = FileLineSource(str(path))
+        assert src.is_empty()
+        assert len(src) == 0
+
+
+class TestGCodeQueue:
+    """Tests for GCodeQueue content handling."""
+
+    def test_enqueue_many_logs_once(self):
+        logs = []
+        q = GCodeQueue(send_fn=lambda line: None, on_log=logs.append)
+        q.enqueue_many(["G90", "", "G1 X1"])
+        assert q.lines == ["G90", "G1 X1"]
+        assert logs == ["Queued 2 line(s)"]
+
+    def test_load_file_then_enqueue(self, program_file):
+        q = GCodeQueue(send_fn=lambda line: None)
+        q.load_file(str(program_file))
+        q.enqueue("M5")
+        assert q.count() == 5
+        assert q.line_at(0) == "G90"
+        assert q.line_at(4) == "M5"
+        assert list(q.iter_lines(3)) == ["G1 X3", "M5"]
+        assert list(q.iter_lines(1, 3)) == ["G1 X1 F100", "G1 X2"]
+
+    def test_known_count_does_not_force_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_source, "INDEX_CHUNK", 16)
+        path = tmp_path / "big.gcode"
+        path.write_text("".join(f"G1 X{i}\n" for i in range(100)))
+        q = GCodeQueue(send_fn=lambda line: None)
+        q.load_file(str(path))
+        q.enqueue("M2")
+        assert q.known_count() == 1
+        assert list(q.iter_lines(10, 12)) == ["G1 X10", "G1 X11"]
+        assert 12 <= q.known_count() < 101
+        assert q.count() == 101
+        assert q.known_count() == 101
+
+    def test_view_read_does_not_index(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(file_source, "INDEX_CHUNK", 16)
+        path = tmp_path / "big.gcode"
+        path.write_text("".join(f"G1 X{i}\n" for i in range(100)))
+        q = GCodeQueue(send_fn=lambda line: None)
+        src = q.load_file(str(path))
+        q.enqueue("M2")
+        assert src[5] == "G1 X5"
+        n = src.indexed_count
+        assert list(q.iter_lines(n - 1, n + 5, wait=False)) == [f"G1 X{n - 1}"]
+        assert src.indexed_count == n
+        assert len(src) == 100
+        assert list(q.iter_lines(99, 105, wait=False)) == ["G1 X99", "M2"]
+
+    def test_clear_drops_source(self, program_file):
+        q = GCodeQueue(send_fn=lambda line: None)
+        q.load_file(str(program_file))
+        q.clear()
+        assert q.is_empty()
+        assert q.source is None
+
+    def test_reload_closes_previous_source(self, program_file):
+        q = GCodeQueue(send_fn=lambda line: None)
+        first = q.load_file(str(program_file))
+        second = q.load_file(str(program_file))
+        assert first._fh.closed
+        assert not second._fh.closed
+        q.clear()
+        assert second._fh.closed
+
+    def test_source_in_use_closed_after_run(self, program_file):
+        q = None
+        first = None
+        closed_during_run = []
+
+        def send(line):
+            if line == "G90":
+                q.load_file(str(program_file))
+                closed_during_run.append(first._fh.closed)
+            q.notify_ack()
+
+        q = GCodeQueue(send_fn=send)
+        first = q.load_file(str(program_file))
+        q.start_run()
+        _wait_idle(q)
+        assert closed_during_run == [False]
+        assert first._fh.closed
+
+    def test_generated_program_dropped_after_load(self, program_file, tmp_path):
+        # An optimize result derived before a load must not replace it
+        q = GCodeQueue(send_fn=lambda line: None)
+        q.load_file(str(program_file))
+        revision = q.revision
+        other = tmp_path / "other.gcode"
+        other.write_text("G0 X9\n")
+        q.load_file(str(other))
+        result = tmp_path / "optimized.gcode"
+        result.write_text("G1 X3\n")
+        assert q.replace_from_file(str(result), revision) is None
+        assert q.source.path == str(other)
+        assert result.exists()
+
+    def test_generated_program_loaded_file_backed(self, program_file, tmp_path):
+        q = GCodeQueue(send_fn=lambda line: None)
+        q.load_file(str(program_file))
+        revision = q.revision
+        result = tmp_path / "optimized.gcode"
+        result.write_text("G90\nG1 X3 F100\n")
+        source = q.replace_from_file(str(result), revision)
+        assert source is q.source and q.lines == ["G90", "G1 X3 F100"]
+        q.enqueue("M2")
+        assert q.replace_from_file(str(result), revision + 1) is None
+        q.clear()
+        assert not result.exists()  # temporary file removed with its source
+
+    def test_runs_file_backed_program(self, program_file):
+        sent = []
+        q = None
+
+        def send(line):
+            sent.append(line)
+            q.notify_ack()
+
+        q = GCodeQueue(send_fn=send)
+        q.load_file(str(program_file))
+        q.start_run()
+        deadline = time.time() + 5.0
+        while q.running and time.time() < deadline:
+            time.sleep(0.01)
+        assert sent == ["G90", "G1 X1 F100", "G1 X2", "G1 X3"]
+
+    def test_progress_callback(self):
+        events = []
+        q = None
+
+        def send(line):
+            q.notify_ack()
+
+        q = GCodeQueue(send_fn=send, on_progress=lambda *ev: events.append(ev))
+        q.enqueue_many(["G90", "G1 X1"])
+        q.start_run()
+        _wait_idle(q)
+        assert events == [(1, 2, "running"), (2, 2, "running"), (2, 2, "finished")]
+
+
+class TestQueueMetrics:
+    """Tests for QueueMetrics and its GCodeQueue integration."""
+
+    def test_rtt_histogram_and_counters(self):
+        m = QueueMetrics()
+        m.begin_run(3)
+        for i in (1, 2, 3):
+            m.on_tx(i)
+            if i == 2:
+                m.on_error()
+            else:
+                m.on_ack()
+        m.on_ack()  # stray ACK without a line in flight is ignored
+        s = m.end_run()
+        assert s["sent"] == 3
+        assert s["acked"] == 2
+        assert s["rtt_ms"]["count"] == 3
+        assert sum(s["hist"]) == 3
+        assert s["errors"] == {"2": 1}
+        assert s["status"] == "finished"
+
+    def test_paused_time_excluded_from_rtt(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+        m = QueueMetrics()
+        m.begin_run(2)
+        m.on_tx(1)
+        now[0] += 0.010
+        m.on_pause()
+        now[0] += 5.0
+        m.on_resume()
+        now[0] += 0.010
+        m.on_ack()
+        now[0] += 0.5
+        m.on_tx(2)
+        m.on_timeout(2)
+        s = m.end_run()
+        assert s["rtt_ms"]["max"] == pytest.approx(20.0)
+        assert s["paused_s"] == pytest.approx(5.0)
+        assert s["starving_s"] == pytest.approx(0.5)
+        assert s["timeouts"] == {"2": 1}
+
+    def test_queue_writes_jsonl_summary(self, program_file, tmp_path):
+        out = tmp_path / "metrics.jsonl"
+        q = None
+
+        def send(line):
+            q.notify_ack()
+
+        q = GCodeQueue(send_fn=send, metrics_path=str(out))
+        q.load_file(str(program_file))
+        q.start_run()
+        deadline = time.time() + 5.0
+        while q.running and time.time() < deadline:
+            time.sleep(0.01)
+        records = [json.loads(ln) for ln in out.read_text().splitlines()]
+        assert len(records) == 1
+        assert records[0]["acked"] == 4
+        assert q.metrics.last_run["total"] == 4
+
+
+class TestCheckpoint:
+    """Tests for modal state tracking and resume-from-line."""
+
+    def test_modal_state_tracking(self):
+        m = ModalState.scan([
+            "G21 G90", "G1 X10 Y5 F800", "G91", "G1 X1 ; relative",
+            "G0 Z2", "G92 Y0",
+        ])
+        assert m.distance == 91
+        assert m.motion == 0
+        assert m.feed == 800
+        assert m.pos == {"X": 11.0}
+        assert m.preamble() == ["G21 G17 G90", "G0 X11.000", "G91", "G0 F800"]
+
+    def test_resume_after_alarm(self, tmp_path):
+        ckpt_path = tmp_path / "ckpt.json"
+        program = ["G90", "G1 X1 Y1 F500", "G1 X2", "G1 X3", "G1 X4"]
+        sent = []
+        alarms = ["ALARM:1"]
+        q = None
+
+        def send(line):
+            sent.append(line)
+            if line == "G1 X3" and alarms:
+                q.notify_alarm(alarms.pop())
+            else:
+                q.notify_ack()
+
+        q = GCodeQueue(send_fn=send, checkpoint_path=str(ckpt_path))
+        q.enqueue_many(program)
+        q.start_run()
+        _wait_idle(q)
+        assert sent == program[:4]
+
+        point = q.resume_point()
+        assert point["status"] == "alarm"
+        assert point["line"] == 3
+        state = json.loads(ckpt_path.read_text())
+        assert state["modal"]["pos"] == {"X": 2.0, "Y": 1.0}
+
+        sent.clear()
+        q.start_run(from_line=point["line"] + 1,
+                    modal=ModalState.from_dict(point["modal"]))
+        _wait_idle(q)
+        assert sent == ["G21 G17 G90", "G0 X2.000 Y1.000", "G1 F500",
+                        "G1 X3", "G1 X4"]
+        assert q.resume_point() is None  # finished
+
+    def test_start_line_checked_off_caller_thread(self, program_file, monkeypatch):
+        counted_on = []
+        real_len = FileLineSource.__len__
+
+        def spy_len(self):
+            counted_on.append(threading.current_thread())
+            return real_len(self)
+
+        monkeypatch.setattr(FileLineSource, "__len__", spy_len)
+        sent, logs = [], []
+        q = GCodeQueue(send_fn=sent.append, on_log=logs.append)
+        q.load_file(str(program_file))
+        q.start_run(from_line=50)
+        _wait_idle(q)
+        assert threading.current_thread() not in counted_on
+        assert sent == [] and not q.running
+        assert "Start line 50 is beyond the end of the queue." in logs
+
+    def test_from_line_replays_modal_state(self):
+        sent = []
+        q = None
+
+        def send(line):
+            sent.append(line)
+            q.notify_ack()
+
+        q = GCodeQueue(send_fn=send)
+        q.enqueue_many(["G91", "G1 X1 F300", "G1 X1", "G1 X1"])
+        q.start_run(from_line=4, restore_position=False)
+        _wait_idle(q)
+        assert sent == ["G21 G17 G90", "G91", "G1 F300", "G1 X1"]
@@ -0,0 +1,61 @@
+"""Test the bounded GUI log buffer."""
+
+import logging
+import threading
+
+from robotrol.gui.log_buffer import LogBuffer, classify, parse_level
+
+
+class TestClassify:
+    """Level from message prefixes."""
+
+    def test_levels(self):
+        assert classify("[12/300] TX: G1 X1") == logging.DEBUG
+        assert classify("RX: [MSG:Reset]") == logging.DEBUG
+        assert classify("RX: error:9") == logging.ERROR
+        assert classify("[WARN] No $$ settings") == logging.WARNING
+        assert classify("RUN started") == logging.INFO
+        assert parse_level("warning") == logging.WARNING
+        assert parse_level("bogus", 5) == 5
+
+
+class TestLogBuffer:
+    """Batching, caps and amortised trimming."""
+
+    def test_level_filter(self):
+        buf = LogBuffer(min_level="INFO")
+        assert not buf.append("[1/2] TX: G0 X0")
+        assert buf.append("RUN started")
+        assert buf.drain() == (["RUN started"], 0)
+        assert buf.filtered == 1
+
+    def test_pending_cap_counts_dropped(self):
+        buf = LogBuffer(max_lines=10)
+        for i in range(35):
+            buf.append(f"line {i}")
+        lines, dropped = buf.drain()
+        assert len(lines) == 10 and lines[-1] == "line 34"
+        assert dropped == 25
+        assert buf.drain() == ([], 0)
+
+    def test_trim_is_amortised(self):
+        buf = LogBuffer(max_lines=100, trim_slack=20)
+        assert buf.trim_count(110) == 0
+        assert buf.trim_count(10) == 0
+        assert buf.trim_count(1) == 21
+        assert buf.widget_lines == 100
+
+    def test_concurrent_appends(self):
+        buf = LogBuffer(max_lines=100000)
+
+        def worker(k):
+            for i in range(1000):
+                buf.append(f"{k}:{i}")
+
+        threads = [threading.Thread(target=worker, args=(k,)) for k in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        lines, dropped = buf.drain()
+        assert len(lines) == 4000 and dropped == 0
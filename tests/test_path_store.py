@@ -0,0 +1,55 @@
+"""Tests for robotrol.visualizer.path_store — ring-buffered visualizer paths."""
+
+from robotrol.visualizer.path_store import PathRing, SEQ_MOD
+
+
+def _pts(start, stop):
+    return [(float(i), 0.0, 0.0, 0.0) for i in range(start, stop)]
+
+
+class TestPathRing:
+    def test_append_and_clear(self):
+        ring = PathRing()
+        assert ring.apply({"seq": 1}, _pts(0, 3))
+        assert ring.apply({"seq": 2, "append": True}, _pts(3, 5))
+        assert ring.points() == _pts(0, 5)
+        assert ring.apply({"seq": 3}, [])
+        assert len(ring) == 0
+        assert ring.stats()["gaps"] == 0
+
+    def test_capacity_drops_oldest(self):
+        ring = PathRing(capacity=10, max_display=None)
+        ring.append(_pts(0, 8))
+        ring.append(_pts(8, 15))
+        assert ring.points() == _pts(5, 15)
+        assert ring.stats()["total"] == 15
+        ring.append(_pts(15, 40))
+        assert ring.points() == _pts(30, 40)
+
+    def test_stale_dropped_gap_counted(self):
+        ring = PathRing()
+        ring.apply({"seq": 5}, _pts(0, 1))
+        assert ring.apply({"seq": 5, "append": True}, _pts(1, 2)) is False
+        assert ring.apply({"seq": 8, "append": True}, _pts(2, 3))
+        assert ring.apply({"seq": 9, "seq_first": 9, "append": True}, _pts(3, 4))
+        assert ring.stats() == {"points": 3, "total": 3, "gaps": 1, "stale": 1}
+        # Wrap-around continues normally; a replace always resyncs
+        ring.apply({"seq": SEQ_MOD - 1}, [])
+        assert ring.apply({"seq": 0, "append": True}, _pts(0, 1))
+        assert ring.apply({"seq": 40000}, _pts(0, 2))
+        assert ring.stats()["gaps"] == 1
+
+    def test_display_decimated_and_cached(self):
+        ring = PathRing(capacity=1000, max_display=100)
+        ring.append(_pts(0, 50))
+        shown = ring.display()
+        assert shown == _pts(0, 50)
+        assert ring.display() is shown
+        ring.append(_pts(50, 450))
+        shown = ring.display()
+        assert len(shown) <= 101
+        assert shown[-1] == (449.0, 0.0, 0.0, 0.0)
+        # Kept points are anchored to absolute indices
+        assert all(int(p[0]) % 5 == 0 for p in shown[:-1])
+        ring.append(_pts(450, 1200))
+        assert all(int(p[0]) % 10 == 0 for p in ring.display()[:-1])
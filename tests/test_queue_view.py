@@ -0,0 +1,114 @@
+"""Tests for robotrol.gui.queue_view — virtualised queue listbox window."""
+
+from robotrol.gui.queue_view import QueueViewport
+
+
+class FakeListbox:
+    """Applies render() edits like tk.Listbox delete/insert."""
+
+    def __init__(self):
+        self.items = []
+
+    def apply(self, ops):
+        for op in ops:
+            if op[0] == "delete":
+                del self.items[op[1]:op[2] + 1]
+            else:
+                self.items[op[1]:op[1]] = list(op[2])
+
+
+class CountingFetch:
+    def __init__(self, lines):
+        self.lines = lines
+        self.fetched = 0
+
+    def __call__(self, start, stop):
+        out = self.lines[start:stop]
+        self.fetched += len(out)
+        return out
+
+
+def _setup(n, rows=4):
+    lines = [f"G1 X{i}" for i in range(n)]
+    fetch = CountingFetch(lines)
+    view = QueueViewport(rows=rows)
+    view.set_total(n)
+    lb = FakeListbox()
+    lb.apply(view.render(fetch))
+    return lines, fetch, view, lb
+
+
+class TestQueueViewport:
+    def test_only_visible_rows_are_fetched(self):
+        lines, fetch, view, lb = _setup(200_000)
+        assert lb.items == lines[:4]
+        assert fetch.fetched == 4
+        assert view.scrollbar() == (0.0, 4 / 200_000)
+
+    def test_append_outside_window_is_free(self):
+        """Appending below a full window only changes the scrollbar."""
+        lines, fetch, view, lb = _setup(10)
+        lines.append("M2")
+        view.set_total(len(lines))
+        assert view.render(fetch) == []
+        assert fetch.fetched == 4
+
+    def test_append_into_partial_window_inserts_only_new(self):
+        lines, fetch, view, lb = _setup(2)
+        lines.append("G0 Z5")
+        view.set_total(3)
+        ops = view.render(fetch)
+        assert ops == [("insert", 2, ["G0 Z5"])]
+        lb.apply(ops)
+        assert lb.items == lines
+
+    def test_scroll_reuses_overlap(self):
+        lines, fetch, view, lb = _setup(100)
+        fetch.fetched = 0
+        view.scroll(1)
+        lb.apply(view.render(fetch))
+        assert lb.items == lines[1:5]
+        assert fetch.fetched == 1
+        view.scroll(-2)  # clamped at the top
+        lb.apply(view.render(fetch))
+        assert lb.items == lines[0:4]
+        view.moveto(0.5)
+        lb.apply(view.render(fetch))
+        assert lb.items == lines[50:54]
+        view.scroll_pages(100)
+        lb.apply(view.render(fetch))
+        assert lb.items == lines[96:100]
+
+    def test_follow_and_highlight(self):
+        lines, fetch, view, lb = _setup(100)
+        view.set_current(2)
+        lb.apply(view.render(fetch))
+        assert view.highlight() == (None, 2)
+        view.set_current(3)
+        lb.apply(view.render(fetch))
+        assert view.highlight() == (2, 3)
+        # Leaving the window scrolls it, keeping one line of context
+        view.set_current(10)
+        lb.apply(view.render(fetch))
+        assert lb.items == lines[9:13]
+        assert view.highlight() == (None, 1)
+
+    def test_no_follow_keeps_window(self):
+        lines, fetch, view, lb = _setup(100)
+        view.follow = False
+        view.set_current(50)
+        assert view.render(fetch) == []
+        assert view.highlight() == (None, None)
+
+    def test_invalidate_rebuilds_and_shrinks(self):
+        lines, fetch, view, lb = _setup(10)
+        lines[:] = ["G28"]
+        view.invalidate()
+        view.set_total(1)
+        lb.apply(view.render(fetch))
+        assert lb.items == ["G28"]
+        # Short fetch: total follows what is really there
+        view.set_total(5)
+        lb.apply(view.render(fetch))
+        assert lb.items == ["G28"]
+        assert view.total == 1
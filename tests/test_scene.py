@@ -0,0 +1,88 @@
+"""Tests for robotrol.visualizer.scene — persistent-artist RoboSim renderer."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+matplotlib = pytest.importorskip("matplotlib")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from robotrol.visualizer import scene  # noqa: E402
+
+
+@pytest.fixture
+def renderer():
+    fig = Figure(figsize=(6, 4), dpi=50)
+    ax3d = fig.add_subplot(2, 2, 4, projection="3d")
+    axes = {"xy": fig.add_subplot(2, 2, 3), "yz": fig.add_subplot(2, 2, 1),
+            "xz": fig.add_subplot(2, 2, 2)}
+    canvas = FigureCanvasAgg(fig)
+    r = scene.SceneRenderer(canvas, ax3d, axes)
+    yield r
+    r.disconnect()
+
+
+ARM = [(0, 0, 0), (0, 0, 24), (10, 0, 40), (20, 5, 45), (25, 5, 40)]
+
+
+class TestHelpers:
+    def test_arrow_has_shaft_and_head(self):
+        segs = scene.arrow((0, 0, 0), (0, 0, 10))
+        assert len(segs) == 3
+        assert np.allclose(segs[0], [[0, 0, 0], [0, 0, 10]])
+        for head in segs[1:]:
+            assert np.allclose(head[0], [0, 0, 10])
+            assert head[1][2] < 10
+
+    def test_zero_arrow_has_no_head(self):
+        assert len(scene.arrow((1, 2, 3), (0, 0, 0))) == 1
+        assert scene.arrow_head((0, 0), (0, 0)) == []
+
+    def test_frame_axes_normalised(self):
+        frame = {"origin": (1, 2, 3), "x": [2, 0, 0], "y": [0, 5, 0], "z": [0, 0, 1]}
+        axes = scene.frame_axes(frame, length=8.0)
+        assert [float(np.linalg.norm(v)) for _, v in axes] == [8.0, 8.0, 8.0]
+        assert scene.frame_axes(None) == []
+
+
+class TestSceneRenderer:
+    def test_first_render_full_then_blit(self, renderer):
+        renderer.set_arm(ARM)
+        renderer.render()
+        assert renderer.full_draws == 1
+        for _ in range(3):
+            renderer.set_arm(ARM)
+            renderer.render()
+        assert renderer.full_draws == 1
+        assert renderer.frames == 4
+
+    def test_arm_split_by_link_colour(self, renderer):
+        renderer.set_arm(ARM)
+        base, links, tool = renderer._arm3d
+        assert len(base.get_data_3d()[0]) == 2
+        assert len(links.get_data_3d()[0]) == 3
+        assert len(tool.get_data_3d()[0]) == 2
+        xs, ys = renderer._arm2d["yz"].get_data()
+        assert list(xs) == [p[1] for p in ARM]
+        assert list(ys) == [p[2] for p in ARM]
+
+    def test_paths_rebuilt_only_for_new_lists(self, renderer):
+        path = [(float(i), 0.0, 10.0, 0.0) for i in range(5000)]
+        assert renderer.set_paths({"kin": path, "fixed": []}) is True
+        assert renderer.set_paths({"kin": path, "fixed": renderer._paths_src["fixed"]}) is False
+        segs = renderer._paths2d["xy"].get_segments()
+        # one polyline for the whole path plus two arrow-head strokes
+        assert len(segs) == 3
+        assert len(segs[0]) == 5000
+        renderer.render()
+
+    def test_overlay_segments(self, renderer):
+        frame = {"origin": (0, 0, 0), "x": [1, 0, 0], "y": [0, 1, 0], "z": [0, 0, 1]}
+        tip = np.array([25.0, 5.0, 40.0])
+        jaws = [(tip, tip + [0, 0, -9]), (tip + [1, 0, 0], tip + [1, 0, -9])]
+        renderer.set_overlay((tip, np.array([0, 0, -10.0])), jaws, frame)
+        assert len(renderer._overlay2d["xz"].get_segments()) == 3 + 2
+        renderer.set_overlay(None, [], None)
+        assert len(renderer._overlay2d["xz"].get_segments()) == 0
+        renderer.render()
@@ -0,0 +1,92 @@
+"""Test serial session recording and replay."""
+
+import os
+import time
+
+import pytest
+
+from robotrol.serial.session_log import (
+    KIND_RX, KIND_TX, SessionRecorder, SessionReplayer, iter_session, session_stats,
+)
+
+
+@pytest.fixture
+def session(tmp_path):
+    path = str(tmp_path / "s.rsl")
+    with SessionRecorder(path) as rec:
+        t0 = rec._t0
+        rec.record(KIND_TX, "G1 X10 F600", t0 + 0.010)
+        rec.record(KIND_RX, "ok", t0 + 0.020)
+        rec.record(KIND_RX, "<Run|MPos:1,0,0,0,0,0>", t0 + 0.120)
+        rec.record(KIND_RX, "<Idle|MPos:10,0,0,0,0,0>", t0 + 0.220)
+    return path
+
+
+class TestRecorder:
+    """Binary log round trip."""
+
+    def test_round_trip(self, session):
+        recs = list(iter_session(session))
+        assert [(k, l) for _, k, l in recs] == [
+            (KIND_TX, "G1 X10 F600"), (KIND_RX, "ok"),
+            (KIND_RX, "<Run|MPos:1,0,0,0,0,0>"), (KIND_RX, "<Idle|MPos:10,0,0,0,0,0>"),
+        ]
+        assert [t for t, _, _ in recs] == pytest.approx([0.010, 0.020, 0.120, 0.220])
+        # 7 bytes framing per record after a 20-byte header
+        payload = sum(len(l) for _, _, l in recs)
+        assert os.path.getsize(session) == 20 + 4 * 7 + payload
+
+    def test_long_gap_and_truncated_tail(self, tmp_path):
+        path = str(tmp_path / "gap.rsl")
+        rec = SessionRecorder(path)
+        rec.record(KIND_RX, "first", rec._t0 + 5000.0)  # > u32 microseconds
+        rec.record(KIND_RX, "second", rec._t0 + 5000.5)
+        rec.close()
+        with open(path, "ab") as f:
+            f.write(b"\x01\x00\x00\x00\x01\x10")  # half a record
+        recs = list(iter_session(path))
+        assert [l for _, _, l in recs] == ["first", "second"]
+        assert recs[1][0] == pytest.approx(5000.5)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "x.rsl"
+        path.write_bytes(b"not a session log at all")
+        with pytest.raises(ValueError):
+            list(iter_session(str(path)))
+
+    def test_stats(self, session):
+        st = session_stats(session)
+        assert st["tx_lines"] == 1 and st["rx_lines"] == 3
+        assert st["status_reports"] == 2
+        assert st["duration_s"] == pytest.approx(0.22)
+
+
+class TestReplayer:
+    """Replay pacing."""
+
+    def test_max_speed_rx_only(self, session):
+        seen = []
+        result = SessionReplayer(session, speed=0).replay([seen.append])
+        assert seen == ["ok", "<Run|MPos:1,0,0,0,0,0>", "<Idle|MPos:10,0,0,0,0,0>"]
+        assert result["lines"] == 3
+        assert result["elapsed_s"] < 0.1
+
+    def test_paced_replay(self, session):
+        times = []
+        t0 = time.monotonic()
+        SessionReplayer(session, speed=2.0).replay([lambda l: times.append(time.monotonic() - t0)])
+        # Recorded at 20/120/220 ms -> 10/60/110 ms at 2x
+        assert times[-1] == pytest.approx(0.110, abs=0.03)
+        assert times[1] - times[0] == pytest.approx(0.050, abs=0.03)
+
+    def test_tx_and_listener_errors(self, session):
+        tx = []
+
+        def bad(_line):
+            raise RuntimeError("boom")
+
+        result = SessionReplayer(session, speed=0, kinds=(KIND_TX, KIND_RX)).replay(
+            [bad], on_tx=tx.append,
+        )
+        assert tx == ["G1 X10 F600"]
+        assert result["listener_errors"] == 3
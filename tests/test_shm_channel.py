@@ -0,0 +1,91 @@
+"""Tests for robotrol.visualizer.shm_channel — shared-memory telemetry."""
+
+import uuid
+
+import pytest
+
+from robotrol.visualizer.shm_channel import ShmTelemetryReader, ShmTelemetryWriter
+from robotrol.visualizer.udp_mirror import UDPMirror
+
+
+@pytest.fixture
+def name():
+    return f"rt_test_{uuid.uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def channel(name):
+    writer = ShmTelemetryWriter(name, path_capacity=16)
+    reader = ShmTelemetryReader(name)
+    yield writer, reader
+    reader.detach()
+    writer.close()
+
+
+def _by_type(msgs):
+    return {m["type"]: m for m in msgs}
+
+
+class TestShmChannel:
+    def test_reader_waits_for_writer(self, name):
+        reader = ShmTelemetryReader(name)
+        assert reader.poll() == []
+        assert not reader.attached
+
+    def test_joints_latest_only(self, channel):
+        writer, reader = channel
+        reader.poll()  # attach, initial empty paths
+        writer.write_joints({"X": 1.0, "Y": 2.0})
+        writer.write_joints({"X": 3.0, "S": 500.0})
+        (pose,) = reader.poll()
+        assert pose["type"] == "abs"
+        assert (pose["X"], pose["Y"], pose["S"]) == (3.0, 2.0, 500.0)
+        assert "Z" not in pose
+        assert reader.poll() == []
+
+    def test_path_replace_append_and_overrun(self, channel):
+        writer, reader = channel
+        writer.write_path([(0, 0, 0, 0), (1, 1, 1, 1)], "path_kin")
+        msgs = _by_type(reader.poll())
+        assert msgs["path_kin"] == {"type": "path_kin", "pts": [[0, 0, 0, 0], [1, 1, 1, 1]]}
+        assert msgs["path_fixed"]["pts"] == []
+        writer.write_path([(2, 2, 2)], "path_kin", append=True)
+        assert reader.poll() == [{"type": "path_kin", "pts": [[2, 2, 2, 0]], "append": True}]
+        # Ring wraps: only the newest 16 points survive
+        writer.write_path([(i, 0, 0, 0) for i in range(3, 40)], "path_kin", append=True)
+        (msg,) = reader.poll()
+        assert [p[0] for p in msg["pts"]] == list(range(24, 40))
+        assert reader.stats()["overruns"] == 1
+        writer.write_path([], "path_kin")
+        assert reader.poll() == [{"type": "path_kin", "pts": []}]
+
+    def test_close_detaches_and_restart_resyncs(self, name):
+        writer = ShmTelemetryWriter(name, path_capacity=16)
+        reader = ShmTelemetryReader(name, clock=lambda: 0.0)
+        writer.write_path([(1, 2, 3, 4)], "path_fixed")
+        assert _by_type(reader.poll())["path_fixed"]["pts"] == [[1, 2, 3, 4]]
+        writer.close()
+        assert reader.poll() == []
+        assert not reader.attached
+        writer = ShmTelemetryWriter(name, path_capacity=16)
+        writer.write_path([(5, 6, 7, 8)], "path_fixed")
+        reader._next_attach = float("-inf")
+        assert _by_type(reader.poll())["path_fixed"]["pts"] == [[5, 6, 7, 8]]
+        reader.detach()
+        writer.close()
+
+
+class TestUDPMirrorShm:
+    def test_mirror_selects_shm(self, name):
+        mirror = UDPMirror(transport="shm", shm_name=name)
+        reader = ShmTelemetryReader(name)
+        try:
+            assert mirror.transport == "shm"
+            mirror.send_joints({"X": 12.5})
+            mirror.append_path([(1, 1, 1, 1)])
+            msgs = _by_type(reader.poll())
+            assert msgs["abs"]["X"] == 12.5
+            assert msgs["path_fixed"] == {"type": "path_fixed", "pts": [[1, 1, 1, 1]]}
+        finally:
+            reader.detach()
+            mirror.close()
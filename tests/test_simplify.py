@@ -0,0 +1,97 @@
+"""Test the joint-space G-code path simplifier and batched FK."""
+
+import math
+
+import pytest
+
+from robotrol.kinematics.dh_model import DHModel
+from robotrol.kinematics.fk import fk6_forward_mm, fk6_positions_mm
+from robotrol.gcode.simplify import simplify_lines
+
+
+def _arc_program(n=300):
+    lines = ["G90", "G1 X0 Y0 Z0 A0 B0 C0 F1000"]
+    for i in range(1, n + 1):
+        t = i / n
+        lines.append(
+            f"G1 X{30 * math.sin(t * math.pi):.3f} Y{20 * t:.3f} Z{-10 * t:.3f}"
+        )
+    return lines
+
+
+class TestBatchFK:
+    """fk6_positions_mm matches the per-pose FK."""
+
+    def test_matches_fk6_forward(self, eb300_profile):
+        dh = DHModel.from_profile(eb300_profile)
+        rows = []
+        for i in range(5):
+            mpos = {"X": 10.0 * i, "Y": -5.0 * i, "Z": 3.0 * i,
+                    "A": 7.0 * i, "B": 11.0 * i, "C": -2.0 * i}
+            rows.append(dh.apply_post_transform(mpos))
+        batch = fk6_positions_mm(dh.geom, rows, dh_model=dh)
+        for joints, (x, y, z) in zip(rows, batch):
+            ref = fk6_forward_mm(dh.geom, joints, dh_model=dh)
+            assert x == pytest.approx(ref[0], abs=1e-9)
+            assert y == pytest.approx(ref[1], abs=1e-9)
+            assert z == pytest.approx(ref[2], abs=1e-9)
+
+
+class TestSimplify:
+    """Tests for simplify_lines."""
+
+    def test_drops_zero_length_moves(self):
+        out, report = simplify_lines(
+            ["G90", "G1 X1 Y0 Z0 A0 B0 C0 F500", "G1 X1", "G1 X1 Y0", "G1 X2"]
+        )
+        assert out == ["G90", "G1 X1 Y0 Z0 A0 B0 C0 F500", "G1 X2"]
+        assert report.zero_length_dropped == 2
+
+    def test_dropped_move_keeps_motion_switch(self):
+        out, report = simplify_lines(
+            ["G90", "G1 X1 Y0 Z0 A0 B0 C0 F500", "G0 X1", "X5"]
+        )
+        assert out == ["G90", "G1 X1 Y0 Z0 A0 B0 C0 F500", "G0", "X5"]
+        assert report.zero_length_dropped == 1
+
+    def test_merges_collinear_moves(self):
+        lines = ["G90", "G1 X0 Y0 Z0 A0 B0 C0 F500"]
+        lines += [f"G1 X{i} Y{2 * i}" for i in range(1, 11)]
+        out, report = simplify_lines(lines)
+        assert out == ["G90", "G1 X0 Y0 Z0 A0 B0 C0 F500", "G1 X10.000 Y20.000"]
+        assert report.collinear_merged == 9
+
+    def test_barriers_are_kept_verbatim(self):
+        lines = [
+            "G90", "G1 X0 Y0 Z0 A0 B0 C0 F500", "G1 X1", "G1 X2",
+            "M3 S100", "G4 P0.5", "G91", "G1 X1", "G1 X1", "G90", "G1 X5",
+        ]
+        out, _ = simplify_lines(lines)
+        assert out == [
+            "G90", "G1 X0 Y0 Z0 A0 B0 C0 F500", "G1 X2.000",
+            "M3 S100", "G4 P0.5", "G91", "G1 X1", "G1 X1", "G90", "G1 X5",
+        ]
+
+    def test_feed_change_splits_runs(self):
+        lines = ["G90", "G1 X0 Y0 Z0 A0 B0 C0 F500", "G1 X1", "G1 X2",
+                 "G1 X3 F900", "G1 X4", "G1 X5"]
+        out, _ = simplify_lines(lines)
+        # the F900 segment is merged separately and keeps its feed
+        assert out == ["G90", "G1 X0 Y0 Z0 A0 B0 C0 F500", "G1 X2.000",
+                       "G1 X5.000 F900"]
+
+    def test_tolerance_bounds_cartesian_deviation(self, eb300_profile):
+        dh = DHModel.from_profile(eb300_profile)
+        lines = _arc_program()
+        out, report = simplify_lines(lines, dh_model=dh, tolerance_mm=0.05)
+        assert len(out) < len(lines) // 2
+        assert report.tolerance_merged > 0
+        assert report.max_deviation_mm <= 0.05
+        assert out[-1] == lines[-1]
+
+    def test_tighter_tolerance_keeps_more(self, eb300_profile):
+        dh = DHModel.from_profile(eb300_profile)
+        lines = _arc_program()
+        loose, _ = simplify_lines(lines, dh_model=dh, tolerance_mm=0.5)
+        tight, _ = simplify_lines(lines, dh_model=dh, tolerance_mm=0.01)
+        assert len(tight) > len(loose)
@@ -0,0 +1,178 @@
+"""Test the pty-backed virtual controller."""
+
+import os
+import select
+import threading
+import time
+
+import pytest
+
+from robotrol.gcode.estimator import MachineLimits
+from robotrol.queue.gcode_queue import GCodeQueue
+from robotrol.serial.protocol import parse_status_line
+
+simulator = pytest.importorskip("robotrol.serial.simulator")
+if not hasattr(os, "openpty"):
+    pytest.skip("pseudo-terminals not available", allow_module_level=True)
+
+
+class _Client:
+    """Minimal line client on the pty slave (what pyserial would do)."""
+
+    def __init__(self, port):
+        self.fd = os.open(port, os.O_RDWR | os.O_NOCTTY)
+        self.buf = b""
+
+    def write(self, data):
+        os.write(self.fd, data.encode() if isinstance(data, str) else data)
+
+    def read_lines(self, timeout=0.3, until=None):
+        lines = []
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            ready, _, _ = select.select([self.fd], [], [], 0.01)
+            if ready:
+                self.buf += os.read(self.fd, 4096)
+            while b"\n" in self.buf:
+                raw, self.buf = self.buf.split(b"\n", 1)
+                line = raw.decode().strip()
+                if line:
+                    lines.append(line)
+                    if until is not None and until(line):
+                        return lines
+        return lines
+
+    def status(self):
+        self.write("?")
+        lines = self.read_lines(until=lambda l: l.startswith("<"))
+        return parse_status_line([l for l in lines if l.startswith("<")][-1])
+
+    def close(self):
+        os.close(self.fd)
+
+
+@pytest.fixture
+def vc():
+    ctl = simulator.VirtualController(time_scale=1.0, homing_time=0.05)
+    ctl.start()
+    yield ctl
+    ctl.stop()
+
+
+@pytest.fixture
+def client(vc):
+    c = _Client(vc.port)
+    c.read_lines(0.05)  # banner
+    yield c
+    c.close()
+
+
+class TestProtocol:
+    """Line protocol and real-time commands."""
+
+    def test_settings_dump(self, client):
+        client.write("$120=50\n$$\n")
+        lines = client.read_lines(0.3)
+        assert lines[0] == "ok" and lines[-1] == "ok"
+        limits = MachineLimits.from_lines(lines)
+        assert limits.accel[0] == 50.0
+        assert limits.max_rate[0] == 3000.0
+
+    def test_status_report(self, client, vc):
+        vc.set_pins("XZ")
+        client.write("G92 X-5\n")
+        assert client.read_lines(until=lambda l: l == "ok") == ["ok"]
+        st = client.status()
+        assert st["state"] == "Idle"
+        assert st["mpos"]["X"] == 0.0
+        assert st["pn"] == {"X", "Z"}
+        assert st["wco"]["X"] == 5.0
+
+    def test_errors_and_alarm(self, client, vc):
+        client.write("Q5\nG1 X1\n")
+        assert client.read_lines(until=lambda l: l == "error:22") == ["error:20", "error:22"]
+        vc.trigger_alarm(2)
+        client.write("G0 X1\n$X\nG0 X1\n")
+        lines = client.read_lines(until=lambda l: l == "ok")
+        assert lines[:2] == ["ALARM:2", "error:9"]
+        assert client.read_lines(until=lambda l: l == "ok") == ["ok"]
+
+    def test_homing(self, client):
+        client.write("$HX\n")
+        assert client.read_lines(until=lambda l: l == "ok") == ["ok"]
+        assert client.status()["state"] == "Idle"
+
+
+class TestMotion:
+    """Planner buffer and motion timing."""
+
+    def test_planner_flow_control(self, vc, client):
+        vc.planner_blocks = 2
+        client.write("G91 F600\n" + "G1 X5\n" * 3)
+        # 5 mm at 10 mm/s: each block takes ~0.55 s, only two fit the buffer
+        lines = client.read_lines(0.25)
+        assert lines.count("ok") == 3
+        assert client.status()["state"] == "Run"
+        assert vc.wait_idle(10.0)
+        lines = client.read_lines(0.1)
+        assert lines.count("ok") == 1
+        assert vc.max_planner_depth == 2
+        assert client.status()["mpos"]["X"] == pytest.approx(15.0)
+
+    def test_feed_hold_and_resume(self, vc, client):
+        client.write("G1 X20 F1200\n")
+        client.read_lines(until=lambda l: l == "ok")
+        time.sleep(0.2)
+        client.write("!")
+        time.sleep(0.05)
+        held = client.status()
+        assert held["state"].startswith("Hold")
+        time.sleep(0.2)
+        assert client.status()["mpos"]["X"] == held["mpos"]["X"]
+        assert 0.0 < held["mpos"]["X"] < 20.0
+        client.write("~")
+        assert client.status()["state"] == "Run"
+        assert vc.wait_idle(5.0)
+        assert client.status()["mpos"]["X"] == pytest.approx(20.0)
+
+    def test_soft_reset_while_moving(self, vc, client):
+        client.write("G1 X50 F600\n")
+        client.read_lines(until=lambda l: l == "ok")
+        client.write(b"\x18")
+        lines = client.read_lines(until=lambda l: l.startswith("ALARM"))
+        assert lines[0].startswith("Grbl") and lines[-1] == "ALARM:3"
+        assert client.status()["state"] == "Alarm"
+
+
+class TestQueueEndToEnd:
+    """GCodeQueue streaming against the simulator."""
+
+    def test_stream_program(self):
+        with simulator.VirtualController(time_scale=0.0) as ctl:
+            client = _Client(ctl.port)
+            client.read_lines(0.05)
+            queue = GCodeQueue(lambda line: client.write(line + "\n"), timeout=5.0)
+            stop = threading.Event()
+
+            def rx():
+                while not stop.is_set():
+                    for line in client.read_lines(0.02, until=lambda l: True):
+                        if line == "ok":
+                            queue.notify_ack()
+                        elif line.startswith("error:"):
+                            queue.notify_error(line)
+
+            t = threading.Thread(target=rx, daemon=True)
+            t.start()
+            queue.enqueue_many(["G21 G90 F3000"] + [f"G1 X{i % 7} Y{i % 5}" for i in range(50)])
+            queue.start_run()
+            deadline = time.monotonic() + 10.0
+            while queue.running and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stop.set()
+            t.join(1.0)
+            client.close()
+            summary = queue.metrics.last_run
+            assert summary["status"] == "finished"
+            assert summary["acked"] == 51
+            assert ctl.oks_sent == 51
@@ -0,0 +1,97 @@
+"""Test the adaptive status-poll scheduler."""
+
+import time
+
+import pytest
+
+from robotrol.serial.status_poller import StatusPoller, state_of
+
+
+@pytest.fixture
+def poller():
+    sent = []
+    p = StatusPoller(lambda: sent.append(1), active_interval=0.1, idle_interval=1.0,
+                     unknown_interval=0.25, reply_timeout=0.5, realtime_holdoff=0.2,
+                     reset_holdoff=2.0)
+    p.reset(now=0.0)
+    p.sent = sent
+    return p
+
+
+class TestStateOf:
+    """Machine state extraction from status reports."""
+
+    def test_variants(self):
+        assert state_of("<Idle|MPos:0,0,0>") == "Idle"
+        assert state_of("<Hold:0|MPos:0,0,0>") == "Hold"
+        assert state_of("<Run>") == "Run"
+        assert state_of("ok") is None
+
+
+class TestSchedule:
+    """Poll period follows the machine state; one query in flight."""
+
+    def test_rates_follow_state(self, poller):
+        assert poller.tick(0.1) == pytest.approx(0.25)
+        assert poller.tick(0.25) == pytest.approx(0.75)  # waiting for reply
+        assert len(poller.sent) == 1
+        poller.on_line("<Idle|MPos:0,0,0>", now=0.27)
+        assert poller.tick(0.3) == pytest.approx(1.25)
+        poller.tick(1.25)
+        poller.on_line("<Run|MPos:1,0,0>", now=1.26)
+        assert poller.tick(1.3) == pytest.approx(1.35)
+        assert len(poller.sent) == 2
+        s = poller.stats()
+        assert s["state"] == "Run" and s["replies"] == 2
+        assert s["rtt_ms"]["max"] == pytest.approx(20.0)
+
+    def test_lost_reply_times_out(self, poller):
+        poller.tick(0.25)
+        assert poller.tick(0.74) == pytest.approx(0.75)
+        # Lost query is written off and the overdue poll goes out at once
+        poller.tick(0.75)
+        assert poller.stats()["timeouts"] == 1
+        assert len(poller.sent) == 2
+
+    def test_motion_while_idle_pulls_poll_forward(self, poller):
+        poller.tick(0.25)
+        poller.on_line("<Idle|MPos:0,0,0>", now=0.26)
+        poller.on_tx("$$", now=0.3)
+        assert poller.tick(0.3) == pytest.approx(1.25)
+        poller.on_tx("G1 X10 F600", now=0.3)
+        assert poller.tick(0.3) == pytest.approx(0.4)
+
+    def test_realtime_holdoff(self, poller):
+        poller.tick(0.25)
+        poller.on_line("<Run|MPos:0,0,0>", now=0.26)
+        poller.on_tx("!", now=0.3)
+        assert poller.tick(0.36) == pytest.approx(0.5)
+        # Soft reset: drops the query in flight, waits for the banner
+        poller.tick(0.5)
+        poller.note_realtime("\x18", now=0.51)
+        assert poller.state == "Unknown"
+        assert poller.tick(0.6) == pytest.approx(2.51)
+        poller.on_line("Grbl 1.1h ['$' for help]")
+        assert poller.tick(0.7) == pytest.approx(0.75)
+
+    def test_disabled(self, poller):
+        poller.enabled = False
+        assert poller.tick(5.0) is None
+        assert poller.sent == []
+
+
+class TestThread:
+    """The poll thread sends queries and stops cleanly."""
+
+    def test_thread_polls(self):
+        sent = []
+        p = StatusPoller(lambda: sent.append(time.monotonic()), unknown_interval=0.02)
+        p.start()
+        try:
+            time.sleep(0.15)
+        finally:
+            p.stop()
+        n = len(sent)
+        assert n >= 1
+        time.sleep(0.05)
+        assert len(sent) == n and not p.running
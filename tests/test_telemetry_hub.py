@@ -0,0 +1,115 @@
+"""Tests for robotrol.visualizer.telemetry_hub — local telemetry fan-out."""
+
+import json
+import socket
+import time
+
+import pytest
+
+from robotrol.visualizer import telemetry_hub as th
+
+
+@pytest.fixture
+def hub():
+    h = th.TelemetryHub(port=0)
+    h.start()
+    yield h
+    h.close()
+
+
+class Client:
+    def __init__(self, hub, **subscription):
+        self.sock = socket.create_connection(hub.address, timeout=2.0)
+        self.buf = b""
+        if subscription:
+            self.sock.sendall((json.dumps(subscription) + "\n").encode())
+
+    def read(self, n, timeout=2.0):
+        out = []
+        deadline = time.monotonic() + timeout
+        while len(out) < n and time.monotonic() < deadline:
+            while b"\n" in self.buf and len(out) < n:
+                line, self.buf = self.buf.split(b"\n", 1)
+                out.append(json.loads(line))
+            if len(out) < n:
+                self.sock.settimeout(max(0.01, deadline - time.monotonic()))
+                try:
+                    self.buf += self.sock.recv(65536)
+                except socket.timeout:
+                    break
+        return out
+
+    def close(self):
+        self.sock.close()
+
+
+def _wait_subscribers(hub, n, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while len(hub.stats()["subscribers"]) < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(hub.stats()["subscribers"]) == n
+
+
+class TestTelemetryHub:
+    def test_publish_without_start_is_noop(self):
+        h = th.TelemetryHub(port=0)
+        h.publish("joints", {"X": 1})
+        assert h.stats() == {"published": 0, "subscribers": []}
+
+    def test_fan_out_with_topic_filter_and_snapshot(self, hub):
+        hub.publish("status", {"state": "Idle"})
+        all_topics = Client(hub)
+        joints_only = Client(hub, topics=["joints"])
+        _wait_subscribers(hub, 2)
+        (snap,) = all_topics.read(1)
+        assert snap["topic"] == "status" and snap["data"] == {"state": "Idle"}
+        hub.publish("joints", {"X": 1.5})
+        (msg,) = all_topics.read(1)
+        assert msg["topic"] == "joints" and msg["seq"] == 1
+        assert joints_only.read(1)[0]["data"] == {"X": 1.5}
+        assert joints_only.read(1, timeout=0.3) == []
+        all_topics.close()
+        joints_only.close()
+
+    def test_latest_policy_coalesces_under_rate_limit(self, hub):
+        c = Client(hub, rate_hz=5)
+        _wait_subscribers(hub, 1)
+        for i in range(1, 101):
+            hub.publish("joints", {"X": i})
+        msgs = c.read(3, timeout=0.6)
+        assert msgs[-1]["data"] == {"X": 100} and msgs[-1]["seq"] == 100
+        assert len(msgs) < 5
+        assert hub.stats()["subscribers"][0]["dropped"] >= 95
+        c.close()
+
+    def test_drop_newest_bounded_queue(self, hub):
+        c = Client(hub, policy="drop_newest", queue=3, rate_hz=2)
+        _wait_subscribers(hub, 1)
+        hub.publish("queue", {"line": 0})
+        c.read(1)  # first flush opens the rate-limit window
+        for i in range(1, 11):
+            hub.publish("queue", {"line": i})
+        assert [m["data"]["line"] for m in c.read(3)] == [1, 2, 3]
+        c.close()
+
+    def test_slow_subscriber_does_not_block_publish(self, hub):
+        stuck = socket.create_connection(hub.address)
+        stuck.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        stuck.sendall(b'{"policy": "drop_oldest", "queue": 16}\n')
+        _wait_subscribers(hub, 1)
+        payload = {"blob": "x" * 2000}
+        t0 = time.monotonic()
+        for _ in range(5000):
+            hub.publish("detections", payload)
+        assert time.monotonic() - t0 < 2.0
+        assert hub.stats()["subscribers"][0]["pending"] <= 16
+        stuck.close()
+
+    def test_disconnect_unregisters(self, hub):
+        c = Client(hub)
+        _wait_subscribers(hub, 1)
+        c.close()
+        deadline = time.monotonic() + 2.0
+        while hub.stats()["subscribers"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert hub.stats()["subscribers"] == []
@@ -0,0 +1,146 @@
+"""Test telemetry recording, indexing and replay."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from robotrol.tools import replay_telemetry
+from robotrol.visualizer.mailbox import TelemetryMailbox
+from robotrol.visualizer.telemetry_log import (
+    INDEX_SUFFIX, TelemetryRecorder, TelemetryReplayer, build_index, iter_telemetry,
+    mailbox_sink, read_index, telemetry_stats,
+)
+
+POSE = {"X": 1.0, "Y": 2.0, "Z": 3.0, "A": 4.0, "B": 5.0, "C": 6.0}
+
+
+@pytest.fixture
+def log(tmp_path):
+    """20 s of joints at 10 Hz plus status, queue and an event."""
+    path = str(tmp_path / "t.rtl")
+    with TelemetryRecorder(path) as rec:
+        t0 = rec._t0
+        rec.record_status({"state": "Run"}, t0)
+        for i in range(200):
+            rec.record_joints(dict(POSE, X=float(i)), t0 + i * 0.1)
+            if i % 50 == 0:
+                rec.record_queue(i, 200, "running", t0 + i * 0.1)
+        rec.record_joints(dict(POSE, X=199.0), t0 + 20.0)  # duplicate, skipped
+        rec.record_event("detections", {"conf": 0.9}, t0 + 20.0)
+        rec.record_status({"state": "Idle"}, t0 + 20.0)
+        rec.record_queue(200, 200, "finished", t0 + 20.0)
+    return path
+
+
+class Collector:
+    def __init__(self):
+        self.items = []
+
+    def __call__(self, topic, data):
+        self.items.append((topic, data))
+
+    def topic(self, name):
+        return [d for t, d in self.items if t == name]
+
+
+class TestRecorder:
+    """Binary log round trip and index."""
+
+    def test_round_trip(self, log):
+        recs = list(iter_telemetry(log))
+        joints = [d for _, t, d in recs if t == "joints"]
+        assert len(joints) == 200
+        assert joints[7] == dict(POSE, X=7.0)
+        assert recs[0][1:] == ("status", {"state": "Run"})
+        assert recs[-1][1:] == ("queue", {"line": 200, "total": 200, "state": "finished"})
+        assert ("detections", {"conf": 0.9}) in [(t, d) for _, t, d in recs]
+        st = telemetry_stats(log)
+        assert st["by_topic"] == {"status": 2, "joints": 200, "queue": 5, "detections": 1}
+        assert st["duration_s"] == pytest.approx(20.0)
+        # 7 bytes framing + 25 bytes per six-axis joint record
+        assert st["bytes"] < 200 * 32 + 400
+
+    def test_index_matches_rebuild(self, log):
+        idx = read_index(log)
+        assert len(idx) == 21  # 0 s .. 20 s
+        assert idx == build_index(log)
+        os.remove(log + INDEX_SUFFIX)
+        assert read_index(log) == idx
+
+    def test_truncated_tail_ignored(self, log):
+        with open(log, "ab") as f:
+            f.write(b"\x01\x00\x00\x00\x01\x20")
+        assert len(list(iter_telemetry(log))) == 208
+
+    def test_oversized_record_dropped(self, tmp_path):
+        path = str(tmp_path / "big.rtl")
+        with TelemetryRecorder(path) as rec:
+            t0 = rec._t0
+            rec.record_event("blob", "x" * 70000, t0)
+            rec.record_status({"state": "Idle"}, t0 + 1.0)
+        assert rec.oversized == 1
+        assert rec.records == 1
+        assert [(t, d) for _, t, d in iter_telemetry(path)] == [("status", {"state": "Idle"})]
+
+
+class TestReplayer:
+    """Pacing, seeking and sinks."""
+
+    def test_max_speed(self, log):
+        sink = Collector()
+        result = TelemetryReplayer(log, speed=0).replay([sink])
+        assert result["records"] == 208
+        assert result["elapsed_s"] < 0.5
+        assert len(sink.topic("joints")) == 200
+
+    def test_paced_100x(self, log):
+        sink = Collector()
+        t0 = time.monotonic()
+        TelemetryReplayer(log, speed=100).replay([sink], end=5.0)
+        # 5 s of recording at 100x
+        assert time.monotonic() - t0 == pytest.approx(0.05, abs=0.04)
+        assert sink.topic("joints")[-1]["X"] == 50.0
+
+    def test_start_collapses_state(self, log):
+        sink = Collector()
+        result = TelemetryReplayer(log, speed=0).replay([sink], start=12.34)
+        # Newest state before 12.34 s first, then playback from there
+        assert sink.items[:3] == [
+            ("joints", dict(POSE, X=123.0)), ("status", {"state": "Run"}),
+            ("queue", {"line": 100, "total": 200, "state": "running"}),
+        ]
+        assert sink.items[3] == ("joints", dict(POSE, X=124.0))
+        assert result["records"] == 208 - 1 - 124 - 3
+
+    def test_seek_while_playing(self, log):
+        sink = Collector()
+        rp = TelemetryReplayer(log, speed=10)
+        th = threading.Thread(target=rp.replay, args=([sink],))
+        th.start()
+        time.sleep(0.1)
+        rp.seek(18.0)
+        th.join(2.0)
+        assert not th.is_alive()
+        xs = [d["X"] for d in sink.topic("joints")]
+        assert 100.0 not in xs
+        assert xs[xs.index(180.0):] == [float(i) for i in range(180, 200)]
+
+    def test_sink_errors_and_mailbox(self, log):
+        def bad(topic, data):
+            raise RuntimeError("boom")
+
+        mb = TelemetryMailbox()
+        result = TelemetryReplayer(log, speed=0).replay([bad, mailbox_sink(mb)])
+        assert result["sink_errors"] == 208
+        (pose,) = mb.drain()
+        assert pose["type"] == "abs" and pose["X"] == 199.0
+
+
+class TestTool:
+    def test_stats_and_bench(self, log, capsys):
+        assert replay_telemetry.main(["stats", log]) == 0
+        assert '"joints": 200' in capsys.readouterr().out
+        assert replay_telemetry.main(["bench", log, "--mailbox-only"]) == 0
+        assert '"records": 208' in capsys.readouterr().out
@@ -0,0 +1,143 @@
+"""Tests for robotrol.visualizer.telemetry_proto and the UDPMirror binary mode."""
+
+import json
+import socket
+
+import pytest
+
+from robotrol.visualizer import telemetry_proto as tp
+from robotrol.visualizer.udp_mirror import UDPMirror
+
+POSE = {"X": 10.0, "Y": -5.25, "Z": 0.0, "A": 45.0, "B": 0.5, "C": -12.5}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCodec:
+    def test_joint_frame_roundtrip(self):
+        enc, dec = tp.TelemetryEncoder(FakeClock()), tp.TelemetryDecoder()
+        data = enc.joints(POSE)
+        assert tp.is_binary(data)
+        assert len(data) == tp.HEADER.size + 1 + 6 * 4
+        assert len(data) < len(json.dumps({"type": "abs", **POSE}))
+        msg = dec.feed(data)
+        assert msg["type"] == "abs"
+        assert msg["seq"] == 1 and msg["t"] == 100.0
+        assert {k: msg[k] for k in POSE} == pytest.approx(POSE)
+        assert "S" not in msg
+
+    def test_stale_frames_dropped_restart_accepted(self):
+        enc, dec = tp.TelemetryEncoder(), tp.TelemetryDecoder()
+        first, second = enc.joints({"X": 1}), enc.joints({"X": 2})
+        assert dec.feed(second)["X"] == 2
+        assert dec.feed(first) is None
+        assert dec.feed(second) is None
+        assert dec.stats()["stale"] == 2
+        # A restarted sender counts from 1 again
+        enc.seq = 5000
+        dec.feed(enc.joints({"X": 3}))
+        assert dec.feed(tp.TelemetryEncoder().joints({"X": 4}))["X"] == 4
+
+    def test_path_chunked_and_reassembled(self):
+        enc, dec = tp.TelemetryEncoder(), tp.TelemetryDecoder()
+        pts = [[float(i), 0.5, -1.0, 2.0] for i in range(2 * tp.POINTS_PER_CHUNK + 3)]
+        dgrams = enc.path(pts, "path_kin")
+        assert len(dgrams) == 3
+        assert all(len(d) <= tp.MAX_DATAGRAM for d in dgrams)
+        # Arrival order does not matter; only the last chunk completes it
+        assert dec.feed(dgrams[2]) is None
+        assert dec.feed(dgrams[0]) is None
+        msg = dec.feed(dgrams[1])
+        assert msg == {"type": "path_kin", "pts": pts, "seq": 1}
+
+    def test_append_and_empty_path(self):
+        enc, dec = tp.TelemetryEncoder(), tp.TelemetryDecoder()
+        (d,) = enc.path([(1, 2, 3)], "path_fixed", append=True, seq=9)
+        assert dec.feed(d) == {"type": "path_fixed", "pts": [[1, 2, 3, 0]], "seq": 9,
+                               "append": True}
+        (d,) = enc.path([], "path_fixed", seq=10)
+        assert dec.feed(d) == {"type": "path_fixed", "pts": [], "seq": 10}
+
+    def test_lost_chunk_transfer_evicted(self):
+        enc, dec = tp.TelemetryEncoder(), tp.TelemetryDecoder()
+        pts = [(0, 0, 0, 0)] * (tp.POINTS_PER_CHUNK + 1)
+        for _ in range(tp.MAX_OPEN_TRANSFERS + 1):
+            dec.feed(enc.path(pts)[0])
+        stats = dec.stats()
+        assert stats["open_transfers"] == tp.MAX_OPEN_TRANSFERS
+        assert stats["incomplete"] == 1
+
+    def test_garbage_is_invalid(self):
+        dec = tp.TelemetryDecoder()
+        assert dec.feed(b"RT") is None
+        assert dec.feed(tp.HEADER.pack(tp.MAGIC, 99, 1, 1, 0.0)) is None
+        assert dec.feed(tp.HEADER.pack(tp.MAGIC, tp.VERSION, 1, 1, 0.0)) is None
+        assert dec.stats()["invalid"] == 3
+        assert not tp.is_binary(b'{"type": "abs"}')
+
+
+@pytest.fixture
+def receiver():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+def _recv_all(sock, timeout=0.2):
+    out = []
+    sock.settimeout(timeout)
+    try:
+        while True:
+            out.append(sock.recvfrom(65535)[0])
+    except socket.timeout:
+        return out
+
+
+class TestUDPMirror:
+    def test_json_mode_unchanged(self, receiver):
+        m = UDPMirror(receiver.getsockname())
+        m.send_joints(POSE)
+        m.append_path([(1, 2, 3, 4)], "path_kin")
+        m.clear_path("path_kin")
+        m.close()
+        abs_msg, path, clear = (json.loads(d) for d in _recv_all(receiver))
+        assert abs_msg["type"] == "abs" and abs_msg["Y"] == -5.25
+        assert path == {"type": "path_kin", "pts": [[1, 2, 3, 4]], "seq": 1, "append": True}
+        assert clear == {"type": "path_kin", "pts": [], "seq": 2}
+
+    def test_binary_mode(self, receiver):
+        m = UDPMirror(receiver.getsockname(), binary=True)
+        m.send_joints(POSE)
+        m.mirror_line("M3 S700")
+        m.send_fixed_frame((0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1))
+        m.close()
+        data = _recv_all(receiver)
+        dec = tp.TelemetryDecoder()
+        assert dec.feed(data[0])["A"] == 45.0
+        assert data[1] == b"M3 S700\n"
+        s_msg = dec.feed(data[2])
+        assert s_msg["S"] == 700.0 and s_msg["seq"] == 2
+        assert "X" not in s_msg
+        assert json.loads(data[3])["type"] == "fixed_frame"
+
+    def test_rate_limit_coalesces_and_flushes_latest(self, receiver):
+        m = UDPMirror(receiver.getsockname(), binary=True, max_rate_hz=20)
+        for i in range(50):
+            m.send_joints({"X": float(i), "Y": 1.0})
+        m.send_joints({"S": 300.0})
+        data = _recv_all(receiver, timeout=0.3)
+        m.close()
+        dec = tp.TelemetryDecoder()
+        msgs = [dec.feed(d) for d in data]
+        # First pose immediately, everything after it merged into one frame
+        assert [msg["X"] for msg in msgs] == [0.0, 49.0]
+        assert msgs[-1]["S"] == 300.0 and msgs[-1]["Y"] == 1.0
+        assert m.stats()["poses_coalesced"] == 50 - 2 + 1
@@ -0,0 +1,155 @@
+"""Test the serial TX writer thread."""
+
+import threading
+import time
+
+import pytest
+
+from robotrol.serial.tx_writer import TxWriter, batch_bytes_for
+
+
+class _Port:
+    """write() records chunks; blocks while ``gate`` is cleared."""
+
+    def __init__(self):
+        self.chunks = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def write(self, data):
+        self.entered.set()
+        self.gate.wait(2.0)
+        self.chunks.append(data)
+        return len(data)
+
+
+@pytest.fixture
+def port():
+    return _Port()
+
+
+@pytest.fixture
+def writer(port):
+    written = []
+    w = TxWriter(port.write, on_written=written.append, max_lines=4, put_timeout=0.05)
+    w.written = written
+    w.start()
+    yield w
+    port.gate.set()
+    w.stop()
+
+
+def _stall(port, writer):
+    """Hold the writer inside write() so later items pile up."""
+    port.gate.clear()
+    port.entered.clear()
+    writer.put_line("G4 P0")
+    assert port.entered.wait(1.0)
+
+
+class TestTxWriter:
+    """Coalescing, priority lane and back-pressure."""
+
+    def test_lines_coalesce_into_one_write(self, port, writer):
+        _stall(port, writer)
+        for i in range(3):
+            writer.put_line(f"G1 X{i}")
+        port.gate.set()
+        assert writer.wait_empty(1.0)
+        assert port.chunks == [b"G4 P0\n", b"G1 X0\nG1 X1\nG1 X2\n"]
+        assert writer.stats()["max_batch"] == 3
+        assert writer.written == ["G4 P0", "G1 X0", "G1 X1", "G1 X2"]
+
+    def test_realtime_jumps_ahead(self, port, writer):
+        _stall(port, writer)
+        writer.put_line("G1 X1")
+        writer.put_line("G1 X2")
+        writer.put_realtime("!")
+        port.gate.set()
+        assert writer.wait_empty(1.0)
+        assert port.chunks[1] == b"!G1 X1\nG1 X2\n"
+        s = writer.stats()
+        assert s["realtime"] == 1 and s["lines"] == 3
+
+    def test_full_lane_drops_and_discard(self, port, writer):
+        _stall(port, writer)
+        for i in range(4):
+            assert writer.put_line(f"G1 X{i}")
+        assert not writer.put_line("G1 X9")
+        assert writer.stats()["dropped"] == 1
+        assert writer.discard_lines() == 4
+        writer.put_realtime("\x18")
+        port.gate.set()
+        assert writer.wait_empty(1.0)
+        assert port.chunks == [b"G4 P0\n", b"\x18"]
+
+    def test_stopped_writer_refuses(self, port):
+        w = TxWriter(port.write)
+        assert not w.put_line("G0 X0")
+        w.start()
+        assert w.put_line("G0 X0")
+        w.stop(drain=True)
+        assert port.chunks == [b"G0 X0\n"]
+        assert not w.put_realtime("?")
+
+    def test_gui_put_does_not_block(self, port, writer):
+        _stall(port, writer)
+        for i in range(4):
+            writer.put_line(f"G1 X{i}")
+        t0 = time.monotonic()
+        assert not writer.put_line("G1 X9", timeout=0.0)
+        assert time.monotonic() - t0 < 0.02
+        assert writer.stats()["dropped"] == 1
+
+
+class TestWriteFailures:
+    """Batch sizing, short writes and lost items."""
+
+    def test_batch_fits_write_timeout(self):
+        n = batch_bytes_for(115200, 0.2)
+        assert n == 1152
+        # Bytes at 10 bit times each, well within the 0.2 s timeout
+        assert n * 10 / 115200 <= 0.1
+        assert batch_bytes_for(300, 0.2) == 64
+
+    def test_short_write_is_continued(self):
+        chunks = []
+
+        def write(data):
+            chunks.append(bytes(data[:5]))
+            return min(5, len(data))
+
+        w = TxWriter(write)
+        w.start()
+        w.put_line("G1 X10 Y20")
+        assert w.wait_empty(1.0)
+        w.stop()
+        assert b"".join(chunks) == b"G1 X10 Y20\n"
+        assert w.stats()["lost"] == 0
+
+    def test_failed_write_reports_unsent_items(self, port):
+        failures = []
+        written = []
+        replies = [None, 6]  # all of "G4 P0", then only "G1 X1\n"
+
+        def write(data):
+            port.write(data)
+            if not replies:
+                raise IOError("Write timeout")
+            n = replies.pop(0)
+            return len(data) if n is None else n
+
+        w = TxWriter(write, on_written=written.append,
+                     on_error=lambda e, texts: failures.append((str(e), texts)))
+        w.start()
+        _stall(port, w)
+        for t in ("G1 X1", "G1 X2", "G1 X3"):
+            w.put_line(t)
+        port.gate.set()
+        assert w.wait_empty(1.0)
+        w.stop()
+        assert written == ["G4 P0", "G1 X1"]
+        assert failures == [("Write timeout", ["G1 X2", "G1 X3"])]
+        s = w.stats()
+        assert s["lost"] == 2 and s["errors"] == 1 and s["lines"] == 2
@@ -0,0 +1,130 @@
+"""Tests for robotrol.gui.ui_coalescer — latest-value UI refresh slots."""
+
+import logging
+import threading
+
+from robotrol.gui.ui_coalescer import UICoalescer
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, delay_ms, fn):
+        self.calls.append((delay_ms, fn))
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for _, fn in calls:
+            fn()
+
+
+class TestUICoalescer:
+    def test_burst_is_one_flush_with_newest_value(self):
+        """Many posts before the frame -> one scheduled flush, newest value wins."""
+        sched = FakeScheduler()
+        seen = []
+        c = UICoalescer(sched)
+        c.register("status", seen.append)
+        for i in range(100):
+            c.post("status", i)
+        assert len(sched.calls) == 1
+        sched.run()
+        assert seen == [99]
+        st = c.stats()
+        assert st["posted"] == 100
+        assert st["merged"] == 99
+        assert st["merged_by_key"] == {"status": 99}
+        assert st["delivered"] == 1
+
+    def test_keys_are_independent(self):
+        sched = FakeScheduler()
+        seen = []
+        c = UICoalescer(sched)
+        c.register("a", lambda v: seen.append(("a", v)))
+        c.register("b", lambda v: seen.append(("b", v)))
+        assert c.post("a", 1) is False
+        assert c.post("b", 2) is False
+        assert c.post("a", 3) is True
+        sched.run()
+        assert sorted(seen) == [("a", 3), ("b", 2)]
+
+    def test_reschedules_after_flush_paced_to_frame(self):
+        """A post right after a flush waits out the rest of the frame."""
+        now = [10.0]
+        sched = FakeScheduler()
+        c = UICoalescer(sched, frame_ms=20, clock=lambda: now[0])
+        c.register("k", lambda v: None)
+        c.post("k", 1)
+        assert sched.calls[0][0] == 0  # idle: no added latency
+        sched.run()
+        now[0] += 0.005
+        c.post("k", 2)
+        assert sched.calls[0][0] == 15
+        assert c.pending
+
+    def test_post_call_and_handler_errors(self):
+        sched = FakeScheduler()
+        out = []
+        c = UICoalescer(sched)
+        c.post_call("x", lambda: out.append("old"))
+        c.post_call("x", lambda: out.append("new"))
+        c.register("bad", lambda v: 1 / 0)
+        c.post("bad", 0)
+        sched.run()
+        assert out == ["new"]
+        assert c.stats()["errors"] == 1
+
+    def test_schedule_failure_does_not_wedge(self):
+        """If the UI cannot schedule, the next post tries again."""
+        attempts = []
+
+        def broken(delay, fn):
+            attempts.append(delay)
+            raise RuntimeError("main thread is not in main loop")
+
+        c = UICoalescer(broken)
+        c.post("k", 1)
+        c.post("k", 2)
+        assert len(attempts) == 2
+        assert not c.pending
+
+    def test_concurrent_posts(self):
+        sched = FakeScheduler()
+        seen = []
+        c = UICoalescer(sched)
+        c.register("k", seen.append)
+
+        def worker(base):
+            for i in range(500):
+                c.post("k", base + i)
+
+        threads = [threading.Thread(target=worker, args=(n * 1000,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(sched.calls) == 1
+        sched.run()
+        st = c.stats()
+        assert st["posted"] == 2000
+        assert st["merged"] == 1999
+        assert len(seen) == 1
+
+    def test_counters_logged_at_debug_interval(self, caplog):
+        now = [0.0]
+        sched = FakeScheduler()
+        c = UICoalescer(sched, clock=lambda: now[0], log_interval_s=10.0)
+        c.register("status", lambda v: None)
+        caplog.set_level(logging.DEBUG, logger="robotrol.gui.ui_coalescer")
+        for t in range(25):
+            now[0] = float(t)
+            c.post("status", 1)
+            c.post("status", 2)
+            sched.run()
+        lines = [r.getMessage() for r in caplog.records if r.getMessage().startswith("UI updates")]
+        assert lines == [
+            "UI updates: posted=22 delivered=11 merged=11 (status=11) flushes=11 errors=0",
+            "UI updates: posted=42 delivered=21 merged=21 (status=21) flushes=21 errors=0",
+        ]
+
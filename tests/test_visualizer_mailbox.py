@@ -0,0 +1,80 @@
+"""Tests for robotrol.visualizer.mailbox — latest-state UDP mailbox."""
+
+import json
+import threading
+
+from robotrol.visualizer.mailbox import TelemetryMailbox
+
+
+def _abs(**axes):
+    return json.dumps({"type": "abs", **axes})
+
+
+class TestTelemetryMailbox:
+    def test_newest_pose_wins(self):
+        mb = TelemetryMailbox()
+        for i in range(100):
+            mb.put_line(_abs(X=i, Y=0, S=500) if i == 0 else _abs(X=i, Y=0))
+        out = mb.drain()
+        assert len(out) == 1
+        assert out[0]["X"] == 99
+        assert out[0]["S"] == 500  # kept from the older message
+        assert mb.stats()["merged"] == 99
+        assert mb.drain() == []
+
+    def test_paths_replace_or_append(self):
+        mb = TelemetryMailbox()
+        mb.put({"type": "path_kin", "pts": [[0, 0, 0]]})
+        mb.put({"type": "path_kin", "pts": [[1, 1, 1]], "append": True})
+        kin = {m["type"]: m for m in mb.drain()}["path_kin"]
+        assert kin["pts"] == [[0, 0, 0], [1, 1, 1]]
+        assert not kin.get("append")
+        mb.put({"type": "path_fixed", "pts": [[5, 5, 5]], "append": True})
+        mb.put({"type": "path_fixed", "pts": [[6, 6, 6]], "append": True})
+        (fixed,) = mb.drain()
+        assert fixed["append"] is True
+        assert fixed["pts"] == [[5, 5, 5], [6, 6, 6]]
+        mb.put({"type": "path_fixed", "pts": [[7, 7, 7]], "append": True})
+        mb.put({"type": "path_fixed", "pts": []})
+        assert mb.drain() == [{"type": "path_fixed", "pts": []}]
+
+    def test_apply_order_and_label(self):
+        mb = TelemetryMailbox()
+        mb.put_line(_abs(X=1))
+        mb.put_line(json.dumps({"type": "robot_profile", "profile": "p"}))
+        assert [m["type"] for m in mb.drain()] == ["robot_profile", "abs"]
+        seq, last = mb.last()
+        assert last["type"] == "robot_profile"
+        assert mb.put_line("G1 X1") is False
+        seq2, last = mb.last()
+        assert seq2 == seq + 1 and last == "G1 X1"
+        assert mb.stats()["parse_errors"] == 1
+
+    def test_concurrent_producer(self):
+        mb = TelemetryMailbox()
+        seen = []
+
+        def produce():
+            for i in range(2000):
+                mb.put_line(_abs(X=i))
+
+        t = threading.Thread(target=produce)
+        t.start()
+        while t.is_alive():
+            seen.extend(m["X"] for m in mb.drain())
+        t.join()
+        seen.extend(m["X"] for m in mb.drain())
+        assert seen == sorted(seen)
+        assert seen[-1] == 1999
+
+    def test_merged_appends_keep_first_seq(self):
+        mb = TelemetryMailbox()
+        for seq in (4, 5, 6):
+            mb.put({"type": "path_fixed", "pts": [[seq, 0, 0]], "seq": seq, "append": True})
+        (msg,) = mb.drain()
+        assert msg["seq_first"] == 4 and msg["seq"] == 6
+        assert len(msg["pts"]) == 3
+        mb.put({"type": "path_fixed", "pts": [], "seq": 7})
+        mb.put({"type": "path_fixed", "pts": [[1, 1, 1]], "seq": 8, "append": True})
+        (msg,) = mb.drain()
+        assert "seq_first" not in msg and not msg.get("append")